@@ -67,6 +67,7 @@ from app.network_connectors.models.network_connectors import (
     NetworkConnectorsSubscription,
 )
 from app.schedulers.models.scheduler import JobMetadata
+from app.threat_intel.models.epss import EpssScore
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
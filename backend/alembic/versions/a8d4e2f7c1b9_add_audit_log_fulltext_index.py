@@ -0,0 +1,37 @@
+"""add audit log fulltext index
+
+Revision ID: a8d4e2f7c1b9
+Revises: f2c6a9e1d3b7
+Create Date: 2026-10-18 17:48:36.615204
+
+The audit log search was three leading-wildcard ILIKE scans over details,
+actor_username and entity_id. This adds a FULLTEXT index over the three for the
+MATCH ... AGAINST search in app/audit/services/query.py. The first FULLTEXT
+index on an InnoDB table rebuilds it to add the hidden FTS_DOC_ID column, so on
+a large audit_log expect this step to take a while.
+
+"""
+from typing import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a8d4e2f7c1b9"
+down_revision: Union[str, None] = "f2c6a9e1d3b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_audit_log_search",
+        "audit_log",
+        ["details", "actor_username", "entity_id"],
+        unique=False,
+        mysql_prefix="FULLTEXT",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_log_search", table_name="audit_log")
@@ -0,0 +1,45 @@
+"""add epss score table
+
+Revision ID: c4e1a7d9b2f3
+Revises: b151c7ebbb95
+Create Date: 2026-10-18 09:12:44.318204
+
+Vulnerability search and CSV export looked up each CVE's EPSS score with its own
+request to api.first.org, so a 5,000-row export made 5,000 sequential HTTP calls.
+This table holds the daily FIRST feed locally instead; see
+app/threat_intel/services/epss_cache.py.
+
+"""
+from typing import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+import sqlmodel
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e1a7d9b2f3"
+down_revision: Union[str, None] = "b151c7ebbb95"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "epss_score",
+        sa.Column("cve", sqlmodel.sql.sqltypes.AutoString(length=32), nullable=False),
+        sa.Column("epss", sqlmodel.sql.sqltypes.AutoString(length=16), nullable=False),
+        sa.Column("percentile", sqlmodel.sql.sqltypes.AutoString(length=16), nullable=False),
+        sa.Column("score_date", sqlmodel.sql.sqltypes.AutoString(length=10), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("cve"),
+    )
+    # The refresh job reads max(updated_at) at startup to decide whether the
+    # snapshot on disk is still today's.
+    op.create_index(op.f("ix_epss_score_updated_at"), "epss_score", ["updated_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_epss_score_updated_at"), table_name="epss_score")
+    op.drop_table("epss_score")
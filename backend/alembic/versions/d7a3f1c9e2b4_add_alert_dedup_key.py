@@ -0,0 +1,67 @@
+"""add alert dedup key
+
+Revision ID: d7a3f1c9e2b4
+Revises: c4e1a7d9b2f3
+Create Date: 2026-10-18 11:40:27.903115
+
+Alert ingest looked for the customer's open alert with an event's title using
+customer_code, alert_name (TEXT) and status, none of them indexed, so every
+ingested event scanned incident_management_alert. This adds a hashed
+(customer, normalised title) key indexed together with status, backfills it,
+and indexes (customer_code, status) for the per-customer alert lists; see
+app/incidents/services/open_alert_index.py.
+
+"""
+import hashlib
+from typing import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+import sqlmodel
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d7a3f1c9e2b4"
+down_revision: Union[str, None] = "c4e1a7d9b2f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE_NAME = "incident_management_alert"
+BATCH_SIZE = 5000
+
+
+def _dedup_key(customer_code, alert_name) -> str:
+    # Frozen copy of app.incidents.services.open_alert_index.alert_dedup_key.
+    normalised = " ".join((alert_name or "").split()).casefold()
+    return hashlib.sha256(f"{customer_code}\x1f{normalised}".encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column(TABLE_NAME, sa.Column("dedup_key", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True))
+
+    # Backfill in id order, a batch at a time, so a large alert table is never
+    # held in memory or locked by one enormous UPDATE.
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(f"SELECT id, customer_code, alert_name FROM {TABLE_NAME} WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        bind.execute(
+            sa.text(f"UPDATE {TABLE_NAME} SET dedup_key = :dedup_key WHERE id = :id"),
+            [{"id": row.id, "dedup_key": _dedup_key(row.customer_code, row.alert_name)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+    op.create_index("ix_incident_management_alert_dedup_key_status", TABLE_NAME, ["dedup_key", "status"], unique=False)
+    op.create_index("ix_incident_management_alert_customer_code_status", TABLE_NAME, ["customer_code", "status"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_incident_management_alert_customer_code_status", table_name=TABLE_NAME)
+    op.drop_index("ix_incident_management_alert_dedup_key_status", table_name=TABLE_NAME)
+    op.drop_column(TABLE_NAME, "dedup_key")
@@ -0,0 +1,34 @@
+"""add alert creation time index
+
+Revision ID: e5b8c2d4f6a1
+Revises: d7a3f1c9e2b4
+Create Date: 2026-10-18 14:05:51.227480
+
+The alert listings can page by (alert_creation_time, id) with a cursor instead
+of an OFFSET; without an index on alert_creation_time every page would still
+sort the whole filtered set. See app/db/keyset.py.
+
+"""
+from typing import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b8c2d4f6a1"
+down_revision: Union[str, None] = "d7a3f1c9e2b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f("ix_incident_management_alert_alert_creation_time"),
+        "incident_management_alert",
+        ["alert_creation_time"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_incident_management_alert_alert_creation_time"), table_name="incident_management_alert")
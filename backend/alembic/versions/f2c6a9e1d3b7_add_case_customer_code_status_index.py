@@ -0,0 +1,35 @@
+"""add case customer code status index
+
+Revision ID: f2c6a9e1d3b7
+Revises: e5b8c2d4f6a1
+Create Date: 2026-10-18 16:22:09.481736
+
+The case list and the customer portal dashboard count a customer's cases per
+status with one GROUP BY case_status; indexing (customer_code, case_status)
+lets that read the index alone instead of every case row. Alerts already have
+the matching index from d7a3f1c9e2b4.
+
+"""
+from typing import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c6a9e1d3b7"
+down_revision: Union[str, None] = "e5b8c2d4f6a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_incident_management_case_customer_code_case_status",
+        "incident_management_case",
+        ["customer_code", "case_status"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_incident_management_case_customer_code_case_status", table_name="incident_management_case")
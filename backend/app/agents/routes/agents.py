@@ -67,6 +67,7 @@ from app.db.db_session import get_db
 from app.db.universal_models import AgentDataStore
 from app.db.universal_models import Agents
 from app.incidents.schema.db_operations import CaseOutResponse
+from app.incidents.services import reference_cache
 from app.incidents.services.db_operations import list_cases_by_asset_name
 from app.middleware.customer_access import customer_access_handler
 from app.middleware.customer_access import verify_customer_code_access
@@ -74,8 +75,7 @@ from app.middleware.customer_query import customer_codes_query
 from app.middleware.search_query import SearchParams
 from app.middleware.search_query import apply_search_limit
 from app.middleware.search_query import search_query
-from app.threat_intel.schema.epss import EpssThreatIntelRequest
-from app.threat_intel.services.epss import collect_epss_score
+from app.threat_intel.services.epss_cache import get_epss_scores
 
 
 async def get_wazuh_manager_version() -> str:
@@ -229,6 +229,7 @@ async def delete_agent_from_database(db: AsyncSession, agent_id: str):
         # Then delete the agent
         await db.execute(delete(Agents).filter(Agents.agent_id == agent_id))
         await db.commit()
+        reference_cache.invalidate("agent")
     except Exception as e:
         logger.error(f"Failed to delete agent {agent_id} from database: {e}")
         await db.rollback()
@@ -671,22 +672,25 @@ async def sync_all_agents() -> SyncedAgentsResponse:
     """
     logger.info("Syncing agents as part of scheduled job")
     loop = asyncio.get_event_loop()
-    await loop.create_task(sync_agents_wazuh())
+    wazuh_sync = await loop.create_task(sync_agents_wazuh())
 
     # Velociraptor is optional — a deployment with only the Wazuh Manager verified must still
     # complete the Wazuh side of the sync rather than failing the whole request.
     try:
-        await loop.create_task(sync_agents_velociraptor())
+        velociraptor_sync = await loop.create_task(sync_agents_velociraptor())
     except Exception as e:
         logger.error(f"Failed to sync agents with Velociraptor, continuing without it: {e}")
         return SyncedAgentsResponse(
             success=True,
             message=f"Agents synced from Wazuh Manager. Velociraptor sync skipped: {e}",
+            wazuh=wazuh_sync.wazuh,
         )
 
     return SyncedAgentsResponse(
         success=True,
         message="Agents synced started successfully",
+        wazuh=wazuh_sync.wazuh,
+        velociraptor=velociraptor_sync.velociraptor,
     )
 
 
@@ -1015,9 +1019,11 @@ async def get_agent_vulnerabilities_csv(
             "EPSS Score",
         ],
     )
+    # One EPSS lookup for the whole file, not one API call per row
+    epss_scores = await get_epss_scores(vulnerability.cve for vulnerability in vulnerabilities)
     # Write the rows
     for vulnerability in vulnerabilities:
-        epss_score = await collect_epss_score(EpssThreatIntelRequest(cve=vulnerability.cve))
+        epss_score = epss_scores.get((vulnerability.cve or "").upper())
         writer.writerow(
             [
                 vulnerability.severity,
@@ -1032,7 +1038,7 @@ async def get_agent_vulnerabilities_csv(
                 vulnerability.cve,
                 vulnerability.status,
                 vulnerability.title,
-                epss_score.data[0].epss if epss_score.data else "",
+                epss_score[0] if epss_score else "",
             ],
         )
     # Return the CSV file as a streaming response
@@ -1344,6 +1350,7 @@ async def update_agent(
 
         agent.velociraptor_id = velociraptor_id
         await session.commit()
+        reference_cache.invalidate("agent", agent.hostname)
         logger.info(f"Agent {agent_id} updated with Velociraptor ID: {velociraptor_id}")
         return AgentModifyResponse(
             success=True,
@@ -24,10 +24,20 @@ class SyncedWazuhAgent(WazuhAgent):
     pass
 
 
+class AgentSyncCounts(BaseModel):
+    added: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    missing: int = Field(0, description="Agents in CoPilot that the source no longer reports and that were kept")
+
+
 class SyncedAgentsResponse(BaseModel):
     # agents_added: List[SyncedAgent]
     success: bool
     message: str
+    wazuh: Optional[AgentSyncCounts] = None
+    velociraptor: Optional[AgentSyncCounts] = None
 
 
 class AgentModifyResponse(BaseModel):
@@ -1,25 +1,53 @@
+import os
 from datetime import datetime
 from datetime import timezone
+from typing import Dict
 from typing import List
+from typing import Sequence
 
 from fastapi import HTTPException
 from loguru import logger
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 import app.agents.velociraptor.services.agents as velociraptor_services
 import app.agents.wazuh.services.agents as wazuh_services
+from app.agents.schema.agents import AgentSyncCounts
 from app.agents.schema.agents import SyncedAgentsResponse
-from app.agents.schema.agents import SyncedWazuhAgent
 from app.agents.velociraptor.schema.agents import VelociraptorAgent
 from app.agents.velociraptor.schema.agents import VelociraptorClients
 from app.agents.velociraptor.schema.agents import VelociraptorOrganizations
-from app.agents.wazuh.schema.agents import WazuhAgent
 from app.agents.wazuh.schema.agents import WazuhAgentsList
 from app.connectors.models import Connectors
 from app.connectors.utils import is_connector_verified
 from app.db.db_session import get_db_session
+from app.db.universal_models import AgentDataStore
 from app.db.universal_models import Agents
+from app.db.universal_models import AgentVulnerabilities
+from app.incidents.services import reference_cache
+
+#: The columns each half of the sync owns. A row whose values already match
+#: is left alone, so a sync of an unchanged fleet writes nothing.
+WAZUH_SYNC_COLUMNS = (
+    "agent_id",
+    "ip_address",
+    "os",
+    "label",
+    "wazuh_last_seen",
+    "wazuh_agent_version",
+    "wazuh_agent_status",
+    "customer_code",
+)
+VELOCIRAPTOR_SYNC_COLUMNS = ("velociraptor_id", "velociraptor_last_seen", "velociraptor_agent_version", "velociraptor_org")
+
+#: Delete agents the Wazuh Manager no longer reports (with their data store and
+#: vulnerability rows). Off by default: a row also carries analyst state —
+#: critical-asset and quarantine flags — that a sync should not discard silently.
+REMOVE_MISSING = os.getenv("AGENT_SYNC_REMOVE_MISSING", "false").strip().lower() in ("1", "true", "yes", "on")
+
+#: Rows per DELETE when removing agents.
+SYNC_BATCH_SIZE = 500
 
 
 async def fetch_wazuh_agents() -> WazuhAgentsList:
@@ -101,57 +129,6 @@ async def fetch_velociraptor_agent_via_client_id(client_id: str) -> Velociraptor
     return await velociraptor_services.collect_velociraptor_agent_via_client_id(client_id)
 
 
-async def add_wazuh_agent_in_db(
-    session: AsyncSession,
-    agent: WazuhAgent,
-    customer_code: str,
-):
-    """Add new agent to database.
-
-    Args:
-        session (AsyncSession): The asynchronous session object for database operations.
-        agent (WazuhAgent): The Wazuh agent object to be added.
-        customer_code (str): The customer code for the agent.
-
-    Returns:
-        None
-
-    """
-    new_agent = Agents.create_wazuh_agent_from_model(agent, customer_code)
-    session.add(new_agent)
-    logger.info(f"Adding agent {agent.agent_name} to the database")
-    try:
-        await session.commit()  # Use the await keyword to commit asynchronously
-    except Exception as e:
-        logger.error(f"Failed to add agent {agent.agent_name} to the database: {e}")
-        await session.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
-    logger.info(f"Agent {agent.agent_name} added to the database")
-
-
-async def update_wazuh_agent_in_db(
-    session: AsyncSession,
-    existing_agent: Agents,
-    agent: WazuhAgent,
-    customer_code: str,
-):
-    """Update existing agent in database.
-
-    Args:
-        session (AsyncSession): The async session object for database operations.
-        existing_agent (Agents): The existing agent object in the database.
-        agent (WazuhAgent): The updated agent object.
-        customer_code (str): The customer code associated with the agent.
-
-    Returns:
-        None
-
-    """
-    existing_agent.update_wazuh_agent_from_model(agent, customer_code)
-    await session.commit()  # Use the await keyword to commit asynchronously
-    logger.info(f"Agent {agent.agent_name} updated in the database")
-
-
 def extract_customer_code(customer_code: str):
     """Extracts the customer code from the agent label.
 
@@ -245,64 +222,97 @@ async def process_velociraptor_agent(session, agent, client_id=None):
         return None
 
 
+def _row_values(agent: Agents, columns: Sequence[str]) -> tuple:
+    # Datetimes are compared naive: MySQL hands them back without a tzinfo.
+    values = []
+    for column in columns:
+        value = getattr(agent, column)
+        values.append(value.replace(tzinfo=None) if isinstance(value, datetime) else value)
+    return tuple(values)
+
+
+async def _remove_agents(session: AsyncSession, agents: List[Agents]) -> None:
+    """Delete ``agents`` and the rows that reference them, in batches, inside the caller's transaction."""
+    for start in range(0, len(agents), SYNC_BATCH_SIZE):
+        batch = agents[start : start + SYNC_BATCH_SIZE]
+        agent_ids = [agent.agent_id for agent in batch]
+        await session.execute(delete(AgentDataStore).where(AgentDataStore.agent_id.in_(agent_ids)))
+        await session.execute(delete(AgentVulnerabilities).where(AgentVulnerabilities.agent_id.in_(agent_ids)))
+        await session.execute(delete(Agents).where(Agents.id.in_([agent.id for agent in batch])))
+
+
+async def _commit_sync(session: AsyncSession, source: str, counts: AgentSyncCounts) -> None:
+    try:
+        await session.commit()
+    except Exception as e:
+        logger.error(f"Failed to sync {source} agents to the database: {e}")
+        await session.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+    # Alert ingest caches agents by hostname; new rows need nothing, as misses are never cached.
+    if counts.changed or counts.removed:
+        reference_cache.invalidate("agent")
+
+
 async def sync_agents_wazuh() -> SyncedAgentsResponse:
+    """
+    Brings the `Agents` table in line with the agents the Wazuh Manager reports.
+
+    The existing rows are loaded once into a hostname map and diffed against
+    the Wazuh list: new hostnames are inserted, rows whose Wazuh columns differ
+    are updated, and the rest are left alone, all in one transaction. Rows for
+    hostnames Wazuh no longer reports are counted as ``missing`` and kept, or
+    deleted when `AGENT_SYNC_REMOVE_MISSING` is set.
+
+    Returns:
+        SyncedAgentsResponse: The outcome, with the per-row counts under ``wazuh``.
+    """
     wazuh_agents_list = await fetch_wazuh_agents()
-    logger.info(f"Collected Wazuh Agents: {wazuh_agents_list}")
+    logger.info(f"Collected {len(wazuh_agents_list.agents)} Wazuh agents")
 
-    agents_added_list: List[WazuhAgent] = []
+    counts = AgentSyncCounts()
+    async with get_db_session() as session:
+        existing_agents = (await session.execute(select(Agents).order_by(Agents.id))).scalars().all()
+        agents_by_hostname: Dict[str, Agents] = {}
+        for agent in existing_agents:
+            agents_by_hostname.setdefault(agent.hostname, agent)
 
-    async with get_db_session() as session:  # Create a new session here
+        reported_hostnames = set()
         for wazuh_agent in wazuh_agents_list.agents:
             customer_code = extract_customer_code(wazuh_agent.agent_label)
-
-            existing_agent_query = select(Agents).filter(
-                Agents.hostname == wazuh_agent.agent_name,
-            )
-            result = await session.execute(existing_agent_query)
-            existing_agent = result.scalars().first()
-
-            if existing_agent:
-                await update_wazuh_agent_in_db(session, existing_agent, wazuh_agent, customer_code)
+            reported_hostnames.add(wazuh_agent.agent_name)
+            synced_agent = Agents.create_wazuh_agent_from_model(wazuh_agent, customer_code)
+
+            existing_agent = agents_by_hostname.get(wazuh_agent.agent_name)
+            if existing_agent is None:
+                session.add(synced_agent)
+                agents_by_hostname[wazuh_agent.agent_name] = synced_agent
+                counts.added += 1
+            elif _row_values(existing_agent, WAZUH_SYNC_COLUMNS) == _row_values(synced_agent, WAZUH_SYNC_COLUMNS):
+                counts.unchanged += 1
             else:
-                await add_wazuh_agent_in_db(session, wazuh_agent, customer_code)
-
-            synced_wazuh_agent = SyncedWazuhAgent(**wazuh_agent.model_dump())
-            agents_added_list.append(synced_wazuh_agent)
-
-    logger.info(f"Agents Added List: {agents_added_list}")
+                existing_agent.update_wazuh_agent_from_model(wazuh_agent, customer_code)
+                counts.changed += 1
+
+        missing_agents = [agent for agent in existing_agents if agent.hostname not in reported_hostnames]
+        # An empty list is far more likely a misconfigured manager than a fleet
+        # decommissioned overnight; it never removes anything.
+        if missing_agents and REMOVE_MISSING and wazuh_agents_list.agents:
+            logger.info(f"Removing {len(missing_agents)} agents the Wazuh Manager no longer reports")
+            await _remove_agents(session, missing_agents)
+            counts.removed = len(missing_agents)
+        else:
+            counts.missing = len(missing_agents)
 
-    # Close the session
-    await session.close()
+        await _commit_sync(session, "Wazuh", counts)
 
+    logger.info(f"Wazuh agent sync: {counts.model_dump()}")
     return SyncedAgentsResponse(
         success=True,
         message="Agents synced successfully",
+        wazuh=counts,
     )
 
 
-async def update_agent_with_velociraptor_in_db(
-    session: AsyncSession,
-    agent: Agents,
-    velociraptor_agent: VelociraptorAgent,
-):
-    """Update existing agent in database with Velociraptor details.
-
-    Args:
-        session (AsyncSession): The async session object for database operations.
-        agent (Agents): The existing agent object in the database.
-        client (VelociraptorAgent): The updated client object.
-
-    Returns:
-        None
-
-    """
-    logger.info(f"Updating agent {agent.hostname} with Velociraptor details in the database")
-    agent.update_velociraptor_details(velociraptor_agent)
-    session.add(agent)  # Add the updated agent back to the session
-    await session.commit()  # Use the await keyword to commit asynchronously
-    logger.info("Agent updated with Velociraptor details in the database")
-
-
 async def is_velociraptor_verified() -> bool:
     """
     Checks whether the Velociraptor connector exists and is verified.
@@ -314,25 +324,47 @@ async def is_velociraptor_verified() -> bool:
         return await is_connector_verified("Velociraptor", session)
 
 
+def _velociraptor_details(client, org_id: str) -> VelociraptorAgent:
+    # Convert Unix epoch timestamp to datetime
+    last_seen_at = datetime.fromtimestamp(
+        int(client.last_seen_at) / 1e6,
+    )  # Divide by 1e6 to convert from microseconds to seconds
+    # Convert datetime to ISO 8601 format without fractional seconds
+    last_seen_at_iso = last_seen_at.replace(tzinfo=timezone.utc).isoformat(timespec="seconds")
+    return VelociraptorAgent(
+        velociraptor_id=client.client_id,
+        velociraptor_last_seen=last_seen_at_iso,
+        velociraptor_agent_version=client.agent_information.version,
+        velociraptor_org=org_id,
+    )
+
+
+def _velociraptor_values(velociraptor_agent: VelociraptorAgent) -> tuple:
+    """The `VELOCIRAPTOR_SYNC_COLUMNS` values `Agents.update_velociraptor_details` would write."""
+    return (
+        velociraptor_agent.client_id or None,
+        velociraptor_agent.client_last_seen_as_datetime,
+        velociraptor_agent.client_version or None,
+        velociraptor_agent.client_org or None,
+    )
+
+
 async def sync_agents_velociraptor() -> SyncedAgentsResponse:
     """
-    Syncronizes the agents with Velociraptor. This function retrieves all the
-    agents from the `Agents` table and invokes the velociraptor API with the
-    hostname. If the hostname cannot be found within Velociraptor, and the agent's
-    `velociraptor_id` is not None, invoke the Velociraptor API and pass it the
-    `velociraptor_id`.
+    Syncronizes the agents with Velociraptor. Every existing `Agents` row is
+    matched to the client in each Velociraptor organization whose hostname, or
+    whose `client_id` equals the row's `velociraptor_id`, matches — the first
+    such client in the org's list, as before. Matching goes through per-org
+    hostname and client-id maps; only rows whose Velociraptor details differ
+    are updated, and all of it is written in one transaction.
 
     Deployments that only run the Wazuh Manager have no Velociraptor connector to talk
     to — that is a supported configuration, so this returns a successful no-op response
     instead of raising when the connector is missing, unverified, or unreachable.
 
-    :param session: The database session to use for querying and updating agents.
-    :type session: AsyncSession
-    :return: The response indicating the success of the synchronization operation and the list of agents added.
+    :return: The response indicating the success of the synchronization operation, with per-row counts under ``velociraptor``.
     :rtype: SyncedAgentsResponse
     """
-    agents_added_list: List[VelociraptorAgent] = []
-
     if not await is_velociraptor_verified():
         logger.info(
             "Velociraptor connector is not verified. Skipping Velociraptor agent sync.",
@@ -340,7 +372,6 @@ async def sync_agents_velociraptor() -> SyncedAgentsResponse:
         return SyncedAgentsResponse(
             success=True,
             message="Velociraptor connector is not verified. Skipped Velociraptor agent sync.",
-            agents_added=agents_added_list,
         )
 
     try:
@@ -350,66 +381,61 @@ async def sync_agents_velociraptor() -> SyncedAgentsResponse:
         return SyncedAgentsResponse(
             success=True,
             message=f"Skipped Velociraptor agent sync: failed to collect Velociraptor organizations: {e}",
-            agents_added=agents_added_list,
         )
     logger.info(f"Collected Velociraptor Orgs: {velo_orgs}")
-    for org in velo_orgs.organizations:
-        try:
-            velociraptor_clients = await fetch_velociraptor_clients(org_id=org.OrgId)
-        except Exception as e:
-            logger.error(f"Failed to collect Velociraptor clients for org {org.OrgId}: {e}")
-            continue
-        logger.info(f"Collected Velociraptor Clients: {velociraptor_clients}")
-        velociraptor_clients = velociraptor_clients.clients if hasattr(velociraptor_clients, "clients") else []
-
-        async with get_db_session() as session:  # Create a new session here
-            existing_agents_query = select(Agents)
-            result = await session.execute(existing_agents_query)
-            existing_agents = result.scalars().all()
+
+    counts = AgentSyncCounts()
+    async with get_db_session() as session:
+        existing_agents = (await session.execute(select(Agents))).scalars().all()
+        matched_agent_ids = set()
+
+        for org in velo_orgs.organizations:
+            try:
+                velociraptor_clients = await fetch_velociraptor_clients(org_id=org.OrgId)
+            except Exception as e:
+                logger.error(f"Failed to collect Velociraptor clients for org {org.OrgId}: {e}")
+                continue
+            velociraptor_clients = velociraptor_clients.clients if hasattr(velociraptor_clients, "clients") else []
+            logger.info(f"Collected {len(velociraptor_clients)} Velociraptor clients for org {org.OrgId}")
+
+            # Positions, so a row matching one client by hostname and another by
+            # client_id still gets whichever comes first in the list.
+            position_by_hostname: Dict[str, int] = {}
+            position_by_client_id: Dict[str, int] = {}
+            for position, client in enumerate(velociraptor_clients):
+                position_by_hostname.setdefault(client.os_info.hostname, position)
+                position_by_client_id.setdefault(client.client_id, position)
 
             for agent in existing_agents:
-                logger.info(f"Collecting Velociraptor Agent for {agent.hostname}")
+                positions = [position_by_hostname.get(agent.hostname)]
+                if agent.velociraptor_id:
+                    positions.append(position_by_client_id.get(agent.velociraptor_id))
+                positions = [position for position in positions if position is not None]
+                if not positions:
+                    continue
+                matched_agent_ids.add(agent.id)
 
                 try:
-                    # Build the velociraptor_agent where the hostname or `client_id` is that equal to the `agents`
-                    velociraptor_agent = next(
-                        (
-                            client
-                            for client in velociraptor_clients
-                            if client.os_info.hostname == agent.hostname or client.client_id == agent.velociraptor_id
-                        ),
-                        None,
-                    )
-                    # Convert Unix epoch timestamp to datetime
-                    last_seen_at = datetime.fromtimestamp(
-                        int(velociraptor_agent.last_seen_at) / 1e6,
-                    )  # Divide by 1e6 to convert from microseconds to seconds
-                    # Convert datetime to ISO 8601 format without fractional seconds
-                    last_seen_at_iso = last_seen_at.replace(tzinfo=timezone.utc).isoformat(timespec="seconds")
-                    velociraptor_agent = VelociraptorAgent(
-                        velociraptor_id=velociraptor_agent.client_id,
-                        velociraptor_last_seen=last_seen_at_iso,
-                        velociraptor_agent_version=velociraptor_agent.agent_information.version,
-                        velociraptor_org=org.OrgId,
-                    )
-
+                    velociraptor_agent = _velociraptor_details(velociraptor_clients[min(positions)], org.OrgId)
+                    values = _velociraptor_values(velociraptor_agent)
                 except Exception as e:
                     logger.error(
                         f"Failed to collect Velociraptor Agent for {agent.hostname}: {e}",
                     )
                     continue
 
-                if velociraptor_agent:
-                    # Update the agent with the Velociraptor client's details
-                    await update_agent_with_velociraptor_in_db(session, agent, velociraptor_agent)
-                    agents_added_list.append(velociraptor_agent)
+                if _row_values(agent, VELOCIRAPTOR_SYNC_COLUMNS) == values:
+                    counts.unchanged += 1
+                else:
+                    agent.update_velociraptor_details(velociraptor_agent)
+                    counts.changed += 1
 
-        # Close the session
-        await session.close()
+        counts.missing = len(existing_agents) - len(matched_agent_ids)
+        await _commit_sync(session, "Velociraptor", counts)
 
-    logger.info(f"Agents Added List: {agents_added_list}")
+    logger.info(f"Velociraptor agent sync: {counts.model_dump()}")
     return SyncedAgentsResponse(
         success=True,
         message="Agents synced successfully",
-        agents_added=agents_added_list,
+        velociraptor=counts,
     )
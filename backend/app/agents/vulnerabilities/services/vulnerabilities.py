@@ -48,35 +48,7 @@ from app.db.universal_models import AgentVulnerabilities
 from app.db.universal_models import Customers
 from app.db.universal_models import VulnerabilityReport
 from app.middleware.customer_access import customer_access_handler
-from app.threat_intel.schema.epss import EpssThreatIntelRequest
-from app.threat_intel.services.epss import collect_epss_score
-
-
-async def get_epss_score_for_cve(cve_id: str) -> tuple[Optional[str], Optional[str]]:
-    """
-    Get EPSS score and percentile for a CVE ID
-
-    Args:
-        cve_id: CVE identifier to get EPSS score for
-
-    Returns:
-        Tuple of (epss_score, epss_percentile) or (None, None) if not found
-    """
-    try:
-        epss_request = EpssThreatIntelRequest(cve=cve_id)
-        epss_response = await collect_epss_score(epss_request)
-
-        if epss_response.success and epss_response.data:
-            # Get the first (and usually only) result
-            epss_data = epss_response.data[0]
-            return epss_data.epss, epss_data.percentile
-        else:
-            logger.debug(f"No EPSS data found for CVE: {cve_id}")
-            return None, None
-
-    except Exception as e:
-        logger.warning(f"Error fetching EPSS score for CVE {cve_id}: {e}")
-        return None, None
+from app.threat_intel.services.epss_cache import get_epss_scores
 
 
 def process_wazuh_document(document: Dict[str, Any]) -> WazuhVulnerabilityData:
@@ -142,6 +114,62 @@ def process_wazuh_document(document: Dict[str, Any]) -> WazuhVulnerabilityData:
         raise
 
 
+async def build_vulnerability_search_items(
+    hits: List[Dict[str, Any]],
+    customer_agent_map: Dict[str, str],
+    include_epss: bool,
+) -> List[VulnerabilitySearchItem]:
+    """
+    Turn a page of Wazuh vulnerability hits into search items.
+
+    EPSS scores for the whole page are looked up in one call rather than one
+    per hit.
+
+    Args:
+        hits: Raw Wazuh vulnerability documents
+        customer_agent_map: Agent hostname to customer code
+        include_epss: Whether to attach EPSS scores
+
+    Returns:
+        List of VulnerabilitySearchItem, skipping documents that fail to parse
+    """
+    parsed = []
+    for hit in hits:
+        try:
+            agent_hostname = hit["_source"].get("agent", {}).get("name", "unknown")
+            parsed.append((agent_hostname, process_wazuh_document(hit)))
+        except Exception as e:
+            logger.error(f"Error processing vulnerability document: {e}")
+
+    epss_scores = await get_epss_scores(vuln_data.cve_id for _, vuln_data in parsed) if include_epss else {}
+
+    items = []
+    for agent_hostname, vuln_data in parsed:
+        epss_score, epss_percentile = epss_scores.get((vuln_data.cve_id or "").upper(), (None, None))
+        try:
+            items.append(
+                VulnerabilitySearchItem(
+                    cve_id=vuln_data.cve_id,
+                    severity=vuln_data.severity,
+                    title=vuln_data.title,
+                    agent_name=agent_hostname,
+                    customer_code=customer_agent_map.get(agent_hostname),
+                    references=vuln_data.references,
+                    detected_at=vuln_data.detected_at,
+                    published_at=vuln_data.published_at,
+                    base_score=vuln_data.base_score,
+                    package_name=vuln_data.package_name,
+                    package_version=vuln_data.package_version,
+                    package_architecture=vuln_data.package_architecture,
+                    epss_score=epss_score,
+                    epss_percentile=epss_percentile,
+                ),
+            )
+        except Exception as e:
+            logger.error(f"Error processing vulnerability document: {e}")
+    return items
+
+
 async def get_vulnerabilities_indices() -> List[str]:
     """Get all vulnerability indices from Wazuh Indexer"""
     try:
@@ -1113,45 +1141,7 @@ async def search_vulnerabilities_from_indexer(
         hits = search_response["hits"]["hits"]
 
         # Process the results
-        vulnerabilities = []
-        for hit in hits:
-            try:
-                source = hit["_source"]
-                agent_data = source.get("agent", {})
-                agent_hostname = agent_data.get("name", "unknown")
-
-                # Get customer code from our mapping
-                agent_customer_code = customer_agent_map.get(agent_hostname)
-
-                # Process the vulnerability data
-                vuln_data = process_wazuh_document(hit)
-
-                # Get EPSS score for the CVE (if requested)
-                epss_score, epss_percentile = None, None
-                if include_epss:
-                    epss_score, epss_percentile = await get_epss_score_for_cve(vuln_data.cve_id)
-
-                vulnerability_item = VulnerabilitySearchItem(
-                    cve_id=vuln_data.cve_id,
-                    severity=vuln_data.severity,
-                    title=vuln_data.title,
-                    agent_name=agent_hostname,
-                    customer_code=agent_customer_code,
-                    references=vuln_data.references,
-                    detected_at=vuln_data.detected_at,
-                    published_at=vuln_data.published_at,
-                    base_score=vuln_data.base_score,
-                    package_name=vuln_data.package_name,
-                    package_version=vuln_data.package_version,
-                    package_architecture=vuln_data.package_architecture,
-                    epss_score=epss_score,
-                    epss_percentile=epss_percentile,
-                )
-                vulnerabilities.append(vulnerability_item)
-
-            except Exception as e:
-                logger.error(f"Error processing vulnerability document: {e}")
-                continue
+        vulnerabilities = await build_vulnerability_search_items(hits, customer_agent_map, include_epss)
 
         # Sort vulnerabilities by EPSS score if included
         if include_epss:
@@ -1362,41 +1352,7 @@ async def fetch_all_vulnerabilities_for_export(
         logger.info(f"Initial scroll batch: {len(hits)} results")
 
         # Process initial batch
-        for hit in hits:
-            try:
-                source = hit["_source"]
-                agent_data = source.get("agent", {})
-                agent_hostname = agent_data.get("name", "unknown")
-                agent_customer_code = customer_agent_map.get(agent_hostname)
-
-                vuln_data = process_wazuh_document(hit)
-
-                # Get EPSS score if requested
-                epss_score, epss_percentile = None, None
-                if include_epss:
-                    epss_score, epss_percentile = await get_epss_score_for_cve(vuln_data.cve_id)
-
-                vulnerability_item = VulnerabilitySearchItem(
-                    cve_id=vuln_data.cve_id,
-                    severity=vuln_data.severity,
-                    title=vuln_data.title,
-                    agent_name=agent_hostname,
-                    customer_code=agent_customer_code,
-                    references=vuln_data.references,
-                    detected_at=vuln_data.detected_at,
-                    published_at=vuln_data.published_at,
-                    base_score=vuln_data.base_score,
-                    package_name=vuln_data.package_name,
-                    package_version=vuln_data.package_version,
-                    package_architecture=vuln_data.package_architecture,
-                    epss_score=epss_score,
-                    epss_percentile=epss_percentile,
-                )
-                all_vulnerabilities.append(vulnerability_item)
-
-            except Exception as e:
-                logger.error(f"Error processing vulnerability document: {e}")
-                continue
+        all_vulnerabilities.extend(await build_vulnerability_search_items(hits, customer_agent_map, include_epss))
 
         # Continue scrolling through all results
         scroll_count = 1
@@ -1413,41 +1369,7 @@ async def fetch_all_vulnerabilities_for_export(
                 logger.info(f"Scroll batch {scroll_count}: {len(hits)} results (total so far: {len(all_vulnerabilities)})")
 
                 # Process batch
-                for hit in hits:
-                    try:
-                        source = hit["_source"]
-                        agent_data = source.get("agent", {})
-                        agent_hostname = agent_data.get("name", "unknown")
-                        agent_customer_code = customer_agent_map.get(agent_hostname)
-
-                        vuln_data = process_wazuh_document(hit)
-
-                        # Get EPSS score if requested
-                        epss_score, epss_percentile = None, None
-                        if include_epss:
-                            epss_score, epss_percentile = await get_epss_score_for_cve(vuln_data.cve_id)
-
-                        vulnerability_item = VulnerabilitySearchItem(
-                            cve_id=vuln_data.cve_id,
-                            severity=vuln_data.severity,
-                            title=vuln_data.title,
-                            agent_name=agent_hostname,
-                            customer_code=agent_customer_code,
-                            references=vuln_data.references,
-                            detected_at=vuln_data.detected_at,
-                            published_at=vuln_data.published_at,
-                            base_score=vuln_data.base_score,
-                            package_name=vuln_data.package_name,
-                            package_version=vuln_data.package_version,
-                            package_architecture=vuln_data.package_architecture,
-                            epss_score=epss_score,
-                            epss_percentile=epss_percentile,
-                        )
-                        all_vulnerabilities.append(vulnerability_item)
-
-                    except Exception as e:
-                        logger.error(f"Error processing vulnerability document: {e}")
-                        continue
+                all_vulnerabilities.extend(await build_vulnerability_search_items(hits, customer_agent_map, include_epss))
 
             except Exception as scroll_error:
                 logger.error(f"Error during scroll: {scroll_error}")
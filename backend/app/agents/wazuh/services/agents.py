@@ -11,6 +11,51 @@ from app.connectors.wazuh_manager.utils.universal import send_delete_request
 from app.connectors.wazuh_manager.utils.universal import send_get_request
 from app.connectors.wazuh_manager.utils.universal import send_put_request
 
+#: Agents per Wazuh API page. The first page tells us the total; the rest are
+#: fetched concurrently, `AGENT_PAGE_CONCURRENCY` at a time.
+AGENT_PAGE_SIZE = 500
+AGENT_PAGE_CONCURRENCY = 4
+
+#: Only the fields `collect_wazuh_agents` builds a `WazuhAgent` from.
+AGENT_SELECT = "id,name,ip,os.name,group,lastKeepAlive,version,status"
+
+
+async def _fetch_agent_page(offset: int) -> dict:
+    # Sorted by id so concurrent pages neither overlap nor skip agents.
+    return await send_get_request(
+        endpoint="/agents",
+        params={"limit": AGENT_PAGE_SIZE, "offset": offset, "select": AGENT_SELECT, "sort": "+id"},
+    )
+
+
+async def _fetch_all_agent_items() -> dict:
+    """Every agent, fetched page by page, in the shape of a single `/agents` response."""
+    first_page = await _fetch_agent_page(0)
+    if first_page.get("success") is False:
+        return first_page
+    data = first_page.get("data", {}).get("data", {})
+    items = list(data.get("affected_items", []))
+    total_affected_items = data.get("total_affected_items", 0)
+
+    semaphore = asyncio.Semaphore(AGENT_PAGE_CONCURRENCY)
+
+    async def fetch(offset: int) -> dict:
+        async with semaphore:
+            return await _fetch_agent_page(offset)
+
+    if len(items) < total_affected_items:
+        offsets = range(AGENT_PAGE_SIZE, total_affected_items, AGENT_PAGE_SIZE)
+        logger.info(f"Total items: {total_affected_items}. Fetching {len(offsets)} more page(s) of agents.")
+        for page in await asyncio.gather(*(fetch(offset) for offset in offsets)):
+            if page.get("success") is False:
+                return page
+            items.extend(page.get("data", {}).get("data", {}).get("affected_items", []))
+
+    return {
+        "success": True,
+        "data": {"data": {"affected_items": items, "total_affected_items": total_affected_items}},
+    }
+
 
 async def collect_wazuh_agents() -> WazuhAgentsList:
     """
@@ -20,25 +65,7 @@ async def collect_wazuh_agents() -> WazuhAgentsList:
         WazuhAgentsList: A list of WazuhAgent objects representing the collected agents.
     """
     logger.info("Collecting all agents from Wazuh Manager")
-    agents_collected = await send_get_request(
-        endpoint="/agents",
-        params={"limit": 500},
-    )
-    total_affected_items = agents_collected.get("data", {}).get("data", {}).get("total_affected_items", 0)
-
-    # If the number of agents is less than total_affected_items, make another request with the limit being total_affected_items
-    if len(agents_collected.get("data", {}).get("data", {}).get("affected_items", [])) < total_affected_items:
-        logger.info(
-            f"Total items: {total_affected_items}.\n"
-            f"Collected {len(agents_collected.get('data', {}).get('data', {}).get('affected_items', []))} agents.\n"
-            "Making another request.",
-        )
-        # sleep for 2 seconds before making another request
-        await asyncio.sleep(2)
-        agents_collected = await send_get_request(
-            endpoint="/agents",
-            params={"limit": total_affected_items},
-        )
+    agents_collected = await _fetch_all_agent_items()
 
     if agents_collected.get("success") is False:
         raise HTTPException(
@@ -1,6 +1,5 @@
 from datetime import datetime
 from datetime import timedelta
-from difflib import SequenceMatcher
 from typing import List
 from typing import Optional
 
@@ -39,6 +38,7 @@ from app.ai_analyst.schema.ai_analyst import SubmitReviewRequest
 from app.ai_analyst.schema.ai_analyst import SubmitReviewResponse
 from app.ai_analyst.schema.ai_analyst import UpdateJobRequest
 from app.ai_analyst.schema.ai_analyst import UpdateJobResponse
+from app.ai_analyst.services import lesson_index
 from app.auth.models.users import User
 from app.db.universal_models import AiAnalystIoc
 from app.db.universal_models import AiAnalystIocReview
@@ -764,6 +764,7 @@ async def queue_palace_lesson(
     session.add(lesson)
     await session.commit()
     await session.refresh(lesson)
+    lesson_index.add(lesson.customer_code, lesson.lesson_type, lesson.id, lesson.lesson_text)
 
     logger.info(f"Palace lesson {lesson.id} queued (status=pending)")
     return QueuePalaceLessonResponse(
@@ -947,8 +948,6 @@ _ONE_OFF_EXPIRY_DAYS = 7
 _EXPIRY_SOON_WINDOW_DAYS = 2
 # Similarity threshold for near-duplicate detection. 0.70 picks up
 # paraphrases without flooding the reviewer with every shared phrase.
-# difflib's SequenceMatcher on short strings is cheap — we can afford
-# O(n²) pairs per room.
 _DUPLICATE_SIMILARITY_THRESHOLD = 0.70
 
 
@@ -973,11 +972,12 @@ def _lesson_to_consolidation(
     )
 
 
-def _find_duplicate_pairs(
+async def _find_duplicate_pairs(
+    customer_code: str,
     lessons: List[PalaceConsolidationLesson],
 ) -> List[PalaceConsolidationDuplicatePair]:
-    """Pairwise SequenceMatcher within the same room. Only returns
-    pairs above the threshold, sorted by similarity descending."""
+    """Near-duplicate pairs within the same room (see ``lesson_index``).
+    Only returns pairs above the threshold, sorted by similarity descending."""
     pairs: List[PalaceConsolidationDuplicatePair] = []
     # Group by room first so we only compare within-room.
     by_room: dict[str, List[PalaceConsolidationLesson]] = {}
@@ -985,28 +985,24 @@ def _find_duplicate_pairs(
         by_room.setdefault(lesson.lesson_type, []).append(lesson)
 
     for room, room_lessons in by_room.items():
-        # Normalize once up-front so SequenceMatcher has stable inputs.
-        normalized = [(ls, ls.lesson_text.strip().lower()) for ls in room_lessons]
-        for i in range(len(normalized)):
-            a_lesson, a_text = normalized[i]
-            if not a_text:
-                continue
-            for j in range(i + 1, len(normalized)):
-                b_lesson, b_text = normalized[j]
-                if not b_text:
-                    continue
-                ratio = SequenceMatcher(None, a_text, b_text).ratio()
-                if ratio >= _DUPLICATE_SIMILARITY_THRESHOLD:
-                    pairs.append(
-                        PalaceConsolidationDuplicatePair(
-                            room=room,
-                            lesson_a_id=a_lesson.id,
-                            lesson_b_id=b_lesson.id,
-                            lesson_a_text=a_lesson.lesson_text,
-                            lesson_b_text=b_lesson.lesson_text,
-                            similarity=round(ratio, 3),
-                        ),
-                    )
+        similar = await lesson_index.similar_pairs(
+            customer_code,
+            room,
+            [(ls.id, ls.lesson_text) for ls in room_lessons],
+            _DUPLICATE_SIMILARITY_THRESHOLD,
+        )
+        for i, j, ratio in similar:
+            a_lesson, b_lesson = room_lessons[i], room_lessons[j]
+            pairs.append(
+                PalaceConsolidationDuplicatePair(
+                    room=room,
+                    lesson_a_id=a_lesson.id,
+                    lesson_b_id=b_lesson.id,
+                    lesson_a_text=a_lesson.lesson_text,
+                    lesson_b_text=b_lesson.lesson_text,
+                    similarity=round(ratio, 3),
+                ),
+            )
     pairs.sort(key=lambda p: p.similarity, reverse=True)
     return pairs
 
@@ -1129,7 +1125,7 @@ async def get_palace_consolidation(
             ),
         )
 
-    duplicates = _find_duplicate_pairs(lessons)
+    duplicates = await _find_duplicate_pairs(customer_code, lessons)
 
     markdown = _render_consolidation_markdown(
         customer_code=customer_code,
@@ -0,0 +1,225 @@
+"""Near-duplicate candidates for Palace lesson consolidation.
+
+The consolidation digest flags lesson pairs in the same room whose
+`SequenceMatcher` ratio is at least 0.70. It used to compute that ratio for
+every pair in a room — O(n²) pure-Python string alignment, tens of seconds for
+a room of a few thousand lessons, all of it on the event loop.
+
+Large rooms now go through a MinHash-LSH candidate index, and only candidates
+get the exact ratio:
+
+* **Signatures are kept, not recomputed.** Each active lesson's MinHash
+  signature (`NUM_PERM` minimums over its 5-character shingles) is stored per
+  (customer, room). `queue_palace_lesson` adds a lesson as it is created, the
+  drainer and sweeper drop lessons that fail or expire, and every
+  consolidation reconciles the index against the rows it just read — so a
+  lesson written by another worker process is picked up there.
+* **Candidates come from banding.** Signatures are split into bands of
+  `BAND_ROWS` values; two lessons that agree on any whole band are a candidate.
+  With 64 bands of 2, a pair whose shingle Jaccard is 0.3 is found 99.8% of
+  the time and one at 0.05 only 15% of the time. A ratio of 0.70 needs long
+  shared runs of text, which shingles see too, so pairs above the threshold
+  sit well above 0.3. Banding is vectorised over the stored signatures and
+  runs per request.
+* **The exact check is unchanged** (same normalisation, same threshold), with
+  `real_quick_ratio`/`quick_ratio` upper bounds skipping hopeless pairs first,
+  and it runs on a worker thread.
+
+Rooms of up to `PAIRWISE_MAX_LESSONS` are still compared exhaustively — cheap
+at that size, and exact.
+"""
+
+from __future__ import annotations
+
+import zlib
+from difflib import SequenceMatcher
+from itertools import combinations
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Sequence
+from typing import Set
+from typing import Tuple
+
+import numpy as np
+
+from app.blocking import run_blocking
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+#: Bands are two uint32 values wide so each one is a single uint64 key.
+BAND_ROWS = 2
+BANDS = NUM_PERM // BAND_ROWS
+
+#: Rooms this size or smaller skip the index and compare every pair.
+PAIRWISE_MAX_LESSONS = 250
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# Fixed seed: signatures must be comparable across calls and restarts.
+_rng = np.random.RandomState(0x1E55)
+_PERM_A = _rng.randint(1, (1 << 61) - 1, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, (1 << 61) - 1, size=NUM_PERM, dtype=np.uint64)
+
+Room = Tuple[str, str]
+
+# (customer_code, room) -> lesson id -> (normalised text, signature)
+_rooms: Dict[Room, Dict[int, Tuple[str, np.ndarray]]] = {}
+_lesson_rooms: Dict[int, Room] = {}
+
+_signatures_computed = 0
+_candidates_checked = 0
+
+
+def normalize(text: str) -> str:
+    """The text the similarity ratio is computed on."""
+    return text.strip().lower()
+
+
+def _shingles(text: str) -> Set[str]:
+    compact = " ".join(text.split())
+    if len(compact) <= SHINGLE_SIZE:
+        return {compact}
+    return {compact[i : i + SHINGLE_SIZE] for i in range(len(compact) - SHINGLE_SIZE + 1)}
+
+
+def signature(text: str) -> np.ndarray:
+    """The MinHash signature of normalised ``text``: `NUM_PERM` uint32 minimums."""
+    global _signatures_computed
+
+    _signatures_computed += 1
+    hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in _shingles(text)), dtype=np.uint64)
+    # a * x + b wraps at 2**64 before the modulus. That is deliberate: keeping
+    # a below 2**32 to avoid it makes the hash nearly monotone in x, and the
+    # shingle with the smallest crc32 then wins every permutation.
+    permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME
+    return (permuted.min(axis=0) & _MAX_HASH).astype(np.uint32)
+
+
+def add(customer_code: str, room: str, lesson_id: int, text: str) -> None:
+    """Index a new active lesson (``text`` as stored; it is normalised here)."""
+    normalised = normalize(text)
+    entries = _rooms.setdefault((customer_code, room), {})
+    current = entries.get(lesson_id)
+    if current is None or current[0] != normalised:
+        entries[lesson_id] = (normalised, signature(normalised))
+        _lesson_rooms[lesson_id] = (customer_code, room)
+
+
+def discard(lesson_id: int) -> None:
+    """Drop a lesson that is no longer active (failed or expired)."""
+    key = _lesson_rooms.pop(lesson_id, None)
+    if key is not None:
+        _rooms.get(key, {}).pop(lesson_id, None)
+
+
+async def similar_pairs(
+    customer_code: str,
+    room: str,
+    lessons: Sequence[Tuple[int, str]],
+    threshold: float,
+) -> List[Tuple[int, int, float]]:
+    """``(i, j, ratio)`` for every pair of ``lessons`` (id, stored text) at or above ``threshold``.
+
+    ``i < j`` are positions in ``lessons``. The room's index is reconciled
+    with ``lessons`` on the way: missing or changed lessons are (re)indexed and
+    indexed lessons that are no longer active are dropped.
+    """
+    key = (customer_code, room)
+    known = dict(_rooms.get(key, {}))
+    scored, fresh = await run_blocking(_similar_pairs, known, lessons, threshold)
+
+    # Back on the loop. Only drop lessons this call saw and found inactive: one
+    # `add`ed while the worker ran was not in the rows we were given.
+    entries = _rooms.setdefault(key, {})
+    active = {lesson_id for lesson_id, _ in lessons}
+    for lesson_id in known:
+        if lesson_id not in active and lesson_id in entries:
+            discard(lesson_id)
+    for lesson_id, entry in fresh.items():
+        entries[lesson_id] = entry
+        _lesson_rooms[lesson_id] = key
+    return scored
+
+
+def _similar_pairs(
+    known: Dict[int, Tuple[str, np.ndarray]],
+    lessons: Sequence[Tuple[int, str]],
+    threshold: float,
+) -> Tuple[List[Tuple[int, int, float]], Dict[int, Tuple[str, np.ndarray]]]:
+    texts = [normalize(text) for _, text in lessons]
+    fresh: Dict[int, Tuple[str, np.ndarray]] = {}
+    signatures = []
+    for (lesson_id, _), text in zip(lessons, texts):
+        entry = known.get(lesson_id)
+        if entry is None or entry[0] != text:
+            entry = fresh[lesson_id] = (text, signature(text))
+        signatures.append(entry[1])
+
+    if len(lessons) <= PAIRWISE_MAX_LESSONS:
+        pairs: Iterable[Tuple[int, int]] = all_pairs(len(lessons))
+    else:
+        pairs = sorted(candidate_pairs(signatures))
+    return score_pairs(texts, pairs, threshold), fresh
+
+
+def candidate_pairs(signatures: Sequence[np.ndarray]) -> Set[Tuple[int, int]]:
+    """Position pairs ``(i, j)``, ``i < j``, whose signatures agree on at least one band."""
+    count = len(signatures)
+    if count < 2:
+        return set()
+    # Two uint32 rows per band make one uint64 key per (lesson, band).
+    keys = np.ascontiguousarray(np.stack(signatures)).view(np.uint64)
+    pairs: Set[Tuple[int, int]] = set()
+    for band in range(BANDS):
+        column = keys[:, band]
+        order = np.argsort(column, kind="stable")
+        ordered = column[order]
+        starts = np.flatnonzero(np.concatenate(([True], ordered[1:] != ordered[:-1])))
+        ends = np.append(starts[1:], count)
+        for start, end in zip(starts[ends - starts > 1].tolist(), ends[ends - starts > 1].tolist()):
+            pairs.update(combinations(sorted(order[start:end].tolist()), 2))
+    return pairs
+
+
+def all_pairs(count: int) -> Iterable[Tuple[int, int]]:
+    return ((i, j) for i in range(count) for j in range(i + 1, count))
+
+
+def score_pairs(texts: Sequence[str], pairs: Iterable[Tuple[int, int]], threshold: float) -> List[Tuple[int, int, float]]:
+    """``(i, j, ratio)`` for every pair of normalised ``texts`` whose ratio is at least ``threshold``."""
+    global _candidates_checked
+
+    scored = []
+    for i, j in pairs:
+        a_text, b_text = texts[i], texts[j]
+        if not a_text or not b_text:
+            continue
+        _candidates_checked += 1
+        matcher = SequenceMatcher(None, a_text, b_text)
+        if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+            continue
+        ratio = matcher.ratio()
+        if ratio >= threshold:
+            scored.append((i, j, ratio))
+    return scored
+
+
+def clear() -> None:
+    _rooms.clear()
+    _lesson_rooms.clear()
+
+
+def stats() -> Dict[str, int]:
+    return {
+        "rooms": len(_rooms),
+        "lessons": len(_lesson_rooms),
+        "signatures_computed": _signatures_computed,
+        "candidates_checked": _candidates_checked,
+    }
+
+
+def reset_stats() -> None:
+    global _signatures_computed, _candidates_checked
+
+    _signatures_computed = _candidates_checked = 0
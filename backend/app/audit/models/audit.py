@@ -21,6 +21,7 @@ from typing import Optional
 
 from sqlalchemy import JSON
 from sqlalchemy import Column
+from sqlalchemy import Index
 from sqlmodel import Field
 from sqlmodel import SQLModel
 
@@ -77,6 +78,11 @@ class AuditResult(str, Enum):
 
 class AuditLog(SQLModel, table=True):
     __tablename__ = "audit_log"
+    __table_args__ = (
+        # The listing's free-text search (see app/audit/services/query.py). FULLTEXT on MySQL;
+        # other databases get a plain index the search never uses.
+        Index("ix_audit_log_search", "details", "actor_username", "entity_id", mysql_prefix="FULLTEXT"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     timestamp: datetime = Field(default_factory=datetime.utcnow, index=True)
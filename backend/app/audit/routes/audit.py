@@ -20,7 +20,7 @@ from app.audit.schema.audit import AuditLogDetailResponse
 from app.audit.schema.audit import AuditLogEntry
 from app.audit.schema.audit import AuditLogResponse
 from app.audit.services.query import get_audit_log_by_id
-from app.audit.services.query import list_audit_logs
+from app.audit.services.query import page_audit_logs
 from app.auth.utils import AuthHandler
 from app.db.db_session import get_db
 from app.middleware.customer_query import customer_codes_query
@@ -53,8 +53,14 @@ async def get_audit_vocabularies():
     dependencies=[Security(AuthHandler().get_current_user, scopes=["admin"])],
 )
 async def get_audit_logs(
-    skip: int = Query(0, ge=0, description="Rows to skip (pagination offset)"),
+    skip: int = Query(0, ge=0, description="Rows to skip (pagination offset); ignored when `cursor` is given"),
     limit: int = Query(100, ge=1, le=MAX_LIMIT, description="Max rows to return"),
+    cursor: Optional[str] = Query(None, description="`pagination.next_cursor` from the previous response"),
+    count: str = Query(
+        "exact",
+        pattern="^(exact|capped|none)$",
+        description="How to compute `pagination.total`: exact, capped (see `pagination.total_capped`), or none",
+    ),
     actor_user_id: Optional[int] = Query(None, description="Filter by acting user id"),
     actor_username: Optional[str] = Query(None, description="Filter by acting username (exact)"),
     action: Optional[str] = Query(None, description="Filter by action, e.g. 'agent.delete'"),
@@ -64,13 +70,18 @@ async def get_audit_logs(
     result: Optional[str] = Query(None, description="Filter by result: success | failure"),
     start_time: Optional[datetime] = Query(None, description="Only entries at/after this UTC time"),
     end_time: Optional[datetime] = Query(None, description="Only entries at/before this UTC time"),
-    search: Optional[str] = Query(None, description="Substring search over details, username and entity id"),
+    search: Optional[str] = Query(
+        None,
+        description="Search over details, username and entity id: every word, as a word prefix (substring on short words)",
+    ),
     session: AsyncSession = Depends(get_db),
 ) -> AuditLogResponse:
-    rows, total = await list_audit_logs(
+    rows, total, total_capped, next_cursor = await page_audit_logs(
         session,
         skip=skip,
         limit=limit,
+        cursor=cursor,
+        count=count,
         actor_user_id=actor_user_id,
         actor_username=actor_username,
         action=action,
@@ -84,9 +95,9 @@ async def get_audit_logs(
     )
     return AuditLogResponse(
         audit_logs=[AuditLogEntry.model_validate(row) for row in rows],
-        pagination={"total": total, "skip": skip, "limit": limit},
+        pagination={"total": total, "total_capped": total_capped, "skip": skip, "limit": limit, "next_cursor": next_cursor},
         success=True,
-        message=f"Retrieved {len(rows)} of {total} audit log entries",
+        message=f"Retrieved {len(rows)} audit log entries" if total is None else f"Retrieved {len(rows)} of {total} audit log entries",
     )
 
 
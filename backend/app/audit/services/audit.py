@@ -26,20 +26,83 @@ AFTER the action's own commit, when the action is already durable.
 Failure handling: best-effort. A failure to write the audit row is logged and swallowed, so
 auditing never breaks a working feature. (If a future compliance requirement demands
 fail-closed auditing, that becomes a deliberate policy change here.)
+
+Buffering: every statement on this deployment costs ~135ms whatever it does (see
+``app/connectors/cache.py``), and a row-per-commit writer paid that once per event — a mass
+alert closure was hundreds of sequential commits. Events are now appended to an in-memory
+buffer and written by a background flusher as one multi-row INSERT per batch, when
+``AUDIT_FLUSH_SIZE`` rows are waiting or every ``AUDIT_FLUSH_INTERVAL_SECONDS``, whichever
+comes first. The row's ``timestamp`` is still taken when the event is recorded, not when it
+is flushed. ``close_audit_writer`` flushes whatever is left on shutdown, and the read API
+flushes before it queries, so an admin never looks for an action that is still in memory.
+
+If a flush fails (the database is down), the batch goes back to the front of the buffer for
+the next attempt — or, when ``AUDIT_SPILL_PATH`` is set, is appended to that JSON Lines file
+and replayed into the table after the next successful flush. The file is only removed once
+the replay has committed, so a crash mid-replay can at worst write a spilled row twice. Without
+a spill file the buffer is capped at ``AUDIT_MAX_BUFFERED`` rows; past that the oldest are
+dropped, loudly.
 """
+import asyncio
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
 from typing import Optional
 from typing import Union
 
 from fastapi import Request
 from loguru import logger
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.audit.models.audit import AuditAction
 from app.audit.models.audit import AuditLog
 from app.audit.models.audit import AuditResult
+from app.blocking import run_blocking
 from app.db.db_session import async_engine
 
 
+def _env_number(name: str, default, cast):
+    raw = os.getenv(name, str(default))
+    try:
+        value = cast(raw)
+    except ValueError:
+        logger.warning(f"{name}={raw!r} is not a number; falling back to {default}")
+        return default
+    return value if value > 0 else default
+
+
+#: Rows per INSERT, and the buffer size that triggers an early flush.
+FLUSH_SIZE = _env_number("AUDIT_FLUSH_SIZE", 100, int)
+
+#: Longest an event waits in memory before it is written.
+FLUSH_INTERVAL_SECONDS = _env_number("AUDIT_FLUSH_INTERVAL_SECONDS", 1.0, float)
+
+#: Rows held in memory while the database is unavailable and there is no spill file.
+MAX_BUFFERED = _env_number("AUDIT_MAX_BUFFERED", 10000, int)
+
+#: Optional JSON Lines file that failed batches are written to and later replayed from.
+SPILL_PATH: Optional[str] = os.getenv("AUDIT_SPILL_PATH") or None
+
+_buffer: List[Dict[str, Any]] = []
+_flush_lock = asyncio.Lock()
+_wake: Optional[asyncio.Event] = None
+_flusher: Optional[asyncio.Task] = None
+_flusher_loop: Optional[asyncio.AbstractEventLoop] = None
+
+_recorded = 0
+_written = 0
+_batches = 0
+_failed_flushes = 0
+_spilled = 0
+_replayed = 0
+_dropped = 0
+
+
 def _client_ip(request: Optional[Request]) -> Optional[str]:
     if request is None:
         return None
@@ -65,23 +128,182 @@ async def record_audit_event(
     details: Optional[str] = None,
     request: Optional[Request] = None,
 ) -> None:
-    """Persist a single audit-log row. Never raises — failures are logged and swallowed."""
+    """Queue a single audit-log row for writing. Never raises — failures are logged and swallowed."""
+    global _recorded
+
     try:
-        entry = AuditLog(
-            action=action.value if isinstance(action, AuditAction) else str(action),
-            actor_user_id=actor_user_id,
-            actor_username=actor_username,
-            customer_code=customer_code,
-            entity_type=entity_type,
-            entity_id=str(entity_id) if entity_id is not None else None,
-            result=result.value if isinstance(result, AuditResult) else str(result),
-            old_value=old_value,
-            new_value=new_value,
-            source_ip=source_ip if source_ip is not None else _client_ip(request),
-            details=details,
+        _buffer.append(
+            {
+                "timestamp": datetime.utcnow(),
+                "action": action.value if isinstance(action, AuditAction) else str(action),
+                "actor_user_id": actor_user_id,
+                "actor_username": actor_username,
+                "customer_code": customer_code,
+                "entity_type": entity_type,
+                "entity_id": str(entity_id) if entity_id is not None else None,
+                "result": result.value if isinstance(result, AuditResult) else str(result),
+                "old_value": old_value,
+                "new_value": new_value,
+                "source_ip": source_ip if source_ip is not None else _client_ip(request),
+                "details": details,
+            },
         )
-        async with AsyncSession(async_engine) as session:
-            session.add(entry)
-            await session.commit()
+        _recorded += 1
+        _ensure_flusher()
+        if len(_buffer) >= FLUSH_SIZE:
+            _wake.set()
     except Exception as e:  # noqa: BLE001 - auditing must never break the caller's action
         logger.error(f"Failed to record audit event '{action}': {e}")
+
+
+def _ensure_flusher() -> None:
+    global _wake, _flusher, _flusher_loop
+
+    loop = asyncio.get_running_loop()
+    if _flusher is not None and _flusher_loop is loop and not _flusher.done():
+        return
+    _wake = asyncio.Event()
+    _flusher_loop = loop
+    _flusher = loop.create_task(_flush_periodically(_wake))
+
+
+async def _flush_periodically(wake: asyncio.Event) -> None:
+    while True:
+        try:
+            await asyncio.wait_for(wake.wait(), timeout=FLUSH_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        wake.clear()
+        await flush_audit_events()
+
+
+async def _insert(rows: List[Dict[str, Any]]) -> None:
+    async with AsyncSession(async_engine) as session:
+        for start in range(0, len(rows), FLUSH_SIZE):
+            await session.execute(insert(AuditLog), rows[start : start + FLUSH_SIZE])
+        await session.commit()
+
+
+def _encode(row: Dict[str, Any]) -> str:
+    return json.dumps({**row, "timestamp": row["timestamp"].isoformat()}, default=str)
+
+
+def _decode(line: str) -> Dict[str, Any]:
+    row = json.loads(line)
+    row["timestamp"] = datetime.fromisoformat(row["timestamp"])
+    return row
+
+
+def _append_spill(rows: List[Dict[str, Any]]) -> None:
+    with open(SPILL_PATH, "a", encoding="utf-8") as handle:
+        handle.writelines(_encode(row) + "\n" for row in rows)
+
+
+def _read_spill() -> List[Dict[str, Any]]:
+    path = Path(SPILL_PATH)
+    if not path.exists():
+        return []
+    return [_decode(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def _remove_spill() -> None:
+    Path(SPILL_PATH).unlink(missing_ok=True)
+
+
+async def _keep(rows: List[Dict[str, Any]]) -> None:
+    """Hold a batch that could not be written until the database is back."""
+    global _spilled, _dropped
+
+    if SPILL_PATH:
+        try:
+            await run_blocking(_append_spill, rows)
+            _spilled += len(rows)
+            return
+        except Exception as e:
+            logger.error(f"Could not spill {len(rows)} audit event(s) to {SPILL_PATH}: {e}")
+    _buffer[:0] = rows
+    overflow = len(_buffer) - MAX_BUFFERED
+    if overflow > 0:
+        del _buffer[:overflow]
+        _dropped += overflow
+        logger.error(f"Audit buffer is full ({MAX_BUFFERED} rows); dropped the {overflow} oldest event(s).")
+
+
+async def flush_audit_events() -> int:
+    """Write everything buffered now. Returns the number of rows written.
+
+    Also replays the spill file, if there is one, once the database accepts a write.
+    """
+    global _written, _batches, _failed_flushes, _replayed
+
+    async with _flush_lock:
+        rows = _buffer[:]
+        del _buffer[: len(rows)]
+        written = 0
+        if rows:
+            try:
+                await _insert(rows)
+            except Exception as e:  # noqa: BLE001 - the rows are kept, see _keep
+                _failed_flushes += 1
+                logger.error(f"Failed to write {len(rows)} audit event(s): {e}")
+                await _keep(rows)
+                return 0
+            written = len(rows)
+            _written += written
+            _batches += 1
+
+        if SPILL_PATH:
+            try:
+                spilled = await run_blocking(_read_spill)
+            except Exception as e:
+                logger.error(f"Could not read the audit spill file {SPILL_PATH}: {e}")
+                spilled = []
+            if spilled:
+                # The file stays until the replay commits: a failure, a cancel or a
+                # crash before then leaves it to be replayed again. Only `_keep`
+                # appends to it, and only under `_flush_lock`.
+                try:
+                    await _insert(spilled)
+                except Exception as e:  # noqa: BLE001
+                    logger.error(f"Failed to replay {len(spilled)} spilled audit event(s): {e}")
+                    return written
+                _replayed += len(spilled)
+                written += len(spilled)
+                logger.info(f"Replayed {len(spilled)} spilled audit event(s) from {SPILL_PATH}")
+                try:
+                    await run_blocking(_remove_spill)
+                except Exception as e:
+                    logger.error(f"Could not remove the replayed audit spill file {SPILL_PATH}; it will be replayed again: {e}")
+        return written
+
+
+async def close_audit_writer() -> None:
+    """Stop the background flusher and write what is left. Called from the app lifespan."""
+    global _flusher, _flusher_loop, _wake
+
+    flusher = _flusher
+    _flusher = _flusher_loop = _wake = None
+    if flusher is not None and not flusher.done():
+        # Cancelled while holding the lock, the flusher is either waiting for its
+        # next interval or queued on the lock — never halfway through an insert
+        # with its batch already out of the buffer.
+        async with _flush_lock:
+            flusher.cancel()
+        await asyncio.gather(flusher, return_exceptions=True)
+    await flush_audit_events()
+    if _buffer:
+        logger.error(f"{len(_buffer)} audit event(s) could not be written before shutdown.")
+
+
+def stats() -> Dict[str, Any]:
+    """Surfaced in the performance session log."""
+    return {
+        "buffered": len(_buffer),
+        "recorded": _recorded,
+        "written": _written,
+        "batches": _batches,
+        "failed_flushes": _failed_flushes,
+        "spilled": _spilled,
+        "replayed": _replayed,
+        "dropped": _dropped,
+    }
@@ -2,27 +2,94 @@
 
 Admin-only listing with filtering + pagination. The write side lives in
 ``app/audit/services/audit.py``; this module never mutates.
+
+On a table of millions of rows, three things made every page cost seconds:
+
+* **Paging.** ``OFFSET`` made page N build and discard every row before it. A page
+  can now start from a cursor on ``(timestamp, id)`` instead (see
+  ``app/db/keyset.py``), which the ``timestamp`` index serves directly —
+  InnoDB secondary indexes end with the primary key. ``skip`` still works
+  for callers that page by number.
+* **The total.** An exact ``COUNT(*)`` over the filter set ran on every page. The
+  caller can ask for ``count="capped"`` (counts at most `COUNT_CAP` + 1 rows and says
+  whether it stopped) or ``count="none"``; ``"exact"`` stays the default so existing
+  clients keep their page counts.
+* **Search.** Three leading-wildcard ``ILIKE`` scans. On MySQL, ``search`` is now a
+  boolean-mode ``MATCH ... AGAINST`` over the FULLTEXT index on ``details``,
+  ``actor_username`` and ``entity_id`` (migration ``a8d4e2f7c1b9``): every word must
+  appear, as a word or word prefix. Words shorter than `FULLTEXT_MIN_WORD`, which
+  InnoDB does not index, and other databases keep the substring match.
 """
+import os
+import re
 from datetime import datetime
 from typing import List
 from typing import Optional
 from typing import Tuple
 
 from fastapi import HTTPException
-from sqlalchemy import desc
+from loguru import logger
 from sqlalchemy import func
 from sqlalchemy import or_
 from sqlalchemy import select
+from sqlalchemy.dialects.mysql import match
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.audit.models.audit import AuditLog
+from app.audit.services.audit import flush_audit_events
+from app.db import keyset
+
+
+def _env_number(name: str, default, cast):
+    raw = os.getenv(name, str(default))
+    try:
+        value = cast(raw)
+    except ValueError:
+        logger.warning(f"Invalid {name}={raw!r}; using default {default}")
+        return default
+    return value if value > 0 else default
+
+
+#: The most rows a ``count="capped"`` total will count.
+COUNT_CAP = _env_number("AUDIT_LOG_COUNT_CAP", 10000, int)
+
+#: InnoDB's default ``innodb_ft_min_token_size``; shorter words are not in the index.
+FULLTEXT_MIN_WORD = _env_number("AUDIT_LOG_FULLTEXT_MIN_WORD", 3, int)
+
+SORT_COLUMNS = (AuditLog.timestamp, AuditLog.id)
+SORT_KEY = "timestamp"
+
+
+def fulltext_terms(search: str) -> Optional[str]:
+    """
+    ``search`` as a boolean-mode FULLTEXT query requiring every word as a prefix, or
+    None when any word is too short to be indexed (the caller falls back to ILIKE).
+    """
+    words = re.findall(r"\w+", search)
+    if not words or any(len(word) < FULLTEXT_MIN_WORD for word in words):
+        return None
+    return " ".join(f"+{word}*" for word in words)
+
 
+def _search_condition(session: AsyncSession, search: str):
+    terms = fulltext_terms(search)
+    if terms is not None and session.bind.dialect.name == "mysql":
+        return match(AuditLog.details, AuditLog.actor_username, AuditLog.entity_id, against=terms).in_boolean_mode()
+    like = f"%{search}%"
+    return or_(
+        AuditLog.details.ilike(like),
+        AuditLog.actor_username.ilike(like),
+        AuditLog.entity_id.ilike(like),
+    )
 
-async def list_audit_logs(
+
+async def page_audit_logs(
     session: AsyncSession,
     *,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    count: str = "exact",
     actor_user_id: Optional[int] = None,
     actor_username: Optional[str] = None,
     action: Optional[str] = None,
@@ -33,13 +100,17 @@ async def list_audit_logs(
     start_time: Optional[datetime] = None,
     end_time: Optional[datetime] = None,
     search: Optional[str] = None,
-) -> Tuple[List[AuditLog], int]:
-    """Return (rows, total_count) for the given filters, newest first.
+) -> Tuple[List[AuditLog], Optional[int], bool, Optional[str]]:
+    """Return (rows, total, total_capped, next_cursor) for the given filters, newest first.
 
-    ``total`` is the count for the filter set (ignoring skip/limit) so the caller can
-    paginate. ``search`` is a case-insensitive substring match across details, actor
-    username and entity id.
+    Rows start after ``cursor`` when one is given, else after ``skip`` rows. ``total``
+    is the count for the filter set per ``count``: ``"exact"``; ``"capped"``, at most
+    `COUNT_CAP` with ``total_capped`` set when there are more; or ``"none"``, None.
+    ``next_cursor`` is None once a page comes back short.
     """
+    # Writes are buffered; make sure the caller sees everything recorded so far.
+    await flush_audit_events()
+
     filters = []
     if actor_user_id is not None:
         filters.append(AuditLog.actor_user_id == actor_user_id)
@@ -60,27 +131,31 @@ async def list_audit_logs(
     if end_time is not None:
         filters.append(AuditLog.timestamp <= end_time)
     if search:
-        like = f"%{search}%"
-        filters.append(
-            or_(
-                AuditLog.details.ilike(like),
-                AuditLog.actor_username.ilike(like),
-                AuditLog.entity_id.ilike(like),
-            ),
-        )
-
-    count_stmt = select(func.count()).select_from(AuditLog)
-    for f in filters:
-        count_stmt = count_stmt.where(f)
-    total = (await session.execute(count_stmt)).scalar_one()
-
-    stmt = select(AuditLog)
-    for f in filters:
-        stmt = stmt.where(f)
-    stmt = stmt.order_by(desc(AuditLog.timestamp), desc(AuditLog.id)).offset(skip).limit(limit)
-    rows = (await session.execute(stmt)).scalars().all()
-
-    return list(rows), total
+        filters.append(_search_condition(session, search))
+
+    total, total_capped = None, False
+    if count == "exact":
+        total = (await session.execute(select(func.count()).select_from(AuditLog).where(*filters))).scalar_one()
+    elif count == "capped":
+        matching = select(AuditLog.id).where(*filters).limit(COUNT_CAP + 1).subquery()
+        total = (await session.execute(select(func.count()).select_from(matching))).scalar_one()
+        total_capped = total > COUNT_CAP
+        total = min(total, COUNT_CAP)
+
+    stmt = select(AuditLog).where(*filters).order_by(*keyset.order_by(SORT_COLUMNS, "desc")).limit(limit)
+    if cursor:
+        stmt = stmt.where(keyset.after(SORT_COLUMNS, "desc", keyset.decode_cursor(cursor, SORT_KEY, "desc", SORT_COLUMNS)))
+    else:
+        stmt = stmt.offset(skip)
+    rows = list((await session.execute(stmt)).scalars().all())
+
+    return rows, total, total_capped, keyset.next_cursor(rows, SORT_COLUMNS, SORT_KEY, "desc", limit)
+
+
+async def list_audit_logs(session: AsyncSession, **filters) -> Tuple[List[AuditLog], int]:
+    """Return (rows, total_count) for the given filters, newest first; see `page_audit_logs`."""
+    rows, total, _, _ = await page_audit_logs(session, count="exact", **filters)
+    return rows, total
 
 
 async def get_audit_log_by_id(session: AsyncSession, audit_id: int) -> AuditLog:
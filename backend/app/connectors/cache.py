@@ -47,7 +47,9 @@ import asyncio
 import os
 import time
 from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import List
 from typing import Optional
 
 from loguru import logger
@@ -78,6 +80,13 @@ _locks: Dict[str, asyncio.Lock] = {}
 # the startup sync — and that calls `invalidate_all()`.
 _names_by_id: Dict[int, str] = {}
 
+# Called with the connector name (or None for "everything") after each
+# invalidation. For state *derived* from a connector row that lives outside this
+# module — the pooled Wazuh-Indexer clients hold the credentials they were built
+# with, and must be rebuilt the moment those change. Not a general event bus:
+# listeners run synchronously, inline with the write path, and must be cheap.
+_listeners: List[Callable[[Optional[str]], None]] = []
+
 _hits = 0
 _misses = 0
 _invalidations = 0
@@ -182,6 +191,21 @@ def name_for_id(connector_id: int) -> Optional[str]:
     return _names_by_id.get(connector_id)
 
 
+def add_invalidation_listener(listener: Callable[[Optional[str]], None]) -> None:
+    """Be told when a connector row may have changed. Idempotent per listener."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def _notify(connector_name: Optional[str]) -> None:
+    """Run every listener, swallowing failures: a write has already committed."""
+    for listener in list(_listeners):
+        try:
+            listener(connector_name)
+        except Exception as exc:
+            logger.warning(f"Connector cache invalidation listener failed for {connector_name}: {exc}")
+
+
 def invalidate(connector_name: Optional[str]) -> None:
     """Forget one connector. Called after every committed write to its row."""
     global _invalidations
@@ -191,6 +215,9 @@ def invalidate(connector_name: Optional[str]) -> None:
     if _entries.pop(connector_name, None) is not None:
         _invalidations += 1
         logger.debug(f"Connector cache invalidated for {connector_name}")
+    # Listeners hear about it even when nothing was cached here: a client built
+    # from a row that has since expired out of `_entries` is still stale.
+    _notify(connector_name)
 
 
 def invalidate_all() -> None:
@@ -205,6 +232,7 @@ def invalidate_all() -> None:
     _invalidations += len(_entries)
     _entries.clear()
     _names_by_id.clear()
+    _notify(None)
 
 
 def reset_stats() -> None:
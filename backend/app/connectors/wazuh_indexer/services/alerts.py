@@ -502,6 +502,18 @@ async def get_original_alert_id(origin_context: str) -> Tuple[str, str]:
 # ! ^^THIS IS OLD WITH ASYNC OPERATIONS^^ ! #
 
 
+# Multi-get sizing for `get_alert_details_bulk`. 200 ids keeps a single `_mget`
+# body and its response small, and four chunks in flight hides latency without
+# recreating the search thread-pool rejections the per-hit GETs caused
+# (`size=1000` used to mean 1000 concurrent requests).
+MGET_CHUNK_SIZE = 200
+MGET_CONCURRENCY = 4
+
+
+def _alert_not_found(index_name: str, index_id: str) -> Dict:
+    return AlertNotFound(_index=index_name, _id=index_id, _source={"message": "alert not found"}).to_dict()
+
+
 async def get_single_alert_details(
     es_client: AsyncElasticsearch,
     index_name: str,
@@ -523,7 +535,7 @@ async def get_single_alert_details(
         return alert
     except NotFoundError:
         logger.warning(f"Alert not found for index {index_name} and id {index_id}")
-        return AlertNotFound(_index=index_name, _id=index_id, _source={"message": "alert not found"}).to_dict()
+        return _alert_not_found(index_name, index_id)
 
 
 async def get_alert_by_id(index_name: str, alert_id: str) -> Dict:
@@ -569,6 +581,59 @@ async def fetch_alerts_from_graylog(index_prefix: str, size: int, timerange: str
     return response["hits"]["hits"]
 
 
+async def get_alert_details_bulk(
+    es_client: AsyncElasticsearch,
+    references: List[Tuple[str, str]],
+) -> List[Dict]:
+    """
+    Retrieves many alerts by (index name, id) with chunked multi-get requests.
+
+    The result is aligned with ``references``: entry ``i`` is the document for
+    ``references[i]``, shaped like a single ``get`` response, or the same
+    ``AlertNotFound`` placeholder `get_single_alert_details` returns when the
+    document or its index is missing.
+
+    Args:
+        es_client: The Elasticsearch client.
+        references (List[Tuple[str, str]]): (index name, document id) pairs.
+
+    Returns:
+        List[Dict]: The alert documents, in the order they were asked for.
+    """
+    positions: Dict[str, List[int]] = defaultdict(list)
+    for position, (index_name, _) in enumerate(references):
+        positions[index_name].append(position)
+
+    results: List[Optional[Dict]] = [None] * len(references)
+    semaphore = asyncio.Semaphore(MGET_CONCURRENCY)
+
+    async def fetch_chunk(index_name: str, chunk: List[int]) -> None:
+        ids = [references[position][1] for position in chunk]
+        async with semaphore:
+            try:
+                response = await es_client.mget(index=index_name, body={"ids": ids})
+            except NotFoundError:
+                logger.warning(f"Index {index_name} not found while hydrating {len(ids)} alert(s)")
+                response = {"docs": []}
+        docs = response.get("docs", [])
+        for offset, position in enumerate(chunk):
+            doc = docs[offset] if offset < len(docs) else None
+            if doc is None or not doc.get("found") or "error" in doc:
+                logger.warning(f"Alert not found for index {index_name} and id {ids[offset]}")
+                results[position] = _alert_not_found(index_name, ids[offset])
+            else:
+                results[position] = doc
+
+    await asyncio.gather(
+        *(
+            fetch_chunk(index_name, index_positions[start : start + MGET_CHUNK_SIZE])
+            for index_name, index_positions in positions.items()
+            for start in range(0, len(index_positions), MGET_CHUNK_SIZE)
+        ),
+    )
+    return results
+
+
 async def process_alert_hits(
     hits: List[Dict],
     es_client: AsyncElasticsearch,
@@ -577,13 +642,17 @@ async def process_alert_hits(
     """
     Hydrate Graylog alert hits with their original alert documents.
 
+    Hits are grouped by origin index and fetched with `get_alert_details_bulk`,
+    so a page of N hits costs a handful of ``_mget`` requests instead of N
+    concurrent GETs.
+
     When ``index_filter`` is supplied, hits whose ``origin_context`` points at a
-    different index are dropped *before* the per-hit detail lookup — the caller
-    only wants that one index, so there's no point paying for the rest.
+    different index are dropped *before* the detail lookup — the caller only
+    wants that one index, so there's no point paying for the rest.
     """
     alerts_dict = defaultdict(lambda: {"total_alerts": 0, "alerts": []})
 
-    tasks = []
+    references: List[Tuple[str, str]] = []
     for hit in hits:
         origin_context = hit.get("_source", {}).get("origin_context")
         if not origin_context:
@@ -596,11 +665,10 @@ async def process_alert_hits(
             continue
         if index_filter is not None and index_name != index_filter:
             continue
-        logger.info(f"Fetching alert details for index {index_name} and id {index_id}")
-        task = get_single_alert_details(es_client, index_name, index_id)
-        tasks.append(task)
+        references.append((index_name, index_id))
 
-    alert_details_list = await asyncio.gather(*tasks)
+    logger.info(f"Fetching alert details for {len(references)} hit(s)")
+    alert_details_list = await get_alert_details_bulk(es_client, references)
 
     for alert_details in alert_details_list:
         index_name = alert_details["_index"]
@@ -0,0 +1,310 @@
+"""Process-wide, pooled Wazuh-Indexer clients.
+
+`create_wazuh_indexer_client_async` used to build a brand-new `AsyncElasticsearch`
+on every call: a new aiohttp session, a new connection pool and — because the
+indexer always speaks TLS — a fresh handshake for the first request on it. Most
+callers never closed it, so each one also left an open session and its sockets
+behind until garbage collection got round to it. `get_graylog_alerts` alone built
+two per request; under alert volume that is thousands of handshakes an hour and
+a file-descriptor count that only goes up.
+
+Clients are now built once per connector name and shared. Three things make that
+safe:
+
+* **Credentials are watched, not assumed.** The registry subscribes to
+  `app.connectors.cache` invalidations, which `ConnectorServices` fires after every
+  committed write to a connector row. The affected client is marked stale, and
+  the next caller re-reads the row and builds a new client if the URL or the
+  credentials changed.
+* **Retired clients are closed late, not immediately.** A request may be halfway
+  through a search on the old client when an operator saves the connector form;
+  closing under it would fail that request for no reason. Retired clients are
+  closed after `RETIRE_GRACE_SECONDS`, and any still waiting at shutdown are
+  closed then.
+* **Callers cannot close the shared client.** Twenty-odd call sites end with
+  `await es_client.close()`, which was correct when the client was theirs. They
+  now receive a thin handle whose `close()` does nothing, so that habit cannot
+  tear the pool down for every other request in flight.
+
+The async client is bound to the event loop it was first used on (aiohttp
+creates its session there), so a client is only reused on the loop that built
+it. In production there is exactly one loop; tests create one per test.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from elasticsearch7 import AsyncElasticsearch
+from elasticsearch7 import Elasticsearch
+from fastapi import HTTPException
+from loguru import logger
+
+from app.connectors import cache as connector_cache
+from app.connectors.utils import get_connector_info_from_db
+from app.db.db_session import get_db_session
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, str(default))
+    try:
+        return max(int(raw), 1)
+    except ValueError:
+        logger.warning(f"{name}={raw!r} is not an integer; falling back to {default}")
+        return default
+
+
+# Connections per client. The indexer's own HTTP thread pool is the real limit;
+# 25 keeps the sidebar and SIEM fan-outs from queueing on the client while
+# staying well inside what a single-node indexer will accept from one process.
+POOL_MAXSIZE = _env_int("WAZUH_INDEXER_POOL_MAXSIZE", 25)
+
+# How long a retired client stays open for requests already using it.
+RETIRE_GRACE_SECONDS = _env_int("WAZUH_INDEXER_RETIRE_GRACE_SECONDS", 60)
+
+# The placeholder URL written by the connector seed; never a real indexer.
+_PLACEHOLDER_URL = "https://127.1.1.1:9200"
+
+Fingerprint = Tuple[str, str, str]
+
+
+@dataclass
+class _Pooled:
+    client: Any
+    fingerprint: Fingerprint
+    loop: Optional[asyncio.AbstractEventLoop] = None
+    # Set by an invalidation. The next caller re-reads the row and only rebuilds
+    # if the URL or credentials actually changed: `verify_connector_by_id`
+    # invalidates on every verify, and that alone should not cost a handshake.
+    stale: bool = False
+
+
+class SharedClient:
+    """A borrowed handle on a pooled client.
+
+    Everything is delegated to the real client except `close()`, which is a
+    no-op: the client belongs to the registry, not to the caller.
+    """
+
+    __slots__ = ("_client",)
+
+    def __init__(self, client: Any) -> None:
+        self._client = client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def close(self):
+        if isinstance(self._client, AsyncElasticsearch):
+            return _noop()
+        return None
+
+
+async def _noop() -> None:
+    return None
+
+
+_async_clients: Dict[str, _Pooled] = {}
+_sync_clients: Dict[str, _Pooled] = {}
+_retired: List[Any] = []
+_locks: Dict[str, asyncio.Lock] = {}
+
+_builds = 0
+_reuses = 0
+_retirements = 0
+
+
+def _lock_for(connector_name: str) -> asyncio.Lock:
+    lock = _locks.get(connector_name)
+    if lock is None:
+        lock = asyncio.Lock()
+        _locks[connector_name] = lock
+    return lock
+
+
+async def _load_attributes(connector_name: str) -> Dict[str, Any]:
+    """The connector row, validated the way the old per-call factories did."""
+    async with get_db_session() as session:
+        attributes = await get_connector_info_from_db(connector_name, session)
+    if attributes is None:
+        raise HTTPException(
+            status_code=500,
+            detail=f"No {connector_name} connector found in the database",
+        )
+    if attributes["connector_url"] == _PLACEHOLDER_URL:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Please update the {connector_name} connector URL",
+        )
+    return attributes
+
+
+def _fingerprint(attributes: Dict[str, Any]) -> Fingerprint:
+    return (
+        attributes["connector_url"],
+        attributes["connector_username"] or "",
+        attributes["connector_password"] or "",
+    )
+
+
+def _client_kwargs(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "http_auth": (
+            attributes["connector_username"],
+            attributes["connector_password"],
+        ),
+        "verify_certs": False,
+        "timeout": 15,
+        "max_retries": 10,
+        "retry_on_timeout": False,
+        "maxsize": POOL_MAXSIZE,
+    }
+
+
+def _usable(pooled: Optional[_Pooled], loop: Optional[asyncio.AbstractEventLoop]) -> bool:
+    if pooled is None:
+        return False
+    if pooled.loop is not None and (pooled.loop is not loop or pooled.loop.is_closed()):
+        return False
+    return True
+
+
+async def _acquire(registry: Dict[str, _Pooled], connector_name: str, build) -> SharedClient:
+    """Read through `registry`, building (or revalidating) at most once per name."""
+    global _builds, _reuses
+
+    loop = asyncio.get_running_loop() if registry is _async_clients else None
+    pooled = registry.get(connector_name)
+    if _usable(pooled, loop) and not pooled.stale:
+        _reuses += 1
+        return SharedClient(pooled.client)
+
+    async with _lock_for(connector_name):
+        pooled = registry.get(connector_name)
+        if _usable(pooled, loop) and not pooled.stale:
+            _reuses += 1
+            return SharedClient(pooled.client)
+
+        attributes = await _load_attributes(connector_name)
+        fingerprint = _fingerprint(attributes)
+        if _usable(pooled, loop) and pooled.fingerprint == fingerprint:
+            pooled.stale = False
+            _reuses += 1
+            return SharedClient(pooled.client)
+        if pooled is not None:
+            registry.pop(connector_name, None)
+            _retire(pooled)
+
+        try:
+            client = build([attributes["connector_url"]], **_client_kwargs(attributes))
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to create Elasticsearch client: {e}",
+            )
+        registry[connector_name] = _Pooled(client=client, fingerprint=fingerprint, loop=loop)
+        _builds += 1
+        logger.info(f"Built pooled {connector_name} client (maxsize={POOL_MAXSIZE})")
+        return SharedClient(client)
+
+
+async def get_async_client(connector_name: str = "Wazuh-Indexer") -> SharedClient:
+    """The shared `AsyncElasticsearch` for this connector, built on first use."""
+    return await _acquire(_async_clients, connector_name, AsyncElasticsearch)
+
+
+async def get_sync_client(connector_name: str = "Wazuh-Indexer") -> SharedClient:
+    """The shared synchronous `Elasticsearch` for this connector.
+
+    urllib3's pool is thread-safe, which is what lets one client serve every
+    `run_blocking` call that uses it.
+    """
+    return await _acquire(_sync_clients, connector_name, Elasticsearch)
+
+
+async def _close(client: Any) -> None:
+    try:
+        result = client.close()
+        if asyncio.iscoroutine(result):
+            await result
+    except Exception as exc:
+        logger.warning(f"Failed to close a retired Wazuh-Indexer client: {exc}")
+
+
+async def _close_after_grace(client: Any) -> None:
+    await asyncio.sleep(RETIRE_GRACE_SECONDS)
+    if client in _retired:
+        _retired.remove(client)
+        await _close(client)
+
+
+def _retire(pooled: _Pooled) -> None:
+    """Queue a replaced client for closing once in-flight requests are done."""
+    global _retirements
+
+    _retirements += 1
+    if pooled.loop is not None and pooled.loop.is_closed():
+        # Its aiohttp session died with its loop; there is nothing to close.
+        return
+    _retired.append(pooled.client)
+    try:
+        asyncio.get_running_loop().create_task(_close_after_grace(pooled.client))
+    except RuntimeError:
+        # No loop here (a sync caller): it waits for `close_all` at shutdown.
+        pass
+
+
+def invalidate(connector_name: Optional[str]) -> None:
+    """Mark the clients built from this connector row (all of them for None) stale.
+
+    Registered as a connector-cache listener, so it runs inline after every
+    committed connector write. Nothing is closed here; see `_acquire`.
+    """
+    for registry in (_async_clients, _sync_clients):
+        for name, pooled in registry.items():
+            if connector_name is None or name == connector_name:
+                pooled.stale = True
+
+
+connector_cache.add_invalidation_listener(invalidate)
+
+
+async def close_all() -> None:
+    """Close every pooled and retired client. Called from the app lifespan."""
+    clients = [pooled.client for pooled in _async_clients.values()]
+    clients += [pooled.client for pooled in _sync_clients.values()]
+    clients += _retired
+    _async_clients.clear()
+    _sync_clients.clear()
+    _retired.clear()
+    for client in clients:
+        await _close(client)
+    if clients:
+        logger.info(f"Closed {len(clients)} Wazuh-Indexer client(s)")
+
+
+def reset_stats() -> None:
+    """Test seam, as in `app.connectors.cache`."""
+    global _builds, _reuses, _retirements
+
+    _builds = _reuses = _retirements = 0
+
+
+def stats() -> Dict[str, Any]:
+    """Surfaced in the performance session log next to the connector cache."""
+    return {
+        "async_clients": len(_async_clients),
+        "sync_clients": len(_sync_clients),
+        "retired_pending_close": len(_retired),
+        "builds": _builds,
+        "reuses": _reuses,
+        "retirements": _retirements,
+        "pool_maxsize": POOL_MAXSIZE,
+    }
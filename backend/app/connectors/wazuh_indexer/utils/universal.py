@@ -15,6 +15,7 @@ from app.blocking import run_blocking
 from app.connectors.utils import get_connector_info_from_db
 from app.connectors.wazuh_indexer.schema.indices import IndexConfigModel
 from app.connectors.wazuh_indexer.schema.indices import Indices
+from app.connectors.wazuh_indexer.utils import client_registry
 from app.db.db_session import get_db_session
 
 
@@ -80,78 +81,26 @@ async def create_wazuh_indexer_client(connector_name: str = "Wazuh-Indexer") ->
     """
     Returns an Elasticsearch client for the Wazuh Indexer service.
 
+    The client is pooled and shared process-wide; see `client_registry` for how
+    it is rebuilt when the connector changes. Calling `close()` on it is a no-op.
+
     Returns:
         Elasticsearch: Elasticsearch client for the Wazuh Indexer service.
     """
-    # attributes = get_connector_info_from_db(connector_name)
-    async with get_db_session() as session:  # This will correctly enter the context manager
-        attributes = await get_connector_info_from_db(connector_name, session)
-    if attributes is None:
-        raise HTTPException(
-            status_code=500,
-            detail=f"No {connector_name} connector found in the database",
-        )
-    if attributes["connector_url"] == "https://127.1.1.1:9200":
-        raise HTTPException(
-            status_code=500,
-            detail=f"Please update the {connector_name} connector URL",
-        )
-    try:
-        return Elasticsearch(
-            [attributes["connector_url"]],
-            http_auth=(
-                attributes["connector_username"],
-                attributes["connector_password"],
-            ),
-            verify_certs=False,
-            timeout=15,
-            max_retries=10,
-            retry_on_timeout=False,
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to create Elasticsearch client: {e}",
-        )
+    return await client_registry.get_sync_client(connector_name)
 
 
 async def create_wazuh_indexer_client_async(connector_name: str = "Wazuh-Indexer") -> AsyncElasticsearch:
     """
     Returns an Elasticsearch client for the Wazuh Indexer service.
 
+    The client is pooled and shared process-wide; see `client_registry` for how
+    it is rebuilt when the connector changes. Calling `close()` on it is a no-op.
+
     Returns:
         Elasticsearch: Elasticsearch client for the Wazuh Indexer service.
     """
-    # attributes = get_connector_info_from_db(connector_name)
-    async with get_db_session() as session:  # This will correctly enter the context manager
-        attributes = await get_connector_info_from_db(connector_name, session)
-    if attributes is None:
-        raise HTTPException(
-            status_code=500,
-            detail=f"No {connector_name} connector found in the database",
-        )
-    if attributes["connector_url"] == "https://127.1.1.1:9200":
-        raise HTTPException(
-            status_code=500,
-            detail=f"Please update the {connector_name} connector URL",
-        )
-    try:
-        return AsyncElasticsearch(
-            [attributes["connector_url"]],
-            http_auth=(
-                attributes["connector_username"],
-                attributes["connector_password"],
-            ),
-            verify_certs=False,
-            timeout=15,
-            max_retries=10,
-            retry_on_timeout=False,
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to create Elasticsearch client: {e}",
-        )
+    return await client_registry.get_async_client(connector_name)
 
 
 async def format_node_allocation(node_allocation):
@@ -31,6 +31,7 @@ from app.connectors.wazuh_manager.services.mitre import get_mitre_techniques
 from app.connectors.wazuh_manager.services.mitre import (
     search_mitre_techniques_in_alerts,
 )
+from app.connectors.wazuh_manager.services.mitre_reference import cached_page
 
 # Initialize router and auth handler
 wazuh_manager_mitre_router = APIRouter()
@@ -65,6 +66,15 @@ async def list_mitre_groups(
     Returns:
         WazuhMitreGroupsResponse: A list of MITRE ATT&CK groups matching the criteria.
     """
+    cached = await cached_page("groups", limit, offset, select, sort, search, q)
+    if cached is not None:
+        items, total = cached
+        return WazuhMitreGroupsResponse(
+            success=True,
+            message=f"Successfully retrieved {len(items)} MITRE groups",
+            results=items,
+            total=total,
+        )
     return await get_mitre_groups(limit=limit, offset=offset, select=select, sort=sort, search=search, q=q)
 
 
@@ -96,6 +106,15 @@ async def list_mitre_mitigations(
     Returns:
         WazuhMitreMitigationsResponse: A list of MITRE ATT&CK mitigations matching the criteria.
     """
+    cached = await cached_page("mitigations", limit, offset, select, sort, search, q)
+    if cached is not None:
+        items, total = cached
+        return WazuhMitreMitigationsResponse(
+            success=True,
+            message=f"Successfully retrieved {len(items)} MITRE mitigations",
+            results=items,
+            total=total,
+        )
     return await get_mitre_mitigations(limit=limit, offset=offset, select=select, sort=sort, search=search, q=q)
 
 
@@ -156,6 +175,10 @@ async def list_mitre_software(
     Returns:
         WazuhMitreSoftwareResponse: A list of MITRE ATT&CK software matching the criteria.
     """
+    cached = await cached_page("software", limit, offset, select, sort, search, q)
+    if cached is not None:
+        items = cached[0]
+        return WazuhMitreSoftwareResponse(success=True, message=f"Successfully retrieved {len(items)} MITRE software", results=items)
     return await get_mitre_software(limit=limit, offset=offset, select=select, sort=sort, search=search, q=q)
 
 
@@ -187,6 +210,10 @@ async def list_mitre_tactics(
     Returns:
         WazuhMitreTacticsResponse: A list of MITRE ATT&CK tactics matching the criteria.
     """
+    cached = await cached_page("tactics", limit, offset, select, sort, search, q)
+    if cached is not None:
+        items = cached[0]
+        return WazuhMitreTacticsResponse(success=True, message=f"Successfully retrieved {len(items)} MITRE tactics", results=items)
     return await get_mitre_tactics(limit=limit, offset=offset, select=select, sort=sort, search=search, q=q)
 
 
@@ -218,6 +245,10 @@ async def list_mitre_techniques(
     Returns:
         WazuhMitreTechniquesResponse: A list of MITRE ATT&CK techniques matching the criteria.
     """
+    cached = await cached_page("techniques", limit, offset, select, sort, search, q)
+    if cached is not None:
+        items = cached[0]
+        return WazuhMitreTechniquesResponse(success=True, message=f"Successfully retrieved {len(items)} MITRE techniques", results=items)
     return await get_mitre_techniques(limit=limit, offset=offset, select=select, sort=sort, search=search, q=q)
 
 
@@ -300,18 +331,9 @@ async def list_atomic_tests(
     logger.info(f"Request for list of all Atomic Red Team tests (page {page}, size {size}, os_category: {os_category})")
 
     try:
-        # Get the list of all atomic tests
-        result = await AtomicRedTeamService.list_all_atomic_tests()
-
-        # Filter by OS category if provided
-        all_tests = result["tests"]
-        if os_category:
-            os_category_lower = os_category.lower()
-            # Filter tests that have the specified OS category in their categories list
-            filtered_tests = [test for test in all_tests if os_category_lower in [cat.lower() for cat in test.get("categories", [])]]
-            logger.info(f"Filtered {len(all_tests)} tests down to {len(filtered_tests)} tests for OS category '{os_category}'")
-        else:
-            filtered_tests = all_tests
+        # Get the tests, already filtered by OS category if one was given
+        result = await AtomicRedTeamService.list_all_atomic_tests(os_category)
+        filtered_tests = result["tests"]
 
         # Apply pagination to the filtered results
         total_techniques = len(filtered_tests)
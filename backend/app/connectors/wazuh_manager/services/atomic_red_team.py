@@ -0,0 +1,357 @@
+"""Local index of the Atomic Red Team tests, synced incrementally from GitHub.
+
+The atomic tests page used to be assembled live: `list_all_atomic_tests`
+downloaded the repository's markdown index (which has no platforms, so the OS
+filter matched nothing) and fell back to walking the GitHub contents API and
+downloading one YAML per technique, five at a time. Each technique's markdown
+was fetched from GitHub when it was opened. Nothing worked without outbound
+network access.
+
+`AtomicRedTeamIndex` keeps the whole library in memory instead:
+
+* **Contents.** For every technique folder under ``atomics/``, the summary the
+  page lists (name, test count, platforms, whether any test has
+  prerequisites) parsed from its YAML, and its markdown, zlib-compressed. The
+  per-platform lists the OS filter needs are built once per sync.
+* **Incremental, versioned sync.** Like the CoPilot Searches rules: the
+  branch head is checked with its ETag (a 304 costs nothing against the rate
+  limit); when it moved, one contents call lists every technique folder with
+  its tree SHA, and only folders whose SHA changed are downloaded, at the
+  commit just resolved. A folder that fails to download keeps its previous
+  version and the commit is not recorded, so the next sync retries it.
+* **On disk, and offline.** The index is snapshotted with the commit it was
+  built from (see ``catalog_snapshots``), so a restart serves it at once; with
+  ``CATALOG_OFFLINE`` set, a snapshot copied from a connected install is
+  served and GitHub is never contacted.
+
+The ``refresh_catalog_caches`` job keeps it current. Requests only wait for a
+sync when there is nothing to serve yet.
+"""
+
+import asyncio
+import base64
+import os
+import zlib
+from datetime import datetime
+from datetime import timedelta
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import httpx
+import yaml
+from fastapi import HTTPException
+from loguru import logger
+
+from app.integrations.copilot_searches.services import catalog_snapshots
+from app.integrations.copilot_searches.services.cache_support import (
+    BackgroundRefreshMixin,
+)
+
+GITHUB_REPO = "redcanaryco/atomic-red-team"
+GITHUB_BRANCH = "master"
+GITHUB_API_BASE = "https://api.github.com"
+GITHUB_RAW_BASE = "https://raw.githubusercontent.com"
+ATOMICS_PATH = "atomics"
+
+
+def _env_number(name: str, default: float) -> float:
+    raw = os.getenv(name, str(default))
+    try:
+        value = float(raw)
+    except ValueError:
+        logger.warning(f"{name}={raw!r} is not a number; falling back to {default}")
+        return default
+    return value if value > 0 else default
+
+
+#: A sync with no upstream change costs one conditional request, but the
+#: library itself changes a few times a week.
+CACHE_TTL_HOURS = _env_number("ATOMIC_RED_TEAM_TTL_HOURS", 24.0)
+
+#: How long a failed sync is left alone before the next attempt.
+RETRY_MINUTES = _env_number("ATOMIC_RED_TEAM_RETRY_MINUTES", 5.0)
+
+#: Technique folders downloaded at once during a sync.
+SYNC_CONCURRENCY = 8
+
+
+def _github_headers() -> Dict[str, str]:
+    headers = {"Accept": "application/vnd.github+json"}
+    token = os.getenv("GITHUB_TOKEN")
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+def summarize_atomics(technique_id: str, data: Any) -> Optional[Dict[str, Any]]:
+    """The listing entry for one technique's parsed YAML; None if it is not an atomics file."""
+    if not isinstance(data, dict):
+        return None
+    tests = data.get("atomic_tests") or []
+    platforms = set()
+    has_prerequisites = False
+    for test in tests:
+        platforms.update(test.get("supported_platforms") or [])
+        if test.get("dependencies"):
+            has_prerequisites = True
+    return {
+        "technique_id": technique_id,
+        "technique_name": data.get("display_name", technique_id),
+        "test_count": len(tests),
+        "categories": sorted(platforms),
+        "has_prerequisites": has_prerequisites,
+    }
+
+
+class AtomicRedTeamIndex(BackgroundRefreshMixin):
+    """Every Atomic Red Team technique's summary and markdown, keyed by technique id."""
+
+    snapshot_name = "atomic_red_team"
+
+    def __init__(self) -> None:
+        # technique id -> {"sha": folder tree sha, "summary": dict or None, "markdown": zlib bytes or None}
+        self._techniques: Dict[str, Dict[str, Any]] = {}
+        self._commit_sha: Optional[str] = None
+        self._etag: Optional[str] = None
+        self._last_refresh: Optional[datetime] = None
+        self._failed_at: Optional[datetime] = None
+        self._unavailable_reason: Optional[str] = None
+        self._lock = asyncio.Lock()
+        self._ordered: List[Dict[str, Any]] = []
+        self._by_category: Dict[str, List[Dict[str, Any]]] = {}
+        self._syncs = 0
+        self._downloads = 0
+
+    # ---- introspection ----------------------------------------------------
+
+    @property
+    def is_loaded(self) -> bool:
+        return bool(self._techniques)
+
+    @property
+    def is_stale(self) -> bool:
+        now = datetime.utcnow()
+        if self._failed_at is not None and now - self._failed_at < timedelta(minutes=RETRY_MINUTES):
+            return False
+        if self._last_refresh is None:
+            return True
+        return now - self._last_refresh > timedelta(hours=CACHE_TTL_HOURS)
+
+    @property
+    def last_refresh(self) -> Optional[datetime]:
+        return self._last_refresh
+
+    @property
+    def commit_sha(self) -> Optional[str]:
+        return self._commit_sha
+
+    # ---- loading ----------------------------------------------------------
+
+    async def ensure_loaded(self) -> None:
+        """Restore the snapshot, then sync if stale. Blocks for the sync."""
+        await self.load_snapshot()
+        if self.is_stale:
+            await self.refresh()
+
+    async def ensure_available(self) -> None:
+        """For requests: wait only if there is nothing to serve, otherwise refresh in the background."""
+        await self.load_snapshot()
+        if not self.is_loaded:
+            await self.ensure_loaded()
+        else:
+            await self.ensure_fresh_nonblocking()
+        if not self.is_loaded:
+            raise HTTPException(status_code=503, detail=f"Atomic Red Team index is not available: {self._unavailable_reason or 'empty'}")
+
+    async def refresh(self) -> int:
+        """
+        Sync the index with the repository's branch head.
+
+        Returns the number of techniques with tests. Never raises: a failed
+        sync keeps the previous index and is retried after `RETRY_MINUTES`.
+        """
+        async with self._lock:
+            await self._load_snapshot_locked()
+            if catalog_snapshots.OFFLINE:
+                logger.info("CATALOG_OFFLINE is set; serving the Atomic Red Team snapshot without contacting GitHub")
+                self._last_refresh = datetime.utcnow()
+                return len(self._ordered)
+
+            try:
+                changed = await self._sync()
+            except Exception as exc:  # noqa: BLE001 — GitHub being unreachable must not empty the index
+                self._failed_at = datetime.utcnow()
+                self._unavailable_reason = str(exc) or exc.__class__.__name__
+                logger.warning(f"Could not sync the Atomic Red Team index: {self._unavailable_reason}. Keeping the previous index.")
+                return len(self._ordered)
+
+            if changed:
+                self._rebuild()
+            self._syncs += 1
+            self._failed_at = None
+            self._unavailable_reason = None
+            self._last_refresh = datetime.utcnow()
+            logger.info(f"Atomic Red Team index at {self._commit_sha}: {len(self._ordered)} techniques with tests")
+
+        if changed:
+            await self.save_snapshot()
+        return len(self._ordered)
+
+    async def _sync(self) -> bool:
+        """Bring `_techniques` up to the branch head. Returns whether anything changed."""
+        async with httpx.AsyncClient(timeout=30.0, headers=_github_headers()) as client:
+            head_headers = {"Accept": "application/vnd.github.sha"}
+            if self._etag and self._techniques:
+                head_headers["If-None-Match"] = self._etag
+            head = await client.get(f"{GITHUB_API_BASE}/repos/{GITHUB_REPO}/commits/{GITHUB_BRANCH}", headers=head_headers)
+            if head.status_code == 304:
+                logger.info("Atomic Red Team repository unchanged since the last sync")
+                return False
+            head.raise_for_status()
+            commit_sha = head.text.strip()
+            etag = head.headers.get("ETag")
+            if commit_sha == self._commit_sha:
+                self._etag = etag
+                return False
+
+            # A folder's tree SHA changes whenever anything inside it does.
+            listing = await client.get(f"{GITHUB_API_BASE}/repos/{GITHUB_REPO}/contents/{ATOMICS_PATH}", params={"ref": commit_sha})
+            listing.raise_for_status()
+            folder_shas = {
+                entry["name"]: entry["sha"] for entry in listing.json() if entry["type"] == "dir" and entry["name"].startswith("T")
+            }
+            changed_ids = [tid for tid, sha in folder_shas.items() if self._techniques.get(tid, {}).get("sha") != sha]
+            logger.info(
+                f"Atomic Red Team has {len(folder_shas)} technique folders at {commit_sha[:12]}: "
+                f"{len(changed_ids)} new or changed, {len([t for t in self._techniques if t not in folder_shas])} removed",
+            )
+
+            semaphore = asyncio.Semaphore(SYNC_CONCURRENCY)
+
+            async def fetch_bounded(technique_id: str):
+                async with semaphore:
+                    return await self._fetch_technique(client, technique_id, commit_sha)
+
+            results = await asyncio.gather(*(fetch_bounded(tid) for tid in changed_ids), return_exceptions=True)
+
+        techniques = {tid: entry for tid, entry in self._techniques.items() if tid in folder_shas}
+        complete = True
+        for technique_id, result in zip(changed_ids, results):
+            if isinstance(result, Exception):
+                # Keep whatever version we had; the commit is not recorded, so
+                # the next sync diffs against it again and retries the folder.
+                logger.warning(f"Failed to fetch Atomic Red Team technique {technique_id}: {result}")
+                complete = False
+            else:
+                summary, markdown = result
+                techniques[technique_id] = {"sha": folder_shas[technique_id], "summary": summary, "markdown": markdown}
+
+        self._techniques = techniques
+        if complete:
+            self._commit_sha = commit_sha
+            self._etag = etag
+        return True
+
+    async def _fetch_technique(
+        self,
+        client: httpx.AsyncClient,
+        technique_id: str,
+        ref: str,
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[bytes]]:
+        """Download one folder's YAML and markdown. Raises on a failed download; a missing file is None."""
+        base = f"{GITHUB_RAW_BASE}/{GITHUB_REPO}/{ref}/{ATOMICS_PATH}/{technique_id}/{technique_id}"
+        summary = markdown = None
+
+        response = await client.get(f"{base}.yaml")
+        if response.status_code != 404:
+            response.raise_for_status()
+            self._downloads += 1
+            try:
+                summary = summarize_atomics(technique_id, yaml.safe_load(response.text))
+            except yaml.YAMLError as exc:
+                logger.warning(f"Error parsing Atomic Red Team YAML for {technique_id}: {exc}")
+
+        response = await client.get(f"{base}.md")
+        if response.status_code != 404:
+            response.raise_for_status()
+            self._downloads += 1
+            markdown = zlib.compress(response.content, 9)
+        return summary, markdown
+
+    def _rebuild(self) -> None:
+        ordered = [
+            self._techniques[tid]["summary"]
+            for tid in sorted(self._techniques)
+            if self._techniques[tid]["summary"] and self._techniques[tid]["summary"]["test_count"] > 0
+        ]
+        by_category: Dict[str, List[Dict[str, Any]]] = {}
+        for summary in ordered:
+            for category in {c.lower() for c in summary["categories"]}:
+                by_category.setdefault(category, []).append(summary)
+        self._ordered = ordered
+        self._by_category = by_category
+
+    def _snapshot_state(self) -> Dict[str, Any]:
+        techniques = {
+            tid: {**entry, "markdown": base64.b64encode(entry["markdown"]).decode("ascii") if entry["markdown"] else None}
+            for tid, entry in self._techniques.items()
+        }
+        return {"commit": self._commit_sha, "etag": self._etag, "techniques": techniques}
+
+    def _restore_snapshot(self, state: Dict[str, Any]) -> None:
+        self._techniques = {
+            tid: {
+                "sha": entry["sha"],
+                "summary": entry["summary"],
+                "markdown": base64.b64decode(entry["markdown"]) if entry["markdown"] else None,
+            }
+            for tid, entry in state["techniques"].items()
+        }
+        self._commit_sha = state.get("commit")
+        self._etag = state.get("etag")
+        self._rebuild()
+
+    # ---- accessors --------------------------------------------------------
+
+    def list_tests(self, os_category: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """``(technique summaries, total tests)``, by technique id, optionally for one platform."""
+        tests = self._by_category.get(os_category.lower(), []) if os_category else self._ordered
+        return tests, sum(summary["test_count"] for summary in tests)
+
+    def has_technique(self, technique_id: str) -> bool:
+        return technique_id in self._techniques
+
+    def get_markdown(self, technique_id: str) -> Optional[str]:
+        entry = self._techniques.get(technique_id)
+        if entry is None or entry["markdown"] is None:
+            return None
+        return zlib.decompress(entry["markdown"]).decode("utf-8")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "commit": self._commit_sha,
+            "techniques": len(self._ordered),
+            "folders": len(self._techniques),
+            "markdown_bytes": sum(len(entry["markdown"] or b"") for entry in self._techniques.values()),
+            "last_refresh": self._last_refresh.isoformat() if self._last_refresh else None,
+            "syncs": self._syncs,
+            "downloads": self._downloads,
+            "unavailable_reason": self._unavailable_reason,
+        }
+
+    def reset_stats(self) -> None:
+        self._syncs = self._downloads = 0
+
+
+def stats() -> Dict[str, Any]:
+    return atomic_red_team_index.stats()
+
+
+def reset_stats() -> None:
+    atomic_red_team_index.reset_stats()
+
+
+atomic_red_team_index = AtomicRedTeamIndex()
@@ -1,5 +1,3 @@
-import asyncio
-import re
 import time
 from datetime import datetime
 from typing import Dict
@@ -9,7 +7,6 @@ from typing import Tuple
 from typing import Union
 
 import aiohttp
-import yaml
 from elasticsearch7 import AsyncElasticsearch
 from fastapi import HTTPException
 from loguru import logger
@@ -24,7 +21,10 @@ from app.connectors.wazuh_manager.schema.mitre import WazuhMitreReferencesRespon
 from app.connectors.wazuh_manager.schema.mitre import WazuhMitreSoftwareResponse
 from app.connectors.wazuh_manager.schema.mitre import WazuhMitreTacticsResponse
 from app.connectors.wazuh_manager.schema.mitre import WazuhMitreTechniquesResponse
+from app.connectors.wazuh_manager.services.atomic_red_team import atomic_red_team_index
+from app.connectors.wazuh_manager.services.mitre_reference import mitre_reference_cache
 from app.connectors.wazuh_manager.utils.universal import send_get_request
+from app.integrations.copilot_searches.services import catalog_snapshots
 
 # Constants for the Atomic Red Team GitHub repository
 GITHUB_RAW_URL = "https://raw.githubusercontent.com/redcanaryco/atomic-red-team/refs/heads/master/atomics"
@@ -32,12 +32,11 @@ CACHE_EXPIRY = 86400  # Cache expiry time in seconds (24 hours)
 
 
 class AtomicRedTeamService:
-    """Service for fetching Atomic Red Team markdown content."""
+    """Service for Atomic Red Team tests, served from the local index (see ``atomic_red_team``)."""
 
-    # Cache to store the markdown content with timestamp
+    # Cache to store markdown fetched live, for techniques the index does not hold yet
     # Format: {technique_id: (markdown_content, timestamp)}
     _cache: Dict[str, Tuple[str, float]] = {}
-    _tests_cache: Dict[str, Tuple[List[Dict], float]] = {}  # Cache for all tests
 
     @classmethod
     async def list_all_atomic_tests(cls, os_category: Optional[str] = None) -> Dict:
@@ -50,222 +49,15 @@ class AtomicRedTeamService:
         Returns:
             Dict containing test information and metadata
         """
-        # Check cache first
-        cache_key = f"all_tests_{os_category}" if os_category else "all_tests"
-        if cache_key in cls._tests_cache:
-            tests, timestamp = cls._tests_cache[cache_key]
-            if time.time() - timestamp < CACHE_EXPIRY:
-                logger.debug(f"Returning cached list of atomic tests for OS category: {os_category}")
-                return {"total_techniques": len(tests), "tests": tests, "last_updated": datetime.fromtimestamp(timestamp).isoformat()}
-
-        # Fetch the list of all techniques with atomic tests
-        try:
-            # First, try to fetch index.yaml which has metadata about all tests
-            async with aiohttp.ClientSession() as session:
-                url = "https://raw.githubusercontent.com/redcanaryco/atomic-red-team/refs/heads/master/atomics/Indexes/Indexes-Markdown/atomic-red-team-index.md"
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await cls._parse_atomic_index_markdown(await response.text(), os_category)
-
-                    # If markdown index not available, try alternate approach
-                    logger.warning(f"Could not fetch atomic-red-team-index.md: {response.status}. Trying alternate method.")
-                    return await cls._fetch_techniques_from_atomics_folder(os_category)
-        except Exception as e:
-            logger.error(f"Error listing atomic tests: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Error listing atomic tests: {str(e)}")
-
-    @classmethod
-    async def _parse_atomic_index_markdown(cls, content: str, os_category: Optional[str] = None) -> Dict:
-        """Parse the atomic-red-team-index.md file to extract test information."""
-        techniques = []
-        technique_pattern = r"\|\s*\[([^]]+)\]\([^)]+\)\s*\|\s*([T\d\.]+)\s*\|\s*(\d+)\s*\|"
-
-        matches = re.findall(technique_pattern, content)
-        total_tests = 0
-
-        for name, technique_id, test_count in matches:
-            try:
-                count = int(test_count)
-                total_tests += count
-
-                # For now, we'll need to fetch individual technique details to get platform info
-                # This is a limitation of parsing just the index markdown
-                technique_data = {
-                    "technique_id": technique_id,
-                    "technique_name": name,
-                    "test_count": count,
-                    "categories": [],  # Would require additional requests to determine
-                    "has_prerequisites": False,  # Would require additional requests to determine
-                }
-
-                # If filtering by OS category, we'd need to fetch individual technique data
-                # For performance, we'll apply the filter after getting all data
-                techniques.append(technique_data)
-
-            except ValueError:
-                continue  # Skip if test_count isn't a valid integer
-
-        # Apply OS category filter if specified
-        if os_category:
-            # Note: This approach has limitations because the index doesn't contain platform info
-            # We'd need to fetch individual technique data for accurate filtering
-            logger.warning("OS category filtering from index markdown has limitations. Consider using the alternate method.")
-
-        result = {
-            "total_techniques": len(techniques),
+        await atomic_red_team_index.ensure_available()
+        tests, total_tests = atomic_red_team_index.list_tests(os_category)
+        return {
+            "total_techniques": len(tests),
             "total_tests": total_tests,
-            "tests": techniques,
-            "last_updated": datetime.utcnow().isoformat(),
+            "tests": tests,
+            "last_updated": atomic_red_team_index.last_refresh.isoformat(),
         }
 
-        # Cache the result
-        cache_key = f"all_tests_{os_category}" if os_category else "all_tests"
-        cls._tests_cache[cache_key] = (techniques, time.time())
-
-        return result
-
-    @classmethod
-    async def _fetch_techniques_from_atomics_folder(cls, os_category: Optional[str] = None) -> Dict:
-        """Fetch and parse techniques directly from the Atomic Red Team repository."""
-        # This is a fallback method that fetches the techniques directly from the GitHub API
-        try:
-            async with aiohttp.ClientSession() as session:
-                url = "https://api.github.com/repos/redcanaryco/atomic-red-team/contents/atomics"
-                headers = {"Accept": "application/vnd.github.v3+json"}
-
-                async with session.get(url, headers=headers) as response:
-                    if response.status != 200:
-                        logger.error(f"GitHub API error: {response.status}")
-                        raise HTTPException(status_code=response.status, detail="Could not access Atomic Red Team repository")
-
-                    folders = await response.json()
-
-                    # Filter to only include technique folders (T#### format)
-                    technique_folders = [f for f in folders if f["type"] == "dir" and f["name"].startswith("T")]
-
-                    techniques = []
-                    total_tests = 0
-
-                    # Process each technique folder (limit concurrent requests)
-                    semaphore = asyncio.Semaphore(5)  # Limit to 5 concurrent requests
-
-                    async def process_technique(folder):
-                        nonlocal total_tests
-                        technique_id = folder["name"]
-
-                        async with semaphore:
-                            # Try to get the YAML file that contains test information
-                            yaml_url = f"{GITHUB_RAW_URL}/{technique_id}/{technique_id}.yaml"
-                            md_url = f"{GITHUB_RAW_URL}/{technique_id}/{technique_id}.md"
-
-                            # First try YAML for structured data
-                            async with session.get(yaml_url) as yaml_resp:
-                                if yaml_resp.status == 200:
-                                    yaml_content = await yaml_resp.text()
-                                    try:
-                                        data = yaml.safe_load(yaml_content)
-                                        test_count = len(data.get("atomic_tests", []))
-                                        platforms = set()
-                                        has_prereqs = False
-
-                                        for test in data.get("atomic_tests", []):
-                                            if test.get("supported_platforms"):
-                                                platforms.update(test.get("supported_platforms", []))
-                                            if test.get("dependencies"):
-                                                has_prereqs = True
-
-                                        technique_data = {
-                                            "technique_id": technique_id,
-                                            "technique_name": data.get("display_name", technique_id),
-                                            "test_count": test_count,
-                                            "categories": list(platforms),
-                                            "has_prerequisites": has_prereqs,
-                                        }
-
-                                        # Apply OS category filter if specified
-                                        if os_category:
-                                            os_category_lower = os_category.lower()
-                                            if os_category_lower not in [cat.lower() for cat in platforms]:
-                                                return None  # Skip this technique
-
-                                        total_tests += test_count
-                                        return technique_data
-
-                                    except Exception as e:
-                                        logger.warning(f"Error parsing YAML for {technique_id}: {e}")
-
-                            # Fall back to MD file and extract basic info
-                            async with session.get(md_url) as md_resp:
-                                if md_resp.status == 200:
-                                    md_content = await md_resp.text()
-
-                                    # Extract name from markdown header
-                                    name_match = re.search(r"# ([^\n]+)", md_content)
-                                    name = name_match.group(1) if name_match else technique_id
-
-                                    # Count atomic tests by headers
-                                    test_headers = re.findall(r"## Atomic Test #\d+", md_content)
-                                    test_count = len(test_headers)
-
-                                    # Look for platform indicators
-                                    platforms = []
-                                    if "windows" in md_content.lower():
-                                        platforms.append("windows")
-                                    if "macos" in md_content.lower() or "darwin" in md_content.lower():
-                                        platforms.append("macos")
-                                    if "linux" in md_content.lower():
-                                        platforms.append("linux")
-
-                                    technique_data = {
-                                        "technique_id": technique_id,
-                                        "technique_name": name.replace(f"- {technique_id}", "").strip(),
-                                        "test_count": test_count,
-                                        "categories": platforms,
-                                        "has_prerequisites": "dependency" in md_content.lower() or "dependencies" in md_content.lower(),
-                                    }
-
-                                    # Apply OS category filter if specified
-                                    if os_category:
-                                        os_category_lower = os_category.lower()
-                                        if os_category_lower not in [cat.lower() for cat in platforms]:
-                                            return None  # Skip this technique
-
-                                    total_tests += test_count
-                                    return technique_data
-
-                        # If both methods fail, return basic info
-                        return {
-                            "technique_id": technique_id,
-                            "technique_name": technique_id,
-                            "test_count": 0,
-                            "categories": [],
-                            "has_prerequisites": False,
-                        }
-
-                    # Process all techniques concurrently but with rate limiting
-                    technique_tasks = [process_technique(folder) for folder in technique_folders]
-                    technique_results = await asyncio.gather(*technique_tasks)
-
-                    # Filter out None results and techniques with 0 tests
-                    techniques = [t for t in technique_results if t is not None and t["test_count"] > 0]
-
-                    result = {
-                        "total_techniques": len(techniques),
-                        "total_tests": total_tests,
-                        "tests": techniques,
-                        "last_updated": datetime.utcnow().isoformat(),
-                    }
-
-                    # Cache the result
-                    cache_key = f"all_tests_{os_category}" if os_category else "all_tests"
-                    cls._tests_cache[cache_key] = (techniques, time.time())
-
-                    return result
-
-        except Exception as e:
-            logger.error(f"Error fetching atomic tests from GitHub: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Error listing atomic tests: {str(e)}")
-
     @classmethod
     async def get_technique_markdown(cls, technique_id: str) -> Optional[str]:
         """
@@ -277,6 +69,12 @@ class AtomicRedTeamService:
         Returns:
             The markdown content or None if not found
         """
+        # The local index answers for every technique it has synced
+        if atomic_red_team_index.has_technique(technique_id):
+            return atomic_red_team_index.get_markdown(technique_id)
+        if catalog_snapshots.OFFLINE:
+            return None
+
         # Check the cache first
         if technique_id in cls._cache:
             content, timestamp = cls._cache[technique_id]
@@ -467,11 +265,8 @@ async def search_mitre_techniques_in_alerts(
     logger.info(f"Searching for MITRE techniques in alerts from {time_range} to now")
 
     try:
-        # First get technique data from Wazuh to build ID-name mapping as fallback
+        # ID-name mapping as fallback, and the tactics of each technique, from the reference cache
         technique_mapping = await _build_technique_id_name_mapping()
-        logger.debug(f"Built technique mapping with {len(technique_mapping)} techniques")
-
-        # Now get the tactic information for each technique
         technique_tactic_mapping = await _build_technique_tactic_mapping()
 
         # Log the number of entries in our mappings
@@ -595,43 +390,16 @@ async def search_mitre_techniques_in_alerts(
 
 async def _build_technique_id_name_mapping() -> Dict[str, str]:
     """
-    Build a mapping of MITRE technique IDs to their names.
+    Mapping of MITRE technique IDs to their names, from the MITRE reference cache.
 
     Returns:
-        Dict mapping technique IDs to technique names
+        Dict mapping technique IDs (with and without the 'T' prefix, and Wazuh's
+        internal ids) to technique names; empty if Wazuh could not be reached
     """
     try:
-        # Fetch all techniques from Wazuh
-        techniques_response = await get_mitre_techniques(limit=1000)
-
-        # Create mapping from ID to name
-        technique_mapping = {}
-        if techniques_response and hasattr(techniques_response, "success") and techniques_response.success:
-            # Debug the response structure
-            logger.debug(f"Techniques response type: {type(techniques_response)}")
-
-            if hasattr(techniques_response, "results"):
-                techniques = techniques_response.results
-                logger.debug(f"Got {len(techniques)} techniques, first item type: {type(techniques[0]) if techniques else 'None'}")
-
-                for technique in techniques:
-                    # Check if it's a dictionary or an object with attributes
-                    if isinstance(technique, dict):
-                        technique_id = technique.get("id", "")
-                        technique_name = technique.get("name", technique_id)
-                    else:
-                        # Try direct attribute access for Pydantic models
-                        technique_id = getattr(technique, "id", "")
-                        technique_name = getattr(technique, "name", technique_id)
-
-                    if technique_id:
-                        technique_mapping[technique_id] = technique_name
-
-                        # Sometimes the ID might be referenced without the 'T' prefix
-                        if technique_id.startswith("T"):
-                            technique_mapping[technique_id[1:]] = technique_name
-
-            logger.info(f"Built mapping for {len(technique_mapping)} MITRE techniques")
+        await mitre_reference_cache.ensure_loaded()
+        technique_mapping = mitre_reference_cache.technique_names()
+        logger.debug(f"Using cached mapping for {len(technique_mapping)} MITRE technique ids")
         return technique_mapping
 
     except Exception as e:
@@ -641,77 +409,15 @@ async def _build_technique_id_name_mapping() -> Dict[str, str]:
 
 async def _build_technique_tactic_mapping() -> Dict[str, List[Dict[str, str]]]:
     """
-    Build a mapping of MITRE technique IDs to their associated tactics.
+    Mapping of MITRE technique IDs to their associated tactics, from the MITRE reference cache.
 
     Returns:
         Dict mapping technique IDs to lists of tactic information
     """
     try:
-        # Fetch all techniques from Wazuh
-        techniques_response = await get_mitre_techniques(limit=1000)
-
-        # Create mapping from ID to tactics
-        technique_tactic_mapping = {}
-        if hasattr(techniques_response, "success") and techniques_response.success:
-            techniques = techniques_response.results
-
-            # Get all tactics for name lookup
-            tactics_response = await get_mitre_tactics(limit=1000)
-            tactic_name_mapping = {}
-
-            if hasattr(tactics_response, "success") and tactics_response.success:
-                for tactic in tactics_response.results:
-                    if isinstance(tactic, dict):
-                        tactic_id = tactic.get("id", "")
-                        tactic_name = tactic.get("name", "")
-                        short_name = tactic.get("short_name", "")
-                    else:
-                        tactic_id = getattr(tactic, "id", "")
-                        tactic_name = getattr(tactic, "name", "")
-                        short_name = getattr(tactic, "short_name", "")
-
-                    if tactic_id:
-                        tactic_name_mapping[tactic_id] = {"name": tactic_name, "short_name": short_name}
-
-            logger.debug(f"Built tactic name mapping with {len(tactic_name_mapping)} tactics")
-
-            # Map techniques to tactics with names
-            for technique in techniques:
-                if isinstance(technique, dict):
-                    technique_id = technique.get("id", "")
-                    technique_external_id = technique.get("external_id", "")
-                    tactic_ids = technique.get("tactics", [])
-                else:
-                    technique_id = getattr(technique, "id", "")
-                    technique_external_id = getattr(technique, "external_id", "")
-                    tactic_ids = getattr(technique, "tactics", [])
-
-                if technique_id:
-                    tactics = []
-                    for tactic_id in tactic_ids:
-                        tactic_info = {
-                            "id": tactic_id,
-                            "name": tactic_name_mapping.get(tactic_id, {}).get("name", "Unknown"),
-                            "short_name": tactic_name_mapping.get(tactic_id, {}).get("short_name", ""),
-                        }
-                        tactics.append(tactic_info)
-
-                    # Store with multiple key formats for more robust matching
-                    if technique_external_id:
-                        # Store as "T1234"
-                        technique_tactic_mapping[technique_external_id] = tactics
-                        # Store as "1234" (without T prefix)
-                        if technique_external_id.startswith("T"):
-                            technique_tactic_mapping[technique_external_id[1:]] = tactics
-
-                    technique_tactic_mapping[technique_id] = tactics
-
-            # Debug log some sample mappings
-            sample_keys = list(technique_tactic_mapping.keys())[:5]
-            logger.debug(f"Sample technique ID keys in mapping: {sample_keys}")
-
-            logger.info(f"Built mapping for {len(technique_tactic_mapping)} techniques with tactics")
-
+        await mitre_reference_cache.ensure_loaded()
+        technique_tactic_mapping = mitre_reference_cache.technique_tactics()
+        logger.debug(f"Using cached tactic mapping for {len(technique_tactic_mapping)} MITRE technique ids")
         return technique_tactic_mapping
     except Exception as e:
         logger.exception(f"Error building technique-tactic mapping: {str(e)}")
@@ -0,0 +1,324 @@
+"""MITRE ATT&CK reference data from the Wazuh Manager, loaded once and kept warm.
+
+Every `search_mitre_techniques_in_alerts` and `get_alerts_by_mitre_id` call
+used to rebuild its id→name and technique→tactic mappings from scratch: a
+``GET /mitre/techniques?limit=1000`` for each mapping plus a
+``GET /mitre/tactics``, all before the indexer query could start. The MITRE
+heatmap paid for two large Wazuh API calls on every load, for reference data
+that changes only when the Wazuh Manager is upgraded.
+
+`MitreReferenceCache` holds that data instead:
+
+* **One load, on a schedule.** Techniques, tactics, groups, software and
+  mitigations are paged in from the Wazuh API (`PAGE_SIZE` items a call) by the
+  ``refresh_mitre_reference`` job and at startup, and kept for
+  `CACHE_TTL_HOURS`. Like the Detections Catalog caches it is snapshotted to
+  disk (see ``catalog_snapshots``), so a restart does not reload it either.
+* **Precompiled, id-keyed.** Wazuh relates objects by internal STIX id
+  (``attack-pattern--…``) while alerts carry ATT&CK ids (``T1059.001``). Each
+  load compiles one compact record per technique — name, tactics, parent
+  technique and the groups, software and mitigations that reference it, all by
+  ATT&CK id — and the two lookup tables the alert searches use, keyed by every
+  spelling they accept (``T1059``, ``1059`` and the internal id).
+* **Shared.** The mapping builders in ``mitre.py`` return the precompiled
+  tables, the unfiltered MITRE list endpoints are paged from the cache, and the
+  case-template suggestion scorer reads technique names from it.
+* **Never in the way.** Requests only wait when nothing has been loaded yet;
+  a stale cache is served while it refreshes in the background. A failed load
+  keeps what was there and is not retried for `RETRY_MINUTES`, so a Wazuh
+  outage costs one timeout per retry window rather than one per request.
+"""
+
+import asyncio
+import os
+from datetime import datetime
+from datetime import timedelta
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from loguru import logger
+
+from app.integrations.copilot_searches.services.cache_support import (
+    BackgroundRefreshMixin,
+)
+
+
+def _env_number(name: str, default: float) -> float:
+    raw = os.getenv(name, str(default))
+    try:
+        value = float(raw)
+    except ValueError:
+        logger.warning(f"{name}={raw!r} is not a number; falling back to {default}")
+        return default
+    return value if value > 0 else default
+
+
+#: ATT&CK data changes with Wazuh Manager upgrades, not during the day.
+CACHE_TTL_HOURS = _env_number("MITRE_REFERENCE_TTL_HOURS", 24.0)
+
+#: How long a failed load is served (or left empty) before it is retried.
+RETRY_MINUTES = _env_number("MITRE_REFERENCE_RETRY_MINUTES", 5.0)
+
+#: What the Wazuh API returns when a request gives no ``limit``.
+DEFAULT_LIMIT = 500
+
+#: Items per call while loading; the page size Wazuh's API documentation recommends.
+PAGE_SIZE = 500
+
+KINDS = ("tactics", "techniques", "groups", "software", "mitigations")
+
+#: Kinds whose items name the techniques they relate to.
+_RELATED_KINDS = ("groups", "software", "mitigations")
+
+
+def _technique_keys(technique: Dict[str, Any]) -> List[str]:
+    """Every spelling an alert or a caller may use for this technique."""
+    keys = []
+    external_id = technique.get("external_id")
+    if external_id:
+        keys.append(external_id)
+        if external_id.startswith("T"):
+            keys.append(external_id[1:])
+    if technique.get("id"):
+        keys.append(technique["id"])
+    return keys
+
+
+class MitreReferenceCache(BackgroundRefreshMixin):
+    """
+    The Wazuh Manager's MITRE ATT&CK objects, with precompiled id-keyed
+    lookups. All accessors are synchronous reads of the last load.
+    """
+
+    snapshot_name = "wazuh_mitre_reference"
+
+    def __init__(self) -> None:
+        # kind -> the Wazuh API items, in the API's default order
+        self._items: Dict[str, List[Dict[str, Any]]] = {kind: [] for kind in KINDS}
+        self._last_refresh: Optional[datetime] = None
+        self._failed_at: Optional[datetime] = None
+        self._unavailable_reason: Optional[str] = None
+        self._lock = asyncio.Lock()
+        self._refreshes = 0
+        self._failures = 0
+        self._page_hits = 0
+        self._compile()
+
+    # ---- introspection ----------------------------------------------------
+
+    @property
+    def is_loaded(self) -> bool:
+        return bool(self._items["techniques"])
+
+    @property
+    def is_stale(self) -> bool:
+        now = datetime.utcnow()
+        if self._failed_at is not None and now - self._failed_at < timedelta(minutes=RETRY_MINUTES):
+            return False
+        if self._last_refresh is None:
+            return True
+        return now - self._last_refresh > timedelta(hours=CACHE_TTL_HOURS)
+
+    @property
+    def last_refresh(self) -> Optional[datetime]:
+        return self._last_refresh
+
+    @property
+    def unavailable_reason(self) -> Optional[str]:
+        return self._unavailable_reason
+
+    # ---- loading ----------------------------------------------------------
+
+    async def ensure_loaded(self) -> None:
+        """Load if nothing is cached; otherwise refresh a stale cache in the background. Never raises."""
+        await self.load_snapshot()
+        if not self.is_stale:
+            return
+        if self.is_loaded:
+            self.schedule_background_refresh()
+        else:
+            await self.refresh()
+
+    async def refresh(self) -> int:
+        """
+        Reload every kind from the Wazuh API and recompile the lookups.
+
+        Returns the number of techniques held. Never raises: on failure the
+        previous data is kept and ``unavailable_reason`` says why.
+        """
+        # Imported here because mitre.py imports this module for its mapping builders.
+        from app.connectors.wazuh_manager.services import mitre as mitre_service
+
+        fetchers = {
+            "tactics": mitre_service.get_mitre_tactics,
+            "techniques": mitre_service.get_mitre_techniques,
+            "groups": mitre_service.get_mitre_groups,
+            "software": mitre_service.get_mitre_software,
+            "mitigations": mitre_service.get_mitre_mitigations,
+        }
+        async with self._lock:
+            await self._load_snapshot_locked()
+            try:
+                # One kind after another: this runs off the request path, and
+                # the Wazuh API is shared with everything else.
+                pages = [await _fetch_all(fetchers[kind]) for kind in KINDS]
+            except Exception as exc:  # noqa: BLE001 — the mappings degrade to empty, as they always have
+                self._failures += 1
+                self._failed_at = datetime.utcnow()
+                self._unavailable_reason = str(getattr(exc, "detail", None) or exc) or exc.__class__.__name__
+                logger.warning(f"Could not load MITRE reference data from Wazuh: {self._unavailable_reason}. Keeping the previous data.")
+                return len(self._items["techniques"])
+
+            self._items = dict(zip(KINDS, pages))
+            self._compile()
+            self._refreshes += 1
+            self._failed_at = None
+            self._unavailable_reason = None
+            self._last_refresh = datetime.utcnow()
+            logger.info(
+                "Loaded MITRE reference data from Wazuh: " + ", ".join(f"{len(self._items[kind])} {kind}" for kind in KINDS),
+            )
+
+        await self.save_snapshot()
+        return len(self._items["techniques"])
+
+    def _snapshot_state(self) -> Dict[str, Any]:
+        return {"items": self._items}
+
+    def _restore_snapshot(self, state: Dict[str, Any]) -> None:
+        self._items = {kind: list(state["items"][kind]) for kind in KINDS}
+        self._compile()
+
+    def _compile(self) -> None:
+        """Build the id-keyed lookups from ``_items``."""
+        external_ids = {item["id"]: item["external_id"] for kind in KINDS for item in self._items[kind] if item.get("external_id")}
+        tactics = {tactic["id"]: tactic for tactic in self._items["tactics"]}
+
+        records: Dict[str, Dict[str, Any]] = {}
+        aliases: Dict[str, str] = {}
+        names: Dict[str, str] = {}
+        technique_tactics: Dict[str, List[Dict[str, str]]] = {}
+        for technique in self._items["techniques"]:
+            tactic_info = [
+                {
+                    "id": tactic_id,
+                    "name": tactics.get(tactic_id, {}).get("name", "Unknown"),
+                    "short_name": tactics.get(tactic_id, {}).get("short_name", ""),
+                }
+                for tactic_id in technique.get("tactics") or []
+            ]
+            for key in _technique_keys(technique):
+                names[key] = technique["name"]
+                technique_tactics[key] = tactic_info
+
+            external_id = technique.get("external_id")
+            if not external_id:
+                continue
+            parent = technique.get("subtechnique_of")
+            records[external_id] = {
+                "id": external_id,
+                "name": technique["name"],
+                "tactics": [tactic["name"] for tactic in tactic_info],
+                "parent": external_ids.get(parent, parent) if parent else None,
+                **{kind: [] for kind in _RELATED_KINDS},
+            }
+            for key in _technique_keys(technique):
+                aliases[key] = external_id
+
+        for kind in _RELATED_KINDS:
+            for item in self._items[kind]:
+                for technique_id in item.get("techniques") or []:
+                    record = records.get(aliases.get(technique_id, ""))
+                    if record is not None and item.get("external_id"):
+                        record[kind].append(item["external_id"])
+
+        self._records = records
+        self._aliases = aliases
+        self._technique_names = names
+        self._technique_tactics = technique_tactics
+
+    # ---- accessors --------------------------------------------------------
+
+    def technique_names(self) -> Dict[str, str]:
+        """Technique id (``T1059``, ``1059`` or internal id) → name. Shared; do not mutate."""
+        return self._technique_names
+
+    def technique_tactics(self) -> Dict[str, List[Dict[str, str]]]:
+        """Technique id (same spellings) → its tactics' ``id``/``name``/``short_name``. Shared; do not mutate."""
+        return self._technique_tactics
+
+    def technique(self, technique_id: str) -> Optional[Dict[str, Any]]:
+        """The compiled record for a technique: name, tactics, parent and related ATT&CK ids."""
+        external_id = self._aliases.get(technique_id.strip()) or self._aliases.get(technique_id.strip().upper())
+        return self._records.get(external_id) if external_id else None
+
+    def parent_of(self, technique_id: str) -> Optional[str]:
+        record = self.technique(technique_id)
+        return record["parent"] if record else None
+
+    def names_for(self, technique_ids: Iterable[str]) -> List[str]:
+        """Names of the known techniques among ``technique_ids``, in sorted-id order."""
+        return [record["name"] for record in (self.technique(t) for t in sorted(technique_ids)) if record]
+
+    def page(self, kind: str, limit: Optional[int] = None, offset: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """``(items, total)`` for an unfiltered listing, paged the way the Wazuh API pages it."""
+        self._page_hits += 1
+        items = self._items[kind]
+        start = offset or 0
+        return items[start : start + (DEFAULT_LIMIT if limit is None else limit)], len(items)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **{kind: len(self._items[kind]) for kind in KINDS},
+            "last_refresh": self._last_refresh.isoformat() if self._last_refresh else None,
+            "stale": self.is_stale,
+            "refreshes": self._refreshes,
+            "failures": self._failures,
+            "page_hits": self._page_hits,
+            "unavailable_reason": self._unavailable_reason,
+        }
+
+    def reset_stats(self) -> None:
+        self._refreshes = self._failures = self._page_hits = 0
+
+
+async def _fetch_all(fetch) -> List[Dict[str, Any]]:
+    """Page through one MITRE endpoint; the fetchers raise on any API error."""
+    items: List[Dict[str, Any]] = []
+    while True:
+        response = await fetch(limit=PAGE_SIZE, offset=len(items))
+        page = [item.model_dump() for item in response.results]
+        items.extend(page)
+        if len(page) < PAGE_SIZE:
+            return items
+
+
+async def cached_page(kind: str, limit: Optional[int], offset: Optional[int], *filters: Any) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+    """
+    Serve a MITRE list endpoint from the cache when it can answer exactly.
+
+    Only unfiltered listings qualify — ``select``, ``sort``, ``search`` and
+    ``q`` are Wazuh's to evaluate — and only once the cache has loaded. Returns
+    None when the caller should ask Wazuh.
+    """
+    if any(filters):
+        return None
+    await mitre_reference_cache.ensure_fresh_nonblocking()
+    if not mitre_reference_cache.is_loaded:
+        return None
+    return mitre_reference_cache.page(kind, limit, offset)
+
+
+def stats() -> Dict[str, Any]:
+    return mitre_reference_cache.stats()
+
+
+def reset_stats() -> None:
+    mitre_reference_cache.reset_stats()
+
+
+mitre_reference_cache = MitreReferenceCache()
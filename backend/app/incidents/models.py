@@ -3,6 +3,7 @@ from typing import Dict
 from typing import List
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlalchemy import PrimaryKeyConstraint
 from sqlmodel import JSON
 from sqlmodel import Column
@@ -33,15 +34,31 @@ class AlertToIoC(SQLModel, table=True):
 
 class Alert(SQLModel, table=True):
     __tablename__ = "incident_management_alert"
+    __table_args__ = (
+        # Alert ingest's "is there an open alert with this title?" check, once per event.
+        Index("ix_incident_management_alert_dedup_key_status", "dedup_key", "status"),
+        # The per-customer OPEN / IN_PROGRESS / CLOSED lists and counters.
+        Index("ix_incident_management_alert_customer_code_status", "customer_code", "status"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     alert_name: str = Field(sa_column=Column(Text, nullable=False))
     alert_description: str = Field(sa_column=Column(Text, nullable=False))
     status: str = Field(max_length=50, nullable=False)
-    alert_creation_time: datetime = Field(default_factory=datetime.utcnow)
+    # Indexed for the listings' (alert_creation_time, id) keyset; InnoDB secondary
+    # indexes carry the primary key, so this one index serves the whole key.
+    alert_creation_time: datetime = Field(default_factory=datetime.utcnow, index=True)
     customer_code: str = Field(max_length=50, nullable=False)
     time_closed: Optional[datetime] = Field(default=None)
     source: str = Field(max_length=50, nullable=False)
 
+    # SHA-256 hex of (customer_code, normalised alert_name): see `alert_dedup_key`.
+    #
+    # Exists only so ingest can find the customer's open alert with a title without
+    # scanning — `alert_name` is TEXT and cannot be indexed usefully. Set at creation
+    # and never updated, since neither input changes. NULL only on rows written by
+    # something that bypasses the two creation paths.
+    dedup_key: Optional[str] = Field(default=None, max_length=64, nullable=True)
+
     # How serious this alert is: Critical | High | Medium | Low | Informational.
     #
     # NULL means "the source did not tell us" — not "unimportant". Wazuh alerts
@@ -205,6 +222,10 @@ class CaseComment(SQLModel, table=True):
 
 class Case(SQLModel, table=True):
     __tablename__ = "incident_management_case"
+    __table_args__ = (
+        # The per-customer status counts on the case list and portal dashboard.
+        Index("ix_incident_management_case_customer_code_case_status", "customer_code", "case_status"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     case_name: str = Field(max_length=10000, nullable=False)
     case_description: str = Field(sa_column=Text)
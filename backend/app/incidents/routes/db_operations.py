@@ -113,6 +113,7 @@ from app.incidents.schema.db_operations import VerdictStatsResponse
 from app.incidents.schema.db_operations import VerdictTrendPoint
 from app.incidents.schema.incident_alert import CreatedAlertPayload
 from app.incidents.schema.incident_alert import CreatedCaseNotificationPayload
+from app.incidents.services import reference_cache
 from app.incidents.services.alert_severity import severity_of
 
 # from app.incidents.services.db_operations import list_alerts
@@ -124,11 +125,11 @@ from app.incidents.services.db_operations import add_asset_name
 from app.incidents.services.db_operations import add_field_name
 from app.incidents.services.db_operations import add_ioc_name
 from app.incidents.services.db_operations import add_timefield_name
+from app.incidents.services.db_operations import alert_status_counts_for_user
 from app.incidents.services.db_operations import alert_total
 from app.incidents.services.db_operations import alert_total_by_alert_title
 from app.incidents.services.db_operations import alert_total_by_assest_name
 from app.incidents.services.db_operations import alert_total_by_customer_codes
-from app.incidents.services.db_operations import alert_total_for_user
 from app.incidents.services.db_operations import alerts_closed
 from app.incidents.services.db_operations import alerts_closed_by_alert_title
 from app.incidents.services.db_operations import alerts_closed_by_asset_name
@@ -138,7 +139,6 @@ from app.incidents.services.db_operations import alerts_closed_by_customer_codes
 from app.incidents.services.db_operations import alerts_closed_by_ioc
 from app.incidents.services.db_operations import alerts_closed_by_source
 from app.incidents.services.db_operations import alerts_closed_by_tag
-from app.incidents.services.db_operations import alerts_closed_for_user
 from app.incidents.services.db_operations import alerts_in_progress
 from app.incidents.services.db_operations import alerts_in_progress_by_alert_title
 from app.incidents.services.db_operations import alerts_in_progress_by_assest_name
@@ -148,7 +148,6 @@ from app.incidents.services.db_operations import alerts_in_progress_by_customer_
 from app.incidents.services.db_operations import alerts_in_progress_by_ioc
 from app.incidents.services.db_operations import alerts_in_progress_by_source
 from app.incidents.services.db_operations import alerts_in_progress_by_tag
-from app.incidents.services.db_operations import alerts_in_progress_for_user
 from app.incidents.services.db_operations import alerts_open
 from app.incidents.services.db_operations import alerts_open_by_alert_title
 from app.incidents.services.db_operations import alerts_open_by_assest_name
@@ -158,7 +157,6 @@ from app.incidents.services.db_operations import alerts_open_by_customer_codes
 from app.incidents.services.db_operations import alerts_open_by_ioc
 from app.incidents.services.db_operations import alerts_open_by_source
 from app.incidents.services.db_operations import alerts_open_by_tag
-from app.incidents.services.db_operations import alerts_open_for_user
 from app.incidents.services.db_operations import alerts_total_by_assigned_to
 from app.incidents.services.db_operations import alerts_total_by_customer_code
 from app.incidents.services.db_operations import alerts_total_by_ioc
@@ -166,10 +164,7 @@ from app.incidents.services.db_operations import alerts_total_by_source
 from app.incidents.services.db_operations import alerts_total_by_tag
 from app.incidents.services.db_operations import alerts_total_multiple_filters
 from app.incidents.services.db_operations import case_alert_unlink
-from app.incidents.services.db_operations import case_total_for_user
-from app.incidents.services.db_operations import cases_closed_for_user
-from app.incidents.services.db_operations import cases_in_progress_for_user
-from app.incidents.services.db_operations import cases_open_for_user
+from app.incidents.services.db_operations import case_status_counts_for_user
 from app.incidents.services.db_operations import create_alert
 from app.incidents.services.db_operations import create_alert_context
 from app.incidents.services.db_operations import create_alert_ioc
@@ -220,7 +215,6 @@ from app.incidents.services.db_operations import list_alerts_by_ioc
 from app.incidents.services.db_operations import list_alerts_by_source
 from app.incidents.services.db_operations import list_alerts_by_tag
 from app.incidents.services.db_operations import list_alerts_by_title
-from app.incidents.services.db_operations import list_alerts_for_user
 from app.incidents.services.db_operations import list_alerts_multiple_filters
 from app.incidents.services.db_operations import list_all_files
 from app.incidents.services.db_operations import list_cases_by_asset_name
@@ -230,6 +224,9 @@ from app.incidents.services.db_operations import list_cases_by_name
 from app.incidents.services.db_operations import list_cases_by_status
 from app.incidents.services.db_operations import list_cases_for_user
 from app.incidents.services.db_operations import list_files_by_case_id
+from app.incidents.services.db_operations import page_alerts_for_user
+from app.incidents.services.db_operations import page_alerts_multiple_filters
+from app.incidents.services.db_operations import page_cases_for_user
 from app.incidents.services.db_operations import put_customer_ai_trigger
 from app.incidents.services.db_operations import put_customer_notification
 from app.incidents.services.db_operations import replace_alert_title_name
@@ -427,6 +424,7 @@ async def delete_configured_source(source: str, session: AsyncSession = Depends(
     logger.info(f"Field names and asset names deleted successfully for source {source}. Committing changes to the database")
 
     await session.commit()
+    reference_cache.invalidate("field_names", source)
 
     return {"message": f"Configured source {source} deleted successfully", "success": True}
 
@@ -481,6 +479,7 @@ async def create_wazuh_fields_and_assets(names: FieldAndAssetNames, session: Asy
     logger.info(f"Field names, asset names, and timefield name created successfully for source {names.source}")
 
     await session.commit()
+    reference_cache.invalidate("field_names", names.source)
 
     return {"message": "Field names and asset names created successfully", "success": True}
 
@@ -523,6 +522,7 @@ async def delete_wazuh_fields_and_assets(names: FieldAndAssetNames, session: Asy
             await delete_ioc_name(ioc_value=ioc_name, source=names.source, session=session)
     logger.info(f"Field names and asset names deleted successfully for source {names.source}. Committing changes to the database")
     await session.commit()
+    reference_cache.invalidate("field_names", names.source)
 
     return {"message": "Field names and asset names deleted successfully", "success": True}
 
@@ -1432,6 +1432,8 @@ async def list_alerts_endpoint(
     page: int = Query(1, ge=1),
     page_size: int = Query(25, ge=1),
     order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None, description="`next_cursor` from the previous response; when given, `page` is ignored"),
+    sort_by: str = Query("id", pattern="^(id|alert_creation_time)$", description="Sort key: id, or alert_creation_time then id"),
     customer_codes: Optional[List[str]] = Query(None, description="Optional subset of customer codes to scope the results to"),
     current_user: User = Depends(AuthHandler().get_current_user),
     db: AsyncSession = Depends(get_db),
@@ -1439,20 +1441,24 @@ async def list_alerts_endpoint(
     """List alerts with automatic customer and tag filtering"""
     logger.info(f"Listing alerts for user: {current_user.username} with role_id: {current_user.role_id}")
 
-    alerts = await list_alerts_for_user(current_user, db, page, page_size, order, customer_codes=customer_codes)
+    alerts, next_cursor = await page_alerts_for_user(
+        current_user,
+        db,
+        page,
+        page_size,
+        order,
+        customer_codes=customer_codes,
+        cursor=cursor,
+        sort_by=sort_by,
+    )
 
     # Get totals with both customer and tag filtering
-    total = await alert_total_for_user(current_user, db, customer_codes=customer_codes)
-    open_alerts = await alerts_open_for_user(current_user, db, customer_codes=customer_codes)
-    in_progress = await alerts_in_progress_for_user(current_user, db, customer_codes=customer_codes)
-    closed = await alerts_closed_for_user(current_user, db, customer_codes=customer_codes)
+    counts = await alert_status_counts_for_user(current_user, db, customer_codes=customer_codes)
 
     return AlertOutResponse(
         alerts=alerts,
-        total=total,
-        open=open_alerts,
-        in_progress=in_progress,
-        closed=closed,
+        **counts,
+        next_cursor=next_cursor,
         success=True,
         message="Alerts retrieved successfully",
     )
@@ -1938,6 +1944,8 @@ async def list_alerts_multiple_filters_endpoint(
     page: int = Query(1, ge=1),
     page_size: int = Query(25, ge=1),
     order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None, description="`next_cursor` from the previous response; when given, `page` is ignored"),
+    sort_by: str = Query("id", pattern="^(id|alert_creation_time)$", description="Sort key: id, or alert_creation_time then id"),
     current_user: User = Depends(AuthHandler().get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -1956,10 +1964,7 @@ async def list_alerts_multiple_filters_endpoint(
         return AlertOutResponse(
             alerts=[],
             total_filtered=0,
-            open=await alerts_open_for_user(current_user, db),
-            in_progress=await alerts_in_progress_for_user(current_user, db),
-            closed=await alerts_closed_for_user(current_user, db),
-            total=await alert_total_for_user(current_user, db),
+            **await alert_status_counts_for_user(current_user, db),
             success=True,
             message="No alerts found for the requested customers",
         )
@@ -1968,7 +1973,7 @@ async def list_alerts_multiple_filters_endpoint(
     scoped_customers = None if "*" in effective_customers else effective_customers
 
     # Pass user for tag filtering
-    alerts = await list_alerts_multiple_filters(
+    alerts, next_cursor = await page_alerts_multiple_filters(
         assigned_to=assigned_to,
         alert_title=alert_title,
         source=source,
@@ -1984,13 +1989,12 @@ async def list_alerts_multiple_filters_endpoint(
         order=order,
         customer_codes=scoped_customers,
         user=current_user,  # Pass user for tag filtering
+        cursor=cursor,
+        sort_by=sort_by,
     )
 
     # Get totals with both customer and tag filtering
-    total = await alert_total_for_user(current_user, db)
-    open_alerts = await alerts_open_for_user(current_user, db)
-    in_progress = await alerts_in_progress_for_user(current_user, db)
-    closed = await alerts_closed_for_user(current_user, db)
+    counts = await alert_status_counts_for_user(current_user, db)
 
     # Get filtered total
     total_filtered = await alerts_total_multiple_filters(
@@ -2010,10 +2014,8 @@ async def list_alerts_multiple_filters_endpoint(
     return AlertOutResponse(
         alerts=alerts,
         total_filtered=total_filtered,
-        open=open_alerts,
-        in_progress=in_progress,
-        closed=closed,
-        total=total,
+        **counts,
+        next_cursor=next_cursor,
         success=True,
         message="Alerts retrieved successfully",
     )
@@ -2028,6 +2030,7 @@ async def list_cases_endpoint(
     page: int = Query(1, ge=1),
     page_size: int = Query(25, ge=1),
     order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None, description="`next_cursor` from the previous response; when given, `page` is ignored"),
     customer_codes: Optional[List[str]] = Query(None, description="Optional subset of customer codes to scope the results to"),
     current_user: User = Depends(AuthHandler().get_current_user),
     db: AsyncSession = Depends(get_db),
@@ -2035,19 +2038,14 @@ async def list_cases_endpoint(
     """List cases with automatic customer filtering and pagination"""
     logger.info(f"Listing cases for user: {current_user.username} with role_id: {current_user.role_id}")
 
-    cases = await list_cases_for_user(current_user, db, page, page_size, order, customer_codes=customer_codes)
+    cases, next_cursor = await page_cases_for_user(current_user, db, page, page_size, order, customer_codes=customer_codes, cursor=cursor)
 
-    total = await case_total_for_user(current_user, db, customer_codes=customer_codes)
-    open_cases = await cases_open_for_user(current_user, db, customer_codes=customer_codes)
-    in_progress = await cases_in_progress_for_user(current_user, db, customer_codes=customer_codes)
-    closed = await cases_closed_for_user(current_user, db, customer_codes=customer_codes)
+    counts = await case_status_counts_for_user(current_user, db, customer_codes=customer_codes)
 
     return CaseOutResponse(
         cases=cases,
-        total=total,
-        open=open_cases,
-        in_progress=in_progress,
-        closed=closed,
+        **counts,
+        next_cursor=next_cursor,
         success=True,
         message="Cases retrieved successfully",
     )
@@ -2415,17 +2413,11 @@ async def list_cases_by_status_endpoint(
         all_user_cases = await list_cases_for_user(current_user, db, page, page_size, order, customer_codes=customer_codes)
         cases = [case for case in all_user_cases if case.case_status == status.value]
 
-    total = await case_total_for_user(current_user, db, customer_codes=customer_codes)
-    open_cases = await cases_open_for_user(current_user, db, customer_codes=customer_codes)
-    in_progress = await cases_in_progress_for_user(current_user, db, customer_codes=customer_codes)
-    closed = await cases_closed_for_user(current_user, db, customer_codes=customer_codes)
+    counts = await case_status_counts_for_user(current_user, db, customer_codes=customer_codes)
 
     return CaseOutResponse(
         cases=cases,
-        total=total,
-        open=open_cases,
-        in_progress=in_progress,
-        closed=closed,
+        **counts,
         success=True,
         message="Cases retrieved successfully",
     )
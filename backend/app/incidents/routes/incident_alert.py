@@ -7,7 +7,6 @@ from fastapi import HTTPException
 from fastapi import Query
 from fastapi import Security
 from loguru import logger
-from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.active_response.routes.graylog import verify_graylog_header
@@ -29,11 +28,9 @@ from app.incidents.schema.velo_sigma import VeloSigmaExclusionCreate
 from app.incidents.schema.velo_sigma import VeloSigmaExclusionListResponse
 from app.incidents.schema.velo_sigma import VeloSigmaExclusionUpdate
 from app.incidents.schema.velo_sigma import VeloSigmaExlcusionRouteResponse
-from app.incidents.services.alert_collection import add_copilot_alert_id
 from app.incidents.services.alert_collection import get_alerts_not_created_in_copilot
 from app.incidents.services.alert_collection import get_graylog_event_indices
-from app.incidents.services.alert_collection import get_original_alert_id
-from app.incidents.services.alert_collection import get_original_alert_index_name
+from app.incidents.services.alert_ingest import run_auto_alert_creation
 from app.incidents.services.incident_alert import add_alert_to_document
 from app.incidents.services.incident_alert import create_alert
 from app.incidents.services.incident_alert import create_alert_full
@@ -244,103 +241,17 @@ async def create_alert_auto_route(
 
     Processing is done in batches to prevent memory issues with large numbers of alerts.
     The scheduler will call this endpoint multiple times until all alerts are processed.
+    Each batch is hydrated in bulk, created with bounded concurrency and written back
+    in one bulk request; see `app/incidents/services/alert_ingest.py`.
 
     Args:
-        batch_size: Number of alerts to process per batch (default 100, max 500)
-        max_batches: Maximum number of batches to process in one scheduler run (default 10, max 50)
-        session (AsyncSession): The database session.
+        session (AsyncSession): The database session. Unused: each concurrent create
+            takes its own session, since one session cannot be shared between them.
 
     Returns:
         AutoCreateAlertResponse: The response object containing the result of the alert creation.
     """
-    batch_size = 100  # Number of alerts to process per batch
-    max_batches = 10  # Maximum number of batches to process in one scheduler run
-
-    total_created = 0
-    total_failed = 0
-    batches_processed = 0
-
-    logger.info(f"Starting auto alert creation with batch_size={batch_size}, max_batches={max_batches}")
-
-    for batch_num in range(max_batches):
-        # Fetch the next batch
-        alerts_payload, total_remaining = await get_alerts_not_created_in_copilot(batch_size=batch_size)
-
-        if len(alerts_payload.alerts) == 0:
-            logger.info(f"No more alerts to process after {batches_processed} batches")
-            break
-
-        logger.info(f"Processing batch {batch_num + 1}/{max_batches}: {len(alerts_payload.alerts)} alerts.)")
-        logger.info(f"Total remaining alerts after this batch: {total_remaining}")
-
-        # Process this batch
-        batch_created = 0
-        batch_failed = 0
-
-        for alert in alerts_payload.alerts:
-            try:
-                create_alert_request = CreateAlertRequest(
-                    index_name=await get_original_alert_index_name(origin_context=alert.source.origin_context),
-                    alert_id=await get_original_alert_id(alert.source.origin_context),
-                )
-
-                alert_id = await create_alert(create_alert_request, session)
-
-                # Add the CoPilot alert ID to Graylog event index
-                await add_copilot_alert_id(index_data=CreateAlertRequest(index_name=alert.index, alert_id=alert.id), alert_id=alert_id)
-
-                batch_created += 1
-                total_created += 1
-
-            except ValidationError as e:
-                # Pydantic validation failure — log per-field detail so a misshapen
-                # index document is fast to diagnose (which field, what was provided,
-                # which constraint failed).
-                logger.error(
-                    f"Failed to create alert {alert.id} from index {alert.index}: "
-                    f"Pydantic validation failed in {len(e.errors())} field(s)",
-                )
-                for err in e.errors():
-                    loc = ".".join(str(x) for x in err.get("loc", ()))
-                    inp = err.get("input", "<not captured>")
-                    inp_repr = repr(inp)[:200]  # truncate verbose inputs
-                    logger.error(
-                        f"  field={loc} type={err.get('type')} msg={err.get('msg')} input={inp_repr}",
-                    )
-                batch_failed += 1
-                total_failed += 1
-            except Exception as e:
-                # Any other error — preserve the full traceback so the source line
-                # of the failure is in the log, not just the message.
-                logger.opt(exception=True).error(
-                    f"Failed to create alert {alert.id} from index {alert.index}: " f"{type(e).__name__}: {e}",
-                )
-                batch_failed += 1
-                total_failed += 1
-
-        batches_processed += 1
-        logger.info(f"Batch {batch_num + 1} complete: {batch_created} created, {batch_failed} failed")
-
-        # If we processed fewer alerts than the batch size, we're done
-        if len(alerts_payload.alerts) < batch_size:
-            logger.info("Processed final batch (fewer alerts than batch size)")
-            break
-
-    message = f"Processed {batches_processed} batches: {total_created} alerts created, {total_failed} failed"
-
-    if total_remaining > 0:
-        message += f". {total_remaining} alerts remaining for next run"
-
-    logger.info(message)
-
-    return AutoCreateAlertResponse(
-        success=True,
-        message=message,
-        alerts_created=total_created,
-        alerts_failed=total_failed,
-        batches_processed=batches_processed,
-        alerts_remaining=max(0, total_remaining - len(alerts_payload.alerts)) if batches_processed < max_batches else total_remaining,
-    )
+    return await run_auto_alert_creation()
 
 
 @incidents_alerts_router.post(
@@ -28,17 +28,17 @@ from app.incidents.models import Asset
 from app.incidents.models import Case
 from app.incidents.models import CaseAlertLink
 from app.incidents.schema.db_operations import CaseDownloadDocxRequest
+from app.incidents.services import report_render_pool
+from app.incidents.services.report_rendering import render_case_report_pdf
 from app.incidents.services.reports import cleanup_temp_files
 from app.incidents.services.reports import create_case_context
 from app.incidents.services.reports import create_file_response
 from app.incidents.services.reports import download_template
 from app.incidents.services.reports import render_document_with_context
 from app.incidents.services.reports import save_template_to_tempfile
-from app.incidents.services.reports_pdf import convert_html_to_pdf
 from app.incidents.services.reports_pdf import create_case_context_pdf
 from app.incidents.services.reports_pdf import create_file_response_pdf
 from app.incidents.services.reports_pdf import download_template_pdf
-from app.incidents.services.reports_pdf import render_html_template
 from app.middleware.customer_access import verify_customer_code_access
 
 incidents_report_router = APIRouter()
@@ -273,18 +273,15 @@ async def get_cases_export_pdf_route(
     # Download and save the template
     tmp_template_name = await download_template_pdf(request.template_name)
 
-    # Render the HTML template with the context
-    rendered_html_file_name = render_html_template(tmp_template_name, context)
-
-    # Convert HTML to PDF using WeasyPrint
-    rendered_pdf_file_name = convert_html_to_pdf(rendered_html_file_name)
+    # Render the HTML template and convert it to PDF on the report-rendering pool
+    try:
+        rendered_pdf_file_name = await report_render_pool.submit(render_case_report_pdf, tmp_template_name, context)
+    finally:
+        cleanup_temp_files([tmp_template_name])
 
     # Create the FileResponse for PDF
     response = create_file_response_pdf(file_path=rendered_pdf_file_name, file_name=request.file_name.replace(".docx", ".pdf"))
 
-    # Clean up temporary files
-    cleanup_temp_files([tmp_template_name, rendered_html_file_name])
-
     return response
 
 
@@ -527,6 +527,8 @@ class AlertOutResponse(BaseModel):
     in_progress: Optional[int] = None
     closed: Optional[int] = None
     total_filtered: Optional[int] = None
+    # Pass back as `cursor` for the next page; null when this page was not full.
+    next_cursor: Optional[str] = None
     success: bool
     message: str
 
@@ -558,6 +560,8 @@ class CaseOutResponse(BaseModel):
     open: Optional[int] = None
     in_progress: Optional[int] = None
     closed: Optional[int] = None
+    # Pass back as `cursor` for the next page; null when this page was not full.
+    next_cursor: Optional[str] = None
     success: bool
     message: str
 
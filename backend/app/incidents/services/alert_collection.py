@@ -205,3 +205,48 @@ async def add_copilot_alert_id(index_data: CreateAlertRequest, alert_id: int):
             logger.error(f"Failed to remove read-only block from index {index_data.index_name}: {e2}")
 
     return None
+
+
+async def add_copilot_alert_ids_bulk(assignments: List[Tuple[CreateAlertRequest, int]]) -> int:
+    """
+    Add CoPilot alert IDs to many Graylog events with one bulk request.
+
+    Refreshes the touched indices before returning, so the next
+    `get_alerts_not_created_in_copilot` call cannot hand the same events back.
+    Events the bulk request could not update (typically an index with a write
+    block) are retried one at a time through `add_copilot_alert_id`, which knows
+    how to lift and restore the block.
+
+    Args:
+        assignments: (Graylog event reference, CoPilot alert ID) pairs.
+
+    Returns:
+        int: The number of events that needed the per-event fallback.
+    """
+    if not assignments:
+        return 0
+
+    es_client = await create_wazuh_indexer_client_async("Wazuh-Indexer")
+    body = []
+    for index_data, alert_id in assignments:
+        body.append({"update": {"_index": index_data.index_name, "_id": index_data.alert_id}})
+        body.append({"doc": {"fields": {"COPILOT_ALERT_ID": f"{alert_id}"}}})
+
+    try:
+        response = await es_client.bulk(body=body, refresh="wait_for")
+        items = response.get("items", [])
+    except Exception as e:
+        logger.error(f"Bulk update of {len(assignments)} CoPilot alert IDs failed, falling back to per-event updates: {e}")
+        items = []
+
+    retries = []
+    for position, (index_data, alert_id) in enumerate(assignments):
+        result = items[position].get("update", {}) if position < len(items) else {}
+        if result.get("error") or not result:
+            retries.append((index_data, alert_id))
+
+    for index_data, alert_id in retries:
+        await add_copilot_alert_id(index_data=index_data, alert_id=alert_id)
+
+    logger.info(f"Added CoPilot alert IDs to {len(assignments) - len(retries)} Graylog events in bulk, {len(retries)} individually")
+    return len(retries)
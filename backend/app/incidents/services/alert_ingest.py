@@ -0,0 +1,236 @@
+"""Staged alert ingest for the `invoke_alert_creation_collect` scheduler job.
+
+`create_alert_auto_route` used to walk each batch of Graylog events strictly one
+at a time: parse the origin, GET the original document, run `create_alert`, then
+a separate `update` to write the CoPilot alert ID back onto the event. During an
+alert storm that loop drained `gl-events-*` slower than Graylog filled it.
+
+Each batch now goes through four stages:
+
+1. **fetch** — the next batch of events with no `COPILOT_ALERT_ID`, as before.
+2. **hydrate** — every origin document in one set of chunked `_mget` calls
+   (`get_alert_details_bulk`) instead of a GET per event.
+3. **create** — `create_alert` for up to `CREATE_CONCURRENCY` events at once,
+   each on its own session. Two events with the same title cannot race each
+   other into duplicate alerts: `create_alert` serialises its "open alert
+   exists?" check per (customer, title).
+4. **write-back** — one bulk request setting `COPILOT_ALERT_ID` on every created
+   event, refreshed before returning.
+
+Batches themselves stay sequential, on purpose: the next fetch must not start
+until the write-back has landed, or it would hand the same events out twice.
+
+Every stage reports its duration and item count to the `PerformanceRegistry`
+under the `alert_ingest` pipeline (`GET /api/performance/pipelines`).
+"""
+
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from loguru import logger
+from pydantic import ValidationError
+
+from app.connectors.wazuh_indexer.services.alerts import get_alert_details_bulk
+from app.connectors.wazuh_indexer.utils.universal import (
+    create_wazuh_indexer_client_async,
+)
+from app.db.db_session import get_db_session
+from app.incidents.schema.alert_collection import AlertPayloadItem
+from app.incidents.schema.incident_alert import AutoCreateAlertResponse
+from app.incidents.schema.incident_alert import CreateAlertRequest
+from app.incidents.schema.incident_alert import GenericAlertModel
+from app.incidents.services.alert_collection import add_copilot_alert_ids_bulk
+from app.incidents.services.alert_collection import get_alerts_not_created_in_copilot
+from app.incidents.services.alert_collection import get_original_alert_id
+from app.incidents.services.alert_collection import get_original_alert_index_name
+from app.incidents.services.incident_alert import alert_model_from_document
+from app.incidents.services.incident_alert import create_alert
+from app.middleware.performance import performance_registry
+
+PIPELINE = "alert_ingest"
+
+# Events per fetch, and fetches per scheduler run — unchanged from the loop this
+# replaces, so one run still handles at most 1,000 events.
+BATCH_SIZE = 100
+MAX_BATCHES = 10
+
+# Concurrent `create_alert` calls, each holding a database connection for its
+# whole duration. A quarter of the default pool (DB_POOL_SIZE + DB_MAX_OVERFLOW
+# = 40): ingest runs while analysts are using the UI and must not starve it.
+CREATE_CONCURRENCY = max(int(os.getenv("ALERT_INGEST_CREATE_CONCURRENCY", "8")), 1)
+
+
+class _StageTimer:
+    def __init__(self) -> None:
+        self.items = 0
+        self.failures = 0
+
+
+@contextmanager
+def _stage(name: str):
+    """Time one stage run and report it, even when the stage raises."""
+    timer = _StageTimer()
+    started = time.perf_counter()
+    try:
+        yield timer
+    finally:
+        performance_registry.record_stage(
+            PIPELINE,
+            name,
+            (time.perf_counter() - started) * 1000.0,
+            items=timer.items,
+            failures=timer.failures,
+        )
+
+
+def _log_create_failure(alert: AlertPayloadItem, error: Exception) -> None:
+    if isinstance(error, ValidationError):
+        # Pydantic validation failure — log per-field detail so a misshapen
+        # index document is fast to diagnose (which field, what was provided,
+        # which constraint failed).
+        logger.error(
+            f"Failed to create alert {alert.id} from index {alert.index}: " f"Pydantic validation failed in {len(error.errors())} field(s)",
+        )
+        for err in error.errors():
+            loc = ".".join(str(x) for x in err.get("loc", ()))
+            inp = err.get("input", "<not captured>")
+            inp_repr = repr(inp)[:200]  # truncate verbose inputs
+            logger.error(
+                f"  field={loc} type={err.get('type')} msg={err.get('msg')} input={inp_repr}",
+            )
+        return
+    # Any other error — preserve the full traceback so the source line of the
+    # failure is in the log, not just the message.
+    logger.opt(exception=error).error(
+        f"Failed to create alert {alert.id} from index {alert.index}: " f"{type(error).__name__}: {error}",
+    )
+
+
+async def _hydrate(alerts: List[AlertPayloadItem]) -> List[Tuple[AlertPayloadItem, CreateAlertRequest, Optional[GenericAlertModel]]]:
+    """Resolve every event's origin document in bulk.
+
+    An event whose document could not be turned into a model is still returned,
+    with `None`; `create_alert` then fetches it itself and reports the real error.
+    """
+    requests = []
+    for alert in alerts:
+        requests.append(
+            CreateAlertRequest(
+                index_name=await get_original_alert_index_name(origin_context=alert.source.origin_context),
+                alert_id=await get_original_alert_id(alert.source.origin_context),
+            ),
+        )
+
+    es_client = await create_wazuh_indexer_client_async("Wazuh-Indexer")
+    documents = await get_alert_details_bulk(es_client, [(request.index_name, request.alert_id) for request in requests])
+
+    hydrated = []
+    for alert, request, document in zip(alerts, requests, documents):
+        model = None
+        if "_version" in document:
+            try:
+                model = alert_model_from_document(document)
+            except Exception as e:
+                logger.debug(f"Could not build alert model for {request.index_name}/{request.alert_id}: {e}")
+        hydrated.append((alert, request, model))
+    return hydrated
+
+
+async def _create_one(
+    limiter: asyncio.Semaphore,
+    alert: AlertPayloadItem,
+    request: CreateAlertRequest,
+    model: Optional[GenericAlertModel],
+) -> Optional[int]:
+    async with limiter:
+        try:
+            async with get_db_session() as session:
+                return await create_alert(request, session, alert_details=model)
+        except Exception as e:
+            _log_create_failure(alert, e)
+            return None
+
+
+async def run_auto_alert_creation(batch_size: int = BATCH_SIZE, max_batches: int = MAX_BATCHES) -> AutoCreateAlertResponse:
+    """
+    Create CoPilot alerts for every pending Graylog event, batch by batch.
+
+    Args:
+        batch_size: Events fetched per batch.
+        max_batches: Batches processed before returning to the scheduler.
+
+    Returns:
+        AutoCreateAlertResponse: Counts of created and failed alerts and what remains.
+    """
+    total_created = 0
+    total_failed = 0
+    batches_processed = 0
+    total_remaining = 0
+    last_batch_len = 0
+    limiter = asyncio.Semaphore(CREATE_CONCURRENCY)
+
+    logger.info(f"Starting auto alert creation with batch_size={batch_size}, max_batches={max_batches}, concurrency={CREATE_CONCURRENCY}")
+
+    for batch_num in range(max_batches):
+        with _stage("fetch") as stage:
+            alerts_payload, total_remaining = await get_alerts_not_created_in_copilot(batch_size=batch_size)
+            stage.items = len(alerts_payload.alerts)
+        last_batch_len = len(alerts_payload.alerts)
+
+        if last_batch_len == 0:
+            logger.info(f"No more alerts to process after {batches_processed} batches")
+            break
+
+        logger.info(f"Processing batch {batch_num + 1}/{max_batches}: {last_batch_len} alerts.")
+        logger.info(f"Total remaining alerts after this batch: {total_remaining}")
+
+        with _stage("hydrate") as stage:
+            hydrated = await _hydrate(alerts_payload.alerts)
+            stage.items = len(hydrated)
+            stage.failures = sum(1 for _, _, model in hydrated if model is None)
+
+        with _stage("create") as stage:
+            alert_ids = await asyncio.gather(*(_create_one(limiter, alert, request, model) for alert, request, model in hydrated))
+            stage.items = sum(1 for alert_id in alert_ids if alert_id is not None)
+            stage.failures = len(alert_ids) - stage.items
+
+        assignments = [
+            (CreateAlertRequest(index_name=alert.index, alert_id=alert.id), alert_id)
+            for (alert, _, _), alert_id in zip(hydrated, alert_ids)
+            if alert_id is not None
+        ]
+        with _stage("write_back") as stage:
+            stage.failures = await add_copilot_alert_ids_bulk(assignments)
+            stage.items = len(assignments)
+
+        batch_created = len(assignments)
+        batch_failed = len(alert_ids) - batch_created
+        total_created += batch_created
+        total_failed += batch_failed
+        batches_processed += 1
+        logger.info(f"Batch {batch_num + 1} complete: {batch_created} created, {batch_failed} failed")
+
+        # If we processed fewer alerts than the batch size, we're done
+        if last_batch_len < batch_size:
+            logger.info("Processed final batch (fewer alerts than batch size)")
+            break
+
+    message = f"Processed {batches_processed} batches: {total_created} alerts created, {total_failed} failed"
+    if total_remaining > 0:
+        message += f". {total_remaining} alerts remaining for next run"
+
+    logger.info(message)
+
+    return AutoCreateAlertResponse(
+        success=True,
+        message=message,
+        alerts_created=total_created,
+        alerts_failed=total_failed,
+        batches_processed=batches_processed,
+        alerts_remaining=max(0, total_remaining - last_batch_len) if batches_processed < max_batches else total_remaining,
+    )
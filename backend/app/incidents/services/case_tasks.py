@@ -371,6 +371,13 @@ async def apply_template_to_case(
             commit=False,
         )
 
+    # The suggestion panel's usage history now counts this case. Dropped before
+    # the commit (the caller's, with commit=False): a reload racing it only
+    # misses this application until the next drop or the TTL.
+    from app.incidents.services.template_suggestions import invalidate_usage_counts
+
+    invalidate_usage_counts(case.customer_code)
+
     if commit:
         await session.commit()
         for t in new_tasks:
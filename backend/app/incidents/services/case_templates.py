@@ -116,6 +116,13 @@ async def _enforce_single_default(
         session.add(other)
 
 
+def _invalidate_suggestion_index() -> None:
+    # Lazy import: template_suggestions imports this module for its serializer.
+    from app.incidents.services.template_suggestions import invalidate_template_index
+
+    invalidate_template_index()
+
+
 # ---------------------------------------------------------------------------
 # Template CRUD
 # ---------------------------------------------------------------------------
@@ -166,6 +173,7 @@ async def create_template(
             )
 
         await session.commit()
+        _invalidate_suggestion_index()
 
         loaded = await _load_template_with_tasks(template.id, session)
         return CaseTemplateOperationResponse(
@@ -309,6 +317,7 @@ async def update_template(
         template.updated_at = datetime.utcnow()
         session.add(template)
         await session.commit()
+        _invalidate_suggestion_index()
 
         refreshed = await _load_template_with_tasks(template_id, session)
         return CaseTemplateOperationResponse(
@@ -365,6 +374,7 @@ async def delete_template(
             await session.delete(task)
         await session.delete(template)
         await session.commit()
+        _invalidate_suggestion_index()
 
         return CaseTemplateOperationResponse(
             template=snapshot,
@@ -415,6 +425,7 @@ async def add_template_task(
         session.add(template)
 
         await session.commit()
+        _invalidate_suggestion_index()
         await session.refresh(task)
 
         return CaseTemplateTaskOperationResponse(
@@ -472,6 +483,7 @@ async def update_template_task(
             session.add(parent)
 
         await session.commit()
+        _invalidate_suggestion_index()
         await session.refresh(task)
 
         return CaseTemplateTaskOperationResponse(
@@ -528,6 +540,7 @@ async def delete_template_task(
             session.add(parent)
 
         await session.commit()
+        _invalidate_suggestion_index()
 
         return CaseTemplateTaskOperationResponse(
             task=snapshot,
@@ -587,6 +600,7 @@ async def reorder_template_tasks(
         session.add(template)
 
         await session.commit()
+        _invalidate_suggestion_index()
 
         refreshed = await _load_template_with_tasks(template_id, session)
         return CaseTemplateOperationResponse(
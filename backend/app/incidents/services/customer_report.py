@@ -4,7 +4,9 @@ Composes two existing patterns:
 - the Vulnerability/SCA report *lifecycle* (DB row + MinIO object + generate/list/
   download/delete with a ``processing -> completed/failed`` status), and
 - the single-case *PDF mechanics* in ``reports_pdf`` (Jinja ``SandboxedEnvironment``
-  + autoescape -> pdfkit/wkhtmltopdf with ``disable-local-file-access``).
+  + autoescape -> pdfkit/wkhtmltopdf with ``disable-local-file-access``), run on
+  the report-rendering worker pool (``report_render_pool``) rather than in the
+  API process.
 
 The template is shipped in-repo (trusted) and rendered with autoescaping on. The
 report layout follows the reference SOC report design: a cover, an executive-
@@ -13,18 +15,13 @@ embedded as base64 PNG ``<img>`` data URIs), and colour-coded open/closed case
 tables plus per-case detail cards.
 """
 import json
-import os
 import re
 from datetime import datetime
-from tempfile import NamedTemporaryFile
 from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
 
-from jinja2 import FileSystemLoader
-from jinja2 import select_autoescape
-from jinja2.sandbox import SandboxedEnvironment
 from loguru import logger
 from sqlalchemy import or_
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -40,28 +37,15 @@ from app.db.universal_models import IncidentManagementCustomerReport
 from app.incidents.schema.customer_report import CustomerReportGenerateRequest
 from app.incidents.schema.customer_report import CustomerReportResponse
 from app.incidents.services import customer_report_aggregations as agg
+from app.incidents.services import report_render_pool
 from app.incidents.services.customer_report_branding import resolve_theme
-from app.incidents.services.customer_report_charts import donut_png
-from app.incidents.services.customer_report_charts import evolution_png
-from app.incidents.services.customer_report_charts import hbar_png
-from app.incidents.services.reports_pdf import convert_html_to_pdf
+from app.incidents.services.report_rendering import render_customer_report_pdf
 from app.incidents.services.verdict_stats import false_positive_reason_label
 from app.incidents.services.verdict_stats import false_positives_by_reason
 from app.incidents.services.verdict_stats import top_false_positives_by_alert_name
 from app.incidents.services.verdict_stats import verdict_counts
 
 BUCKET_NAME = "incident-management-reports"
-TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
-# Report layout -> Jinja template file. All four share `build_report_context`;
-# they only render different subsets of it (see schema.ReportTemplate). "full"
-# keeps the original filename for backward-compatibility.
-TEMPLATE_FILES = {
-    "full": "customer_incident_report_template.html",
-    "executive": "customer_incident_report_executive.html",
-    "operational": "customer_incident_report_operational.html",
-    "analytics": "customer_incident_report_analytics.html",
-}
-DEFAULT_TEMPLATE = "full"
 # Cap on assets / IOCs surfaced per case card (full & operational reports).
 MAX_CASE_ASSETS = 20
 MAX_CASE_IOCS = 25
@@ -248,21 +232,23 @@ async def build_report_context(
         },
         "alerts_by_source": by_source,
         "cases_by_type": cases_by_type,
+        # Chart specs, drawn by the render worker (see customer_report_charts.render_charts).
         "charts": {
-            "alerts_by_status": donut_png(by_status, status_aware=True) if total_alerts else None,
-            "alerts_by_source": donut_png(by_source) if total_alerts else None,
-            "top_alert_names": hbar_png(top_alert_names, color=theme["chart_bar"]) if top_alert_names else None,
-            "top_tags": hbar_png(top_alert_tags, color=theme["chart_bar"]) if top_alert_tags else None,
-            "false_positive_reasons": hbar_png(
-                [(false_positive_reason_label(reason), count) for reason, count in fp_by_reason],
-                color=theme["chart_bar"],
+            "alerts_by_status": ("donut", [by_status], {"status_aware": True}) if total_alerts else None,
+            "alerts_by_source": ("donut", [by_source], {}) if total_alerts else None,
+            "top_alert_names": ("hbar", [top_alert_names], {"color": theme["chart_bar"]}) if top_alert_names else None,
+            "top_tags": ("hbar", [top_alert_tags], {"color": theme["chart_bar"]}) if top_alert_tags else None,
+            "false_positive_reasons": (
+                "hbar",
+                [[(false_positive_reason_label(reason), count) for reason, count in fp_by_reason]],
+                {"color": theme["chart_bar"]},
             )
             if fp_by_reason
             else None,
-            "evolution_alerts": evolution_png(months, [row["alerts"] for row in trend], color=theme["chart_evo_alerts"])
+            "evolution_alerts": ("evolution", [months, [row["alerts"] for row in trend]], {"color": theme["chart_evo_alerts"]})
             if show_evolution
             else None,
-            "evolution_cases": evolution_png(months, [row["cases"] for row in trend], color=theme["chart_evo_cases"])
+            "evolution_cases": ("evolution", [months, [row["cases"] for row in trend]], {"color": theme["chart_evo_cases"]})
             if show_evolution
             else None,
         },
@@ -287,62 +273,6 @@ async def build_report_context(
     return context
 
 
-def _render_pdf(context: Dict[str, Any], template: str = DEFAULT_TEMPLATE) -> bytes:
-    """Render the selected in-repo Jinja template and convert it to PDF bytes.
-
-    ``template`` is one of ``schema.ReportTemplate``; an unknown value falls back
-    to the full report. Autoescaping is on; the only ``|safe`` values in the
-    template are the server-generated chart images (base64 PNG data URIs), which
-    contain no caller-controlled markup. The repeating footer (brand line + TLP +
-    page number) is drawn by wkhtmltopdf so it appears on every page.
-    """
-    env = SandboxedEnvironment(
-        loader=FileSystemLoader(TEMPLATE_DIR),
-        autoescape=select_autoescape(["html", "htm", "xml"], default=True),
-    )
-    template_name = TEMPLATE_FILES.get(template, TEMPLATE_FILES[DEFAULT_TEMPLATE])
-    rendered_html = env.get_template(template_name).render(context)
-
-    brand = context.get("brand") or "CoPilot"
-    tlp = context.get("tlp") or "TLP:RED"
-
-    html_path = None
-    pdf_path = None
-    try:
-        with NamedTemporaryFile(delete=False, suffix=".html") as tmp:
-            tmp.write(rendered_html.encode("utf-8"))
-            html_path = tmp.name
-        pdf_path = convert_html_to_pdf(
-            html_path,
-            extra_options={
-                "footer-left": f"{brand}  ·  {tlp}",
-                "footer-right": "[page] / [topage]",
-                "footer-font-size": "8",
-                "footer-font-name": "Helvetica",
-                "footer-spacing": "4",
-                "margin-top": "16mm",
-                "margin-bottom": "16mm",
-                "margin-left": "14mm",
-                "margin-right": "14mm",
-                "encoding": "UTF-8",
-                # Render at 1:1 (96dpi) so the light full-page cover's pixel heights
-                # map predictably; smart-shrinking would rescale the page and leave
-                # the cover short of the page bottom.
-                "disable-smart-shrinking": None,
-                "dpi": "96",
-            },
-        )
-        with open(pdf_path, "rb") as fh:
-            return fh.read()
-    finally:
-        for path in (html_path, pdf_path):
-            if path and os.path.exists(path):
-                try:
-                    os.remove(path)
-                except OSError:
-                    pass
-
-
 def _to_response(report: IncidentManagementCustomerReport, user_name: Optional[str] = None) -> CustomerReportResponse:
     filters: Dict[str, Any] = {}
     if report.filters_json:
@@ -411,8 +341,9 @@ async def generate_customer_report(
             raise ValueError(f"Customer {request.customer_code} not found")
 
         context = await build_report_context(session, customer, request)
-        pdf_bytes = _render_pdf(context, template=request.report_template)
-        stats = context["_stats"]
+        stats = context.pop("_stats")
+        # Charts, template and wkhtmltopdf run on the report-rendering pool, off the API process.
+        pdf_bytes = await report_render_pool.submit(render_customer_report_pdf, context, request.report_template)
 
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
         report_name = (report.report_name if report else None) or request.report_name or f"incident_report_{timestamp}"
@@ -13,6 +13,8 @@ database cannot inject markup into the surrounding HTML.
 import base64
 import io
 import math
+from typing import Any
+from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Sequence
@@ -237,4 +239,22 @@ def evolution_png(
     return _fig_to_data_uri(fig)
 
 
-__all__ = ["donut_png", "hbar_png", "evolution_png", "PALETTE"]
+# A chart is described in the API process as ``(kind, args, kwargs)`` -- plain data
+# that pickles -- and drawn in the report-rendering worker, which is the process
+# that has matplotlib and its font cache warm.
+ChartSpec = Tuple[str, Sequence[Any], Dict[str, Any]]
+
+CHART_RENDERERS = {"donut": donut_png, "hbar": hbar_png, "evolution": evolution_png}
+
+
+def render_charts(specs: Dict[str, Optional[ChartSpec]]) -> Dict[str, Optional[str]]:
+    """Draw every chart in ``specs``; a ``None`` spec stays ``None`` (the template hides it)."""
+    return {name: CHART_RENDERERS[spec[0]](*spec[1], **spec[2]) if spec else None for name, spec in specs.items()}
+
+
+def warm_up() -> None:
+    """Resolve the chart font once, so the first report in a fresh worker does not pay for it."""
+    fm.findfont(_FONT)
+
+
+__all__ = ["donut_png", "hbar_png", "evolution_png", "render_charts", "PALETTE"]
@@ -15,6 +15,7 @@ from sqlalchemy import asc
 from sqlalchemy import delete
 from sqlalchemy import desc
 from sqlalchemy import distinct
+from sqlalchemy import exists
 from sqlalchemy import func
 from sqlalchemy import update
 from sqlalchemy.exc import IntegrityError
@@ -29,6 +30,7 @@ from app.data_store.data_store_operations import upload_case_data_store
 from app.data_store.data_store_operations import upload_case_report_template_data_store
 from app.data_store.data_store_schema import CaseDataStoreCreation
 from app.data_store.data_store_schema import CaseReportTemplateDataStoreCreation
+from app.db import keyset
 from app.incidents.middleware.tag_access import tag_access_handler
 from app.incidents.models import AIAnalystTriggerEnabled
 from app.incidents.models import Alert
@@ -82,6 +84,10 @@ from app.incidents.schema.db_operations import LinkedCaseCreate
 from app.incidents.schema.db_operations import PutNotification
 from app.incidents.schema.db_operations import UpdateAlertStatus
 from app.incidents.schema.db_operations import UpdateCaseStatus
+from app.incidents.services import reference_cache
+from app.incidents.services.open_alert_index import alert_dedup_key
+from app.incidents.services.open_alert_index import forget_alert
+from app.incidents.services.open_alert_index import remember_open_alert
 from app.integrations.alert_creation_settings.models.alert_creation_settings import (
     AlertCreationSettings,
 )
@@ -287,105 +293,17 @@ async def alerts_open_by_customer_codes(db: AsyncSession, customer_codes: List[s
     return len(result.scalars().all())
 
 
-async def alert_total_for_user(user: User, db: AsyncSession, customer_codes: Optional[List[str]] = None) -> int:
-    """Get total alerts count with customer and tag filtering"""
-    from sqlalchemy import and_
-    from sqlalchemy import exists
-    from sqlalchemy import or_
-
-    filters = []
-
-    # Customer filtering
-    accessible_customers = await customer_access_handler.resolve_effective_customers(user, customer_codes, db)
-    if "*" not in accessible_customers:
-        filters.append(Alert.customer_code.in_(accessible_customers))
-
-    # Tag filtering
-    tag_filters = await tag_access_handler.build_alert_query_filters(user, db)
-    accessible_tags = tag_filters["accessible_tags"]
-
-    if "*" not in accessible_tags:
-        tag_conditions = []
-        if accessible_tags:
-            has_accessible_tag = exists(
-                select(AlertToTag.alert_id).where(
-                    and_(
-                        AlertToTag.alert_id == Alert.id,
-                        AlertToTag.tag_id.in_(accessible_tags),
-                    ),
-                ),
-            )
-            tag_conditions.append(has_accessible_tag)
-
-        if tag_filters["include_untagged"]:
-            is_untagged = ~exists(
-                select(AlertToTag.alert_id).where(AlertToTag.alert_id == Alert.id),
-            )
-            tag_conditions.append(is_untagged)
-
-        if tag_conditions:
-            filters.append(or_(*tag_conditions))
-        else:
-            return 0
-
-    query = select(func.count(Alert.id)).where(*filters) if filters else select(func.count(Alert.id))
-    result = await db.execute(query)
-    return result.scalar_one()
-
-
-async def alerts_open_for_user(user: User, db: AsyncSession, customer_codes: Optional[List[str]] = None) -> int:
-    """Get open alerts count with customer and tag filtering"""
-    from sqlalchemy import and_
-    from sqlalchemy import exists
-    from sqlalchemy import or_
-
-    filters = [Alert.status == "OPEN"]
-
-    # Customer filtering
-    accessible_customers = await customer_access_handler.resolve_effective_customers(user, customer_codes, db)
-    if "*" not in accessible_customers:
-        filters.append(Alert.customer_code.in_(accessible_customers))
-
-    # Tag filtering
-    tag_filters = await tag_access_handler.build_alert_query_filters(user, db)
-    accessible_tags = tag_filters["accessible_tags"]
-
-    if "*" not in accessible_tags:
-        tag_conditions = []
-        if accessible_tags:
-            has_accessible_tag = exists(
-                select(AlertToTag.alert_id).where(
-                    and_(
-                        AlertToTag.alert_id == Alert.id,
-                        AlertToTag.tag_id.in_(accessible_tags),
-                    ),
-                ),
-            )
-            tag_conditions.append(has_accessible_tag)
-
-        if tag_filters["include_untagged"]:
-            is_untagged = ~exists(
-                select(AlertToTag.alert_id).where(AlertToTag.alert_id == Alert.id),
-            )
-            tag_conditions.append(is_untagged)
-
-        if tag_conditions:
-            filters.append(or_(*tag_conditions))
-        else:
-            return 0
-
-    query = select(func.count(Alert.id)).where(*filters)
-    result = await db.execute(query)
-    return result.scalar_one()
-
+async def alert_access_conditions(user: User, db: AsyncSession, customer_codes: Optional[List[str]] = None) -> Optional[list]:
+    """
+    The customer and tag RBAC conditions that limit alerts to the ones ``user`` may see.
 
-async def alerts_in_progress_for_user(user: User, db: AsyncSession, customer_codes: Optional[List[str]] = None) -> int:
-    """Get in-progress alerts count with customer and tag filtering"""
+    Returns None when the user's tag access admits no alert at all, so callers can
+    answer without a query; an empty list means no restriction.
+    """
     from sqlalchemy import and_
-    from sqlalchemy import exists
     from sqlalchemy import or_
 
-    filters = [Alert.status == "IN_PROGRESS"]
+    filters = []
 
     # Customer filtering
     accessible_customers = await customer_access_handler.resolve_effective_customers(user, customer_codes, db)
@@ -418,61 +336,46 @@ async def alerts_in_progress_for_user(user: User, db: AsyncSession, customer_cod
         if tag_conditions:
             filters.append(or_(*tag_conditions))
         else:
-            return 0
-
-    query = select(func.count(Alert.id)).where(*filters)
-    result = await db.execute(query)
-    return result.scalar_one()
-
+            return None
 
-async def alerts_closed_for_user(user: User, db: AsyncSession, customer_codes: Optional[List[str]] = None) -> int:
-    """Get closed alerts count with customer and tag filtering"""
-    from sqlalchemy import and_
-    from sqlalchemy import exists
-    from sqlalchemy import or_
+    return filters
 
-    filters = [Alert.status == "CLOSED"]
 
-    # Customer filtering
-    accessible_customers = await customer_access_handler.resolve_effective_customers(user, customer_codes, db)
-    if "*" not in accessible_customers:
-        filters.append(Alert.customer_code.in_(accessible_customers))
+def _status_counts(rows) -> dict:
+    """``{"total", "open", "in_progress", "closed"}`` from ``(status, count)`` rows; other statuses count toward total only."""
+    by_status = {status: count for status, count in rows}
+    return {
+        "total": sum(by_status.values()),
+        "open": by_status.get("OPEN", 0),
+        "in_progress": by_status.get("IN_PROGRESS", 0),
+        "closed": by_status.get("CLOSED", 0),
+    }
 
-    # Tag filtering
-    tag_filters = await tag_access_handler.build_alert_query_filters(user, db)
-    accessible_tags = tag_filters["accessible_tags"]
 
-    if "*" not in accessible_tags:
-        tag_conditions = []
-        if accessible_tags:
-            has_accessible_tag = exists(
-                select(AlertToTag.alert_id).where(
-                    and_(
-                        AlertToTag.alert_id == Alert.id,
-                        AlertToTag.tag_id.in_(accessible_tags),
-                    ),
-                ),
-            )
-            tag_conditions.append(has_accessible_tag)
+async def alert_status_counts_for_user(user: User, db: AsyncSession, customer_codes: Optional[List[str]] = None) -> dict:
+    """
+    Total, open, in-progress and closed alert counts with customer and tag filtering.
 
-        if tag_filters["include_untagged"]:
-            is_untagged = ~exists(
-                select(AlertToTag.alert_id).where(AlertToTag.alert_id == Alert.id),
-            )
-            tag_conditions.append(is_untagged)
+    One ``GROUP BY status`` over the access conditions, resolved once, in place of
+    four separate counts that each resolved them again.
+    """
+    filters = await alert_access_conditions(user, db, customer_codes)
+    if filters is None:
+        return _status_counts([])
+    result = await db.execute(select(Alert.status, func.count(Alert.id)).where(*filters).group_by(Alert.status))
+    return _status_counts(result.all())
 
-        if tag_conditions:
-            filters.append(or_(*tag_conditions))
-        else:
-            return 0
 
-    query = select(func.count(Alert.id)).where(*filters)
-    result = await db.execute(query)
+async def alert_total_for_user(user: User, db: AsyncSession, customer_codes: Optional[List[str]] = None) -> int:
+    """Get total alerts count with customer and tag filtering"""
+    filters = await alert_access_conditions(user, db, customer_codes)
+    if filters is None:
+        return 0
+    result = await db.execute(select(func.count(Alert.id)).where(*filters))
     return result.scalar_one()
 
 
-async def alerts_total_multiple_filters(
-    db: AsyncSession,
+def alert_filter_conditions(
     assigned_to: Optional[str] = None,
     alert_title: Optional[str] = None,
     customer_code: Optional[str] = None,
@@ -484,13 +387,15 @@ async def alerts_total_multiple_filters(
     ioc_value: Optional[str] = None,
     verdict: Optional[str] = None,
     verdict_reason: Optional[str] = None,
-) -> int:
-    """Count alerts matching the filter set.
-
-    ``customer_code`` filters to a single customer; ``customer_codes`` to a set — mirrors
-    ``list_alerts_multiple_filters`` so the count and the page it annotates stay in sync.
+) -> list:
+    """WHERE conditions on ``Alert`` for the filtered listing and its counts.
+
+    Asset, tag and IoC filters are ``EXISTS`` semi-joins. They used to be outer joins
+    of five tables with ``DISTINCT`` (or ``COUNT(DISTINCT)``) folding the fan-out back
+    into one row per alert, which made MySQL build and de-duplicate every joined row
+    before it could sort or count — filter or no filter. A semi-join only probes the
+    link tables for the alerts it is asked about and never multiplies rows.
     """
-    # Build dynamic filters
     filters = []
     if assigned_to:
         filters.append(Alert.assigned_to == assigned_to)
@@ -503,13 +408,15 @@ async def alerts_total_multiple_filters(
     if source:
         filters.append(Alert.source == source)
     if asset_name:
-        filters.append(Asset.asset_name == asset_name)
+        filters.append(exists().where(Asset.alert_linked == Alert.id, Asset.asset_name == asset_name))
     if status:
         filters.append(Alert.status == status)
     if tags:
-        filters.append(AlertTag.tag.in_(tags))
+        filters.append(
+            exists().where(AlertToTag.alert_id == Alert.id, AlertToTag.tag_id == AlertTag.id, AlertTag.tag.in_(tags)),
+        )
     if ioc_value:
-        filters.append(IoC.value == ioc_value)
+        filters.append(exists().where(AlertToIoC.alert_id == Alert.id, AlertToIoC.ioc_id == IoC.id, IoC.value == ioc_value))
     if verdict:
         # UNTRIAGED is a filter-only sentinel, not a stored value: the untriaged state is
         # NULL on the column, and "no verdict yet" is exactly the slice an analyst working
@@ -517,22 +424,45 @@ async def alerts_total_multiple_filters(
         filters.append(Alert.verdict.is_(None) if verdict == VERDICT_FILTER_UNTRIAGED else Alert.verdict == verdict)
     if verdict_reason:
         filters.append(Alert.verdict_reason == verdict_reason)
+    return filters
 
-    # Build the query with dynamic filters
-    query = (
-        select(func.count(distinct(Alert.id)))
-        .select_from(Alert)
-        .join(Asset, Asset.alert_linked == Alert.id, isouter=True)  # Join with Asset table
-        .join(AlertToTag, AlertToTag.alert_id == Alert.id, isouter=True)  # Join with AlertToTag table
-        .join(AlertTag, AlertToTag.tag_id == AlertTag.id, isouter=True)  # Join with AlertTag table
-        .join(AlertToIoC, AlertToIoC.alert_id == Alert.id, isouter=True)  # Join with AlertToIoC table
-        .join(IoC, AlertToIoC.ioc_id == IoC.id, isouter=True)  # Join with IoC table
-        .where(*filters)
-    )
 
+async def alerts_total_multiple_filters(
+    db: AsyncSession,
+    assigned_to: Optional[str] = None,
+    alert_title: Optional[str] = None,
+    customer_code: Optional[str] = None,
+    customer_codes: Optional[List[str]] = None,
+    source: Optional[str] = None,
+    asset_name: Optional[str] = None,
+    status: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    ioc_value: Optional[str] = None,
+    verdict: Optional[str] = None,
+    verdict_reason: Optional[str] = None,
+) -> int:
+    """Count alerts matching the filter set.
+
+    ``customer_code`` filters to a single customer; ``customer_codes`` to a set — mirrors
+    ``list_alerts_multiple_filters`` so the count and the page it annotates stay in sync.
+    """
+    query = select(func.count(Alert.id)).where(
+        *alert_filter_conditions(
+            assigned_to=assigned_to,
+            alert_title=alert_title,
+            customer_code=customer_code,
+            customer_codes=customer_codes,
+            source=source,
+            asset_name=asset_name,
+            status=status,
+            tags=tags,
+            ioc_value=ioc_value,
+            verdict=verdict,
+            verdict_reason=verdict_reason,
+        ),
+    )
     result = await db.execute(query)
-    total = result.scalar_one()
-    return total
+    return result.scalar_one()
 
 
 async def alerts_closed_multiple_filters(
@@ -546,40 +476,21 @@ async def alerts_closed_multiple_filters(
     tags: Optional[List[str]] = None,
     ioc_value: Optional[str] = None,
 ) -> int:
-    # Include the status filter
-    filters = [Alert.status == "CLOSED"]
-    if assigned_to:
-        filters.append(Alert.assigned_to == assigned_to)
-    if alert_title:
-        filters.append(Alert.alert_name.like(f"%{alert_title}%"))
-    if customer_code:
-        filters.append(Alert.customer_code == customer_code)
-    if source:
-        filters.append(Alert.source == source)
-    if asset_name:
-        filters.append(Asset.asset_name == asset_name)
-    if status:
-        filters.append(Alert.status == status)
-    if tags:
-        filters.append(AlertTag.tag.in_(tags))
-    if ioc_value:
-        filters.append(IoC.value == ioc_value)
-
-    # Build the query with dynamic filters
-    query = (
-        select(func.count(distinct(Alert.id)))
-        .select_from(Alert)
-        .join(Asset, Asset.alert_linked == Alert.id, isouter=True)  # Join with Asset table
-        .join(AlertToTag, AlertToTag.alert_id == Alert.id, isouter=True)  # Join with AlertToTag table
-        .join(AlertTag, AlertToTag.tag_id == AlertTag.id, isouter=True)  # Join with AlertTag table
-        .join(AlertToIoC, AlertToIoC.alert_id == Alert.id, isouter=True)  # Join with AlertToIoC table
-        .join(IoC, AlertToIoC.ioc_id == IoC.id, isouter=True)  # Join with IoC table
-        .where(*filters)
+    query = select(func.count(Alert.id)).where(
+        Alert.status == "CLOSED",
+        *alert_filter_conditions(
+            assigned_to=assigned_to,
+            alert_title=alert_title,
+            customer_code=customer_code,
+            source=source,
+            asset_name=asset_name,
+            status=status,
+            tags=tags,
+            ioc_value=ioc_value,
+        ),
     )
-
     result = await db.execute(query)
-    closed_count = result.scalar_one()
-    return closed_count
+    return result.scalar_one()
 
 
 async def alerts_in_progress_multiple_filters(
@@ -593,38 +504,21 @@ async def alerts_in_progress_multiple_filters(
     tags: Optional[List[str]] = None,
     ioc_value: Optional[str] = None,
 ) -> int:
-    filters = [Alert.status == "IN_PROGRESS"]
-    if assigned_to:
-        filters.append(Alert.assigned_to == assigned_to)
-    if alert_title:
-        filters.append(Alert.alert_name.like(f"%{alert_title}%"))
-    if customer_code:
-        filters.append(Alert.customer_code == customer_code)
-    if source:
-        filters.append(Alert.source == source)
-    if asset_name:
-        filters.append(Asset.asset_name == asset_name)
-    if status:
-        filters.append(Alert.status == status)
-    if tags:
-        filters.append(AlertTag.tag.in_(tags))
-    if ioc_value:
-        filters.append(IoC.value == ioc_value)
-
-    query = (
-        select(func.count(distinct(Alert.id)))
-        .select_from(Alert)
-        .join(Asset, Asset.alert_linked == Alert.id, isouter=True)  # Join with Asset table
-        .join(AlertToTag, AlertToTag.alert_id == Alert.id, isouter=True)  # Join with AlertToTag table
-        .join(AlertTag, AlertToTag.tag_id == AlertTag.id, isouter=True)  # Join with AlertTag table
-        .join(AlertToIoC, AlertToIoC.alert_id == Alert.id, isouter=True)  # Join with AlertToIoC table
-        .join(IoC, AlertToIoC.ioc_id == IoC.id, isouter=True)  # Join with IoC table
-        .where(*filters)
+    query = select(func.count(Alert.id)).where(
+        Alert.status == "IN_PROGRESS",
+        *alert_filter_conditions(
+            assigned_to=assigned_to,
+            alert_title=alert_title,
+            customer_code=customer_code,
+            source=source,
+            asset_name=asset_name,
+            status=status,
+            tags=tags,
+            ioc_value=ioc_value,
+        ),
     )
-
     result = await db.execute(query)
-    in_progress_count = result.scalar_one()
-    return in_progress_count
+    return result.scalar_one()
 
 
 async def alerts_open_multiple_filters(
@@ -638,38 +532,21 @@ async def alerts_open_multiple_filters(
     tags: Optional[List[str]] = None,
     ioc_value: Optional[str] = None,
 ) -> int:
-    filters = [Alert.status == "OPEN"]
-    if assigned_to:
-        filters.append(Alert.assigned_to == assigned_to)
-    if alert_title:
-        filters.append(Alert.alert_name.like(f"%{alert_title}%"))
-    if customer_code:
-        filters.append(Alert.customer_code == customer_code)
-    if source:
-        filters.append(Alert.source == source)
-    if asset_name:
-        filters.append(Asset.asset_name == asset_name)
-    if status:
-        filters.append(Alert.status == status)
-    if tags:
-        filters.append(AlertTag.tag.in_(tags))
-    if ioc_value:
-        filters.append(IoC.value == ioc_value)
-
-    query = (
-        select(func.count(distinct(Alert.id)))
-        .select_from(Alert)
-        .join(Asset, Asset.alert_linked == Alert.id, isouter=True)  # Join with Asset table
-        .join(AlertToTag, AlertToTag.alert_id == Alert.id, isouter=True)  # Join with AlertToTag table
-        .join(AlertTag, AlertToTag.tag_id == AlertTag.id, isouter=True)  # Join with AlertTag table
-        .join(AlertToIoC, AlertToIoC.alert_id == Alert.id, isouter=True)  # Join with AlertToIoC table
-        .join(IoC, AlertToIoC.ioc_id == IoC.id, isouter=True)  # Join with IoC table
-        .where(*filters)
+    query = select(func.count(Alert.id)).where(
+        Alert.status == "OPEN",
+        *alert_filter_conditions(
+            assigned_to=assigned_to,
+            alert_title=alert_title,
+            customer_code=customer_code,
+            source=source,
+            asset_name=asset_name,
+            status=status,
+            tags=tags,
+            ioc_value=ioc_value,
+        ),
     )
-
     result = await db.execute(query)
-    open_count = result.scalar_one()
-    return open_count
+    return result.scalar_one()
 
 
 async def alerts_total_by_ioc(db: AsyncSession, ioc_value: str) -> int:
@@ -813,6 +690,7 @@ async def put_customer_ai_trigger(notification: PutNotification, session: AsyncS
         existing_notification.customer_code = notification.customer_code
         existing_notification.enabled = notification.enabled
     await session.commit()
+    reference_cache.invalidate("ai_trigger", notification.customer_code)
 
 
 async def get_customer_notification(customer_code: str, session: AsyncSession):
@@ -833,6 +711,7 @@ async def put_customer_notification(notification: PutNotification, session: Asyn
         existing_notification.shuffle_workflow_id = notification.shuffle_workflow_id
         existing_notification.enabled = notification.enabled
     await session.commit()
+    reference_cache.invalidate("notification", notification.customer_code)
 
 
 async def add_field_name(source: str, field_name: str, session: AsyncSession):
@@ -911,6 +790,7 @@ async def replace_field_name(source: str, field_names: List[str], session: Async
 
     # Commit the changes
     await session.commit()
+    reference_cache.invalidate("field_names", source)
 
 
 async def replace_ioc_name(source: str, ioc_names: List[str], session: AsyncSession):
@@ -928,6 +808,7 @@ async def replace_ioc_name(source: str, ioc_names: List[str], session: AsyncSess
 
     # Commit the changes
     await session.commit()
+    reference_cache.invalidate("field_names", source)
 
 
 async def replace_asset_name(source: str, asset_name: str, session: AsyncSession):
@@ -941,6 +822,7 @@ async def replace_asset_name(source: str, asset_name: str, session: AsyncSession
 
     # Commit the changes
     await session.commit()
+    reference_cache.invalidate("field_names", source)
 
 
 async def replace_timefield_name(source: str, timefield_name: str, session: AsyncSession):
@@ -954,6 +836,7 @@ async def replace_timefield_name(source: str, timefield_name: str, session: Asyn
 
     # Commit the changes
     await session.commit()
+    reference_cache.invalidate("field_names", source)
 
 
 async def replace_alert_title_name(source: str, alert_title_name: str, session: AsyncSession):
@@ -967,6 +850,7 @@ async def replace_alert_title_name(source: str, alert_title_name: str, session:
 
     # Commit the changes
     await session.commit()
+    reference_cache.invalidate("field_names", source)
 
 
 # ! NOT USING FOR NOW. GETTING THE CUSTOMER CODE FROM THE ALERTS SOURCE FIELD INSTEAD ! #
@@ -1045,7 +929,7 @@ async def delete_customer_code_name(source: str, customer_code_name: str, sessio
 
 
 async def create_alert(alert: AlertCreate, db: AsyncSession) -> Alert:
-    db_alert = Alert(**alert.model_dump())
+    db_alert = Alert(**alert.model_dump(), dedup_key=alert_dedup_key(alert.customer_code, alert.alert_name))
     db.add(db_alert)
     try:
         await db.flush()
@@ -1054,6 +938,7 @@ async def create_alert(alert: AlertCreate, db: AsyncSession) -> Alert:
     except IntegrityError:
         await db.rollback()
         raise HTTPException(status_code=400, detail="Alert already exists")
+    remember_open_alert(db_alert)
     return db_alert
 
 
@@ -1072,6 +957,8 @@ async def update_alert_status(update_alert_status: UpdateAlertStatus, db: AsyncS
         alert.time_closed = None
 
     await db.commit()
+    if alert.status != "OPEN":
+        forget_alert(alert.id)
     return alert
 
 
@@ -2387,6 +2274,14 @@ async def list_alerts_by_source(
     return alerts_out
 
 
+#: What the alert listings can be ordered by. ``id`` closes every key so that it is
+#: unique and keyset paging neither skips nor repeats rows that share a timestamp.
+ALERT_SORT_KEYS = {
+    "id": (Alert.id,),
+    "alert_creation_time": (Alert.alert_creation_time, Alert.id),
+}
+
+
 async def list_alerts_multiple_filters(
     db: AsyncSession,
     assigned_to: Optional[str] = None,
@@ -2405,46 +2300,72 @@ async def list_alerts_multiple_filters(
     order: str = "desc",
     user: Optional[User] = None,  # New parameter for tag filtering
 ) -> List[AlertOut]:
-    """List alerts with multiple filters including tag-based RBAC.
+    """List alerts with multiple filters including tag-based RBAC; see ``page_alerts_multiple_filters``."""
+    alerts, _ = await page_alerts_multiple_filters(
+        db,
+        assigned_to=assigned_to,
+        alert_title=alert_title,
+        customer_code=customer_code,
+        customer_codes=customer_codes,
+        source=source,
+        asset_name=asset_name,
+        status=status,
+        tags=tags,
+        ioc_value=ioc_value,
+        verdict=verdict,
+        verdict_reason=verdict_reason,
+        page=page,
+        page_size=page_size,
+        order=order,
+        user=user,
+    )
+    return alerts
+
+
+async def page_alerts_multiple_filters(
+    db: AsyncSession,
+    assigned_to: Optional[str] = None,
+    alert_title: Optional[str] = None,
+    customer_code: Optional[str] = None,
+    customer_codes: Optional[List[str]] = None,
+    source: Optional[str] = None,
+    asset_name: Optional[str] = None,
+    status: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    ioc_value: Optional[str] = None,
+    verdict: Optional[str] = None,
+    verdict_reason: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 25,
+    order: str = "desc",
+    user: Optional[User] = None,
+    cursor: Optional[str] = None,
+    sort_by: str = "id",
+) -> Tuple[List[AlertOut], Optional[str]]:
+    """List alerts with multiple filters including tag-based RBAC, and the cursor for the next page.
 
     ``customer_code`` filters to a single customer; ``customer_codes`` filters to
     a set (used to constrain scoped users to their accessible customers — passing
     the caller's full accessible set prevents cross-tenant disclosure).
+
+    With ``cursor`` the page starts after it and ``page`` is ignored (see ``keyset``).
     """
     from sqlalchemy import and_
-    from sqlalchemy import exists
     from sqlalchemy import or_
 
-    offset = (page - 1) * page_size
-    order_by = asc(Alert.id) if order == "asc" else desc(Alert.id)
-
-    # Build dynamic filters
-    filters = []
-    if assigned_to:
-        filters.append(Alert.assigned_to == assigned_to)
-    if alert_title:
-        filters.append(Alert.alert_name.like(f"%{alert_title}%"))
-    if customer_code:
-        filters.append(Alert.customer_code == customer_code)
-    if customer_codes:
-        filters.append(Alert.customer_code.in_(customer_codes))
-    if source:
-        filters.append(Alert.source == source)
-    if asset_name:
-        filters.append(Asset.asset_name == asset_name)
-    if status:
-        filters.append(Alert.status == status)
-    if tags:
-        filters.append(AlertTag.tag.in_(tags))
-    if ioc_value:
-        filters.append(IoC.value == ioc_value)
-    if verdict:
-        # UNTRIAGED is a filter-only sentinel, not a stored value: the untriaged state is
-        # NULL on the column, and "no verdict yet" is exactly the slice an analyst working
-        # a review queue wants (GitHub issue #1085).
-        filters.append(Alert.verdict.is_(None) if verdict == VERDICT_FILTER_UNTRIAGED else Alert.verdict == verdict)
-    if verdict_reason:
-        filters.append(Alert.verdict_reason == verdict_reason)
+    filters = alert_filter_conditions(
+        assigned_to=assigned_to,
+        alert_title=alert_title,
+        customer_code=customer_code,
+        customer_codes=customer_codes,
+        source=source,
+        asset_name=asset_name,
+        status=status,
+        tags=tags,
+        ioc_value=ioc_value,
+        verdict=verdict,
+        verdict_reason=verdict_reason,
+    )
 
     # Apply tag-based RBAC filtering if user is provided
     if user:
@@ -2477,17 +2398,12 @@ async def list_alerts_multiple_filters(
                 filters.append(or_(*tag_conditions))
             else:
                 # No accessible tags and untagged not allowed - return empty
-                return []
+                return [], None
 
     # Build the query with dynamic filters
-    query = (
+    sort_columns = ALERT_SORT_KEYS[sort_by]
+    query = keyset.paginate(
         select(Alert)
-        .distinct(Alert.id)
-        .join(Asset, Asset.alert_linked == Alert.id, isouter=True)
-        .join(AlertToTag, AlertToTag.alert_id == Alert.id, isouter=True)
-        .join(AlertTag, AlertToTag.tag_id == AlertTag.id, isouter=True)
-        .join(AlertToIoC, AlertToIoC.alert_id == Alert.id, isouter=True)
-        .join(IoC, AlertToIoC.ioc_id == IoC.id, isouter=True)
         .where(*filters)
         .options(
             selectinload(Alert.comments),
@@ -2495,10 +2411,13 @@ async def list_alerts_multiple_filters(
             selectinload(Alert.cases).selectinload(CaseAlertLink.case),
             selectinload(Alert.tags).selectinload(AlertToTag.tag),
             selectinload(Alert.iocs).selectinload(AlertToIoC.ioc),
-        )
-        .order_by(order_by)
-        .offset(offset)
-        .limit(page_size)
+        ),
+        sort_columns,
+        sort_by,
+        order,
+        page,
+        page_size,
+        cursor,
     )
 
     result = await db.execute(query)
@@ -2514,7 +2433,7 @@ async def list_alerts_multiple_filters(
         alert_out = build_alert_out(alert, comments=comments, assets=assets, tags=tags_out, iocs=iocs, linked_cases=linked_cases)
         alerts_out.append(alert_out)
 
-    return alerts_out
+    return alerts_out, keyset.next_cursor(alerts, sort_columns, sort_by, order, page_size)
 
 
 async def list_alerts_for_user(
@@ -2526,13 +2445,27 @@ async def list_alerts_for_user(
     customer_codes: Optional[List[str]] = None,
 ) -> List[AlertOut]:
     """List alerts filtered by user's customer access and tag access"""
+    alerts, _ = await page_alerts_for_user(user, session, page, page_size, order, customer_codes=customer_codes)
+    return alerts
+
+
+async def page_alerts_for_user(
+    user: User,
+    session: AsyncSession,
+    page: int = 1,
+    page_size: int = 25,
+    order: str = "desc",
+    customer_codes: Optional[List[str]] = None,
+    cursor: Optional[str] = None,
+    sort_by: str = "id",
+) -> Tuple[List[AlertOut], Optional[str]]:
+    """List alerts filtered by user's customer access and tag access, and the cursor for the next page.
+
+    With ``cursor`` the page starts after it and ``page`` is ignored (see ``keyset``).
+    """
     from sqlalchemy import and_
-    from sqlalchemy import exists
     from sqlalchemy import or_
 
-    offset = (page - 1) * page_size
-    order_by = asc(Alert.id) if order == "asc" else desc(Alert.id)
-
     # Start building the query
     base_query = select(Alert).options(
         selectinload(Alert.comments),
@@ -2580,14 +2513,15 @@ async def list_alerts_for_user(
             filters.append(or_(*tag_conditions))
         else:
             # No accessible tags and untagged not allowed - return empty
-            return []
+            return [], None
 
     # Apply all filters
     if filters:
         base_query = base_query.where(and_(*filters))
 
     # Apply ordering and pagination
-    final_query = base_query.order_by(order_by).offset(offset).limit(page_size)
+    sort_columns = ALERT_SORT_KEYS[sort_by]
+    final_query = keyset.paginate(base_query, sort_columns, sort_by, order, page, page_size, cursor)
     result = await session.execute(final_query)
     alerts = result.scalars().all()
 
@@ -2603,48 +2537,24 @@ async def list_alerts_for_user(
         alert_out = build_alert_out(alert, comments=comments, assets=assets, tags=tags, iocs=iocs, linked_cases=linked_cases)
         alerts_out.append(alert_out)
 
-    return alerts_out
+    return alerts_out, keyset.next_cursor(alerts, sort_columns, sort_by, order, page_size)
 
 
-async def case_total_for_user(user: User, session: AsyncSession, customer_codes: Optional[List[str]] = None) -> int:
-    """Get total cases count with customer filtering"""
-    base_query = select(func.count(Case.id))
-
-    accessible_customers = await customer_access_handler.resolve_effective_customers(user, customer_codes, session)
-    if "*" not in accessible_customers:
-        base_query = base_query.where(Case.customer_code.in_(accessible_customers))
-
-    result = await session.execute(base_query)
-    return result.scalar_one()
-
-
-async def cases_open_for_user(user: User, session: AsyncSession, customer_codes: Optional[List[str]] = None) -> int:
-    """Get open cases count with customer filtering"""
-    base_query = select(func.count(Case.id)).where(Case.case_status == "OPEN")
+async def case_status_counts_for_user(user: User, session: AsyncSession, customer_codes: Optional[List[str]] = None) -> dict:
+    """Total, open, in-progress and closed case counts with customer filtering, in one ``GROUP BY case_status``"""
+    query = select(Case.case_status, func.count(Case.id)).group_by(Case.case_status)
 
     accessible_customers = await customer_access_handler.resolve_effective_customers(user, customer_codes, session)
     if "*" not in accessible_customers:
-        base_query = base_query.where(Case.customer_code.in_(accessible_customers))
-
-    result = await session.execute(base_query)
-    return result.scalar_one()
-
+        query = query.where(Case.customer_code.in_(accessible_customers))
 
-async def cases_in_progress_for_user(user: User, session: AsyncSession, customer_codes: Optional[List[str]] = None) -> int:
-    """Get in-progress cases count with customer filtering"""
-    base_query = select(func.count(Case.id)).where(Case.case_status == "IN_PROGRESS")
+    result = await session.execute(query)
+    return _status_counts(result.all())
 
-    accessible_customers = await customer_access_handler.resolve_effective_customers(user, customer_codes, session)
-    if "*" not in accessible_customers:
-        base_query = base_query.where(Case.customer_code.in_(accessible_customers))
 
-    result = await session.execute(base_query)
-    return result.scalar_one()
-
-
-async def cases_closed_for_user(user: User, session: AsyncSession, customer_codes: Optional[List[str]] = None) -> int:
-    """Get closed cases count with customer filtering"""
-    base_query = select(func.count(Case.id)).where(Case.case_status == "CLOSED")
+async def case_total_for_user(user: User, session: AsyncSession, customer_codes: Optional[List[str]] = None) -> int:
+    """Get total cases count with customer filtering"""
+    base_query = select(func.count(Case.id))
 
     accessible_customers = await customer_access_handler.resolve_effective_customers(user, customer_codes, session)
     if "*" not in accessible_customers:
@@ -2663,9 +2573,24 @@ async def list_cases_for_user(
     customer_codes: Optional[List[str]] = None,
 ) -> List[CaseOut]:
     """List cases filtered by user's customer access with pagination"""
+    cases, _ = await page_cases_for_user(user, session, page, page_size, order, customer_codes=customer_codes)
+    return cases
 
-    offset = (page - 1) * page_size
-    order_by = asc(Case.id) if order == "asc" else desc(Case.id)
+
+async def page_cases_for_user(
+    user: User,
+    session: AsyncSession,
+    page: int = 1,
+    page_size: int = 25,
+    order: str = "desc",
+    customer_codes: Optional[List[str]] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[CaseOut], Optional[str]]:
+    """List cases filtered by user's customer access, and the cursor for the next page.
+
+    Cases page by ``id``; with ``cursor`` the page starts after it and ``page`` is ignored.
+    """
+    sort_columns = (Case.id,)
 
     base_query = select(Case).options(
         selectinload(Case.alerts).selectinload(CaseAlertLink.alert).selectinload(Alert.comments),
@@ -2686,7 +2611,7 @@ async def list_cases_for_user(
     )
 
     # Apply ordering and pagination
-    final_query = filtered_query.order_by(order_by).offset(offset).limit(page_size)
+    final_query = keyset.paginate(filtered_query, sort_columns, "id", order, page, page_size, cursor)
 
     result = await session.execute(final_query)
     cases = result.scalars().all()
@@ -2731,7 +2656,7 @@ async def list_cases_for_user(
             escalated=case.escalated,
         )
         cases_out.append(case_out)
-    return cases_out
+    return cases_out, keyset.next_cursor(cases, sort_columns, "id", order, page_size)
 
 
 async def delete_comments(alert_id: int, db: AsyncSession):
@@ -2825,6 +2750,7 @@ async def delete_alert(alert_id: int, db: AsyncSession):
     except IntegrityError:
         await db.rollback()
         raise HTTPException(status_code=400, detail="Error deleting alert")
+    forget_alert(alert_id)
 
 
 async def delete_case(case_id: int, db: AsyncSession):
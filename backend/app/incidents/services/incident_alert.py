@@ -1,11 +1,14 @@
+import asyncio
 import os
 import re
+from contextlib import asynccontextmanager
 from datetime import datetime
 from datetime import timedelta
 from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 
 from fastapi import HTTPException
 from loguru import logger
@@ -30,7 +33,6 @@ from app.incidents.models import AlertContext
 from app.incidents.models import AlertToIoC
 from app.incidents.models import Asset
 from app.incidents.models import IoC
-from app.incidents.routes.db_operations import get_configured_sources
 from app.incidents.schema.db_operations import AlertIoCCreate
 from app.incidents.schema.db_operations import AlertIocValue
 from app.incidents.schema.incident_alert import CreateAlertRequest
@@ -40,6 +42,7 @@ from app.incidents.schema.incident_alert import CreatedAlertPayload
 from app.incidents.schema.incident_alert import FieldNames
 from app.incidents.schema.incident_alert import GenericAlertModel
 from app.incidents.schema.incident_alert import GenericSourceModel
+from app.incidents.services import reference_cache
 from app.incidents.services.alert_severity import normalize_severity
 from app.incidents.services.db_operations import get_alert_title_names
 from app.incidents.services.db_operations import get_asset_names
@@ -50,6 +53,9 @@ from app.incidents.services.db_operations import get_ioc_names
 from app.incidents.services.db_operations import get_timefield_names
 from app.incidents.services.notification_enrichment import extract_rule_level
 from app.incidents.services.notification_enrichment import severity_from_rule_level
+from app.incidents.services.open_alert_index import alert_dedup_key
+from app.incidents.services.open_alert_index import find_open_alert
+from app.incidents.services.open_alert_index import remember_open_alert
 from app.incidents.services.threshold_alert import retrieve_threshold_alert_timeline
 from app.integrations.alert_creation_settings.models.alert_creation_settings import (
     AlertCreationSettings,
@@ -102,25 +108,27 @@ async def is_customer_code_valid(customer_code: str, session: AsyncSession) -> A
         session (AsyncSession): The database session.
 
     Returns:
-        bool: True if the customer code is valid, False otherwise.
+        AlertCreationSettings: The customer's settings, a copy of the cached row
+            (see `reference_cache`) rather than one attached to ``session``.
     """
-    settings = await fetch_settings("customer_code", customer_code, session)
 
-    if settings:
-        return settings
+    async def load():
+        settings = await fetch_settings("customer_code", customer_code, session)
 
-    # If no settings found customer_code, try with the lowered customer_name
-    normalized_code = customer_code.lower().replace("_", " ")
-    settings = await fetch_settings("customer_name", normalized_code, session, case_insensitive=True)
+        if not settings:
+            # If no settings found customer_code, try with the lowered customer_name
+            normalized_code = customer_code.lower().replace("_", " ")
+            settings = await fetch_settings("customer_name", normalized_code, session, case_insensitive=True)
 
-    if settings:
-        return settings
+        if not settings:
+            # If no settings found with customer_code, try with office365_organization_id
+            settings = await fetch_settings("office365_organization_id", customer_code, session)
 
-    # If no settings found with customer_code, try with office365_organization_id
-    settings = await fetch_settings("office365_organization_id", customer_code, session)
+        return settings.model_dump() if settings else None
 
+    settings = await reference_cache.get_or_load("alert_creation_settings", customer_code, load)
     if settings:
-        return settings
+        return AlertCreationSettings(**settings)
 
     raise HTTPException(
         status_code=400,
@@ -177,6 +185,29 @@ async def update_alert_creation_time(
     logger.info(f"Updated alert_creation_time for alert ID {alert_id} to {alert_obj.alert_creation_time}")
 
 
+def alert_model_from_document(alert: Dict[str, Any]) -> GenericAlertModel:
+    """
+    Builds the alert model from an indexer document, as returned by ``get`` or
+    as one entry of an ``_mget`` response.
+
+    Raises:
+        HTTPException: If the document carries neither `syslog_type` nor `integration`.
+    """
+    source_model = GenericSourceModel(**alert["_source"])
+    syslog_type = getattr(source_model, "syslog_type", None)
+    if syslog_type is None:
+        syslog_type = getattr(source_model, "integration", None)
+    if syslog_type is None:
+        raise HTTPException(status_code=400, detail="Neither syslog_type nor integration field found in source_model")
+    return GenericAlertModel(
+        _source=source_model,
+        _id=alert["_id"],
+        _index=alert["_index"],
+        _version=alert["_version"],
+        syslog_type=syslog_type,
+    )
+
+
 async def get_single_alert_details(
     alert_details: CreateAlertRequest,
 ) -> GenericAlertModel:
@@ -198,19 +229,7 @@ async def get_single_alert_details(
     es_client = await create_wazuh_indexer_client_async("Wazuh-Indexer")
     try:
         alert = await es_client.get(index=alert_details.index_name, id=alert_details.alert_id)
-        source_model = GenericSourceModel(**alert["_source"])
-        syslog_type = getattr(source_model, "syslog_type", None)
-        if syslog_type is None:
-            syslog_type = getattr(source_model, "integration", None)
-        if syslog_type is None:
-            raise HTTPException(status_code=400, detail="Neither syslog_type nor integration field found in source_model")
-        return GenericAlertModel(
-            _source=source_model,
-            _id=alert["_id"],
-            _index=alert["_index"],
-            _version=alert["_version"],
-            syslog_type=syslog_type,
-        )
+        return alert_model_from_document(alert)
     except Exception as e:
         logger.debug(f"Failed to collect alert details: {e}")
         raise HTTPException(
@@ -423,24 +442,53 @@ async def retrieve_agent_details_from_db(agent_name: str, session: AsyncSession)
         session (AsyncSession): The database session.
 
     Returns:
-        Agents: The agent details.
+        Agents: The agent details, a copy of the cached row rather than one
+            attached to ``session``; None if no agent has that hostname.
     """
-    logger.info(f"Retrieving agent details for {agent_name}")
-    result = await session.execute(
-        select(Agents).where(Agents.hostname == agent_name),
-    )
-    agent = result.scalars().first()
+
+    async def load():
+        logger.info(f"Retrieving agent details for {agent_name}")
+        result = await session.execute(
+            select(Agents).where(Agents.hostname == agent_name),
+        )
+        agent = result.scalars().first()
+        return agent.model_dump() if agent else None
+
+    agent = await reference_cache.get_or_load("agent", agent_name, load)
     if agent:
-        return agent
+        return Agents(**agent)
     return None
 
 
+async def _source_field_names(source: str, session: AsyncSession) -> Optional[dict]:
+    """
+    The source's field-name mappings as a `FieldNames` dict, or None when the source
+    is not configured.
+
+    A source is configured exactly when it has `FieldName` rows, so this one cached
+    entry answers both `validate_syslog_type_source` and `get_all_field_names`.
+    """
+
+    async def load():
+        field_names = await get_field_names(source, session)
+        if not field_names:
+            return None
+        return FieldNames(
+            field_names=field_names,
+            asset_name=await get_asset_names(source, session),
+            timefield_name=await get_timefield_names(source, session),
+            alert_title_name=await get_alert_title_names(source, session),
+            ioc_field_names=await get_ioc_names(source, session),
+        ).model_dump()
+
+    return await reference_cache.get_or_load("field_names", source, load)
+
+
 async def validate_syslog_type_source(source: str, session: AsyncSession) -> bool:
     """
-    Invoke the `get_configured_sources` to ensure the `source` has been configured
+    Ensure the `source` has been configured
     """
-    sources = await get_configured_sources(session)
-    if source not in sources.sources:
+    if await _source_field_names(source, session) is None:
         raise HTTPException(
             status_code=400,
             detail=f"Incident Management: {source} Source must be configured",
@@ -458,13 +506,13 @@ async def get_all_field_names(syslog_type: str, session: AsyncSession) -> FieldN
     Returns:
         FieldNames: The field names.
     """
-    return FieldNames(
-        field_names=await get_field_names(syslog_type, session),
-        asset_name=await get_asset_names(syslog_type, session),
-        timefield_name=await get_timefield_names(syslog_type, session),
-        alert_title_name=await get_alert_title_names(syslog_type, session),
-        ioc_field_names=await get_ioc_names(syslog_type, session),
-    )
+    field_names = await _source_field_names(syslog_type, session)
+    if field_names is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Incident Management: {syslog_type} Source must be configured",
+        )
+    return FieldNames(**field_names)
 
 
 async def resolve_asset_name_from_payload(asset_name_field: str, alert_payload: dict) -> Optional[str]:
@@ -651,6 +699,25 @@ async def build_alert_payload(
     )
 
 
+async def _customer_setting(namespace: str, lookup, customer_code: str, session: AsyncSession) -> Optional[dict]:
+    """
+    The customer's `Notification` or `AIAnalystTriggerEnabled` row as a dict, read
+    through `reference_cache`; None if the customer has none.
+
+    Args:
+        namespace (str): The cache namespace, ``"notification"`` or ``"ai_trigger"``.
+        lookup: `get_customer_notification` or `get_customer_ai_trigger`.
+        customer_code (str): The customer code.
+        session (AsyncSession): The database session.
+    """
+
+    async def load():
+        rows = await lookup(customer_code, session)
+        return rows[0].model_dump() if rows else None
+
+    return await reference_cache.get_or_load(namespace, customer_code, load)
+
+
 async def handle_customer_notifications(
     customer_code: str,
     asset_name: str,
@@ -658,8 +725,8 @@ async def handle_customer_notifications(
     session: AsyncSession,
     type: str = "alert",
 ) -> None:
-    customer_notifications = await get_customer_notification(customer_code, session)
-    if customer_notifications and customer_notifications[0].enabled:
+    customer_notification = await _customer_setting("notification", get_customer_notification, customer_code, session)
+    if customer_notification and customer_notification["enabled"]:
         logger.info(f"Executing workflow for customer code {customer_code}")
         # Best-effort: this runs inside the alert-ingestion path, so a Shuffle
         # failure (e.g. workflow not retrievable because of a wrong regional
@@ -669,7 +736,7 @@ async def handle_customer_notifications(
         try:
             await execute_workflow(
                 ExecuteWorkflowRequest(
-                    workflow_id=customer_notifications[0].shuffle_workflow_id,
+                    workflow_id=customer_notification["shuffle_workflow_id"],
                     execution_arguments={
                         "type": type,
                         "customer_code": customer_code,
@@ -1034,8 +1101,8 @@ async def handle_talon_investigation(alert_id: int, customer_code: str, session:
         session: The database session.
     """
     try:
-        ai_triggers = await get_customer_ai_trigger(customer_code, session)
-        if ai_triggers and ai_triggers[0].enabled:
+        ai_trigger = await _customer_setting("ai_trigger", get_customer_ai_trigger, customer_code, session)
+        if ai_trigger and ai_trigger["enabled"]:
             logger.info(f"AI analyst trigger enabled for customer {customer_code}, invoking Talon investigation for alert {alert_id}")
             await talon_investigate_alert(
                 TalonInvestigateRequest(
@@ -1197,6 +1264,7 @@ async def create_alert_in_copilot(alert_payload: CreatedAlertPayload, customer_c
         status="OPEN",
         alert_creation_time=datetime.utcnow(),
         customer_code=customer_code,
+        dedup_key=alert_dedup_key(customer_code, alert_payload.alert_title_payload),
         source=alert_payload.source,
         # Persisted so everything after ingest can read it. NULL when the source
         # supplied nothing — Wazuh carries a rule level, Office 365 / CrowdStrike
@@ -1208,6 +1276,7 @@ async def create_alert_in_copilot(alert_payload: CreatedAlertPayload, customer_c
     # Commit it to the database
     session.add(alert)
     await session.commit()
+    remember_open_alert(alert)
     return alert
 
 
@@ -1302,25 +1371,45 @@ async def open_alert_exists(alert_payload: CreatedAlertPayload, customer_code: s
         bool: True if an open alert exists, None otherwise.
     """
     logger.info(f"Checking if an open alert exists for customer code {customer_code} with alert title {alert_payload.alert_title_payload}")
-    result = await session.execute(
-        select(Alert).where(
-            Alert.customer_code == customer_code,
-            Alert.alert_name == alert_payload.alert_title_payload,
-            Alert.status == "OPEN",
-        ),
-    )
-    alert = result.scalars().first()
-    if alert:
+    alert_id = await find_open_alert(customer_code, alert_payload.alert_title_payload, session)
+    if alert_id:
         logger.info(f"Open alert exists for customer code {customer_code} with alert title {alert_payload.alert_title_payload}")
-        return alert.id
+        return alert_id
     logger.info(f"No open alert exists for customer code {customer_code} with alert title {alert_payload.alert_title_payload}")
     return None
 
 
+# Serialises the "is there an open alert with this title?" check and the create
+# that follows it, per (customer, title). Alert ingest now runs several creates
+# at once, and two events with the same title racing through the check would
+# each see "no open alert" and open a duplicate. Entries are dropped when the
+# last holder leaves, so the map stays as small as the number of in-flight titles.
+_open_alert_locks: Dict[Tuple[str, str], Tuple[asyncio.Lock, int]] = {}
+
+
+@asynccontextmanager
+async def open_alert_guard(customer_code: str, alert_title: str):
+    key = (customer_code, alert_title)
+    lock, holders = _open_alert_locks.get(key, (None, 0))
+    if lock is None:
+        lock = asyncio.Lock()
+    _open_alert_locks[key] = (lock, holders + 1)
+    try:
+        async with lock:
+            yield
+    finally:
+        lock, holders = _open_alert_locks[key]
+        if holders <= 1:
+            _open_alert_locks.pop(key, None)
+        else:
+            _open_alert_locks[key] = (lock, holders - 1)
+
+
 async def create_alert(
     alert: CreateAlertRequest,
     session: AsyncSession,
     simga_alert: str = None,
+    alert_details: Optional[GenericAlertModel] = None,
 ) -> CreateAlertResponse:
     """
     Creates an alert in CoPilot.
@@ -1328,6 +1417,9 @@ async def create_alert(
     Args:
         alert (CreateAlertRequest): The request object containing the alert details.
         session (AsyncSession): The database session.
+        alert_details (GenericAlertModel, optional): The indexer document, when the
+            caller has already fetched it (alert ingest hydrates in bulk). Fetched
+            here otherwise.
 
     Returns:
         CreateAlertResponse: The response object containing the created alert details.
@@ -1336,7 +1428,8 @@ async def create_alert(
         HTTPException: If there is an error creating the alert.
     """
     logger.info(f"Creating alert {alert.alert_id} in CoPilot")
-    alert_details = await get_single_alert_details(alert_details=alert)
+    if alert_details is None:
+        alert_details = await get_single_alert_details(alert_details=alert)
     await validate_syslog_type_source(alert_details.syslog_type, session)
     customer_code = await get_customer_code(dict(alert_details.source), session=session)
     logger.info(f"Customer code: {customer_code}")
@@ -1352,6 +1445,12 @@ async def create_alert(
     if simga_alert is not None:
         return await create_alert_full(alert_payload, customer_code, session)
 
+    async with open_alert_guard(customer_code, alert_payload.alert_title_payload):
+        return await _create_or_merge_alert(alert_payload, customer_code, session)
+
+
+async def _create_or_merge_alert(alert_payload: CreatedAlertPayload, customer_code: str, session: AsyncSession) -> int:
+    """Attach to the customer's open alert with this title, or create a new one."""
     existing_alert = await open_alert_exists(alert_payload, customer_code, session)
     if existing_alert:
         logger.info(
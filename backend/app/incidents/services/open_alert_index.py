@@ -0,0 +1,135 @@
+"""Finding a customer's open alert with a given title, on every ingested event.
+
+Alert ingest attaches each event to the customer's OPEN alert with the same
+title when there is one (see ``_create_or_merge_alert``). That check used to be
+``WHERE customer_code=? AND alert_name=? AND status='OPEN'`` with no usable
+index — ``alert_name`` is TEXT — so every ingested event scanned
+``incident_management_alert`` and ingest latency grew with the table.
+
+Two things replace the scan:
+
+* **An indexed dedup key.** `Alert.dedup_key` is a SHA-256 of the customer code
+  and the normalised title (`alert_dedup_key`), set when an alert is created and
+  backfilled by migration ``d7a3f1c9e2b4``. ``(dedup_key, status)`` is indexed,
+  so the lookup reads the handful of rows for that customer and title. The exact
+  ``alert_name`` comparison is kept as a residual filter: normalising only
+  widens the index match, never which alert is found.
+* **An in-process map of open alerts.** (customer, exact title) → alert id,
+  filled on create and on lookup, dropped when this process closes or deletes
+  the alert. Other workers can close an alert too, so a hit is confirmed with a
+  primary-key read of the alert's status rather than trusted — still far cheaper
+  than a secondary-index lookup plus the TEXT comparison. Only open alerts are
+  remembered: "no open alert" is never cached, because another worker may open
+  one at any moment. Bounded to `CACHE_SIZE` entries, least recently used first out.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.incidents.models import Alert
+
+
+def _env_number(name: str, default: float) -> float:
+    raw = os.getenv(name, str(default))
+    try:
+        value = float(raw)
+    except ValueError:
+        logger.warning(f"{name}={raw!r} is not a number; falling back to {default}")
+        return default
+    return value if value > 0 else default
+
+
+#: Open (customer, title) pairs remembered per process.
+CACHE_SIZE = int(_env_number("OPEN_ALERT_CACHE_SIZE", 10000))
+
+_open_alerts: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+_keys_by_id: Dict[int, Tuple[str, str]] = {}
+_stats = {"hits": 0, "misses": 0, "stale": 0}
+
+
+def alert_dedup_key(customer_code: str, alert_name: str) -> str:
+    """
+    The value of `Alert.dedup_key`: SHA-256 hex of the customer code and the
+    title with whitespace collapsed and case folded.
+
+    Migration ``d7a3f1c9e2b4`` computes the same thing for existing rows; keep
+    the two in step.
+    """
+    normalised = " ".join((alert_name or "").split()).casefold()
+    return hashlib.sha256(f"{customer_code}\x1f{normalised}".encode("utf-8")).hexdigest()
+
+
+def remember_open_alert(alert: Alert) -> None:
+    """Record a just-created (or just-found) OPEN alert."""
+    if alert.id is None or alert.status != "OPEN":
+        return
+    key = (alert.customer_code, alert.alert_name)
+    _open_alerts[key] = alert.id
+    _open_alerts.move_to_end(key)
+    _keys_by_id[alert.id] = key
+    while len(_open_alerts) > CACHE_SIZE:
+        _, evicted_id = _open_alerts.popitem(last=False)
+        _keys_by_id.pop(evicted_id, None)
+
+
+def forget_alert(alert_id: int) -> None:
+    """Drop an alert that is no longer OPEN (or no longer exists)."""
+    key = _keys_by_id.pop(alert_id, None)
+    if key is not None and _open_alerts.get(key) == alert_id:
+        del _open_alerts[key]
+
+
+async def find_open_alert(customer_code: str, alert_name: str, session: AsyncSession) -> Optional[int]:
+    """The id of the customer's OPEN alert titled exactly ``alert_name``, or None."""
+    key = (customer_code, alert_name)
+    alert_id = _open_alerts.get(key)
+    if alert_id is not None:
+        status = (await session.execute(select(Alert.status).where(Alert.id == alert_id))).scalar_one_or_none()
+        if status == "OPEN":
+            _stats["hits"] += 1
+            _open_alerts.move_to_end(key)
+            return alert_id
+        # Closed or deleted by another worker since we remembered it.
+        _stats["stale"] += 1
+        forget_alert(alert_id)
+
+    _stats["misses"] += 1
+    result = await session.execute(
+        select(Alert)
+        .where(
+            Alert.dedup_key == alert_dedup_key(customer_code, alert_name),
+            Alert.status == "OPEN",
+            Alert.customer_code == customer_code,
+            Alert.alert_name == alert_name,
+        )
+        .order_by(Alert.id)
+        .limit(1),
+    )
+    alert = result.scalars().first()
+    if alert is None:
+        return None
+    remember_open_alert(alert)
+    return alert.id
+
+
+def stats() -> Dict[str, Any]:
+    return {"size": len(_open_alerts), "max_size": CACHE_SIZE, **_stats}
+
+
+def reset_stats() -> None:
+    for name in _stats:
+        _stats[name] = 0
+
+
+def clear() -> None:
+    _open_alerts.clear()
+    _keys_by_id.clear()
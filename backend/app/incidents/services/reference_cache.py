@@ -0,0 +1,179 @@
+"""Process-wide cache for the reference data alert ingest reads on every alert.
+
+`create_alert` asks the database the same questions for every alert it
+ingests, and almost always gets the same answers:
+
+* is the event's source configured (`FieldName.source`, DISTINCT over the table);
+* which fields carry the title, asset, timestamp and IoCs for that source —
+  five more queries, one per mapping table;
+* is the customer set up for alert creation (`AlertCreationSettings`, up to three
+  queries as it falls back from code to name to Office365 tenant id);
+* which agent is the asset (`Agents` by hostname), once per new alert and again
+  per asset merged into an open one;
+* are Shuffle notifications and the AI analyst enabled for the customer.
+
+At ~135ms a statement (see `app/connectors/cache.py`) that is the better part of
+a second of every alert spent re-reading rows an operator edits a few times a
+month. This module holds those answers per process, keyed by
+``(namespace, key)`` — ``("field_names", "wazuh")``,
+``("agent", "host-1")`` — with the same shape as the connector cache: a TTL
+from the environment (`0` disables it), a per-key lock so a burst of alerts for
+a cold key loads it once, and hit/miss counters for the performance log.
+
+**Invalidation is by namespace.** Each write path that commits one of these
+rows calls `invalidate` afterwards: the field-name and source routes, the
+customer notification and AI-trigger setters, the Office365 tenant id updates
+to `AlertCreationSettings`, and the agent sync, delete and Velociraptor-id
+update. Writes that know a different key from the one ingest looks up by (an
+agent is deleted by ``agent_id`` and looked up by hostname) drop the whole
+namespace; they are rare enough that this costs nothing. The TTL is the
+backstop for what invalidation cannot see — another worker's write, or someone
+editing the table directly — and bounds how long a worker can disagree with
+the one that took the write.
+
+As in the connector cache:
+
+* **Misses are not cached.** An unconfigured source, an unprovisioned customer
+  or an unknown hostname is usually about to exist; remembering its absence
+  would hold alerts back for a whole TTL after the operator fixed it.
+* **Payloads are plain values, copied out.** Loaders return dicts and lists,
+  never ORM instances — an instance belongs to the session that loaded it — and
+  every caller gets its own copy.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import os
+import time
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+from typing import Tuple
+
+from loguru import logger
+
+
+def _ttl_seconds() -> int:
+    """Read at import; `0` disables the cache."""
+    raw = os.getenv("INGEST_REFERENCE_CACHE_TTL_SECONDS", "300")
+    try:
+        return max(int(raw), 0)
+    except ValueError:
+        logger.warning(f"INGEST_REFERENCE_CACHE_TTL_SECONDS={raw!r} is not an integer; falling back to 300s")
+        return 300
+
+
+TTL_SECONDS = _ttl_seconds()
+
+_Key = Tuple[str, Hashable]
+
+_entries: Dict[_Key, Tuple[float, Any]] = {}
+_locks: Dict[_Key, asyncio.Lock] = {}
+
+_hits = 0
+_misses = 0
+_invalidations = 0
+
+
+def _peek(key: _Key) -> Optional[Any]:
+    """A pure lookup: no counters, no locking. Not the entry point."""
+    if TTL_SECONDS == 0:
+        return None
+
+    entry = _entries.get(key)
+    if entry is None:
+        return None
+
+    stored_at, payload = entry
+    if time.monotonic() - stored_at >= TTL_SECONDS:
+        _entries.pop(key, None)
+        return None
+
+    return copy.deepcopy(payload)
+
+
+def _lock_for(key: _Key) -> asyncio.Lock:
+    lock = _locks.get(key)
+    if lock is None:
+        lock = asyncio.Lock()
+        _locks[key] = lock
+    return lock
+
+
+async def get_or_load(namespace: str, key: Hashable, loader) -> Optional[Any]:
+    """Read through the cache, loading at most once per key.
+
+    Args:
+        namespace: what kind of row — ``"field_names"``, ``"agent"``, … — and
+            the unit `invalidate` drops when no key is given.
+        key: the value ingest looks the row up by within the namespace.
+        loader: an async callable returning the payload (dicts, lists and
+            scalars only), or None when there is nothing to find.
+    """
+    global _hits, _misses
+
+    cache_key = (namespace, key)
+    cached = _peek(cache_key)
+    if cached is not None:
+        _hits += 1
+        return cached
+
+    async with _lock_for(cache_key):
+        cached = _peek(cache_key)
+        if cached is not None:
+            _hits += 1
+            return cached
+
+        _misses += 1
+        payload = await loader()
+        if payload is None:
+            # Not cached: see the module docstring.
+            return None
+
+        if TTL_SECONDS > 0:
+            _entries[cache_key] = (time.monotonic(), copy.deepcopy(payload))
+        return payload
+
+
+def invalidate(namespace: str, key: Optional[Hashable] = None) -> None:
+    """Forget one key, or every key in ``namespace``. Called after committed writes."""
+    global _invalidations
+
+    if key is not None:
+        dropped = [(namespace, key)] if (namespace, key) in _entries else []
+    else:
+        dropped = [cache_key for cache_key in _entries if cache_key[0] == namespace]
+    for cache_key in dropped:
+        _entries.pop(cache_key, None)
+    if dropped:
+        _invalidations += len(dropped)
+        logger.debug(f"Ingest reference cache invalidated {len(dropped)} {namespace} entries")
+
+
+def invalidate_all() -> None:
+    global _invalidations
+
+    _invalidations += len(_entries)
+    _entries.clear()
+
+
+def reset_stats() -> None:
+    """Test seam. Production never needs this; the counters are cumulative."""
+    global _hits, _misses, _invalidations
+
+    _hits = _misses = _invalidations = 0
+
+
+def stats() -> Dict[str, Any]:
+    looked_up = _hits + _misses
+    return {
+        "entries": len(_entries),
+        "hits": _hits,
+        "misses": _misses,
+        "invalidations": _invalidations,
+        "hit_ratio": round(_hits / looked_up, 4) if looked_up else None,
+        "ttl_seconds": TTL_SECONDS,
+    }
@@ -0,0 +1,201 @@
+"""A dedicated worker pool for PDF report rendering.
+
+A customer report is matplotlib charts, a Jinja render of a large template and a
+wkhtmltopdf run — seconds of CPU each, and all of it used to happen inside the
+API process: the charts and the render on the event loop itself, wkhtmltopdf as
+a blocking subprocess wait on it. Month-end reports for 40 customers pinned the
+loop and the API's CPU until the last one finished; every other request waited.
+
+Rendering now goes to a pool of `REPORT_RENDER_WORKERS` worker processes
+(`spawn`ed, so no copy of the API's threads or sockets is forked into them):
+
+* **Concurrency is capped.** At most one job per worker runs at a time; the rest
+  wait here, in order. More than `REPORT_RENDER_QUEUE_SIZE` waiting jobs and a
+  new one is refused with `RenderQueueFull` — the report row is marked
+  ``failed`` with that message instead of queueing without bound.
+* **Workers start warm.** `report_rendering.init_worker` builds the template
+  environment and resolves the chart fonts once per worker, not once per report.
+* **Status stays on the report row.** Callers keep the existing
+  ``processing -> completed/failed`` lifecycle; the row is ``processing`` while
+  the job waits and renders. Queue depth and render times are on
+  `GET /api/performance/pipelines` (the `report_render` queue and pipeline).
+
+`REPORT_RENDER_WORKERS=0` renders in-process on a thread via `run_blocking` —
+the loop is still free, but the API's CPU is shared — for hosts where spawning
+processes is not possible.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import CancelledError as FutureCancelledError
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+
+from loguru import logger
+
+from app.blocking import run_blocking
+from app.incidents.services.report_rendering import init_worker
+from app.middleware.performance import performance_registry
+
+T = TypeVar("T")
+
+PIPELINE = "report_render"
+
+
+def _env_int(name: str, default: int, minimum: int = 1) -> int:
+    raw = os.getenv(name, str(default))
+    try:
+        return max(int(raw), minimum)
+    except ValueError:
+        logger.warning(f"{name}={raw!r} is not an integer; falling back to {default}")
+        return default
+
+
+#: Worker processes, and so the most reports rendered at once. 0 renders in-process.
+WORKERS = _env_int("REPORT_RENDER_WORKERS", 2, minimum=0)
+
+#: Jobs allowed to wait for a worker before new ones are refused.
+QUEUE_SIZE = _env_int("REPORT_RENDER_QUEUE_SIZE", 100)
+
+
+class RenderQueueFull(RuntimeError):
+    """More reports are waiting to render than `REPORT_RENDER_QUEUE_SIZE` allows."""
+
+
+_executor: Optional[Executor] = None
+# A semaphore belongs to the loop it first waited on; production has one loop,
+# tests create one per test.
+_slots: Dict[int, Tuple[int, asyncio.Semaphore]] = {}
+
+_waiting = 0
+_running = 0
+_submitted = 0
+_completed = 0
+_failed = 0
+_rejected = 0
+_max_waiting = 0
+
+
+def _get_executor() -> Executor:
+    global _executor
+
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+        )
+        logger.info(f"Started the report-rendering pool with {WORKERS} worker process(es)")
+    return _executor
+
+
+def _slot() -> asyncio.Semaphore:
+    key = id(asyncio.get_running_loop())
+    limit = max(WORKERS, 1)
+    current = _slots.get(key)
+    if current is None or current[0] != limit:
+        current = (limit, asyncio.Semaphore(limit))
+        _slots[key] = current
+    return current[1]
+
+
+async def _execute(func: Callable[..., T], *args: Any) -> T:
+    global _executor
+
+    if WORKERS == 0:
+        return await run_blocking(func, *args)
+    executor = _get_executor()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+    except BrokenProcessPool:
+        # A worker died (OOM, wkhtmltopdf segfault). The pool cannot recover;
+        # start a fresh one for the next job.
+        if _executor is executor:
+            _executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise RuntimeError("The report-rendering worker exited unexpectedly")
+    except FutureCancelledError:
+        raise RuntimeError("Report rendering was cancelled because the server is shutting down")
+
+
+async def submit(func: Callable[..., T], *args: Any) -> T:
+    """Run ``func(*args)`` on a render worker and return its result.
+
+    ``func`` must be a module-level function and ``args`` picklable. Waits for a
+    free worker; raises `RenderQueueFull` if too many jobs are already waiting.
+    Exceptions raised by ``func`` propagate unchanged.
+    """
+    global _waiting, _running, _submitted, _completed, _failed, _rejected, _max_waiting
+
+    if _waiting >= QUEUE_SIZE:
+        _rejected += 1
+        raise RenderQueueFull(f"Report rendering queue is full ({QUEUE_SIZE} waiting); try again later")
+
+    _submitted += 1
+    _waiting += 1
+    _max_waiting = max(_max_waiting, _waiting)
+    queued_at = time.perf_counter()
+    try:
+        slot = _slot()
+        await slot.acquire()
+    finally:
+        _waiting -= 1
+    started_at = time.perf_counter()
+    performance_registry.record_stage(PIPELINE, "queued", (started_at - queued_at) * 1000.0, items=1)
+
+    _running += 1
+    failed = False
+    try:
+        return await _execute(func, *args)
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        _running -= 1
+        slot.release()
+        if failed:
+            _failed += 1
+        else:
+            _completed += 1
+        performance_registry.record_stage(
+            PIPELINE,
+            func.__name__,
+            (time.perf_counter() - started_at) * 1000.0,
+            items=1,
+            failures=int(failed),
+        )
+
+
+async def shutdown() -> None:
+    """Stop the worker processes, abandoning queued jobs. Called from the app lifespan."""
+    global _executor
+
+    executor, _executor = _executor, None
+    if executor is not None:
+        await run_blocking(executor.shutdown, wait=True, cancel_futures=True)
+
+
+def stats() -> Dict[str, int]:
+    """Surfaced as the `report_render` queue on GET /api/performance/pipelines."""
+    return {
+        "workers": WORKERS,
+        "capacity": QUEUE_SIZE,
+        "depth": _waiting,
+        "max_depth": _max_waiting,
+        "running": _running,
+        "submitted": _submitted,
+        "completed": _completed,
+        "failed": _failed,
+        "rejected": _rejected,
+    }
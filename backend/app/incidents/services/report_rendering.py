@@ -0,0 +1,132 @@
+"""PDF rendering for incident reports — the part that runs in a render worker.
+
+Everything here is synchronous and CPU- or subprocess-bound: matplotlib charts,
+the Jinja render and the wkhtmltopdf run. It is called through
+``report_render_pool`` so none of it runs on the API event loop; the functions
+take and return plain, picklable values so the pool can hand them to a worker
+process.
+
+Per-process state is built once: the customer-report ``SandboxedEnvironment``
+(its compiled templates are cached by Jinja for the life of the environment)
+and matplotlib's font lookup. ``init_worker`` does both when a worker starts.
+"""
+import os
+from tempfile import NamedTemporaryFile
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+from jinja2 import FileSystemLoader
+from jinja2 import select_autoescape
+from jinja2.sandbox import SandboxedEnvironment
+
+from app.incidents.services.customer_report_charts import render_charts
+from app.incidents.services.customer_report_charts import warm_up as warm_up_charts
+from app.incidents.services.reports_pdf import convert_html_to_pdf
+from app.incidents.services.reports_pdf import render_html_template
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+# Report layout -> Jinja template file. All four share `build_report_context`;
+# they only render different subsets of it (see schema.ReportTemplate). "full"
+# keeps the original filename for backward-compatibility.
+TEMPLATE_FILES = {
+    "full": "customer_incident_report_template.html",
+    "executive": "customer_incident_report_executive.html",
+    "operational": "customer_incident_report_operational.html",
+    "analytics": "customer_incident_report_analytics.html",
+}
+DEFAULT_TEMPLATE = "full"
+
+_env: Optional[SandboxedEnvironment] = None
+
+
+def _template_env() -> SandboxedEnvironment:
+    global _env
+
+    if _env is None:
+        _env = SandboxedEnvironment(
+            loader=FileSystemLoader(TEMPLATE_DIR),
+            autoescape=select_autoescape(["html", "htm", "xml"], default=True),
+        )
+    return _env
+
+
+def init_worker() -> None:
+    """Process-pool initializer: load the template environment and chart fonts up front."""
+    _template_env()
+    warm_up_charts()
+
+
+def _pdf_bytes(html: str, extra_options: Optional[Dict[str, object]] = None) -> bytes:
+    html_path = None
+    pdf_path = None
+    try:
+        with NamedTemporaryFile(delete=False, suffix=".html") as tmp:
+            tmp.write(html.encode("utf-8"))
+            html_path = tmp.name
+        pdf_path = convert_html_to_pdf(html_path, extra_options=extra_options)
+        with open(pdf_path, "rb") as fh:
+            return fh.read()
+    finally:
+        for path in (html_path, pdf_path):
+            if path and os.path.exists(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def render_customer_report_pdf(context: Dict[str, Any], template: str = DEFAULT_TEMPLATE) -> bytes:
+    """Draw the charts, render the selected in-repo Jinja template and convert it to PDF bytes.
+
+    ``context["charts"]`` holds chart specs (see ``customer_report_charts.render_charts``)
+    and is replaced by the rendered images. ``template`` is one of
+    ``schema.ReportTemplate``; an unknown value falls back to the full report.
+    Autoescaping is on; the only ``|safe`` values in the template are the
+    server-generated chart images (base64 PNG data URIs), which contain no
+    caller-controlled markup. The repeating footer (brand line + TLP + page
+    number) is drawn by wkhtmltopdf so it appears on every page.
+    """
+    context = {**context, "charts": render_charts(context.get("charts") or {})}
+    template_name = TEMPLATE_FILES.get(template, TEMPLATE_FILES[DEFAULT_TEMPLATE])
+    rendered_html = _template_env().get_template(template_name).render(context)
+
+    brand = context.get("brand") or "CoPilot"
+    tlp = context.get("tlp") or "TLP:RED"
+    return _pdf_bytes(
+        rendered_html,
+        extra_options={
+            "footer-left": f"{brand}  ·  {tlp}",
+            "footer-right": "[page] / [topage]",
+            "footer-font-size": "8",
+            "footer-font-name": "Helvetica",
+            "footer-spacing": "4",
+            "margin-top": "16mm",
+            "margin-bottom": "16mm",
+            "margin-left": "14mm",
+            "margin-right": "14mm",
+            "encoding": "UTF-8",
+            # Render at 1:1 (96dpi) so the light full-page cover's pixel heights
+            # map predictably; smart-shrinking would rescale the page and leave
+            # the cover short of the page bottom.
+            "disable-smart-shrinking": None,
+            "dpi": "96",
+        },
+    )
+
+
+def render_case_report_pdf(template_path: str, context: Dict[str, Any]) -> str:
+    """Render an uploaded single-case template and convert it; returns the PDF's path.
+
+    The template differs per request, so it gets a fresh sandbox each time (see
+    ``reports_pdf.render_html_template``). The rendered HTML is removed here; the
+    PDF is left for the caller to stream.
+    """
+    html_path = render_html_template(template_path, context)
+    try:
+        return convert_html_to_pdf(html_path)
+    finally:
+        try:
+            os.remove(html_path)
+        except OSError:
+            pass
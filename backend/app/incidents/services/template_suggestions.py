@@ -20,7 +20,8 @@ auto-apply condition ``CaseTemplate.match_field`` / ``match_value`` evaluated
 alert tags           ``incident_management_alert_to_tag`` → ``…_alerttag.tag``
 MITRE technique ids  ``incident_management_alertcontext.context`` (the ingest
                      dictionary already stores ``rule_mitre_id`` and friends),
-                     falling back to the raw Wazuh document
+                     falling back to the raw Wazuh document; names for those
+                     ids from the MITRE reference cache when it is loaded
 Wazuh rule groups    same context blob (``rule_groups``)
 alert title keywords ``Alert.alert_name``
 usage history        ``CaseTask.template_task_id`` → ``CaseTemplateTask`` →
@@ -46,12 +47,27 @@ credit for any single shared token — would make groups like ``windows`` or
 ``web`` match most of the library. Precision is worth more than recall here:
 one bad suggestion at the top of the list costs more trust than a missing
 signal on a template that still ranks on customer, source and MITRE.
+
+**Templates are indexed, not reloaded per call.** The panel fires on every
+alert-to-case action, and it used to load every template with its tasks, rebuild
+each corpus and re-count usage history each time. Templates now sit in an
+in-memory ``TemplateIndex``: corpora and preview responses built once, plus
+inverted postings from corpus tokens and MITRE ids to templates. The
+template CRUD in ``case_templates`` invalidates it, and a TTL
+(``CASE_TEMPLATE_SUGGESTION_CACHE_SECONDS``) picks up edits made by another
+worker. A call runs the topical scorers only on templates the postings say
+could match; every other in-scope template is still ranked on scope, usage and
+``is_default``, exactly as before. Usage counts are cached per customer for
+``CASE_TEMPLATE_USAGE_CACHE_SECONDS``, and applying a template to a case drops
+that customer's counts.
 """
 
 from __future__ import annotations
 
 import math
+import os
 import re
+import time
 from dataclasses import dataclass
 from dataclasses import field as dataclass_field
 from typing import Any
@@ -68,6 +84,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.connectors.wazuh_manager.services.mitre_reference import mitre_reference_cache
 from app.incidents.models import Alert
 from app.incidents.models import AlertContext
 from app.incidents.models import AlertTag
@@ -77,6 +94,7 @@ from app.incidents.models import Case
 from app.incidents.models import CaseTask
 from app.incidents.models import CaseTemplate
 from app.incidents.models import CaseTemplateTask
+from app.incidents.schema.case_templates import CaseTemplateResponse
 from app.incidents.schema.case_templates import CaseTemplateSuggestion
 from app.incidents.schema.case_templates import CaseTemplateSuggestionListResponse
 from app.incidents.schema.case_templates import SuggestionReason
@@ -139,6 +157,25 @@ CONFIDENCE_MEDIUM_THRESHOLD = 25
 
 DEFAULT_SUGGESTION_LIMIT = 5
 
+
+def _env_seconds(name: str, default: float) -> float:
+    raw = os.getenv(name, str(default))
+    try:
+        value = float(raw)
+    except ValueError:
+        logger.warning(f"{name}={raw!r} is not a number; falling back to {default}")
+        return default
+    return value if value > 0 else default
+
+
+#: Longest the template index is trusted before a reload, for edits made in another process.
+INDEX_CACHE_SECONDS = _env_seconds("CASE_TEMPLATE_SUGGESTION_CACHE_SECONDS", 60.0)
+
+#: Longest a customer's usage counts are trusted. Applying a template in this
+#: process drops them straight away; this bounds how stale another worker's
+#: applications, and deleted cases, can leave the tiebreaker.
+USAGE_CACHE_SECONDS = _env_seconds("CASE_TEMPLATE_USAGE_CACHE_SECONDS", 300.0)
+
 # ---------------------------------------------------------------------------
 # Text handling
 # ---------------------------------------------------------------------------
@@ -412,6 +449,11 @@ async def build_alert_signals(
         if len(token) >= _MIN_TOKEN_LENGTH and token not in _KEYWORD_STOPWORDS
     ]
 
+    # An ingest dictionary that keeps ``rule_mitre_id`` but not the technique
+    # name still gets the names, from the cache the MITRE views load. Only what
+    # is already loaded: suggestions never wait on the Wazuh API.
+    signals.mitre_names.extend(mitre_reference_cache.names_for(signals.mitre_ids))
+
     # De-duplicate while preserving order so the reasons read predictably.
     signals.mitre_names = list(dict.fromkeys(n.strip() for n in signals.mitre_names if n.strip()))
     signals.rule_groups = list(dict.fromkeys(g.strip() for g in signals.rule_groups if g.strip()))
@@ -463,6 +505,7 @@ async def enrich_with_raw_event(
     signals.document_available = True
     _signals_from_document(signals, raw_event)
 
+    signals.mitre_names.extend(mitre_reference_cache.names_for(signals.mitre_ids))
     signals.mitre_names = list(dict.fromkeys(n.strip() for n in signals.mitre_names if n.strip()))
     signals.rule_groups = list(dict.fromkeys(g.strip() for g in signals.rule_groups if g.strip()))
     return signals
@@ -755,14 +798,20 @@ def score_template(
     usage_counts: Dict[int, int],
     *,
     corpus: Optional[TemplateCorpus] = None,
+    topical: bool = True,
 ) -> Tuple[int, List[SuggestionReason], Optional[bool]]:
     """Score one template. Returns ``(score, reasons, condition_result)``.
 
     ``condition_result`` is passed back so the caller can drop templates whose
     auto-apply condition was evaluated and failed — that is a filtering
     decision, not a scoring one.
+
+    ``topical=False`` skips the tag, MITRE, rule-group and keyword scorers. The
+    caller passes it only for templates ``TemplateIndex.topical_candidates``
+    has already ruled out, where each of them would score nothing.
     """
-    corpus = corpus or build_template_corpus(template)
+    if topical:
+        corpus = corpus or build_template_corpus(template)
     reasons: List[SuggestionReason] = []
     score = 0
 
@@ -786,10 +835,11 @@ def score_template(
         )
 
     score += _score_scope(template, signals, reasons)
-    score += _score_tags(corpus, signals, reasons)
-    score += _score_mitre(corpus, signals, reasons)
-    score += _score_rule_groups(corpus, signals, reasons)
-    score += _score_keywords(corpus, signals, reasons)
+    if topical:
+        score += _score_tags(corpus, signals, reasons)
+        score += _score_mitre(corpus, signals, reasons)
+        score += _score_rule_groups(corpus, signals, reasons)
+        score += _score_keywords(corpus, signals, reasons)
 
     usage = usage_counts.get(template.id, 0)
     usage_points = _usage_points(usage)
@@ -849,6 +899,175 @@ async def _load_candidate_templates(session: AsyncSession) -> List[CaseTemplate]
     return list((await session.execute(stmt)).scalars().all())
 
 
+# ---------------------------------------------------------------------------
+# Template index
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class IndexedTemplate:
+    """A template as the index holds it, detached from any session.
+
+    Carries the ``CaseTemplate`` columns scope filtering and scoring read, so
+    ``_in_scope`` and ``score_template`` take it in place of the ORM row, plus
+    the corpus and the preview response, built once when the index is.
+    """
+
+    id: int
+    name: str
+    customer_code: Optional[str]
+    source: Optional[str]
+    is_default: bool
+    match_field: Optional[str]
+    match_value: Optional[str]
+    corpus: TemplateCorpus
+    response: CaseTemplateResponse
+
+    @classmethod
+    def from_template(cls, template: CaseTemplate) -> "IndexedTemplate":
+        return cls(
+            id=template.id,
+            name=template.name,
+            customer_code=template.customer_code,
+            source=template.source,
+            is_default=template.is_default,
+            match_field=template.match_field,
+            match_value=template.match_value,
+            corpus=build_template_corpus(template),
+            response=_template_to_response(template),
+        )
+
+
+@dataclass
+class TemplateIndex:
+    """Every template, with postings from corpus token and MITRE id to template ids."""
+
+    templates: List[IndexedTemplate] = dataclass_field(default_factory=list)
+    by_token: Dict[str, Set[int]] = dataclass_field(default_factory=dict)
+    by_mitre: Dict[str, Set[int]] = dataclass_field(default_factory=dict)
+
+    @classmethod
+    def build(cls, templates: Iterable[CaseTemplate]) -> "TemplateIndex":
+        index = cls()
+        for template in templates:
+            indexed = IndexedTemplate.from_template(template)
+            index.templates.append(indexed)
+            for token in indexed.corpus.tokens:
+                index.by_token.setdefault(token, set()).add(indexed.id)
+            for technique_id in indexed.corpus.mitre_ids:
+                index.by_mitre.setdefault(technique_id, set()).add(indexed.id)
+        return index
+
+    def _phrase(self, phrase: str) -> Set[int]:
+        # Every token of a phrase ``_contains_phrase`` matches is a corpus token,
+        # so intersecting their postings cannot lose a match.
+        tokens = [t for t in _tokenize(phrase) if len(t) >= _MIN_TOKEN_LENGTH]
+        if not tokens:
+            return set()
+        found = set(self.by_token.get(tokens[0], ()))
+        for token in tokens[1:]:
+            found &= self.by_token.get(token, set())
+        return found
+
+    def _mitre(self, technique_ids: Iterable[str]) -> Set[int]:
+        found: Set[int] = set()
+        for technique_id in technique_ids:
+            found |= self.by_mitre.get(technique_id, set())
+        return found
+
+    def topical_candidates(self, signals: AlertSignals) -> Set[int]:
+        """Ids of the templates a topical scorer could give points to.
+
+        A superset: the scorers still decide. Any template left out would have
+        scored nothing on tags, MITRE, rule groups and keywords.
+        """
+        found: Set[int] = set()
+        for tag in signals.tags:
+            mitre_in_tag = _extract_mitre_ids(tag)
+            found |= self._mitre(mitre_in_tag) if mitre_in_tag else self._phrase(tag)
+        found |= self._mitre(signals.mitre_ids)
+        found |= self._mitre(filter(None, map(_mitre_parent, signals.mitre_ids)))
+        for name in signals.mitre_names:
+            found |= self._phrase(name)
+        for group in signals.rule_groups:
+            if group.lower() not in _GENERIC_RULE_GROUPS:
+                found |= self._phrase(group)
+        for keyword in signals.keywords:
+            found |= self.by_token.get(keyword, set())
+        return found
+
+
+_index: Optional[TemplateIndex] = None
+_index_loaded_at = 0.0
+_index_generation = 0
+
+# customer_code (None = unscoped) -> (loaded at, template id -> distinct cases)
+_usage: Dict[Optional[str], Tuple[float, Dict[int, int]]] = {}
+_usage_generation = 0
+
+_index_loads = 0
+_index_invalidations = 0
+_usage_loads = 0
+_usage_hits = 0
+_suggestions = 0
+_templates_ranked = 0
+_templates_scored_topically = 0
+
+
+def invalidate_template_index() -> None:
+    """Drop the template index; the next suggestion reloads it. Called on every template write."""
+    global _index, _index_generation, _index_invalidations
+
+    _index = None
+    _index_generation += 1
+    _index_invalidations += 1
+
+
+def invalidate_usage_counts(customer_code: Optional[str] = None) -> None:
+    """Drop cached usage counts for ``customer_code`` and the unscoped table, or all of them without one.
+
+    Called when a template is applied to a case.
+    """
+    global _usage_generation
+
+    if customer_code is None:
+        _usage.clear()
+    else:
+        _usage.pop(customer_code, None)
+        _usage.pop(None, None)
+    _usage_generation += 1
+
+
+async def _template_index(session: AsyncSession) -> TemplateIndex:
+    global _index, _index_loaded_at, _index_loads
+
+    index = _index
+    if index is not None and time.monotonic() - _index_loaded_at < INDEX_CACHE_SECONDS:
+        return index
+    generation = _index_generation
+    index = TemplateIndex.build(await _load_candidate_templates(session))
+    _index_loads += 1
+    # A template written while we were reading invalidated this load; use it once, keep nothing.
+    if generation == _index_generation:
+        _index, _index_loaded_at = index, time.monotonic()
+    return index
+
+
+async def _usage_counts(session: AsyncSession, customer_code: Optional[str]) -> Dict[int, int]:
+    global _usage_loads, _usage_hits
+
+    cached = _usage.get(customer_code)
+    if cached is not None and time.monotonic() - cached[0] < USAGE_CACHE_SECONDS:
+        _usage_hits += 1
+        return cached[1]
+    generation = _usage_generation
+    counts = await load_usage_counts(session, customer_code)
+    _usage_loads += 1
+    if generation == _usage_generation:
+        _usage[customer_code] = (time.monotonic(), counts)
+    return counts
+
+
 async def suggest_templates(
     session: AsyncSession,
     *,
@@ -894,8 +1113,8 @@ async def suggest_templates(
             source=source,
         )
 
-        templates = await _load_candidate_templates(session)
-        candidates = [t for t in templates if _in_scope(t, signals)]
+        index = await _template_index(session)
+        candidates = [t for t in index.templates if _in_scope(t, signals)]
 
         # Only pay for the indexer round-trip when an in-scope conditional
         # template keys on a field the stored context does not already carry.
@@ -907,30 +1126,25 @@ async def suggest_templates(
                 )
                 signals = await enrich_with_raw_event(signals, alert, session)
 
-        usage_counts = await load_usage_counts(session, signals.customer_code)
+        usage_counts = await _usage_counts(session, signals.customer_code)
+        topical = index.topical_candidates(signals)
 
-        suggestions: List[CaseTemplateSuggestion] = []
+        ranked: List[Tuple[IndexedTemplate, int, List[SuggestionReason], bool]] = []
         for template in candidates:
-            score, reasons, condition_result = score_template(template, signals, usage_counts)
+            score, reasons, condition_result = score_template(
+                template,
+                signals,
+                usage_counts,
+                corpus=template.corpus,
+                topical=template.id in topical,
+            )
 
             # A condition we checked and that came back false is the operator
             # saying "not this one". Drop it rather than ranking it low —
             # showing it invites an analyst to override a rule deliberately set.
             if condition_result is False:
                 continue
-
-            suggestions.append(
-                CaseTemplateSuggestion(
-                    # Reuse the list/CRUD serializer rather than validating the
-                    # ORM row directly: it sorts tasks by order_index, which is
-                    # the order the preview has to show them in.
-                    template=_template_to_response(template),
-                    score=score,
-                    confidence=_confidence_for(score),
-                    condition_matched=condition_result is True,
-                    reasons=sorted(reasons, key=lambda r: r.points, reverse=True),
-                ),
-            )
+            ranked.append((template, score, reasons, condition_result is True))
 
         # Condition-matched templates first, as a partition rather than a score
         # comparison — the operator's explicit "when eventID == 11, use this"
@@ -939,21 +1153,33 @@ async def suggest_templates(
         # is_default, then name: the last two make repeated calls return a
         # stable order, since a list that reshuffles between renders reads as
         # broken even when every score is right.
-        suggestions.sort(
-            key=lambda s: (
-                not s.condition_matched,
-                -s.score,
-                not s.template.is_default,
-                s.template.name.lower(),
+        ranked.sort(
+            key=lambda r: (
+                not r[3],
+                -r[1],
+                not r[0].is_default,
+                r[0].name.lower(),
             ),
         )
-        top = suggestions[: max(0, limit)] if limit else suggestions
+        top = [
+            CaseTemplateSuggestion(
+                # The index holds the list/CRUD serializer's output, tasks in
+                # order_index order — the order the preview has to show them in.
+                template=template.response,
+                score=score,
+                confidence=_confidence_for(score),
+                condition_matched=condition_matched,
+                reasons=sorted(reasons, key=lambda r: r.points, reverse=True),
+            )
+            for template, score, reasons, condition_matched in (ranked[: max(0, limit)] if limit else ranked)
+        ]
+        _record_suggestion(len(candidates), len(topical))
 
         return CaseTemplateSuggestionListResponse(
             suggestions=top,
-            total_candidates=len(suggestions),
+            total_candidates=len(ranked),
             success=True,
-            message=f"Ranked {len(suggestions)} applicable template(s)",
+            message=f"Ranked {len(ranked)} applicable template(s)",
         )
 
     except Exception as e:
@@ -965,12 +1191,48 @@ async def suggest_templates(
         )
 
 
+def _record_suggestion(ranked: int, scored_topically: int) -> None:
+    global _suggestions, _templates_ranked, _templates_scored_topically
+
+    _suggestions += 1
+    _templates_ranked += ranked
+    _templates_scored_topically += scored_topically
+
+
+def stats() -> Dict[str, Any]:
+    """Surfaced in GET /performance/caches."""
+    index = _index
+    return {
+        "loaded": index is not None,
+        "templates": len(index.templates) if index else 0,
+        "index_loads": _index_loads,
+        "index_invalidations": _index_invalidations,
+        "usage_tables": len(_usage),
+        "usage_loads": _usage_loads,
+        "usage_hits": _usage_hits,
+        "suggestions": _suggestions,
+        "templates_ranked": _templates_ranked,
+        "templates_scored_topically": _templates_scored_topically,
+    }
+
+
+def reset_stats() -> None:
+    global _index_loads, _index_invalidations, _usage_loads, _usage_hits, _suggestions, _templates_ranked, _templates_scored_topically
+
+    _index_loads = _index_invalidations = _usage_loads = _usage_hits = 0
+    _suggestions = _templates_ranked = _templates_scored_topically = 0
+
+
 __all__ = (
     "AlertSignals",
+    "IndexedTemplate",
     "TemplateCorpus",
+    "TemplateIndex",
     "build_alert_signals",
     "build_template_corpus",
     "enrich_with_raw_event",
+    "invalidate_template_index",
+    "invalidate_usage_counts",
     "load_usage_counts",
     "score_template",
     "suggest_templates",
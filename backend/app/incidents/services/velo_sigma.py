@@ -1,5 +1,4 @@
 import json
-import re
 from datetime import datetime
 from datetime import timedelta
 from typing import Any
@@ -11,7 +10,6 @@ from typing import Union
 from loguru import logger
 from sqlalchemy import func
 from sqlalchemy import select
-from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.connectors.wazuh_indexer.utils.universal import (
@@ -30,10 +28,12 @@ from app.incidents.schema.velo_sigma import SysmonEvent
 from app.incidents.schema.velo_sigma import VelociraptorSigmaAlert
 from app.incidents.schema.velo_sigma import VelociraptorSigmaAlertResponse
 from app.incidents.schema.velo_sigma import VeloSigmaExclusionCreate
+from app.incidents.services import velo_sigma_exclusions as exclusion_cache
 from app.incidents.services.db_operations import add_alert_tag_if_not_exists
 from app.incidents.services.db_operations import create_comment
 from app.incidents.services.incident_alert import create_alert
 from app.incidents.services.incident_alert import create_alert_full
+from app.incidents.services.velo_sigma_exclusions import CompiledExclusion
 
 
 class VeloSigmaExclusionService:
@@ -42,296 +42,69 @@ class VeloSigmaExclusionService:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def check_exclusions(self, alert: VelociraptorSigmaAlert) -> Optional[VeloSigmaExclusion]:
+    async def check_exclusions(self, alert: VelociraptorSigmaAlert) -> Optional[CompiledExclusion]:
         """
         Check if the given alert matches any exclusion rules.
 
+        Only the exclusions that could apply to the alert's channel and Sigma rule are
+        evaluated, against the compiled set in `velo_sigma_exclusions`.
+
         Args:
             alert: The Velociraptor Sigma alert to check
 
         Returns:
             The first matching exclusion rule, or None if no match is found
         """
-        # Get all enabled exclusions
-        stmt = select(VeloSigmaExclusion).where(VeloSigmaExclusion.enabled == True)
-        result = await self.session.execute(stmt)
-        exclusions = result.scalars().all()
-
-        if not exclusions:
+        candidate_exclusions = await exclusion_cache.candidates(self.session, alert.channel, alert.title)
+        if not candidate_exclusions:
             return None
 
-        # Parse the event data
         try:
-            parsed_event = alert.get_parsed_event()
-            logger.debug(f"Checking exclusions for alert | Channel: {alert.channel} | Type: {type(parsed_event).__name__}")
-            logger.debug(f"Parsed event: {parsed_event}")
-            event_data = {}
-
-            # Extract event data fields from different event types
-            if hasattr(parsed_event, "EventData"):
-                # First add all top-level fields
-                for attr_name in dir(parsed_event.EventData):
-                    if not attr_name.startswith("_") and not callable(getattr(parsed_event.EventData, attr_name)):
-                        try:
-                            value = getattr(parsed_event.EventData, attr_name)
-                            if not callable(value):
-                                event_data[attr_name] = str(value)
-                        except Exception:
-                            pass
-
-                # Special handling for PowerShell ContextInfo which contains Host Application
-                if hasattr(parsed_event.EventData, "ContextInfo") and parsed_event.EventData.ContextInfo:
-                    # Parse the ContextInfo string which contains multiple lines of key-value pairs
-                    context_info = parsed_event.EventData.ContextInfo
-                    logger.debug(f"Found ContextInfo in PowerShell event: {context_info}")
-
-                    for line in context_info.splitlines():
-                        line = line.strip()
-                        if line and " = " in line:
-                            key, value = line.split(" = ", 1)
-                            key = key.strip()
-                            # Add these fields with their original names for direct matching
-                            event_data[key] = value.strip()
-                            # Also add common CamelCase variations to make matching more flexible
-                            if " " in key:
-                                # Convert "Host Application" to "HostApplication"
-                                camel_key = "".join(word.capitalize() for word in key.split())
-                                camel_key = camel_key[0].lower() + camel_key[1:]  # lowerCamelCase
-                                event_data[camel_key] = value.strip()
-
-                # Log the extracted field names and values for debugging
-                for key, value in event_data.items():
-                    logger.debug(f"Extracted field: {key} = {value}")
-
+            event_data = self._extract_event_data(alert)
         except Exception as e:
             logger.error(f"Error parsing event data: {str(e)}")
             # If we can't parse the event, we won't exclude it
             return None
 
-        # Check each exclusion against this alert
-        for exclusion in exclusions:
-            logger.debug(f"Checking exclusion: {exclusion.name} (ID: {exclusion.id})")
-            if await self._matches_exclusion(alert, event_data, exclusion):
-                # Update match statistics
-                await self._update_exclusion_stats(exclusion.id)
-                return exclusion
-
-        return None
-
-    async def _matches_exclusion(self, alert: VelociraptorSigmaAlert, event_data: Dict[str, str], exclusion: VeloSigmaExclusion) -> bool:
-        """Check if the alert matches the given exclusion rule."""
-        # Check customer code if specified
-        if exclusion.customer_code and exclusion.customer_code != self._get_customer_code(alert):
-            logger.debug(f"Customer code mismatch: rule={exclusion.customer_code}, alert={self._get_customer_code(alert)}")
-            return False
-
-        # Check channel if specified
-        if exclusion.channel and exclusion.channel != alert.channel:
-            logger.debug(f"Channel mismatch: rule={exclusion.channel}, alert={alert.channel}")
-            return False
-
-        # Check title if specified
-        if exclusion.title and exclusion.title != alert.title:
-            logger.debug(f"Title mismatch: rule={exclusion.title}, alert={alert.title}")
-            return False
-
-        # Check field matches if specified
-        if exclusion.field_matches:
-            for field_name, field_value in exclusion.field_matches.items():
-                # Special handling for Host Application field
-                if field_name.lower() == "hostapplication" and field_name not in event_data:
-                    # Try common variations
-                    alternate_keys = ["Host Application", "HostApplication", "hostApplication"]
-                    found = False
-                    for alt_key in alternate_keys:
-                        if alt_key in event_data:
-                            field_name = alt_key  # Use the key that exists in the data
-                            found = True
-                            break
-                    if not found:
-                        logger.debug(f"Field '{field_name}' and its variations not found in event data")
-                        return False
-
-                # Direct match
-                if field_name in event_data:
-                    event_value = event_data[field_name]
-                    logger.debug(f"Checking field match: {field_name}={field_value} against {event_value}")
-
-                    # Support exact match or regex match
-                    if isinstance(field_value, str):
-                        if field_value.startswith("regex:"):
-                            # Remove the regex: prefix and try to match
-                            regex_pattern = field_value[6:]
-                            # Special handling for path-based regex patterns
-                            if (
-                                "path" in field_name.lower()
-                                or "file" in field_name.lower()
-                                or "\\" in regex_pattern
-                                or "/" in regex_pattern
-                            ):
-                                try:
-                                    # Normalize paths for comparison by converting all to lowercase and standardizing backslashes
-                                    pattern = regex_pattern.lower().replace("\\\\", "\\")
-                                    value = event_value.lower().replace("\\\\", "\\")
-
-                                    # Remove the regex: prefix if present
-                                    if pattern.startswith("regex:"):
-                                        pattern = pattern[6:]
-
-                                    # Handle escaped parentheses in Windows paths
-                                    pattern = pattern.replace("\\(", "(").replace("\\)", ")")
-
-                                    # Convert the wildcard pattern to proper regex format
-                                    # Escape special regex characters except for the wildcards we want to keep
-                                    pattern_parts = re.split(r"(\.\*)", pattern)
-                                    regex_parts = []
-
-                                    for i, part in enumerate(pattern_parts):
-                                        if part == ".*":
-                                            # Keep wildcards as-is
-                                            regex_parts.append(part)
-                                        else:
-                                            # Escape regex special characters but keep path separators
-                                            escaped = re.escape(part)
-                                            regex_parts.append(escaped)
-
-                                    pattern_regex = "".join(regex_parts)
-
-                                    # Force matching the entire string
-                                    pattern_regex = f"^{pattern_regex}$"
-
-                                    logger.debug(f"Path regex check: Pattern='{pattern}' → Regex='{pattern_regex}' vs Value='{value}'")
-
-                                    # Try the match
-                                    match_result = re.search(pattern_regex, value, re.IGNORECASE)
-                                    if match_result:
-                                        logger.debug(f"Path regex match succeeded! Match: {match_result.group(0)}")
-                                        return True
-                                    else:
-                                        logger.debug("Path regex match failed")
-                                        return False
-
-                                except Exception as e:
-                                    logger.error(f"Error in path regex matching: {str(e)}")
-                                    return False
-                            else:
-                                # Standard regex for non-path values
-                                try:
-                                    if not re.search(regex_pattern, event_value, re.IGNORECASE):
-                                        logger.debug(f"Regex pattern '{regex_pattern}' did not match '{event_value}'")
-                                        return False
-                                    else:
-                                        logger.debug(f"Regex pattern '{regex_pattern}' matched '{event_value}'")
-                                except re.error as e:
-                                    logger.error(f"Invalid regex pattern in exclusion {exclusion.id}: {regex_pattern} - Error: {str(e)}")
-                                    return False
-                        else:
-                            # Case-insensitive path comparison for Windows paths
-                            if "path" in field_name.lower() or "file" in field_name.lower() or "\\" in field_value or "/" in field_value:
-                                # Log raw values for debugging
-                                logger.debug(f"Before normalization - Rule: '{field_value}', Event: '{event_value}'")
-
-                                # Use the path normalization helper
-                                norm_field_value = self._normalize_windows_path(field_value)
-                                norm_event_value = self._normalize_windows_path(event_value)
-
-                                logger.debug(f"After normalization - Rule: '{norm_field_value}', Event: '{norm_event_value}'")
-
-                                if norm_field_value != norm_event_value:
-                                    logger.debug(f"Path mismatch: rule='{norm_field_value}' event='{norm_event_value}'")
-                                    return False
-                                else:
-                                    logger.debug(f"Path match found for: {field_name}")
-                            else:
-                                # Standard case-insensitive match for other fields
-                                if field_value.lower() != event_value.lower():
-                                    logger.debug(f"Case-insensitive match failed: rule='{field_value}' event='{event_value}'")
-                                    return False
-                    else:
-                        # For non-string values (like lists or objects), convert to string for comparison
-                        if str(field_value) != event_value:
-                            logger.debug(f"String conversion match failed: rule='{str(field_value)}' event='{event_value}'")
-                            return False
-                else:
-                    # If field doesn't exist in the event and we're looking for it, no match
-                    logger.debug(f"Field '{field_name}' not found in event data")
-                    logger.debug(f"Available fields: {', '.join(event_data.keys())}")
-                    return False
+        return exclusion_cache.first_match(candidate_exclusions, self._get_customer_code(alert), event_data)
 
-        # If we passed all checks, this is a match
-        logger.info(f"Alert matched exclusion rule '{exclusion.name}' (ID: {exclusion.id})")
-        return True
-
-    def _normalize_windows_path(self, path: str, is_regex: bool = False) -> str:
-        """
-        Normalize Windows paths by converting all backslash variations to a consistent format.
-
-        Args:
-            path: The path string to normalize
-            is_regex: Whether the path contains regex patterns that should be preserved
-
-        Returns:
-            Normalized path with consistent backslashes and formatting
-        """
-        if not path:
-            return ""
-
-        # Convert to lowercase for case-insensitive comparison
-        normalized = path.lower()
-
-        if is_regex:
-            # Special handling for regex patterns
-            # First, temporarily replace regex character classes with placeholders
-            placeholders = {}
-
-            # Find all character classes like [^\\] or [\\w] and preserve them
-            char_class_pattern = r"(\[\^?[^\]]*\])"
-            char_classes = re.finditer(char_class_pattern, normalized)
-
-            for i, match in enumerate(char_classes):
-                placeholder = f"__REGEX_PLACEHOLDER_{i}__"
-                placeholders[placeholder] = match.group(0)
-                normalized = normalized.replace(match.group(0), placeholder)
-
-        # Use regex to replace any sequence of one or more backslashes with a single backslash
-        # This handles \, \\, \\\, \\\\, etc.
-        normalized = re.sub(r"\\+", r"\\", normalized)
-
-        # Handle escaped special characters in paths
-        normalized = normalized.replace("\\(", "(").replace("\\)", ")")
-        normalized = normalized.replace("\\[", "[").replace("\\]", "]")
-        normalized = normalized.replace("\\ ", " ")
-
-        # Remove any trailing backslash
-        if normalized.endswith("\\"):
-            normalized = normalized[:-1]
-
-        if is_regex:
-            # Restore the regex character classes with their original content
-            for placeholder, original in placeholders.items():
-                normalized = normalized.replace(placeholder, original)
-
-        # Log only in debug for excessive paths
-        if path != normalized:
-            path_preview = path[:20] + "..." if len(path) > 20 else path
-            norm_preview = normalized[:20] + "..." if len(normalized) > 20 else normalized
-            logger.debug(f"Path normalized: '{path_preview}' → '{norm_preview}'")
-
-        return normalized
-
-    async def _update_exclusion_stats(self, exclusion_id: int) -> None:
-        """Update the statistics for an exclusion after it matches."""
-        try:
-            stmt = (
-                update(VeloSigmaExclusion)
-                .where(VeloSigmaExclusion.id == exclusion_id)
-                .values(last_matched_at=datetime.utcnow(), match_count=VeloSigmaExclusion.match_count + 1)
-            )
-            await self.session.execute(stmt)
-            await self.session.commit()
-        except Exception as e:
-            logger.error(f"Error updating exclusion stats: {str(e)}")
-            # Don't raise the error, just log it
+    @staticmethod
+    def _extract_event_data(alert: VelociraptorSigmaAlert) -> Dict[str, str]:
+        """Flatten the alert's EventData (and PowerShell ContextInfo) into field name -> string value."""
+        parsed_event = alert.get_parsed_event()
+        logger.debug(f"Checking exclusions for alert | Channel: {alert.channel} | Type: {type(parsed_event).__name__}")
+        event_data = {}
+
+        # Extract event data fields from different event types
+        if hasattr(parsed_event, "EventData"):
+            # First add all top-level fields
+            for attr_name in dir(parsed_event.EventData):
+                if not attr_name.startswith("_") and not callable(getattr(parsed_event.EventData, attr_name)):
+                    try:
+                        value = getattr(parsed_event.EventData, attr_name)
+                        if not callable(value):
+                            event_data[attr_name] = str(value)
+                    except Exception:
+                        pass
+
+            # Special handling for PowerShell ContextInfo which contains Host Application
+            if hasattr(parsed_event.EventData, "ContextInfo") and parsed_event.EventData.ContextInfo:
+                # Parse the ContextInfo string which contains multiple lines of key-value pairs
+                for line in parsed_event.EventData.ContextInfo.splitlines():
+                    line = line.strip()
+                    if line and " = " in line:
+                        key, value = line.split(" = ", 1)
+                        key = key.strip()
+                        # Add these fields with their original names for direct matching
+                        event_data[key] = value.strip()
+                        # Also add common CamelCase variations to make matching more flexible
+                        if " " in key:
+                            # Convert "Host Application" to "HostApplication"
+                            camel_key = "".join(word.capitalize() for word in key.split())
+                            camel_key = camel_key[0].lower() + camel_key[1:]  # lowerCamelCase
+                            event_data[camel_key] = value.strip()
+
+        return event_data
 
     def _get_customer_code(self, alert: VelociraptorSigmaAlert) -> str:
         """Extract or determine customer code from the alert."""
@@ -351,6 +124,7 @@ class VeloSigmaExclusionService:
         db_exclusion = VeloSigmaExclusion(**exclusion_data)
         self.session.add(db_exclusion)
         await self.session.commit()
+        exclusion_cache.invalidate()
         await self.session.refresh(db_exclusion)
         return db_exclusion
 
@@ -362,6 +136,7 @@ class VeloSigmaExclusionService:
 
     async def list_exclusions(self, skip: int = 0, limit: int = 100, enabled_only: bool = False) -> List[VeloSigmaExclusion]:
         """List all exclusion rules with pagination."""
+        await exclusion_cache.flush_match_stats()
         query = select(VeloSigmaExclusion)
         if enabled_only:
             query = query.where(VeloSigmaExclusion.enabled == True)
@@ -381,6 +156,7 @@ class VeloSigmaExclusionService:
                 setattr(db_exclusion, key, value)
 
         await self.session.commit()
+        exclusion_cache.invalidate()
         await self.session.refresh(db_exclusion)
         return db_exclusion
 
@@ -392,6 +168,7 @@ class VeloSigmaExclusionService:
 
         await self.session.delete(db_exclusion)
         await self.session.commit()
+        exclusion_cache.invalidate()
         return True
 
     async def list_exclusions_with_count(self, skip: int = 0, limit: int = 100, enabled_only: bool = False) -> tuple[list, int]:
@@ -406,6 +183,8 @@ class VeloSigmaExclusionService:
         Returns:
             Tuple of (list of exclusions, total count)
         """
+        # Pending match counts first, so the list shows them.
+        await exclusion_cache.flush_match_stats()
         query = select(VeloSigmaExclusion)
 
         if enabled_only:
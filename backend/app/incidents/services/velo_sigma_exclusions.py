@@ -0,0 +1,386 @@
+"""Compiled, in-memory Velociraptor Sigma exclusions.
+
+`VeloSigmaExclusionService.check_exclusions` used to read every enabled exclusion
+from MySQL for every incoming Sigma alert, walk them all in turn, and for each
+field re-normalise the rule's path and rebuild its regex from the source string.
+A match then cost a separate UPDATE and commit for `match_count`. On a busy
+Velociraptor deployment that was one SELECT plus N regex compilations per alert,
+and a write per excluded alert — the excluded ones being the noisiest.
+
+Exclusions now live here, compiled once:
+
+* **Loaded once, invalidated on change.** The enabled rows are read on first use
+  and compiled into `CompiledExclusion` matchers: regexes built, rule-side paths
+  normalised. Create, update and delete call `invalidate()`; a TTL
+  (`VELO_SIGMA_EXCLUSION_CACHE_SECONDS`) picks up edits made by another worker.
+* **Only candidates are evaluated.** Exclusions are indexed by `(channel, title)`
+  with `None` as the wildcard, so an alert is only checked against the rules that
+  could match its channel and Sigma rule; each candidate then needs its fields to
+  be present before any value is compared. Alerts with no candidate skip event
+  parsing altogether.
+* **Match statistics are batched.** A match increments an in-memory counter; a
+  background flusher writes one UPDATE per exclusion every
+  `VELO_SIGMA_EXCLUSION_STATS_FLUSH_SECONDS`. The list endpoint flushes before it
+  reads, and the app lifespan flushes on shutdown.
+
+Matching semantics are unchanged, including that a path regex decides the match
+on its own without the remaining fields being checked.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import datetime
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from loguru import logger
+from sqlalchemy import case
+from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.db_session import async_engine
+from app.incidents.models import VeloSigmaExclusion
+
+
+def _env_number(name: str, default, cast):
+    raw = os.getenv(name, str(default))
+    try:
+        value = cast(raw)
+    except ValueError:
+        logger.warning(f"{name}={raw!r} is not a number; falling back to {default}")
+        return default
+    return value if value > 0 else default
+
+
+#: Longest a compiled set is trusted before it is re-read, for edits made in another process.
+CACHE_SECONDS = _env_number("VELO_SIGMA_EXCLUSION_CACHE_SECONDS", 60.0, float)
+
+#: How often pending match counts are written back.
+STATS_FLUSH_SECONDS = _env_number("VELO_SIGMA_EXCLUSION_STATS_FLUSH_SECONDS", 30.0, float)
+
+_HOST_APPLICATION_KEYS = ("Host Application", "HostApplication", "hostApplication")
+
+# A field check either rejects the exclusion (False), passes on to the next field
+# (None), or — for path regexes, as before — accepts it outright (True).
+FieldCheck = Callable[[str], Optional[bool]]
+
+
+def normalize_windows_path(path: str, is_regex: bool = False) -> str:
+    """
+    Normalize Windows paths by converting all backslash variations to a consistent format.
+
+    Args:
+        path: The path string to normalize
+        is_regex: Whether the path contains regex patterns that should be preserved
+
+    Returns:
+        Normalized path with consistent backslashes and formatting
+    """
+    if not path:
+        return ""
+
+    # Convert to lowercase for case-insensitive comparison
+    normalized = path.lower()
+
+    if is_regex:
+        # Temporarily replace regex character classes like [^\\] or [\\w] with placeholders
+        placeholders = {}
+        for i, match in enumerate(re.finditer(r"(\[\^?[^\]]*\])", normalized)):
+            placeholder = f"__REGEX_PLACEHOLDER_{i}__"
+            placeholders[placeholder] = match.group(0)
+            normalized = normalized.replace(match.group(0), placeholder)
+
+    # Replace any run of backslashes (\, \\, \\\, ...) with a single one
+    normalized = re.sub(r"\\+", r"\\", normalized)
+
+    # Handle escaped special characters in paths
+    normalized = normalized.replace("\\(", "(").replace("\\)", ")")
+    normalized = normalized.replace("\\[", "[").replace("\\]", "]")
+    normalized = normalized.replace("\\ ", " ")
+
+    # Remove any trailing backslash
+    if normalized.endswith("\\"):
+        normalized = normalized[:-1]
+
+    if is_regex:
+        for placeholder, original in placeholders.items():
+            normalized = normalized.replace(placeholder, original)
+
+    return normalized
+
+
+def _is_path_like(field_name: str, value: str) -> bool:
+    lowered = field_name.lower()
+    return "path" in lowered or "file" in lowered or "\\" in value or "/" in value
+
+
+def _path_regex(regex_pattern: str) -> "re.Pattern[str]":
+    """The anchored regex a `regex:` path rule has always been evaluated as."""
+    pattern = regex_pattern.lower().replace("\\\\", "\\")
+    if pattern.startswith("regex:"):
+        pattern = pattern[6:]
+    pattern = pattern.replace("\\(", "(").replace("\\)", ")")
+    # Only `.*` is a wildcard; everything else in a path rule is literal.
+    parts = [part if part == ".*" else re.escape(part) for part in re.split(r"(\.\*)", pattern)]
+    return re.compile(f"^{''.join(parts)}$", re.IGNORECASE)
+
+
+def _compile_field(exclusion_id: int, field_name: str, field_value: Any) -> FieldCheck:
+    if not isinstance(field_value, str):
+        expected = str(field_value)
+        return lambda value: None if value == expected else False
+
+    if field_value.startswith("regex:"):
+        regex_pattern = field_value[6:]
+        if _is_path_like(field_name, regex_pattern):
+            try:
+                path_regex = _path_regex(regex_pattern)
+            except re.error as e:
+                logger.error(f"Invalid path regex in exclusion {exclusion_id}: {regex_pattern} - Error: {str(e)}")
+                return lambda value: False
+            return lambda value: path_regex.search(value.lower().replace("\\\\", "\\")) is not None
+        try:
+            value_regex = re.compile(regex_pattern, re.IGNORECASE)
+        except re.error as e:
+            logger.error(f"Invalid regex pattern in exclusion {exclusion_id}: {regex_pattern} - Error: {str(e)}")
+            return lambda value: False
+        return lambda value: None if value_regex.search(value) else False
+
+    if _is_path_like(field_name, field_value):
+        expected = normalize_windows_path(field_value)
+        return lambda value: None if normalize_windows_path(value) == expected else False
+
+    expected = field_value.lower()
+    return lambda value: None if value.lower() == expected else False
+
+
+@dataclass
+class CompiledExclusion:
+    """An enabled exclusion with its field checks built once."""
+
+    id: int
+    name: str
+    customer_code: Optional[str]
+    channel: Optional[str]
+    title: Optional[str]
+    # (keys to look the field up under, check) in the rule's field order.
+    fields: List[Tuple[Tuple[str, ...], FieldCheck]] = field(default_factory=list)
+
+    @classmethod
+    def from_row(cls, exclusion: VeloSigmaExclusion) -> "CompiledExclusion":
+        compiled = cls(
+            id=exclusion.id,
+            name=exclusion.name,
+            customer_code=exclusion.customer_code,
+            channel=exclusion.channel,
+            title=exclusion.title,
+        )
+        for field_name, field_value in (exclusion.field_matches or {}).items():
+            keys = (field_name,)
+            if field_name.lower() == "hostapplication":
+                keys += tuple(key for key in _HOST_APPLICATION_KEYS if key != field_name)
+            compiled.fields.append((keys, _compile_field(exclusion.id, field_name, field_value)))
+        return compiled
+
+    def matches(self, customer_code: str, event_data: Dict[str, str]) -> bool:
+        if self.customer_code and self.customer_code != customer_code:
+            return False
+        for keys, check in self.fields:
+            key = next((key for key in keys if key in event_data), None)
+            if key is None:
+                logger.debug(f"Exclusion {self.id}: field '{keys[0]}' not found in event data")
+                return False
+            outcome = check(event_data[key])
+            if outcome is not None:
+                return outcome
+        return True
+
+
+# (channel, title) -> exclusions in id order; None in either position matches any value.
+_index: Optional[Dict[Tuple[Optional[str], Optional[str]], List[CompiledExclusion]]] = None
+_loaded_at = 0.0
+_generation = 0
+
+_pending: Dict[int, Tuple[int, datetime]] = {}
+_flush_lock = asyncio.Lock()
+_flusher: Optional[asyncio.Task] = None
+_flusher_loop: Optional[asyncio.AbstractEventLoop] = None
+
+_loads = 0
+_invalidations = 0
+_checks = 0
+_evaluated = 0
+_matches = 0
+_stat_flushes = 0
+_failed_stat_flushes = 0
+
+
+def invalidate() -> None:
+    """Drop the compiled set; the next check re-reads the table. Called on every exclusion write."""
+    global _index, _generation, _invalidations
+
+    _index = None
+    _generation += 1
+    _invalidations += 1
+
+
+def _build_index(rows: Sequence[VeloSigmaExclusion]) -> Dict[Tuple[Optional[str], Optional[str]], List[CompiledExclusion]]:
+    index: Dict[Tuple[Optional[str], Optional[str]], List[CompiledExclusion]] = {}
+    for row in sorted(rows, key=lambda row: row.id):
+        compiled = CompiledExclusion.from_row(row)
+        index.setdefault((compiled.channel or None, compiled.title or None), []).append(compiled)
+    return index
+
+
+async def _compiled(session: AsyncSession) -> Dict[Tuple[Optional[str], Optional[str]], List[CompiledExclusion]]:
+    global _index, _loaded_at, _loads
+
+    index = _index
+    if index is not None and time.monotonic() - _loaded_at < CACHE_SECONDS:
+        return index
+    generation = _generation
+    result = await session.execute(select(VeloSigmaExclusion).where(VeloSigmaExclusion.enabled == True))  # noqa: E712
+    index = _build_index(result.scalars().all())
+    _loads += 1
+    # An exclusion written while we were reading invalidated this load; use it once, keep nothing.
+    if generation == _generation:
+        _index, _loaded_at = index, time.monotonic()
+    return index
+
+
+async def candidates(session: AsyncSession, channel: Optional[str], title: Optional[str]) -> List[CompiledExclusion]:
+    """The enabled exclusions that could match an alert on `channel` from Sigma rule `title`, in id order."""
+    index = await _compiled(session)
+    buckets = [index.get(key) for key in {(channel, title), (channel, None), (None, title), (None, None)}]
+    found = [exclusion for bucket in buckets if bucket for exclusion in bucket]
+    found.sort(key=lambda exclusion: exclusion.id)
+    return found
+
+
+def first_match(
+    candidate_exclusions: Sequence[CompiledExclusion],
+    customer_code: str,
+    event_data: Dict[str, str],
+) -> Optional[CompiledExclusion]:
+    """The first candidate the event matches, recording the match for the next stats flush."""
+    global _checks, _evaluated, _matches
+
+    _checks += 1
+    for exclusion in candidate_exclusions:
+        _evaluated += 1
+        if exclusion.matches(customer_code, event_data):
+            _matches += 1
+            logger.info(f"Alert matched exclusion rule '{exclusion.name}' (ID: {exclusion.id})")
+            record_match(exclusion.id)
+            return exclusion
+    return None
+
+
+def record_match(exclusion_id: int) -> None:
+    count, _ = _pending.get(exclusion_id, (0, None))
+    _pending[exclusion_id] = (count + 1, datetime.utcnow())
+    _ensure_flusher()
+
+
+def _ensure_flusher() -> None:
+    global _flusher, _flusher_loop
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    if _flusher is not None and _flusher_loop is loop and not _flusher.done():
+        return
+    _flusher_loop = loop
+    _flusher = loop.create_task(_flush_periodically())
+
+
+async def _flush_periodically() -> None:
+    while True:
+        await asyncio.sleep(STATS_FLUSH_SECONDS)
+        await flush_match_stats()
+
+
+async def _write(pending: Dict[int, Tuple[int, datetime]]) -> None:
+    async with AsyncSession(async_engine) as session:
+        for exclusion_id, (count, last_matched_at) in pending.items():
+            await session.execute(
+                update(VeloSigmaExclusion)
+                .where(VeloSigmaExclusion.id == exclusion_id)
+                .values(
+                    match_count=VeloSigmaExclusion.match_count + count,
+                    last_matched_at=case(
+                        (VeloSigmaExclusion.last_matched_at > last_matched_at, VeloSigmaExclusion.last_matched_at),
+                        else_=last_matched_at,
+                    ),
+                ),
+            )
+        await session.commit()
+
+
+async def flush_match_stats() -> int:
+    """Write pending match counts, one UPDATE per exclusion. Returns the number of matches written."""
+    global _pending, _stat_flushes, _failed_stat_flushes
+
+    async with _flush_lock:
+        if not _pending:
+            return 0
+        pending, _pending = _pending, {}
+        try:
+            await _write(pending)
+        except Exception as e:  # noqa: BLE001 - the counts are merged back for the next flush
+            _failed_stat_flushes += 1
+            logger.error(f"Error updating exclusion stats: {str(e)}")
+            for exclusion_id, (count, last_matched_at) in pending.items():
+                newer_count, newer_at = _pending.get(exclusion_id, (0, last_matched_at))
+                _pending[exclusion_id] = (count + newer_count, max(last_matched_at, newer_at))
+            return 0
+        _stat_flushes += 1
+        return sum(count for count, _ in pending.values())
+
+
+async def close_match_stats() -> None:
+    """Stop the background flusher and write what is left. Called from the app lifespan."""
+    global _flusher, _flusher_loop
+
+    flusher = _flusher
+    _flusher = _flusher_loop = None
+    if flusher is not None and not flusher.done():
+        flusher.cancel()
+        await asyncio.gather(flusher, return_exceptions=True)
+    await flush_match_stats()
+
+
+def stats() -> Dict[str, Any]:
+    """Surfaced in the performance session log and GET /performance/caches."""
+    index = _index
+    return {
+        "loaded": index is not None,
+        "exclusions": sum(len(bucket) for bucket in index.values()) if index else 0,
+        "loads": _loads,
+        "invalidations": _invalidations,
+        "checks": _checks,
+        "candidates_evaluated": _evaluated,
+        "matches": _matches,
+        "pending_match_updates": sum(count for count, _ in _pending.values()),
+        "stat_flushes": _stat_flushes,
+        "failed_stat_flushes": _failed_stat_flushes,
+    }
+
+
+def reset_stats() -> None:
+    global _loads, _invalidations, _checks, _evaluated, _matches, _stat_flushes, _failed_stat_flushes
+
+    _loads = _invalidations = _checks = _evaluated = _matches = _stat_flushes = _failed_stat_flushes = 0
@@ -18,13 +18,22 @@ This mixin gives all four caches the same contract:
 
 The host class supplies `is_stale` and `refresh()`; `refresh()` is expected to
 handle its own failures, as all four already do.
+
+A cache that sets `snapshot_name` is also persisted to disk (see
+`catalog_snapshots`): it supplies `_snapshot_state()` and
+`_restore_snapshot(state)`, and the mixin reads the snapshot back once, before
+the first load, so a restart serves the last catalog instead of an empty one.
 """
 
 import asyncio
+from typing import Any
+from typing import Dict
 from typing import Optional
 
 from loguru import logger
 
+from app.integrations.copilot_searches.services import catalog_snapshots
+
 
 class BackgroundRefreshMixin:
     """Adds non-blocking refresh to a cache exposing `is_stale` and `refresh()`."""
@@ -33,6 +42,10 @@ class BackgroundRefreshMixin:
     # needs no cooperation from each cache's __init__.
     _refresh_task: Optional[asyncio.Task] = None
 
+    #: Snapshot file name (without extension); None keeps the cache memory-only.
+    snapshot_name: Optional[str] = None
+    _snapshot_checked: bool = False
+
     @property
     def is_loading(self) -> bool:
         """True while a background refresh is in flight."""
@@ -59,8 +72,51 @@ class BackgroundRefreshMixin:
     async def _background_refresh(self) -> None:
         name = type(self).__name__
         try:
+            # A snapshot young enough to be fresh makes the download unnecessary.
+            if await self.load_snapshot() and not self.is_stale:
+                return
             await self.refresh()
         except Exception as exc:  # noqa: BLE001 — a refresh must never escape into a request
             logger.warning(f"Background refresh of {name} failed: {exc}")
         finally:
             self._refresh_task = None
+
+    async def load_snapshot(self) -> bool:
+        """Restore the on-disk snapshot once, before the first load. True if one was restored."""
+        if self.snapshot_name is None or self._snapshot_checked:
+            return False
+        async with self._lock:
+            return await self._load_snapshot_locked()
+
+    async def _load_snapshot_locked(self) -> bool:
+        # For `refresh()`, which already holds the lock: a conditional refresh
+        # needs the change tokens the snapshot carries.
+        if self.snapshot_name is None or self._snapshot_checked:
+            return False
+        self._snapshot_checked = True
+        if self._last_refresh is not None:
+            return False
+        loaded = await catalog_snapshots.read(self.snapshot_name)
+        if loaded is None:
+            return False
+        state, saved_at = loaded
+        try:
+            self._restore_snapshot(state)
+        except Exception as exc:  # noqa: BLE001 — a bad snapshot only costs the cold start it was meant to save
+            logger.warning(f"Ignoring {self.snapshot_name} snapshot: {exc}")
+            return False
+        self._last_refresh = saved_at
+        logger.info(f"Restored {type(self).__name__} from its snapshot saved at {saved_at.isoformat()}")
+        return True
+
+    async def save_snapshot(self) -> None:
+        """Persist the current contents; a no-op for memory-only caches."""
+        if self.snapshot_name is None or self._last_refresh is None:
+            return
+        await catalog_snapshots.write(self.snapshot_name, self._snapshot_state(), self._last_refresh)
+
+    def _snapshot_state(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def _restore_snapshot(self, state: Dict[str, Any]) -> None:
+        raise NotImplementedError
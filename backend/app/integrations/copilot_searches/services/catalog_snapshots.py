@@ -0,0 +1,142 @@
+"""On-disk snapshots of the Detections Catalog caches.
+
+`RulesCache`, `MitreMatrix` and `WazuhRulesCache` live in process memory, so
+every restart began with an empty catalog: a few thousand raw GitHub downloads
+for the rules, a 40 MB STIX bundle for the matrix and an 80–110s `GET /rules`
+against the Wazuh Manager, all before the first page could show anything.
+
+Each cache now writes a compact snapshot of what it holds after a refresh that
+changed it, and reads it back before its first load:
+
+* **Format.** One gzipped JSON document per cache, ``<name>.json.gz`` in
+  `SNAPSHOT_DIR` (``backend/data/catalog_snapshots`` by default — the directory
+  docker-compose already persists). The document is
+  ``{"format": 1, "saved_at": <ISO time>, "state": {...}}``; ``state`` is
+  whatever the cache needs to resume, including the change tokens (commit
+  SHA, blob SHAs, ETag) its next conditional refresh starts from.
+* **Freshness.** A restored cache counts as refreshed at ``saved_at``, so a
+  restart inside the TTL serves the snapshot without touching the network, and
+  an older snapshot is served while the usual background refresh runs.
+* **Writes are atomic** (temporary file, then `os.replace`), and both reads and
+  writes run on a worker thread. A missing, corrupt or foreign snapshot, or a
+  read-only data directory, is logged and otherwise ignored: the cache simply
+  loads the way it always has.
+* **Air-gapped installs.** The snapshot files are self-contained and portable.
+  Copy them from a connected install into `SNAPSHOT_DIR` and set
+  ``CATALOG_OFFLINE=true``: the GitHub-backed caches then serve the snapshot
+  and never reach out to GitHub.
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from loguru import logger
+
+from app.blocking import run_blocking
+
+FORMAT_VERSION = 1
+
+SNAPSHOT_DIR = os.getenv("CATALOG_SNAPSHOT_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))),
+    "data",
+    "catalog_snapshots",
+)
+
+#: Serve the GitHub-backed caches from their snapshots only, never from GitHub.
+OFFLINE = os.getenv("CATALOG_OFFLINE", "false").strip().lower() in ("1", "true", "yes")
+
+_reads = 0
+_restored = 0
+_writes = 0
+_failed_writes = 0
+
+
+def snapshot_path(name: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, f"{name}.json.gz")
+
+
+def _read(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        logger.warning(f"Ignoring unreadable catalog snapshot {path}: {exc}")
+        return None
+    if not isinstance(payload, dict) or payload.get("format") != FORMAT_VERSION or not isinstance(payload.get("state"), dict):
+        logger.warning(f"Ignoring catalog snapshot {path}: unknown format")
+        return None
+    return payload
+
+
+def _write(path: str, payload: Dict[str, Any]) -> int:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        # YAML can hand back dates; they are stored as their ISO strings.
+        with gzip.open(temporary, "wt", encoding="utf-8", compresslevel=6) as handle:
+            json.dump(payload, handle, separators=(",", ":"), default=str)
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+    return os.path.getsize(path)
+
+
+async def read(name: str) -> Optional[Tuple[Dict[str, Any], datetime]]:
+    """The saved ``(state, saved_at)`` for cache ``name``, or None when there is no usable snapshot."""
+    global _reads, _restored
+
+    _reads += 1
+    path = snapshot_path(name)
+    payload = await run_blocking(_read, path)
+    if payload is None:
+        return None
+    try:
+        saved_at = datetime.fromisoformat(payload["saved_at"])
+    except (KeyError, TypeError, ValueError):
+        logger.warning(f"Ignoring catalog snapshot {path}: no saved_at")
+        return None
+    _restored += 1
+    return payload["state"], saved_at
+
+
+async def write(name: str, state: Dict[str, Any], saved_at: datetime) -> bool:
+    """Persist ``state`` for cache ``name``. Never raises; returns whether it was written."""
+    global _writes, _failed_writes
+
+    path = snapshot_path(name)
+    payload = {"format": FORMAT_VERSION, "saved_at": saved_at.isoformat(), "state": state}
+    try:
+        size = await run_blocking(_write, path, payload)
+    except (OSError, TypeError, ValueError) as exc:
+        _failed_writes += 1
+        logger.warning(f"Could not write catalog snapshot {path}: {exc}")
+        return False
+    _writes += 1
+    logger.info(f"Wrote catalog snapshot {path} ({size} bytes)")
+    return True
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "directory": SNAPSHOT_DIR,
+        "offline": OFFLINE,
+        "reads": _reads,
+        "restored": _restored,
+        "writes": _writes,
+        "failed_writes": _failed_writes,
+    }
+
+
+def reset_stats() -> None:
+    global _reads, _restored, _writes, _failed_writes
+
+    _reads = _restored = _writes = _failed_writes = 0
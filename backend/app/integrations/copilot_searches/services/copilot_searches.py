@@ -58,6 +58,7 @@ from app.integrations.copilot_searches.schema.copilot_searches import SearchHit
 from app.integrations.copilot_searches.schema.copilot_searches import (
     SearchValidationError,
 )
+from app.integrations.copilot_searches.services import catalog_snapshots
 from app.integrations.copilot_searches.services.cache_support import (
     BackgroundRefreshMixin,
 )
@@ -191,6 +192,110 @@ def category_from_path(file_path: str) -> str:
     return UNCATEGORIZED
 
 
+# =============================================================================
+# Rule Index
+# =============================================================================
+
+_WORD = re.compile(r"\w+")
+
+
+def _lower(value: Any) -> str:
+    return value.lower() if isinstance(value, str) else ""
+
+
+class RuleIndex:
+    """
+    Posting lists over the cached rules, built once per refresh.
+
+    The rules list is filtered on every keystroke in the catalog UI; scanning
+    every rule dict per filter and re-sorting the result each time made that
+    cost grow with the repository. Rules are numbered by their position in name
+    order, each filter value maps to the set of positions carrying it, and a
+    filtered page is the sorted intersection of the sets a request names.
+
+    Matching is unchanged. MITRE IDs still match as case-insensitive
+    substrings: the postings are keyed by the few hundred distinct IDs and a
+    query unions every key containing it. Text search narrows to rules with a
+    word containing the query's longest word — any rule whose name or
+    description contains the query has one — and only those candidates get the
+    substring check.
+    """
+
+    def __init__(self, rules: list[dict]):
+        # Stable, so rules with the same name keep the cache's order as before.
+        self.ordered = sorted(rules, key=lambda r: _lower(r.get("name")))
+        self.names = [_lower(rule.get("name")) for rule in self.ordered]
+        self.descriptions = [_lower(rule.get("description")) for rule in self.ordered]
+        self.by_platform: dict[str, set[int]] = {}
+        self.by_category: dict[str, set[int]] = {}
+        self.by_status: dict[str, set[int]] = {}
+        self.by_severity: dict[str, set[int]] = {}
+        self.by_graylog: dict[bool, set[int]] = {}
+        self.by_mitre: dict[str, set[int]] = {}
+        self.by_word: dict[str, set[int]] = {}
+
+        for position, rule in enumerate(self.ordered):
+            response = rule.get("response")
+            tags = rule.get("tags")
+            mitre_ids = tags.get("mitre_attack_id", []) if isinstance(tags, dict) else []
+            if isinstance(mitre_ids, str):
+                mitre_ids = [mitre_ids]
+
+            self.by_platform.setdefault(rule.get("_platform", "unknown"), set()).add(position)
+            # The repo mixes cases (Entra_id, Exchange vs auditd); categories match case-insensitively.
+            self.by_category.setdefault((rule.get("_category") or UNCATEGORIZED).lower(), set()).add(position)
+            self.by_status.setdefault(_lower(rule.get("status")), set()).add(position)
+            self.by_severity.setdefault(_lower(response.get("severity")) if isinstance(response, dict) else "", set()).add(position)
+            self.by_graylog.setdefault(bool(rule.get("_has_graylog", False)), set()).add(position)
+            for mitre_id in mitre_ids:
+                if isinstance(mitre_id, str):
+                    self.by_mitre.setdefault(mitre_id.upper(), set()).add(position)
+            for word in set(_WORD.findall(self.names[position])) | set(_WORD.findall(self.descriptions[position])):
+                self.by_word.setdefault(word, set()).add(position)
+
+    def filter(
+        self,
+        platform: PlatformFilter = PlatformFilter.ALL,
+        category: Optional[str] = None,
+        status: Optional[RuleStatus] = None,
+        severity: Optional[RuleSeverity] = None,
+        mitre_id: Optional[str] = None,
+        search: Optional[str] = None,
+        has_graylog: Optional[bool] = None,
+    ) -> list[dict]:
+        """The matching rules, in name order."""
+        selected: list[set[int]] = []
+        if platform != PlatformFilter.ALL:
+            selected.append(self.by_platform.get(platform.value, set()))
+        if category is not None:
+            selected.append(self.by_category.get(category.lower(), set()))
+        if status is not None:
+            selected.append(self.by_status.get(status.value, set()))
+        if severity is not None:
+            selected.append(self.by_severity.get(severity.value, set()))
+        if has_graylog is not None:
+            selected.append(self.by_graylog.get(has_graylog, set()))
+        if mitre_id is not None:
+            needle = mitre_id.upper()
+            selected.append(set().union(*(positions for key, positions in self.by_mitre.items() if needle in key)))
+
+        search_lower = search.lower() if search is not None else None
+        words = _WORD.findall(search_lower) if search_lower else []
+        if words:
+            longest = max(words, key=len)
+            selected.append(set().union(*(positions for word, positions in self.by_word.items() if longest in word)))
+
+        if selected:
+            selected.sort(key=len)
+            positions = sorted(selected[0].intersection(*selected[1:]))
+        else:
+            positions = range(len(self.ordered))
+
+        if search_lower is not None:
+            positions = [p for p in positions if search_lower in self.names[p] or search_lower in self.descriptions[p]]
+        return [self.ordered[p] for p in positions]
+
+
 # =============================================================================
 # Rules Cache
 # =============================================================================
@@ -201,11 +306,24 @@ class RulesCache(BackgroundRefreshMixin):
     In-memory cache for detection rules fetched from GitHub.
 
     Handles fetching, parsing, and caching YAML rules from the repository.
+
+    Refreshes are conditional. The branch head is checked with its ETag (a 304
+    costs nothing against the GitHub rate limit); when it moved, the tree at
+    the new commit is diffed against the blob SHA recorded for every rule file
+    and only added or changed files are downloaded. The cache is snapshotted
+    to disk with those SHAs, so a restart resumes from the last commit.
     """
 
+    snapshot_name = "copilot_search_rules"
+
     def __init__(self):
         self._rules: dict[str, dict] = {}  # id -> rule data
         self._rules_by_name: dict[str, str] = {}  # normalized name -> id
+        # path -> {"sha": blob sha, "rule": parsed rule, or None if it did not parse}
+        self._files: dict[str, dict] = {}
+        self._commit_sha: Optional[str] = None
+        self._etag: Optional[str] = None
+        self._index = RuleIndex([])
         self._last_refresh: Optional[datetime] = None
         self._lock = asyncio.Lock()
 
@@ -237,6 +355,7 @@ class RulesCache(BackgroundRefreshMixin):
 
     async def ensure_loaded(self):
         """Ensure rules are loaded, refreshing if stale."""
+        await self.load_snapshot()
         if self.is_stale:
             await self.refresh()
 
@@ -244,39 +363,81 @@ class RulesCache(BackgroundRefreshMixin):
         """
         Refresh rules cache from GitHub repository.
 
+        Only rule files whose blob SHA changed since the last refresh are
+        downloaded. Does nothing but restore the snapshot when
+        `CATALOG_OFFLINE` is set.
+
         Returns:
             Number of rules loaded
         """
         async with self._lock:
+            await self._load_snapshot_locked()
+            if catalog_snapshots.OFFLINE:
+                logger.info("CATALOG_OFFLINE is set; serving the rules snapshot without contacting GitHub")
+                self._last_refresh = datetime.utcnow()
+                return len(self._rules)
+
             logger.info("Refreshing rules cache from GitHub...")
+            changed = await self._sync_rules()
+            if changed:
+                self._rebuild_indexes()
+            self._last_refresh = datetime.utcnow()
+            logger.info(f"Loaded {len(self._rules)} rules from GitHub")
 
-            rules = await self._fetch_all_rules()
+        if changed:
+            await self.save_snapshot()
+        return len(self._rules)
 
-            self._rules = {}
-            self._rules_by_name = {}
+    def _rebuild_indexes(self) -> None:
+        self._rules = {}
+        self._rules_by_name = {}
 
-            for rule in rules:
-                rule_id = rule.get("id", "")
-                rule_name = rule.get("name", "")
+        for path in sorted(self._files):
+            rule = self._files[path]["rule"]
+            if rule is None:
+                continue
+            rule_id = rule.get("id", "")
+            rule_name = rule.get("name", "")
 
-                self._rules[rule_id] = rule
+            self._rules[rule_id] = rule
 
-                # Index by normalized name for lookup
-                normalized_name = self._normalize_name(rule_name)
-                self._rules_by_name[normalized_name] = rule_id
+            # Index by normalized name for lookup
+            normalized_name = self._normalize_name(rule_name)
+            self._rules_by_name[normalized_name] = rule_id
 
-            self._last_refresh = datetime.utcnow()
-            logger.info(f"Loaded {len(self._rules)} rules from GitHub")
+        self._index = RuleIndex(list(self._rules.values()))
 
-            return len(self._rules)
+    def _snapshot_state(self) -> dict:
+        return {"commit": self._commit_sha, "etag": self._etag, "files": self._files}
 
-    async def _fetch_all_rules(self) -> list[dict]:
-        """Fetch all YAML rules from GitHub repository."""
-        rules = []
+    def _restore_snapshot(self, state: dict) -> None:
+        files = {path: {"sha": entry["sha"], "rule": entry["rule"]} for path, entry in state["files"].items()}
+        self._files = files
+        self._commit_sha = state.get("commit")
+        self._etag = state.get("etag")
+        self._rebuild_indexes()
 
+    async def _sync_rules(self) -> bool:
+        """Bring `_files` up to the branch head. Returns whether anything changed."""
         async with httpx.AsyncClient(timeout=30.0, headers=_github_headers()) as client:
-            # Get the directory tree for detections
-            tree_url = f"{GITHUB_API_BASE}/repos/{GITHUB_REPO}/git/trees/{GITHUB_BRANCH}" f"?recursive=1"
+            # The sha media type makes this a 40-byte answer, and a 304 for an
+            # unchanged branch is not counted against the rate limit.
+            head_headers = {"Accept": "application/vnd.github.sha"}
+            if self._etag and self._files:
+                head_headers["If-None-Match"] = self._etag
+            head = await client.get(f"{GITHUB_API_BASE}/repos/{GITHUB_REPO}/commits/{GITHUB_BRANCH}", headers=head_headers)
+            if head.status_code == 304:
+                logger.info("Rules repository unchanged since the last refresh")
+                return False
+            head.raise_for_status()
+            commit_sha = head.text.strip()
+            etag = head.headers.get("ETag")
+            if commit_sha == self._commit_sha:
+                self._etag = etag
+                return False
+
+            # Get the directory tree for detections, at the commit just resolved
+            tree_url = f"{GITHUB_API_BASE}/repos/{GITHUB_REPO}/git/trees/{commit_sha}" f"?recursive=1"
 
             response = await client.get(tree_url)
             response.raise_for_status()
@@ -284,13 +445,17 @@ class RulesCache(BackgroundRefreshMixin):
             tree_data = response.json()
 
             # Filter for YAML files in detections directory
-            yaml_files = [
-                item
+            blob_shas = {
+                item["path"]: item["sha"]
                 for item in tree_data.get("tree", [])
                 if item["path"].startswith("detections/") and item["path"].endswith(".yaml") and item["type"] == "blob"
-            ]
+            }
+            changed_paths = [path for path, sha in blob_shas.items() if self._files.get(path, {}).get("sha") != sha]
+            removed_paths = [path for path in self._files if path not in blob_shas]
 
-            logger.info(f"Found {len(yaml_files)} YAML files in repository")
+            logger.info(
+                f"Found {len(blob_shas)} YAML files in repository: " f"{len(changed_paths)} new or changed, {len(removed_paths)} removed",
+            )
 
             # Fetch each YAML file with bounded concurrency. Firing every
             # request at once (thousands, once the repo grows) exhausts the
@@ -300,33 +465,47 @@ class RulesCache(BackgroundRefreshMixin):
 
             async def _fetch_bounded(path: str):
                 async with semaphore:
-                    return await self._fetch_yaml_file(client, path)
+                    return await self._fetch_yaml_file(client, path, ref=commit_sha)
 
-            tasks = [_fetch_bounded(file_info["path"]) for file_info in yaml_files]
+            tasks = [_fetch_bounded(path) for path in changed_paths]
 
             results = await asyncio.gather(*tasks, return_exceptions=True)
 
-            for result in results:
-                if isinstance(result, Exception):
-                    logger.warning(f"Failed to fetch rule: {result}")
-                elif result is not None:
-                    rules.append(result)
+        files = {path: entry for path, entry in self._files.items() if path in blob_shas}
+        complete = True
+        for path, result in zip(changed_paths, results):
+            if isinstance(result, Exception):
+                # Keep whatever version we had; the commit is not recorded, so
+                # the next refresh diffs against it again and retries the file.
+                logger.warning(f"Failed to fetch rule {path}: {result}")
+                complete = False
+            else:
+                files[path] = {"sha": blob_shas[path], "rule": result}
 
-        return rules
+        self._files = files
+        if complete:
+            self._commit_sha = commit_sha
+            self._etag = etag
+        return True
 
     async def _fetch_yaml_file(
         self,
         client: httpx.AsyncClient,
         file_path: str,
+        ref: str = GITHUB_BRANCH,
     ) -> Optional[dict]:
-        """Fetch and parse a single YAML file from GitHub."""
-        try:
-            raw_url = f"{GITHUB_RAW_BASE}/{GITHUB_REPO}/{GITHUB_BRANCH}/{file_path}"
+        """Fetch and parse a single YAML file from GitHub.
 
-            response = await client.get(raw_url)
-            response.raise_for_status()
+        Raises on a failed download; returns None for a file that is not a
+        valid rule.
+        """
+        raw_url = f"{GITHUB_RAW_BASE}/{GITHUB_REPO}/{ref}/{file_path}"
+
+        response = await client.get(raw_url)
+        response.raise_for_status()
 
-            raw_yaml = response.text
+        raw_yaml = response.text
+        try:
             rule_data = yaml.safe_load(raw_yaml)
 
             if not isinstance(rule_data, dict):
@@ -340,12 +519,12 @@ class RulesCache(BackgroundRefreshMixin):
             rule_data["_platform"] = self._detect_platform(file_path, rule_data)
             rule_data["_has_graylog"] = "graylog" in rule_data and bool(rule_data.get("graylog", {}).get("query"))
 
-            return rule_data
-
         except Exception as e:
-            logger.warning(f"Error fetching {file_path}: {e}")
+            logger.warning(f"Error parsing {file_path}: {e}")
             return None
 
+        return rule_data
+
     def _detect_platform(self, file_path: str, rule_data: dict) -> str:
         """Detect the platform / source category for a rule from its folder.
 
@@ -475,59 +654,16 @@ class RulesCache(BackgroundRefreshMixin):
         search: Optional[str] = None,
         has_graylog: Optional[bool] = None,
     ) -> list[dict]:
-        """Filter rules based on criteria."""
-        results = []
-        category_key = category.lower() if category else None
-
-        for rule in self._rules.values():
-            # Platform filter
-            if platform != PlatformFilter.ALL:
-                rule_platform = rule.get("_platform", "unknown")
-                if rule_platform != platform.value:
-                    continue
-
-            # Category (detections/ folder) filter — matched case-insensitively
-            # because the repo mixes cases (Entra_id, Exchange vs auditd).
-            if category_key is not None:
-                rule_category = (rule.get("_category") or UNCATEGORIZED).lower()
-                if rule_category != category_key:
-                    continue
-
-            # Status filter
-            if status is not None:
-                rule_status = rule.get("status", "").lower()
-                if rule_status != status.value:
-                    continue
-
-            # Severity filter
-            if severity is not None:
-                rule_severity = rule.get("response", {}).get("severity", "").lower()
-                if rule_severity != severity.value:
-                    continue
-
-            # MITRE ATT&CK filter
-            if mitre_id is not None:
-                mitre_ids = rule.get("tags", {}).get("mitre_attack_id", [])
-                if not any(mitre_id.upper() in m.upper() for m in mitre_ids):
-                    continue
-
-            # Text search (name, description)
-            if search is not None:
-                search_lower = search.lower()
-                name = rule.get("name", "").lower()
-                description = rule.get("description", "").lower()
-                if search_lower not in name and search_lower not in description:
-                    continue
-
-            # Graylog query filter
-            if has_graylog is not None:
-                rule_has_graylog = rule.get("_has_graylog", False)
-                if rule_has_graylog != has_graylog:
-                    continue
-
-            results.append(rule)
-
-        return results
+        """Filter rules based on criteria, returning them sorted by name."""
+        return self._index.filter(
+            platform=platform,
+            category=category,
+            status=status,
+            severity=severity,
+            mitre_id=mitre_id,
+            search=search,
+            has_graylog=has_graylog,
+        )
 
     def get_stats(self) -> dict:
         """Get statistics about cached rules."""
@@ -872,7 +1008,7 @@ async def get_rules_list(
                 f"Unknown category '{category}'. See GET /copilot_searches/categories for the available folders.",
             )
 
-    # Filter rules
+    # Filter rules, already in name order
     filtered_rules = rules_cache.filter_rules(
         platform=platform,
         category=category,
@@ -883,9 +1019,6 @@ async def get_rules_list(
         has_graylog=has_graylog,
     )
 
-    # Sort by name
-    filtered_rules.sort(key=lambda r: r.get("name", "").lower())
-
     # Paginate
     total_filtered = len(filtered_rules)
     paginated = filtered_rules[skip : skip + limit]
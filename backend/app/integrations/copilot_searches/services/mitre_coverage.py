@@ -10,6 +10,7 @@ from loguru import logger
 from app.integrations.copilot_searches.schema.copilot_searches import PlatformFilter
 from app.integrations.copilot_searches.schema.copilot_searches import RuleSeverity
 from app.integrations.copilot_searches.schema.copilot_searches import RuleStatus
+from app.integrations.copilot_searches.services import catalog_snapshots
 from app.integrations.copilot_searches.services.cache_support import (
     BackgroundRefreshMixin,
 )
@@ -23,12 +24,17 @@ class MitreMatrix(BackgroundRefreshMixin):
     """In-memory cache of the MITRE ATT&CK Enterprise matrix structure.
 
     Pulls the official STIX bundle from mitre/cti and indexes tactics + techniques
-    so we can cross-reference them against CoPilot Search rules.
+    so we can cross-reference them against CoPilot Search rules. Only the parsed
+    index is snapshotted to disk, with the bundle's ETag: a refresh sends it
+    back and skips the download when the bundle has not changed.
     """
 
+    snapshot_name = "mitre_matrix"
+
     def __init__(self) -> None:
         self._tactics: list[dict] = []
         self._techniques: dict[str, dict] = {}
+        self._etag: Optional[str] = None
         self._last_refresh: Optional[datetime] = None
         self._lock = asyncio.Lock()
 
@@ -39,28 +45,52 @@ class MitreMatrix(BackgroundRefreshMixin):
         return datetime.utcnow() - self._last_refresh > timedelta(hours=MITRE_CACHE_TTL_HOURS)
 
     async def ensure_loaded(self) -> None:
+        await self.load_snapshot()
         if self.is_stale:
             await self.refresh()
 
     async def refresh(self) -> None:
         async with self._lock:
+            await self._load_snapshot_locked()
+            if catalog_snapshots.OFFLINE:
+                logger.info("CATALOG_OFFLINE is set; serving the MITRE matrix snapshot without contacting GitHub")
+                self._last_refresh = datetime.utcnow()
+                return
+
             logger.info(f"Fetching MITRE ATT&CK Enterprise STIX bundle from {MITRE_STIX_URL}")
             headers = {}
             token = os.getenv("GITHUB_TOKEN")
             if token:
                 headers["Authorization"] = f"Bearer {token}"
+            if self._etag and self._techniques:
+                headers["If-None-Match"] = self._etag
 
             async with httpx.AsyncClient(timeout=120.0, headers=headers) as client:
                 response = await client.get(MITRE_STIX_URL)
+                if response.status_code == 304:
+                    self._last_refresh = datetime.utcnow()
+                    logger.info("MITRE ATT&CK STIX bundle unchanged since the last refresh")
+                    return
                 response.raise_for_status()
                 bundle = response.json()
 
             self._parse_bundle(bundle)
+            self._etag = response.headers.get("ETag")
             self._last_refresh = datetime.utcnow()
             logger.info(
                 f"Loaded MITRE matrix: {len(self._tactics)} tactics, {len(self._techniques)} techniques",
             )
 
+        await self.save_snapshot()
+
+    def _snapshot_state(self) -> dict:
+        return {"etag": self._etag, "tactics": self._tactics, "techniques": self._techniques}
+
+    def _restore_snapshot(self, state: dict) -> None:
+        tactics, techniques = list(state["tactics"]), dict(state["techniques"])
+        self._tactics, self._techniques = tactics, techniques
+        self._etag = state.get("etag")
+
     def _parse_bundle(self, bundle: dict) -> None:
         tactics_by_short: dict[str, dict] = {}
         techniques: dict[str, dict] = {}
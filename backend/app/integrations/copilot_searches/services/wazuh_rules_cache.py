@@ -14,6 +14,11 @@ Why this exists separately from ``RulesCache`` (CoPilot Searches):
   case — the Stories tab and the rest of CoPilot keep working without the
   Wazuh tab. The cache holds an ``unavailable_reason`` string so the UI can
   render an explanatory empty state instead of a generic error.
+- Different refresh: the Wazuh API has no ETag or revision to ask "changed
+  since?", so every refresh is a full load. What the cache can do is not
+  repeat it on restart: each successful load is snapshotted to disk (see
+  ``catalog_snapshots``) and restored on startup, so a restart inside the TTL
+  serves the last ruleset instead of waiting 80–110s for ``GET /rules``.
 
 Auth note:
 The wrapped connector route (``/wazuh_manager/rules``) is admin-only via
@@ -51,6 +56,8 @@ class WazuhRulesCache(BackgroundRefreshMixin):
     catalog aggregator code can treat them symmetrically.
     """
 
+    snapshot_name = "wazuh_rules"
+
     def __init__(self) -> None:
         # rule_id (int) -> raw rule dict (the Wazuh API "affected_items" entry)
         self._rules: Dict[int, Dict[str, Any]] = {}
@@ -95,6 +102,7 @@ class WazuhRulesCache(BackgroundRefreshMixin):
         user explicitly asked for this data (the catalog itself) — see
         `ensure_fresh_nonblocking` for everything else.
         """
+        await self.load_snapshot()
         if self.is_stale:
             await self.refresh()
 
@@ -113,6 +121,8 @@ class WazuhRulesCache(BackgroundRefreshMixin):
         from app.connectors.wazuh_manager.services.rules import get_wazuh_rules
 
         async with self._lock:
+            # A failed load below keeps this snapshot rather than an empty cache.
+            await self._load_snapshot_locked()
             logger.info("Refreshing Wazuh rules cache from Wazuh Manager…")
             try:
                 # limit=100000 is the Wazuh API ceiling; one call gets the
@@ -146,7 +156,16 @@ class WazuhRulesCache(BackgroundRefreshMixin):
             self._unavailable_reason = None
             self._last_refresh = datetime.utcnow()
             logger.info(f"Loaded {len(self._rules)} Wazuh rules into cache")
-            return len(self._rules)
+
+        await self.save_snapshot()
+        return len(self._rules)
+
+    def _snapshot_state(self) -> Dict[str, Any]:
+        # JSON object keys are strings; a list keeps the integer rule IDs intact.
+        return {"rules": list(self._rules.values())}
+
+    def _restore_snapshot(self, state: Dict[str, Any]) -> None:
+        self._rules = {rule["id"]: rule for rule in state["rules"] if isinstance(rule.get("id"), int)}
 
     # ---- accessors --------------------------------------------------------
 
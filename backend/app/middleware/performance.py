@@ -167,6 +167,30 @@ class EndpointStats:
         return f"{self.method} {self.path}"
 
 
+@dataclass
+class StageStats:
+    """Rolling aggregates for one stage of a background pipeline.
+
+    Request timing cannot see work the scheduler does — the alert ingest job has
+    no request, only stages. Each stage run reports how long it took and how many
+    items it moved, which is what "the backlog grows faster than we drain it"
+    has to be answered with.
+    """
+
+    pipeline: str
+    stage: str
+    runs: int = 0
+    items: int = 0
+    failures: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    samples: Deque[float] = field(default_factory=lambda: deque(maxlen=DURATION_SAMPLES))
+
+    @property
+    def key(self) -> str:
+        return f"{self.pipeline}.{self.stage}"
+
+
 def _normalise_path(raw_path: str) -> str:
     """Collapse identifier-looking segments so unmatched paths stay low cardinality.
 
@@ -263,6 +287,7 @@ class PerformanceRegistry:
         self._recent: Deque[RequestRecord] = deque(maxlen=RECENT_REQUESTS)
         self._stalls: Deque[StallRecord] = deque(maxlen=RECENT_STALLS)
         self._endpoints: Dict[str, EndpointStats] = {}
+        self._stages: Dict[str, StageStats] = {}
         self._lag_samples: Deque[float] = deque(maxlen=LAG_SAMPLES)
         self.total_requests = 0
         self.total_slow = 0
@@ -459,6 +484,34 @@ class PerformanceRegistry:
 
         return suspects
 
+    # ── background pipelines ─────────────────────────────────────────────
+
+    def record_stage(
+        self,
+        pipeline: str,
+        stage: str,
+        duration_ms: float,
+        items: int = 0,
+        failures: int = 0,
+    ) -> None:
+        """Account one run of a pipeline stage.
+
+        Pipelines and their stages are a short, fixed list declared in code, so
+        unlike endpoints there is no cardinality cap to enforce here.
+        """
+        key = f"{pipeline}.{stage}"
+        stats = self._stages.get(key)
+        if stats is None:
+            stats = StageStats(pipeline=pipeline, stage=stage)
+            self._stages[key] = stats
+        stats.runs += 1
+        stats.items += items
+        stats.failures += failures
+        stats.total_ms += duration_ms
+        stats.samples.append(duration_ms)
+        if duration_ms > stats.max_ms:
+            stats.max_ms = duration_ms
+
     def record_event(self, event_type: str, payload: dict) -> None:
         """Append an arbitrary diagnostic record to the session log.
 
@@ -487,6 +540,10 @@ class PerformanceRegistry:
     def endpoints(self) -> List[EndpointStats]:
         return list(self._endpoints.values())
 
+    @property
+    def stages(self) -> List[StageStats]:
+        return list(self._stages.values())
+
     @property
     def lag_samples(self) -> List[float]:
         return list(self._lag_samples)
@@ -17,6 +17,7 @@ from app.auth.utils import AuthHandler
 from app.db.db_session import get_db
 from app.db.universal_models import Customers
 from app.db.universal_models import CustomersMeta
+from app.incidents.services import reference_cache
 from app.integrations.alert_creation_settings.models.alert_creation_settings import (
     AlertCreationSettings,
 )
@@ -455,6 +456,8 @@ async def update_office365_organization_id(
     )
     await session.execute(stmt)
     await session.commit()
+    # Ingest resolves customers by tenant id too; see is_customer_code_valid.
+    reference_cache.invalidate("alert_creation_settings")
 
 
 async def get_network_connector_service_id(
@@ -0,0 +1,82 @@
+"""Per-channel caps on concurrent provider calls.
+
+The dispatch queue in `emit.py` bounds how many events are being dispatched at
+once; this bounds how many of those are talking to one provider at once. The two
+are different limits because the providers are: Resend rate-limits an account
+at a few requests a second, a Teams workflow URL starts returning 429s under a
+burst, while an operator's own webhook receiver can usually take more. Without a
+per-channel cap, a burst that happens to match only Resend routes sends every
+worker at Resend together.
+
+Limits come from `NOTIFICATION_CHANNEL_CONCURRENCY_<CHANNEL>` (e.g.
+`NOTIFICATION_CHANNEL_CONCURRENCY_TEAMS=2`). A channel without a default or an
+override is not limited beyond the worker count.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from loguru import logger
+
+from app.notifications.schema.notifications import NotificationChannel
+
+_DEFAULT_LIMITS: Dict[str, int] = {
+    NotificationChannel.TEAMS.value: 4,
+    NotificationChannel.RESEND.value: 2,
+    NotificationChannel.SHUFFLE.value: 4,
+    NotificationChannel.WEBHOOK.value: 8,
+}
+
+
+def _limit_for(channel: str) -> Optional[int]:
+    name = f"NOTIFICATION_CHANNEL_CONCURRENCY_{channel.upper()}"
+    raw = os.getenv(name)
+    if raw is None:
+        return _DEFAULT_LIMITS.get(channel)
+    try:
+        return max(int(raw), 1)
+    except ValueError:
+        logger.warning(f"{name}={raw!r} is not an integer; falling back to {_DEFAULT_LIMITS.get(channel)}")
+        return _DEFAULT_LIMITS.get(channel)
+
+
+# Keyed by loop as well as channel: a semaphore belongs to the loop it first
+# waited on. Production has one loop; tests create one per test.
+_semaphores: Dict[Tuple[int, str], asyncio.Semaphore] = {}
+_waits: Dict[str, int] = {}
+
+
+def _semaphore(channel: str) -> Optional[asyncio.Semaphore]:
+    limit = _limit_for(channel)
+    if limit is None:
+        return None
+    key = (id(asyncio.get_running_loop()), channel)
+    semaphore = _semaphores.get(key)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(limit)
+        _semaphores[key] = semaphore
+    return semaphore
+
+
+@asynccontextmanager
+async def channel_slot(channel: str):
+    """Hold one of `channel`'s provider-call slots for the duration of the block."""
+    semaphore = _semaphore(channel)
+    if semaphore is None:
+        yield
+        return
+    if semaphore.locked():
+        _waits[channel] = _waits.get(channel, 0) + 1
+    async with semaphore:
+        yield
+
+
+def stats() -> Dict[str, Dict[str, Optional[int]]]:
+    """Limit and how often a send had to wait for a slot, per channel."""
+    return {channel.value: {"limit": _limit_for(channel.value), "waits": _waits.get(channel.value, 0)} for channel in NotificationChannel}
@@ -19,11 +19,34 @@ already carry comments about. `_run` opens a fresh `AsyncSession` and owns it.
 **A hung provider must not leak a task forever.** The whole dispatch is wrapped
 in a timeout, so a black-holed endpoint produces a logged failure rather than a
 task that never finishes.
+
+**A burst must not take the database with it.** Each emit used to become its own
+task with its own session, so 2,000 alerts created in one ingest run meant 2,000
+dispatches competing at once for the 40-connection pool — and API requests
+queued behind them. Events now go onto a bounded queue drained by
+`NOTIFICATION_WORKERS` workers, so at most that many sessions are ever held for
+notifications. Around it:
+
+* an event whose `dedupe_key` is already waiting is coalesced rather than queued
+  twice — the dispatch log would skip the duplicate anyway, after paying a
+  session for it;
+* provider calls are further capped per channel (`channel_limits.py`);
+* a full queue drops the event with an error naming it, rather than blocking
+  the caller — `emit` sits on the ingest path and must stay non-blocking;
+* queue wait and dispatch time are recorded as the `notification_dispatch`
+  pipeline on `GET /api/performance/pipelines`, with the depth alongside;
+* `drain` lets the app lifespan finish what is queued before shutting down.
 """
 
 from __future__ import annotations
 
 import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import List
 from typing import Optional
 from typing import Set
 
@@ -31,17 +54,58 @@ from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.db_session import async_engine
+from app.middleware.performance import performance_registry
 from app.notifications.schema.events import NotificationEvent
+from app.notifications.services import channel_limits
 
 #: Ceiling for one whole emission — every matched route, including provider
 #: calls. Generous because a batch may fan out to several channels; the point is
 #: to bound a hang, not to be tight.
 _EMIT_TIMEOUT_S = 60.0
 
-#: asyncio keeps only a weak reference to a bare task, so one that is never
-#: awaited can be garbage-collected mid-flight. Holding a strong reference until
-#: it completes is the documented way to avoid that.
-_IN_FLIGHT: Set[asyncio.Task] = set()
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, str(default))
+    try:
+        return max(int(raw), 1)
+    except ValueError:
+        logger.warning(f"{name}={raw!r} is not an integer; falling back to {default}")
+        return default
+
+
+#: Events waiting for a worker. Sized for a large ingest burst; an event only
+#: holds its envelope while it waits, not a session.
+QUEUE_SIZE = _env_int("NOTIFICATION_QUEUE_SIZE", 5000)
+
+#: Concurrent dispatches, and so the most database connections notifications
+#: can hold at once.
+WORKERS = _env_int("NOTIFICATION_WORKERS", 4)
+
+#: How long shutdown waits for the queue to empty before abandoning the rest.
+_DRAIN_TIMEOUT_S = 30.0
+
+PIPELINE = "notification_dispatch"
+
+
+@dataclass
+class _Queued:
+    event: NotificationEvent
+    enqueued_at: float
+
+
+_queue: Optional[asyncio.Queue] = None
+_queue_loop: Optional[asyncio.AbstractEventLoop] = None
+#: Workers are held here for the same reason any bare task must be: asyncio only
+#: keeps a weak reference, and a collected worker would silently stop draining.
+_workers: List[asyncio.Task] = []
+_queued_keys: Set[str] = set()
+_accepting = True
+
+_enqueued = 0
+_coalesced = 0
+_dropped = 0
+_processed = 0
+_max_depth = 0
 
 
 async def _run(event: NotificationEvent) -> None:
@@ -80,6 +144,36 @@ async def _run(event: NotificationEvent) -> None:
         logger.error(f"Notification emit [{event.trigger.value}] failed: {type(e).__name__}: {e}")
 
 
+async def _worker(queue: asyncio.Queue) -> None:
+    global _processed
+
+    while True:
+        item = await queue.get()
+        try:
+            # Released as soon as the event is picked up: a duplicate arriving
+            # mid-dispatch is queued again and left to the dispatch log.
+            _queued_keys.discard(item.event.dedupe_key)
+            started = time.perf_counter()
+            performance_registry.record_stage(PIPELINE, "queued", (started - item.enqueued_at) * 1000.0, items=1)
+            await _run(item.event)
+            performance_registry.record_stage(PIPELINE, "dispatch", (time.perf_counter() - started) * 1000.0, items=1)
+            _processed += 1
+        finally:
+            queue.task_done()
+
+
+def _ensure_workers(loop: asyncio.AbstractEventLoop) -> asyncio.Queue:
+    """The queue for this loop, with its workers started on first use."""
+    global _queue, _queue_loop, _workers
+
+    if _queue is None or _queue_loop is not loop:
+        _queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        _queue_loop = loop
+        _queued_keys.clear()
+        _workers = [loop.create_task(_worker(_queue)) for _ in range(WORKERS)]
+    return _queue
+
+
 def emit(event: NotificationEvent) -> None:
     """Schedule `event` for dispatch and return immediately.
 
@@ -88,7 +182,8 @@ def emit(event: NotificationEvent) -> None:
 
     Safe to call with no running event loop (a sync context or a test): the
     emission is skipped with a warning rather than raising, because failing to
-    notify must never fail the operation that triggered it.
+    notify must never fail the operation that triggered it. The same goes for a
+    full queue and for an emit that arrives after `drain`.
     """
     try:
         loop = asyncio.get_running_loop()
@@ -98,9 +193,71 @@ def emit(event: NotificationEvent) -> None:
         )
         return
 
-    task = loop.create_task(_run(event))
-    _IN_FLIGHT.add(task)
-    task.add_done_callback(_IN_FLIGHT.discard)
+    global _enqueued, _coalesced, _dropped, _max_depth
+
+    if not _accepting:
+        logger.warning(
+            f"Notification emit [{event.trigger.value}] {event.entity_type}#{event.entity_id} skipped: shutting down.",
+        )
+        return
+
+    queue = _ensure_workers(loop)
+    if event.dedupe_key in _queued_keys:
+        _coalesced += 1
+        logger.debug(f"Notification emit [{event.trigger.value}] {event.dedupe_key} coalesced with a queued event.")
+        return
+
+    try:
+        queue.put_nowait(_Queued(event=event, enqueued_at=time.perf_counter()))
+    except asyncio.QueueFull:
+        _dropped += 1
+        logger.error(
+            f"Notification emit [{event.trigger.value}] {event.entity_type}#{event.entity_id} dropped: "
+            f"the dispatch queue is full ({QUEUE_SIZE} waiting). Raise NOTIFICATION_WORKERS or NOTIFICATION_QUEUE_SIZE.",
+        )
+        return
+    _queued_keys.add(event.dedupe_key)
+    _enqueued += 1
+    _max_depth = max(_max_depth, queue.qsize())
+
+
+async def drain(timeout: float = _DRAIN_TIMEOUT_S) -> None:
+    """Stop accepting events, finish what is queued, then stop the workers.
+
+    Called from the app lifespan after the scheduler has stopped, so nothing is
+    still producing. Whatever is left when `timeout` runs out is logged and
+    abandoned rather than holding shutdown hostage to a slow provider.
+    """
+    global _accepting, _queue, _queue_loop, _workers
+
+    _accepting = False
+    queue, workers = _queue, _workers
+    if queue is None:
+        return
+    try:
+        await asyncio.wait_for(queue.join(), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Notification queue not drained after {timeout}s; abandoning {queue.qsize()} queued event(s).")
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    _queue, _queue_loop, _workers = None, None, []
+    _queued_keys.clear()
+
+
+def stats() -> Dict[str, Any]:
+    """Queue depth and throughput, surfaced next to the pipeline stage timings."""
+    return {
+        "depth": _queue.qsize() if _queue is not None else 0,
+        "max_depth": _max_depth,
+        "capacity": QUEUE_SIZE,
+        "workers": WORKERS,
+        "enqueued": _enqueued,
+        "coalesced": _coalesced,
+        "dropped": _dropped,
+        "processed": _processed,
+        "channels": channel_limits.stats(),
+    }
 
 
 async def emit_now(event: NotificationEvent, session: Optional[AsyncSession] = None):
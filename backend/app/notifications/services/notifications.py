@@ -66,6 +66,7 @@ from app.notifications.schema.notifications import ShuffleIntegrationCreate
 from app.notifications.schema.notifications import ShuffleIntegrationUpdate
 from app.notifications.schema.notifications import ShuffleOrg
 from app.notifications.services.ai_report_context import safe_load_ai_report_context
+from app.notifications.services.channel_limits import channel_slot
 from app.notifications.services.dispatchers import (
     list_shuffle_apps as shuffle_apps_client,
 )
@@ -1186,7 +1187,8 @@ async def deliver_one(
     message, template_error = await _render_body(route, event, session, ctx=ctx)
 
     try:
-        result = await provider.send(route=route, event=event, message=message, ctx=ctx)
+        async with channel_slot(route.channel):
+            result = await provider.send(route=route, event=event, message=message, ctx=ctx)
     except Exception as e:  # noqa: BLE001 — report, never 500 the caller
         logger.exception(f"Dispatch raised for route {route.id}: {e!r}")
         result = SendResult.failed(f"Dispatcher exception: {type(e).__name__}: {e}")
@@ -1403,12 +1405,13 @@ async def dispatch_event(event: NotificationEvent, session: AsyncSession) -> Dis
                 error_message = f"Unsupported channel: {route_channel}"
                 latency_ms = None
             else:
-                result = await provider.send(
-                    route=route,
-                    event=event,
-                    message=message,
-                    ctx=ctx,
-                )
+                async with channel_slot(route_channel):
+                    result = await provider.send(
+                        route=route,
+                        event=event,
+                        message=message,
+                        ctx=ctx,
+                    )
                 result_status = result.status
                 error_message = result.error_message
                 latency_ms = result.latency_ms
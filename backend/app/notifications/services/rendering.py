@@ -22,11 +22,24 @@ silently stops working and surfaces days later in the dispatch log.
 event shape, a filter misused — `render_body` falls back to the channel default
 and reports the error. A broken template must never mean a missed critical
 alert.
+
+**Compile once.** `env.from_string` parses and compiles the template to Python
+bytecode, and used to run on every dispatch — once per event per route. During
+an alert storm that was the bulk of the time spent in here, all of it on the
+event loop. Compiled templates are now kept in a small LRU keyed by the hash of
+the source and the autoescape flag, shared by `compile_template`, `render` and
+`render_json`. An edited template has a different hash, so nothing needs
+invalidating; the old entry simply ages out. Counters are on
+`GET /api/performance/caches`.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import threading
+from collections import OrderedDict
 from collections import defaultdict
 from typing import Any
 from typing import Dict
@@ -34,6 +47,7 @@ from typing import Optional
 from typing import Tuple
 
 from jinja2 import StrictUndefined
+from jinja2 import Template
 from jinja2 import TemplateError
 from jinja2.sandbox import SandboxedEnvironment
 from loguru import logger
@@ -82,6 +96,74 @@ _ENV = _build_environment()
 _ENV_AUTOESCAPE = SandboxedEnvironment(undefined=StrictUndefined, autoescape=True)
 
 
+def _cache_size() -> int:
+    raw = os.getenv("NOTIFICATION_TEMPLATE_CACHE_SIZE", "256")
+    try:
+        return max(int(raw), 0)
+    except ValueError:
+        logger.warning(f"NOTIFICATION_TEMPLATE_CACHE_SIZE={raw!r} is not an integer; falling back to 256")
+        return 256
+
+
+#: Distinct (template, autoescape) pairs kept compiled. Every route and named
+#: template on a deployment is one entry; 256 covers them with room to spare.
+#: `0` disables the cache, which is how you A/B it.
+TEMPLATE_CACHE_SIZE = _cache_size()
+
+_compiled: "OrderedDict[Tuple[str, bool], Template]" = OrderedDict()
+# Rendering also runs from worker threads (manual sends, previews).
+_compiled_lock = threading.Lock()
+_hits = 0
+_misses = 0
+
+
+def _get_template(source: str, autoescape: bool) -> Template:
+    """The compiled template for `source`, compiling it on first use.
+
+    A source that fails to compile is not cached: the `TemplateError`
+    propagates exactly as `from_string` raised it.
+    """
+    global _hits, _misses
+
+    key = (hashlib.sha256(source.encode("utf-8")).hexdigest(), autoescape)
+    with _compiled_lock:
+        template = _compiled.get(key)
+        if template is not None:
+            _compiled.move_to_end(key)
+            _hits += 1
+            return template
+        _misses += 1
+
+    env = _ENV_AUTOESCAPE if autoescape else _ENV
+    template = env.from_string(source)
+    if TEMPLATE_CACHE_SIZE:
+        with _compiled_lock:
+            _compiled[key] = template
+            _compiled.move_to_end(key)
+            while len(_compiled) > TEMPLATE_CACHE_SIZE:
+                _compiled.popitem(last=False)
+    return template
+
+
+def clear_template_cache() -> None:
+    """Drop every compiled template and zero the counters. Test seam."""
+    global _hits, _misses
+
+    with _compiled_lock:
+        _compiled.clear()
+        _hits = _misses = 0
+
+
+def template_cache_stats() -> Dict[str, Any]:
+    """Surfaced on `GET /api/performance/caches` and in the session log."""
+    return {
+        "size": len(_compiled),
+        "max_size": TEMPLATE_CACHE_SIZE,
+        "hits": _hits,
+        "misses": _misses,
+    }
+
+
 def build_context(event: NotificationEvent) -> Dict[str, Any]:
     """The variables a template can reference.
 
@@ -134,8 +216,7 @@ def compile_template(source: str, *, autoescape: bool = False) -> None:
     variables — those depend on the event, and a template legitimately valid for
     one trigger may reference fields another does not carry.
     """
-    env = _ENV_AUTOESCAPE if autoescape else _ENV
-    env.from_string(source)
+    _get_template(source, autoescape)
 
 
 def render(
@@ -154,16 +235,19 @@ def render(
     on a key collision, so an extra can never shadow `severity` or `summary` and
     change what an existing template means.
     """
-    env = _ENV_AUTOESCAPE if autoescape else _ENV
-    template = env.from_string(source)
+    template = _get_template(source, autoescape)
     context = {**(extra_context or {}), **build_context(event)}
     output = template.render(**context)
 
-    if len(output.encode("utf-8")) > MAX_RENDERED_BYTES:
-        raise TemplateTooLargeError(
-            f"Rendered body is {len(output.encode('utf-8'))} bytes, over the {MAX_RENDERED_BYTES} byte limit. "
-            f"A loop over an unbounded collection is the usual cause.",
-        )
+    # A character is at most four bytes in UTF-8, so a body this short cannot be
+    # over the cap and is never encoded just to be measured.
+    if len(output) * 4 > MAX_RENDERED_BYTES:
+        size = len(output.encode("utf-8"))
+        if size > MAX_RENDERED_BYTES:
+            raise TemplateTooLargeError(
+                f"Rendered body is {size} bytes, over the {MAX_RENDERED_BYTES} byte limit. "
+                f"A loop over an unbounded collection is the usual cause.",
+            )
     return output
 
 
@@ -11,15 +11,19 @@ from fastapi import Security
 
 from app.auth.utils import AuthHandler
 from app.performance.schema.performance import DatabaseSummaryResponse
+from app.performance.schema.performance import PerformanceCachesResponse
 from app.performance.schema.performance import PerformanceEndpointsResponse
+from app.performance.schema.performance import PerformancePipelinesResponse
 from app.performance.schema.performance import PerformanceRequestsResponse
 from app.performance.schema.performance import PerformanceResetResponse
 from app.performance.schema.performance import PerformanceStallsResponse
 from app.performance.schema.performance import PerformanceSummaryResponse
+from app.performance.services.performance import get_cache_stats
 from app.performance.services.performance import get_database_summary
 from app.performance.services.performance import get_endpoint_timings
 from app.performance.services.performance import get_loop_stalls
 from app.performance.services.performance import get_performance_summary
+from app.performance.services.performance import get_pipeline_stages
 from app.performance.services.performance import get_recent_requests
 from app.performance.services.performance import reset_performance_counters
 
@@ -74,6 +78,26 @@ async def performance_requests_endpoint(
     return await get_recent_requests(limit=limit, min_duration_ms=min_duration_ms)
 
 
+@performance_router.get(
+    "/pipelines",
+    response_model=PerformancePipelinesResponse,
+    description="Per-stage timings and throughput for background pipelines such as alert ingest",
+    dependencies=[Security(AuthHandler().require_any_scope("admin"))],
+)
+async def performance_pipelines_endpoint() -> PerformancePipelinesResponse:
+    return await get_pipeline_stages()
+
+
+@performance_router.get(
+    "/caches",
+    response_model=PerformanceCachesResponse,
+    description="Hit/miss counters for the in-process caches (connectors, indexer clients, EPSS, notification templates)",
+    dependencies=[Security(AuthHandler().require_any_scope("admin"))],
+)
+async def performance_caches_endpoint() -> PerformanceCachesResponse:
+    return await get_cache_stats()
+
+
 @performance_router.post(
     "/reset",
     response_model=PerformanceResetResponse,
@@ -1,3 +1,5 @@
+from typing import Any
+from typing import Dict
 from typing import List
 from typing import Optional
 
@@ -35,6 +37,18 @@ class EndpointTiming(BaseModel):
     stalled_ms: float = Field(..., description="Loop-stall time attributed to this endpoint by time overlap")
 
 
+class PipelineStageTiming(BaseModel):
+    pipeline: str
+    stage: str
+    runs: int
+    items: int = Field(..., description="Items the stage handled across all runs")
+    failures: int = Field(..., description="Items the stage could not handle")
+    avg_ms: float
+    p95_ms: float
+    max_ms: float
+    items_per_second: float = Field(..., description="Throughput while the stage was running")
+
+
 class RequestTiming(BaseModel):
     request_id: int
     method: str
@@ -90,6 +104,24 @@ class PerformanceEndpointsResponse(BaseModel):
     dropped_endpoints: int = Field(..., description="Distinct routes not tracked because the endpoint cap was hit")
 
 
+class PerformancePipelinesResponse(BaseModel):
+    success: bool
+    message: str
+    stages: List[PipelineStageTiming]
+    queues: Dict[str, Dict[str, Any]] = Field(default_factory=dict, description="Depth and throughput of in-process work queues")
+
+
+class CacheStats(BaseModel):
+    name: str
+    stats: Dict[str, Any] = Field(..., description="Whatever the cache reports: size, hits, misses and so on")
+
+
+class PerformanceCachesResponse(BaseModel):
+    success: bool
+    message: str
+    caches: List[CacheStats]
+
+
 class PerformanceRequestsResponse(BaseModel):
     success: bool
     message: str
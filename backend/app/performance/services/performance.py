@@ -18,24 +18,58 @@ from datetime import timezone
 from typing import List
 from typing import Sequence
 
+from app.ai_analyst.services.lesson_index import stats as palace_lesson_index_stats
+from app.connectors.cache import stats as connector_cache_stats
+from app.connectors.wazuh_indexer.utils.client_registry import (
+    stats as wazuh_indexer_client_stats,
+)
+from app.connectors.wazuh_manager.services.atomic_red_team import (
+    stats as atomic_red_team_stats,
+)
+from app.connectors.wazuh_manager.services.mitre_reference import (
+    stats as mitre_reference_stats,
+)
 from app.db.query_metrics import query_registry
 from app.db.query_metrics import summary as query_summary
+from app.incidents.services.open_alert_index import stats as open_alert_index_stats
+from app.incidents.services.reference_cache import stats as ingest_reference_cache_stats
+from app.incidents.services.report_render_pool import stats as report_render_stats
+from app.incidents.services.template_suggestions import (
+    stats as template_suggestion_stats,
+)
+from app.incidents.services.velo_sigma_exclusions import (
+    stats as velo_sigma_exclusion_stats,
+)
+from app.integrations.copilot_searches.services.catalog_snapshots import (
+    stats as catalog_snapshot_stats,
+)
 from app.middleware.performance import LAG_SAMPLE_INTERVAL
 from app.middleware.performance import LAG_STALL_THRESHOLD_MS
 from app.middleware.performance import PERF_MONITOR_ENABLED
 from app.middleware.performance import SLOW_REQUEST_MS
 from app.middleware.performance import performance_registry
+from app.notifications.services.emit import stats as notification_queue_stats
+from app.notifications.services.rendering import template_cache_stats
+from app.performance.schema.performance import CacheStats
 from app.performance.schema.performance import DatabaseSummaryResponse
 from app.performance.schema.performance import EndpointTiming
 from app.performance.schema.performance import InFlightRequest
 from app.performance.schema.performance import LoopLagStats
 from app.performance.schema.performance import LoopStall
+from app.performance.schema.performance import PerformanceCachesResponse
 from app.performance.schema.performance import PerformanceEndpointsResponse
+from app.performance.schema.performance import PerformancePipelinesResponse
 from app.performance.schema.performance import PerformanceRequestsResponse
 from app.performance.schema.performance import PerformanceResetResponse
 from app.performance.schema.performance import PerformanceStallsResponse
 from app.performance.schema.performance import PerformanceSummaryResponse
+from app.performance.schema.performance import PipelineStageTiming
 from app.performance.schema.performance import RequestTiming
+from app.schedulers.services.integration_collector import (
+    stats as integration_collect_stats,
+)
+from app.siem.services.panel_cache import stats as siem_panel_cache_stats
+from app.threat_intel.services.epss_cache import stats as epss_cache_stats
 
 SORT_FIELDS = {
     "stalled_ms",
@@ -154,6 +188,60 @@ async def get_endpoint_timings(limit: int = 50, sort_by: str = "stalled_ms") ->
     )
 
 
+async def get_pipeline_stages() -> PerformancePipelinesResponse:
+    """Per-stage timings for background pipelines, grouped by pipeline."""
+    rows = [
+        PipelineStageTiming(
+            pipeline=stats.pipeline,
+            stage=stats.stage,
+            runs=stats.runs,
+            items=stats.items,
+            failures=stats.failures,
+            avg_ms=round(stats.total_ms / stats.runs, 2),
+            p95_ms=_percentile(list(stats.samples), 95),
+            max_ms=round(stats.max_ms, 2),
+            items_per_second=round(stats.items / (stats.total_ms / 1000.0), 2) if stats.total_ms else 0.0,
+        )
+        for stats in performance_registry.stages
+        if stats.runs
+    ]
+    rows.sort(key=lambda row: (row.pipeline, row.stage))
+    return PerformancePipelinesResponse(
+        success=True,
+        message="Pipeline stage timings retrieved successfully",
+        stages=rows,
+        queues={
+            "notification_dispatch": notification_queue_stats(),
+            "report_render": report_render_stats(),
+            "integration_collect": integration_collect_stats(),
+        },
+    )
+
+
+async def get_cache_stats() -> PerformanceCachesResponse:
+    """Hit/miss counters for the process-wide caches, by name."""
+    caches = {
+        "connector_cache": connector_cache_stats,
+        "wazuh_indexer_clients": wazuh_indexer_client_stats,
+        "epss_scores": epss_cache_stats,
+        "notification_templates": template_cache_stats,
+        "velo_sigma_exclusions": velo_sigma_exclusion_stats,
+        "siem_dashboard_panels": siem_panel_cache_stats,
+        "palace_lesson_index": palace_lesson_index_stats,
+        "case_template_suggestions": template_suggestion_stats,
+        "catalog_snapshots": catalog_snapshot_stats,
+        "mitre_reference": mitre_reference_stats,
+        "atomic_red_team_index": atomic_red_team_stats,
+        "open_alert_index": open_alert_index_stats,
+        "ingest_reference_data": ingest_reference_cache_stats,
+    }
+    return PerformanceCachesResponse(
+        success=True,
+        message="Cache statistics retrieved successfully",
+        caches=[CacheStats(name=name, stats=collect()) for name, collect in caches.items()],
+    )
+
+
 async def get_recent_requests(limit: int = 50, min_duration_ms: float = 0.0) -> PerformanceRequestsResponse:
     records = [record for record in performance_registry.recent_requests if record.duration_ms >= min_duration_ms]
     records.reverse()  # newest first
@@ -46,9 +46,16 @@ from typing import Optional
 
 from loguru import logger
 
+from app.audit.services.audit import stats as audit_writer_stats
 from app.connectors.cache import stats as connector_cache_stats
+from app.connectors.wazuh_indexer.utils.client_registry import (
+    stats as wazuh_indexer_client_stats,
+)
 from app.db.query_metrics import query_registry
 from app.db.query_metrics import summary as query_summary
+from app.incidents.services.velo_sigma_exclusions import (
+    stats as velo_sigma_exclusion_stats,
+)
 from app.middleware.performance import LAG_SAMPLE_INTERVAL
 from app.middleware.performance import LAG_STALL_THRESHOLD_MS
 from app.middleware.performance import MAX_ENDPOINTS
@@ -61,6 +68,10 @@ from app.middleware.performance import _env_flag
 from app.middleware.performance import _env_float
 from app.middleware.performance import _env_int
 from app.middleware.performance import performance_registry
+from app.notifications.services.emit import stats as notification_queue_stats
+from app.notifications.services.rendering import template_cache_stats
+from app.siem.services.panel_cache import stats as siem_panel_cache_stats
+from app.threat_intel.services.epss_cache import stats as epss_cache_stats
 
 # backend/app/performance/services/session_log.py -> backend/
 _BACKEND_ROOT = Path(__file__).resolve().parents[3]
@@ -282,6 +293,32 @@ class PerformanceSessionLog:
             "database": query_summary(),
             # …and how much of it the connector cache is now removing (level 4).
             "connector_cache": connector_cache_stats(),
+            # …and whether the pooled indexer clients are actually being reused.
+            "wazuh_indexer_clients": wazuh_indexer_client_stats(),
+            # …and how often vulnerability lookups still leave the building for EPSS.
+            "epss_cache": epss_cache_stats(),
+            # …and whether notification templates are still being compiled per send.
+            "notification_templates": template_cache_stats(),
+            "notification_queue": notification_queue_stats(),
+            # …and how many audit rows each database round-trip is now carrying.
+            "audit_writer": audit_writer_stats(),
+            # …and how many exclusions each Velociraptor Sigma alert is still checked against.
+            "velo_sigma_exclusions": velo_sigma_exclusion_stats(),
+            # …and how many dashboard refreshes were served without touching the indexer.
+            "siem_dashboard_panels": siem_panel_cache_stats(),
+            "pipeline_stages": [
+                {
+                    "pipeline": stats.pipeline,
+                    "stage": stats.stage,
+                    "runs": stats.runs,
+                    "items": stats.items,
+                    "failures": stats.failures,
+                    "avg_ms": round(stats.total_ms / stats.runs, 2),
+                    "max_ms": round(stats.max_ms, 2),
+                }
+                for stats in registry.stages
+                if stats.runs
+            ],
             "top_endpoints": [
                 {
                     "method": stats.method,
@@ -67,6 +67,8 @@ from app.schedulers.services.invoke_snapshot_and_restore import (
     invoke_snapshot_schedules,
 )
 from app.schedulers.services.refresh_catalog_caches import refresh_catalog_caches
+from app.schedulers.services.refresh_epss_scores import refresh_epss_scores
+from app.schedulers.services.refresh_mitre_reference import refresh_mitre_reference
 from app.schedulers.services.refresh_sidebar_health import refresh_sidebar_health
 from app.schedulers.services.refresh_sidebar_indicators import (
     refresh_sidebar_indicators,
@@ -198,7 +200,7 @@ async def initialize_job_metadata():
                 # TTL-aware, so the 24h MITRE bundle is not re-downloaded each run.
                 "time_interval": 15,
                 "function": refresh_catalog_caches,
-                "description": "Refreshes the Detections Catalog GitHub-backed caches (CoPilot Searches rules, MITRE matrix) off the request path.",
+                "description": "Refreshes the Detections Catalog GitHub-backed caches (CoPilot Searches rules, MITRE matrix, Atomic Red Team index) off the request path.",
             },
             {
                 "job_id": "refresh_sidebar_health",
@@ -218,6 +220,23 @@ async def initialize_job_metadata():
                 "function": refresh_sidebar_indicators,
                 "description": "Assembles the deployment-wide sidebar indicators so /status/sidebar reads them from memory.",
             },
+            {
+                "job_id": "refresh_epss_scores",
+                # Hourly, but it only downloads once the snapshot is a day old
+                # (EPSS_REFRESH_HOURS); the short interval is so a restart or a
+                # failed download is retried within the hour.
+                "time_interval": 60,
+                "function": refresh_epss_scores,
+                "description": "Refreshes the local EPSS score snapshot used by vulnerability search and CSV export.",
+            },
+            {
+                "job_id": "refresh_mitre_reference",
+                # Hourly against a 24h TTL (MITRE_REFERENCE_TTL_HOURS): a fresh
+                # cache is skipped, so this only picks up a restart or a failed load.
+                "time_interval": 60,
+                "function": refresh_mitre_reference,
+                "description": "Refreshes the MITRE ATT&CK reference data used by the MITRE views and case template suggestions.",
+            },
             {
                 "job_id": "prune_audit_log",
                 # Daily. Deletes audit_log rows older than AUDIT_LOG_RETENTION_DAYS (default 90)
@@ -361,6 +380,8 @@ def get_function_by_name(function_name: str):
         "refresh_catalog_caches": refresh_catalog_caches,
         "refresh_sidebar_health": refresh_sidebar_health,
         "refresh_sidebar_indicators": refresh_sidebar_indicators,
+        "refresh_epss_scores": refresh_epss_scores,
+        "refresh_mitre_reference": refresh_mitre_reference,
         # Add other function mappings here
     }
     # Raise rather than returning a placeholder lambda: APScheduler's SQLAlchemy jobstore
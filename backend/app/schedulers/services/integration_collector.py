@@ -0,0 +1,192 @@
+"""Per-customer collection for the third-party integration scheduler jobs.
+
+The Huntress, CarbonBlack, Darktrace, DUO, CATO and Mimecast jobs each looked
+up the customers with the integration and then collected for them one at a
+time, on one shared session, and finally stamped `last_success` through the
+synchronous session, which stalls the event loop. Huntress and CATO also
+re-read the job's `JobMetadata` for every customer, to pass a ``time_range``
+their request models do not have (pydantic dropped it). With sixty customers,
+one slow tenant held back every customer queued behind it by however long it
+took.
+
+`run_customer_collections` is the loop all of them share now:
+
+* **Bounded fan-out.** Up to `COLLECT_CONCURRENCY` customers collect at once,
+  each on its own session — an `AsyncSession` cannot be shared between
+  concurrent tasks.
+* **Per-customer timeout.** A collection that runs past
+  `COLLECT_TIMEOUT_SECONDS` is abandoned and reported as ``timeout``; the
+  others are unaffected, and the next run tries it again.
+* **Outcomes are recorded.** Each customer's duration and outcome are logged,
+  reported to the `PerformanceRegistry` under the ``integration_collect``
+  pipeline (one stage per integration) and kept for the last run of each job
+  (``GET /api/performance/pipelines``, under ``queues``).
+* **Job metadata is written asynchronously.** ``last_success`` is stamped
+  when the run finishes, as before: a customer's failure is that customer's,
+  not the job's.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import datetime
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.db_session import get_db_session
+from app.integrations.models.customer_integration_settings import CustomerIntegrations
+from app.middleware.performance import performance_registry
+from app.schedulers.models.scheduler import JobMetadata
+
+PIPELINE = "integration_collect"
+
+
+def _env_number(name: str, default: float) -> float:
+    raw = os.getenv(name, str(default))
+    try:
+        value = float(raw)
+    except ValueError:
+        logger.warning(f"{name}={raw!r} is not a number; falling back to {default}")
+        return default
+    return value if value > 0 else default
+
+
+#: Customers collected at once per job. Each holds a database connection for
+#: the whole collection, and several jobs can run side by side on the default
+#: pool of 40 alongside the UI.
+COLLECT_CONCURRENCY = int(_env_number("INTEGRATION_COLLECT_CONCURRENCY", 4))
+
+#: Longest one customer's collection may take before it is abandoned.
+COLLECT_TIMEOUT_SECONDS = _env_number("INTEGRATION_COLLECT_TIMEOUT_SECONDS", 300.0)
+
+Collect = Callable[[str, AsyncSession], Awaitable[Any]]
+
+
+@dataclass
+class CustomerOutcome:
+    customer_code: str
+    #: ``success``, ``failed`` (the collection reported success=False),
+    #: ``error`` (it raised) or ``timeout``.
+    outcome: str
+    duration_ms: float
+    message: Optional[str] = None
+
+
+@dataclass
+class CollectionRun:
+    job_id: str
+    service_name: str
+    started_at: datetime
+    duration_ms: float = 0.0
+    customers: List[CustomerOutcome] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for customer in self.customers if customer.outcome == "success")
+
+
+_last_runs: Dict[str, CollectionRun] = {}
+
+
+async def run_customer_collections(job_id: str, service_name: str, collect: Collect) -> CollectionRun:
+    """
+    Run ``collect(customer_code, session)`` for every customer with the
+    ``service_name`` integration, then stamp the job's ``last_success``.
+
+    Each call gets a session of its own. Never raises for a customer's
+    failure; each one is recorded in the returned `CollectionRun`.
+    """
+    started = time.perf_counter()
+    run = CollectionRun(job_id=job_id, service_name=service_name, started_at=datetime.utcnow())
+
+    async with get_db_session() as session:
+        result = await session.execute(
+            select(CustomerIntegrations.customer_code).where(CustomerIntegrations.integration_service_name == service_name),
+        )
+        customer_codes = list(result.scalars())
+    logger.info(f"{job_id}: collecting {service_name} for {len(customer_codes)} customer(s): {customer_codes}")
+
+    semaphore = asyncio.Semaphore(max(COLLECT_CONCURRENCY, 1))
+
+    async def collect_one(customer_code: str) -> CustomerOutcome:
+        async with semaphore:
+            return await _collect_customer(service_name, customer_code, collect)
+
+    run.customers = list(await asyncio.gather(*(collect_one(code) for code in customer_codes)))
+    run.duration_ms = (time.perf_counter() - started) * 1000.0
+    _last_runs[job_id] = run
+
+    await mark_job_success(job_id)
+    logger.info(
+        f"{job_id}: {run.succeeded}/{len(run.customers)} {service_name} collection(s) succeeded in {run.duration_ms / 1000.0:.1f}s",
+    )
+    return run
+
+
+async def _collect_customer(
+    service_name: str,
+    customer_code: str,
+    collect: Collect,
+) -> CustomerOutcome:
+    started = time.perf_counter()
+    message = None
+    try:
+        async with get_db_session() as session:
+            response = await asyncio.wait_for(collect(customer_code, session), timeout=COLLECT_TIMEOUT_SECONDS)
+        if getattr(response, "success", True):
+            outcome = "success"
+        else:
+            outcome, message = "failed", getattr(response, "message", None)
+    except asyncio.TimeoutError:
+        outcome, message = "timeout", f"No result after {COLLECT_TIMEOUT_SECONDS:g}s"
+    except Exception as e:  # noqa: BLE001 — one customer's failure must not stop the others
+        outcome, message = "error", str(e) or e.__class__.__name__
+
+    duration_ms = (time.perf_counter() - started) * 1000.0
+    performance_registry.record_stage(PIPELINE, service_name, duration_ms, items=1, failures=0 if outcome == "success" else 1)
+    if outcome == "success":
+        logger.info(f"{service_name} collection for {customer_code} succeeded in {duration_ms / 1000.0:.1f}s")
+    else:
+        logger.warning(f"{service_name} collection for {customer_code} {outcome} after {duration_ms / 1000.0:.1f}s: {message}")
+    return CustomerOutcome(customer_code=customer_code, outcome=outcome, duration_ms=round(duration_ms, 2), message=message)
+
+
+async def mark_job_success(job_id: str) -> None:
+    """Set ``last_success`` on the job's `JobMetadata` row."""
+    async with get_db_session() as session:
+        job_metadata = (await session.execute(select(JobMetadata).where(JobMetadata.job_id == job_id))).scalars().first()
+        if job_metadata is None:
+            logger.warning(f"JobMetadata for {job_id!r} not found.")
+            return
+        job_metadata.last_success = datetime.utcnow()
+        session.add(job_metadata)
+        await session.commit()
+
+
+def stats() -> Dict[str, Any]:
+    """The last run of each job, with every customer's outcome."""
+    return {
+        job_id: {
+            "service_name": run.service_name,
+            "started_at": run.started_at.isoformat(),
+            "duration_ms": round(run.duration_ms, 2),
+            "succeeded": run.succeeded,
+            "customers": [asdict(customer) for customer in run.customers],
+        }
+        for job_id, run in _last_runs.items()
+    }
+
+
+def reset_stats() -> None:
+    _last_runs.clear()
@@ -16,6 +16,7 @@ from datetime import datetime
 from loguru import logger
 from sqlalchemy.future import select
 
+from app.ai_analyst.services import lesson_index
 from app.connectors.talon.utils.universal import send_post_request
 from app.db.db_session import get_db_session
 from app.db.universal_models import AiAnalystPalaceLesson
@@ -108,6 +109,7 @@ async def invoke_palace_lesson_drainer() -> None:
                 logger.info(f"Lesson {lesson.id} ingested (customer={lesson.customer_code}, type={lesson.lesson_type})")
             else:
                 lesson.status = "failed"
+                lesson_index.discard(lesson.id)
                 failed += 1
                 logger.warning(
                     f"Palace lesson {lesson.id} failed: " f"{response.get('message', 'unknown error')}",
@@ -24,6 +24,7 @@ from datetime import timedelta
 from loguru import logger
 from sqlalchemy.future import select
 
+from app.ai_analyst.services import lesson_index
 from app.connectors.talon.utils.universal import send_post_request
 from app.db.db_session import get_db_session
 from app.db.universal_models import AiAnalystPalaceLesson
@@ -123,6 +124,7 @@ async def invoke_palace_lesson_sweeper() -> None:
             lesson.status = "expired"
             lesson.expired_at = datetime.utcnow()
             session.add(lesson)
+            lesson_index.discard(lesson.id)
             # Commit per-row so partial progress survives a mid-batch crash.
             await session.commit()
 
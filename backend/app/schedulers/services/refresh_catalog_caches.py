@@ -1,11 +1,13 @@
 """Keep the Detections Catalog's content caches warm (#1072).
 
-The catalog reads from three in-memory caches, all of which load lazily on first
+The catalog reads from these in-memory caches, all of which load lazily on first
 access. Whoever triggers a cold load pays for it inside their request:
 
 * ``rules_cache``   — CoPilot Searches corpus, fetched from GitHub (TTL 30 min)
 * ``mitre_matrix``  — MITRE ATT&CK STIX bundle, tens of MB from GitHub with a
   120s client timeout (TTL 24h)
+* ``atomic_red_team_index`` — the Atomic Red Team library, synced from GitHub
+  folder by folder (TTL 24h)
 * ``wazuh_rules_cache`` — handled by its own job, see refresh_wazuh_rules_cache
 
 With none of them warmed, `/catalog/stories` was measured at **130 seconds** and
@@ -20,6 +22,7 @@ particular must not be re-downloaded every 15 minutes.
 
 from loguru import logger
 
+from app.connectors.wazuh_manager.services.atomic_red_team import atomic_red_team_index
 from app.integrations.copilot_searches.services.copilot_searches import rules_cache
 from app.integrations.copilot_searches.services.mitre_coverage import mitre_matrix
 
@@ -28,9 +31,14 @@ async def refresh_catalog_caches() -> None:
     """Load the catalog's GitHub-backed caches if their TTL has expired.
 
     Each cache is handled independently: GitHub being unreachable for one must
-    not stop the other from refreshing, and neither may fail the scheduler job.
+    not stop the others from refreshing, and none may fail the scheduler job.
     """
-    for name, cache in (("CoPilot Searches rules", rules_cache), ("MITRE ATT&CK matrix", mitre_matrix)):
+    caches = (
+        ("CoPilot Searches rules", rules_cache),
+        ("MITRE ATT&CK matrix", mitre_matrix),
+        ("Atomic Red Team index", atomic_red_team_index),
+    )
+    for name, cache in caches:
         if not cache.is_stale:
             logger.debug(f"{name} cache is still fresh, skipping")
             continue
@@ -61,6 +69,17 @@ async def warm_catalog_caches() -> None:
     except Exception as exc:  # noqa: BLE001
         logger.warning(f"Could not warm the Wazuh rules cache at startup: {exc}")
 
+    # Same shape as the Wazuh ruleset: the MITRE views and case template
+    # suggestions read it, and it should not wait for the hourly job.
+    from app.connectors.wazuh_manager.services.mitre_reference import (
+        mitre_reference_cache,
+    )
+
+    try:
+        await mitre_reference_cache.ensure_loaded()
+    except Exception as exc:  # noqa: BLE001
+        logger.warning(f"Could not warm the MITRE reference cache at startup: {exc}")
+
     # The sidebar's InfluxDB indicator is refreshed on the same principle: filled
     # in here so the first sidebar load after a restart already has a value.
     from app.schedulers.services.refresh_sidebar_health import refresh_sidebar_health
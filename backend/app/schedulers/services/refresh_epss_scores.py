@@ -0,0 +1,31 @@
+"""Keep the local EPSS snapshot current for vulnerability search and export.
+
+FIRST publishes the full set of scores once a day. This job runs hourly and
+downloads only once the snapshot is older than `EPSS_REFRESH_HOURS`, so a restart
+or a failed download is picked up within the hour instead of the next day. See
+`app/threat_intel/services/epss_cache.py`.
+"""
+
+from loguru import logger
+
+from app.threat_intel.services import epss_cache
+
+
+async def refresh_epss_scores() -> None:
+    """Reload the EPSS feed if the snapshot is due.
+
+    Never raises: without the feed, lookups keep serving the previous snapshot
+    and fall back to the API for anything it lacks.
+    """
+    await epss_cache.ensure_loaded()
+    if not epss_cache.is_stale():
+        logger.debug("EPSS snapshot is still current, skipping")
+        return
+
+    logger.info("Scheduled refresh of the EPSS snapshot starting")
+    try:
+        count = await epss_cache.refresh()
+    except Exception as exc:  # noqa: BLE001 — an unreachable feed must not kill the job
+        logger.warning(f"Could not refresh the EPSS snapshot: {exc}. Serving the previous one ({epss_cache.stats()['scores']} scores).")
+        return
+    logger.info(f"Scheduled refresh of the EPSS snapshot completed: {count} scores (score date {epss_cache.stats()['score_date']})")
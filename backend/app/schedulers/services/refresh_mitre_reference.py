@@ -0,0 +1,35 @@
+"""Keep the MITRE ATT&CK reference cache loaded so no MITRE view ever loads it.
+
+The MITRE heatmap and the per-technique alert view used to fetch every technique
+and tactic from the Wazuh API on each request, before the indexer query even
+started. They now read `mitre_reference_cache`, and this job is what keeps it
+current. The interval is far shorter than the cache's 24h TTL only so that a
+restart or a failed load is picked up within the hour; a fresh cache is left
+alone. See `app/connectors/wazuh_manager/services/mitre_reference.py`.
+"""
+
+from loguru import logger
+
+from app.connectors.wazuh_manager.services.mitre_reference import mitre_reference_cache
+
+
+async def refresh_mitre_reference() -> None:
+    """Reload the MITRE reference data if it is due.
+
+    Never raises: `refresh()` keeps the previous data when Wazuh cannot be
+    reached and records why in `unavailable_reason`.
+    """
+    await mitre_reference_cache.load_snapshot()
+    if not mitre_reference_cache.is_stale:
+        logger.debug("MITRE reference cache is still fresh, skipping")
+        return
+
+    logger.info("Scheduled refresh of the MITRE reference cache starting")
+    count = await mitre_reference_cache.refresh()
+    if mitre_reference_cache.unavailable_reason is None:
+        logger.info(f"Scheduled refresh of the MITRE reference cache completed: {count} techniques")
+    else:
+        logger.warning(
+            f"Scheduled refresh of the MITRE reference cache could not reach Wazuh: {mitre_reference_cache.unavailable_reason}. "
+            f"Serving the previous data ({count} techniques).",
+        )
@@ -1,3 +1,4 @@
+import re
 from typing import Optional
 
 from fastapi import APIRouter
@@ -5,6 +6,7 @@ from fastapi import Depends
 from fastapi import HTTPException
 from fastapi import Query
 from fastapi import Security
+from fastapi.responses import StreamingResponse
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -16,6 +18,8 @@ from app.siem.schema.events import EventDocumentResponse
 from app.siem.schema.events import EventsQueryParams
 from app.siem.schema.events import EventsQueryResponse
 from app.siem.schema.events import FieldMappingsResponse
+from app.siem.services.events import EXPORT_MAX_EVENTS
+from app.siem.services.events import export_events
 from app.siem.services.events import get_event_document
 from app.siem.services.events import get_field_mappings
 from app.siem.services.events import query_events
@@ -26,7 +30,7 @@ siem_events_router = APIRouter()
 @siem_events_router.get(
     "/{customer_code}/{source_name}",
     response_model=EventsQueryResponse,
-    description="Query events from a customer's event source with scroll-based pagination and optional Lucene query",
+    description="Query events from a customer's event source with cursor-based pagination and optional Lucene query",
     dependencies=[Security(AuthHandler().require_any_scope("admin", "analyst", "customer_user"))],
 )
 async def query_events_endpoint(
@@ -34,7 +38,8 @@ async def query_events_endpoint(
     source_name: str,
     timerange: str = Query("24h", description="Time range (e.g. '1h', '24h', '7d', '1w')"),
     page_size: int = Query(50, ge=1, le=1000, description="Number of results per page"),
-    scroll_id: Optional[str] = Query(None, description="Scroll ID for fetching the next page"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous response for fetching the next page"),
+    scroll_id: Optional[str] = Query(None, description="Deprecated: scroll ID from an older response. Use cursor."),
     query: Optional[str] = Query(None, description="Lucene query string (e.g. 'agent_name:piHole AND agent_id:088')"),
     time_from: Optional[str] = Query(None, description="Absolute start time in ISO format. Overrides timerange."),
     time_to: Optional[str] = Query(None, description="Absolute end time in ISO format. Overrides timerange."),
@@ -50,6 +55,7 @@ async def query_events_endpoint(
         timerange=timerange,
         page_size=page_size,
         scroll_id=scroll_id,
+        cursor=cursor,
         query=query,
         time_from=time_from,
         time_to=time_to,
@@ -57,6 +63,38 @@ async def query_events_endpoint(
     return await query_events(customer_code, source_name, params, db)
 
 
+@siem_events_router.get(
+    "/{customer_code}/{source_name}/export",
+    response_class=StreamingResponse,
+    description="Download every event matching a search as newline-delimited JSON, newest first",
+    dependencies=[Security(AuthHandler().require_any_scope("admin", "analyst", "customer_user"))],
+)
+async def export_events_endpoint(
+    customer_code: str,
+    source_name: str,
+    timerange: str = Query("24h", description="Time range (e.g. '1h', '24h', '7d', '1w')"),
+    query: Optional[str] = Query(None, description="Lucene query string (e.g. 'agent_name:piHole AND agent_id:088')"),
+    time_from: Optional[str] = Query(None, description="Absolute start time in ISO format. Overrides timerange."),
+    time_to: Optional[str] = Query(None, description="Absolute end time in ISO format. Overrides timerange."),
+    max_events: int = Query(EXPORT_MAX_EVENTS, ge=1, le=EXPORT_MAX_EVENTS, description="Stop after this many events"),
+    current_user: User = Depends(AuthHandler().get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    logger.info(f"Exporting events for customer {customer_code}, source {source_name}")
+
+    if not await customer_access_handler.check_customer_access(current_user, customer_code, db):
+        raise HTTPException(status_code=403, detail=f"Access denied to customer {customer_code}")
+
+    params = EventsQueryParams(timerange=timerange, query=query, time_from=time_from, time_to=time_to)
+    stream = await export_events(customer_code, source_name, params, db, max_events=max_events)
+    filename = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{customer_code}-{source_name}-events.ndjson")
+    return StreamingResponse(
+        stream,
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @siem_events_router.get(
     "/{customer_code}/{source_name}/document",
     response_model=EventDocumentResponse,
@@ -10,7 +10,8 @@ from pydantic import Field
 class EventsQueryParams(BaseModel):
     timerange: str = Field("24h", description="Time range (e.g. '1h', '24h', '7d', '1w')")
     page_size: int = Field(50, ge=1, le=1000, description="Number of results per page")
-    scroll_id: Optional[str] = Field(None, description="Scroll ID for fetching the next page")
+    scroll_id: Optional[str] = Field(None, description="Deprecated: scroll ID from an older response. Use cursor.")
+    cursor: Optional[str] = Field(None, description="Cursor from the previous response for fetching the next page")
     query: Optional[str] = Field(None, description="Lucene query string (e.g. 'agent_name:piHole AND agent_id:088')")
     time_from: Optional[str] = Field(
         None,
@@ -23,6 +24,7 @@ class EventsQueryResponse(BaseModel):
     events: List[Dict[str, Any]]
     total: int
     scroll_id: Optional[str] = None
+    cursor: Optional[str] = Field(None, description="Pass back as `cursor` for the next page; null on the last page")
     page_size: int
     success: bool
     message: str
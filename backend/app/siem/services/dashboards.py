@@ -4,8 +4,8 @@ from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 
-from elasticsearch7.exceptions import RequestError
 from fastapi import HTTPException
 from loguru import logger
 from sqlalchemy import select
@@ -26,6 +26,7 @@ from app.siem.schema.dashboards import DashboardCategoryWithTemplates
 from app.siem.schema.dashboards import DashboardTemplate
 from app.siem.schema.dashboards import EnableDashboardRequest
 from app.siem.schema.dashboards import PanelResult
+from app.siem.services import panel_cache
 
 TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "dashboard_templates"
 
@@ -191,23 +192,19 @@ async def disable_dashboard(
 # ── Panel data (execute queries for dashboard rendering) ─────────
 
 
-def _is_text_field_agg_error(exc: RequestError) -> bool:
-    """True iff the Elasticsearch error is the one raised when a terms agg
+def _is_text_field_agg_error(error: Dict[str, Any]) -> bool:
+    """True iff an `_msearch` per-search error is the one raised when a terms agg
     targets a `text`-typed field (which lacks per-document field data by
     default). The error string is stable across ES 7.x and is the cue we
     use to retry the agg against `<field>.keyword`.
 
-    Sample message body (in `exc.info`):
+    Sample reason (nested under `error.caused_by` / `error.root_cause`):
         "Text fields are not optimised for operations that require
          per-document field data like aggregations and sorting..."
 
-    Note: `str(exc)` for elasticsearch7 RequestError only includes the
-    error code ("search_phase_execution_exception"), NOT the message —
-    the human-readable text lives on `exc.info`. We match against both
-    so the type code and the specific cause both have to line up.
+    The type code and the specific cause both have to line up.
     """
-    info = getattr(exc, "info", "") or ""
-    return getattr(exc, "error", "") == "search_phase_execution_exception" and "Text fields are not optimised" in str(info)
+    return error.get("type") == "search_phase_execution_exception" and "Text fields are not optimised" in json.dumps(error)
 
 
 async def get_custom_template(
@@ -262,6 +259,49 @@ def _compute_histogram_interval(timerange: str) -> str:
     return mapping.get(timerange, "1h")
 
 
+def _msearch_error_message(error: Any) -> str:
+    if not isinstance(error, dict):
+        return str(error)
+    root_causes = error.get("root_cause") or []
+    reason = (root_causes[0].get("reason") if root_causes else None) or error.get("reason") or ""
+    return f"{error.get('type', 'search_error')}: {reason}" if reason else str(error.get("type", "search_error"))
+
+
+def _build_terms_agg(agg_field: str, bucket_size: int) -> dict:
+    return {
+        "top_values": {
+            "terms": {"field": agg_field, "size": bucket_size},
+        },
+    }
+
+
+async def _resolve_agg_fields(es_client, index_pattern: str, fields: List[str]) -> Dict[str, str]:
+    """Map each terms-panel field to the field its aggregation should target.
+
+    A field mapped as `text` (in any index the pattern covers) that has a
+    `keyword` subfield aggregates on `<field>.keyword`; everything else on itself.
+    Decided from one `_field_caps` call per index pattern and cached (see
+    `panel_cache`), instead of failing a search to find out. If the lookup fails
+    the fields are used as-is and the search-error fallback still applies.
+    """
+    known, unknown = panel_cache.cached_agg_fields(index_pattern, [f for f in fields if not f.endswith(".keyword")])
+    if unknown:
+        try:
+            caps = await es_client.field_caps(index=index_pattern, fields=",".join([*unknown, *(f"{f}.keyword" for f in unknown)]))
+        except Exception as e:
+            logger.warning(f"Could not read field types for {index_pattern}: {e}")
+            return {f: known.get(f, f) for f in fields}
+        mapped = caps.get("fields") or {}
+        resolved = {}
+        for field in unknown:
+            is_text = "text" in (mapped.get(field) or {})
+            has_keyword = "keyword" in (mapped.get(f"{field}.keyword") or {})
+            resolved[field] = f"{field}.keyword" if is_text and has_keyword else field
+        panel_cache.remember_agg_fields(index_pattern, resolved)
+        known.update(resolved)
+    return {f: known.get(f, f) for f in fields}
+
+
 async def execute_panels(
     panels: List[Dict[str, Any]],
     index_pattern: str,
@@ -278,18 +318,49 @@ async def execute_panels(
     ``base_query`` is the dashboard-wide Lucene filter (custom dashboards only);
     it is ANDed with each panel's own filter. A panel failure is captured on that
     panel's result instead of failing the whole dashboard.
+
+    Identical requests within `SIEM_DASHBOARD_CACHE_SECONDS` share one execution
+    (see `panel_cache`).
+    """
+    base_query = (base_query or "*").strip() or "*"
+    key = panel_cache.result_key(
+        index_pattern=index_pattern,
+        time_field=time_field,
+        timerange=timerange,
+        base_query=base_query,
+        panels=panels,
+    )
+    results = await panel_cache.get_or_run(key, lambda: _run_panels(panels, index_pattern, time_field, timerange, base_query))
+    # The cached dict is shared; hand each caller its own.
+    return dict(results)
+
+
+async def _run_panels(
+    panels: List[Dict[str, Any]],
+    index_pattern: str,
+    time_field: str,
+    timerange: str,
+    base_query: str,
+) -> Tuple[Dict[str, PanelResult], bool]:
+    """Build every panel's search, send them as one `_msearch`, and parse each response on its own.
+
+    Returns the results and whether they may be cached: not when the indexer
+    could not be reached, so an outage is not served for a whole TTL after it ends.
     """
     # Build time range filter
     query_builder = AlertsQueryBuilder()
     query_builder.add_time_range(timerange=timerange, timestamp_field=time_field)
     time_filter = query_builder.query["query"]["bool"]["must"]
 
-    base_query = (base_query or "*").strip() or "*"
-
     es_client = await create_wazuh_indexer_client_async("Wazuh-Indexer")
     results: Dict[str, PanelResult] = {}
+    # (panel id, panel type, panel, search body) for each panel that needs a search.
+    searches: List[tuple] = []
 
     try:
+        terms_fields = [p["field"] for p in panels if p["type"] in ("pie", "bar_h") and p.get("field")]
+        agg_fields = await _resolve_agg_fields(es_client, index_pattern, terms_fields) if terms_fields else {}
+
         for panel in panels:
             pid = panel["id"]
             ptype = panel["type"]
@@ -298,110 +369,144 @@ async def execute_panels(
             table_fields = panel.get("fields") or []
             size = panel.get("size") or 10
 
-            try:
-                must: List[dict] = [
-                    *time_filter,
-                    {"query_string": {"query": lucene, "default_operator": "AND"}},
-                ]
-                # "*" matches everything, so only pay for the extra clause when
-                # the dashboard actually narrows the scope.
-                if base_query != "*":
-                    must.append({"query_string": {"query": base_query, "default_operator": "AND"}})
-
-                # Build base query with time filter + Lucene
-                body: dict = {
-                    "query": {"bool": {"must": must}},
-                    "size": 0,
+            must: List[dict] = [
+                *time_filter,
+                {"query_string": {"query": lucene, "default_operator": "AND"}},
+            ]
+            # "*" matches everything, so only pay for the extra clause when
+            # the dashboard actually narrows the scope.
+            if base_query != "*":
+                must.append({"query_string": {"query": base_query, "default_operator": "AND"}})
+
+            # Build base query with time filter + Lucene
+            body: dict = {
+                "query": {"bool": {"must": must}},
+                "size": 0,
+            }
+
+            if ptype == "stat":
+                # Just need the total count
+                pass
+
+            elif ptype == "histogram":
+                interval = _compute_histogram_interval(timerange)
+                body["aggs"] = {
+                    "over_time": {
+                        "date_histogram": {
+                            "field": time_field,
+                            "fixed_interval": interval,
+                            "min_doc_count": 0,
+                        },
+                    },
                 }
 
-                if ptype == "stat":
-                    # Just need the total count
-                    resp = await es_client.search(index=index_pattern, body=body)
-                    total = resp["hits"]["total"]
-                    count = total["value"] if isinstance(total, dict) else total
-                    results[pid] = PanelResult(type="stat", value=count)
-
-                elif ptype == "histogram":
-                    interval = _compute_histogram_interval(timerange)
-                    body["aggs"] = {
-                        "over_time": {
-                            "date_histogram": {
-                                "field": time_field,
-                                "fixed_interval": interval,
-                                "min_doc_count": 0,
-                            },
-                        },
-                    }
-                    resp = await es_client.search(index=index_pattern, body=body)
-                    buckets = resp["aggregations"]["over_time"]["buckets"]
-                    labels = [b["key_as_string"] for b in buckets]
-                    data = [b["doc_count"] for b in buckets]
-                    results[pid] = PanelResult(type="histogram", labels=labels, data=data)
-
-                elif ptype in ("pie", "bar_h"):
-                    if not field:
-                        results[pid] = PanelResult(type=ptype, error="No field specified for aggregation")
-                        continue
-
-                    def _build_terms_agg(agg_field: str, bucket_size: int = size) -> dict:
-                        return {
-                            "top_values": {
-                                "terms": {"field": agg_field, "size": bucket_size},
-                            },
-                        }
-
-                    body["aggs"] = _build_terms_agg(field)
-                    try:
-                        resp = await es_client.search(index=index_pattern, body=body)
-                    except RequestError as exc:
-                        # Elasticsearch refuses terms aggs on `text` fields by default.
-                        # If the index maps `field` as text, retry with the conventional
-                        # `field.keyword` subfield. Cheap one-shot fallback that handles
-                        # the common case where customer index templates differ.
-                        if _is_text_field_agg_error(exc) and not field.endswith(".keyword"):
-                            logger.info(
-                                f"Panel {pid}: '{field}' is text-typed in {index_pattern}; " f"retrying with '{field}.keyword'",
-                            )
-                            body["aggs"] = _build_terms_agg(f"{field}.keyword")
-                            resp = await es_client.search(index=index_pattern, body=body)
-                        else:
-                            raise
-                    buckets = resp["aggregations"]["top_values"]["buckets"]
-                    labels = [str(b["key"]) for b in buckets]
-                    data = [b["doc_count"] for b in buckets]
-                    results[pid] = PanelResult(type=ptype, labels=labels, data=data)
-
-                elif ptype == "table":
-                    if not table_fields:
-                        results[pid] = PanelResult(type=ptype, error="No fields specified for the table")
-                        continue
-
-                    body["size"] = size
-                    body["_source"] = table_fields
-                    body["sort"] = [{time_field: {"order": "desc"}}]
-                    try:
-                        resp = await es_client.search(index=index_pattern, body=body)
-                    except RequestError:
-                        # Sorting needs a mapped, sortable time field; some custom
-                        # index patterns don't have one. Newest-first is a nicety,
-                        # so fall back to an unsorted sample rather than erroring.
-                        logger.info(f"Panel {pid}: cannot sort {index_pattern} by '{time_field}'; retrying unsorted")
-                        body.pop("sort", None)
-                        resp = await es_client.search(index=index_pattern, body=body)
-
-                    rows = [{f: _extract_field(hit.get("_source") or {}, f) for f in table_fields} for hit in resp["hits"]["hits"]]
-                    results[pid] = PanelResult(type=ptype, columns=table_fields, rows=rows)
-
-                else:
-                    results[pid] = PanelResult(type=ptype, error=f"Unknown panel type: {ptype}")
+            elif ptype in ("pie", "bar_h"):
+                if not field:
+                    results[pid] = PanelResult(type=ptype, error="No field specified for aggregation")
+                    continue
+                body["aggs"] = _build_terms_agg(agg_fields.get(field, field), size)
+
+            elif ptype == "table":
+                if not table_fields:
+                    results[pid] = PanelResult(type=ptype, error="No fields specified for the table")
+                    continue
+                body["size"] = size
+                body["_source"] = table_fields
+                body["sort"] = [{time_field: {"order": "desc"}}]
 
+            else:
+                results[pid] = PanelResult(type=ptype, error=f"Unknown panel type: {ptype}")
+                continue
+
+            searches.append((pid, ptype, panel, body))
+
+        if not searches:
+            return results, True
+
+        lines: List[dict] = []
+        for _, _, _, body in searches:
+            lines.extend(({"index": index_pattern}, body))
+        try:
+            responses = (await es_client.msearch(body=lines))["responses"]
+        except Exception as e:
+            logger.error(f"Error running dashboard panel searches against {index_pattern}: {e}")
+            for pid, ptype, _, _ in searches:
+                results[pid] = PanelResult(type=ptype, error=str(e))
+            return results, False
+
+        for (pid, ptype, panel, body), resp in zip(searches, responses):
+            try:
+                if "error" in resp:
+                    resp = await _retry_failed_panel(es_client, index_pattern, time_field, pid, ptype, panel, body, resp["error"])
+                results[pid] = _panel_result(ptype, panel, resp)
             except Exception as e:
                 logger.error(f"Error querying panel {pid}: {e}")
                 results[pid] = PanelResult(type=ptype, error=str(e))
     finally:
         await es_client.close()
 
-    return results
+    return results, True
+
+
+async def _retry_failed_panel(
+    es_client,
+    index_pattern: str,
+    time_field: str,
+    pid: str,
+    ptype: str,
+    panel: Dict[str, Any],
+    body: dict,
+    error: Dict[str, Any],
+) -> dict:
+    """Re-run one panel whose search failed inside the `_msearch`, where a fallback exists.
+
+    Raises for any other failure, which the caller records on that panel only.
+    """
+    if ptype in ("pie", "bar_h") and _is_text_field_agg_error(error):
+        field = panel["field"]
+        current = body["aggs"]["top_values"]["terms"]["field"]
+        if not current.endswith(".keyword"):
+            # Elasticsearch refuses terms aggs on `text` fields by default. The
+            # cached field types said otherwise (the mapping changed since), so
+            # retry with the conventional `field.keyword` subfield and remember it.
+            logger.info(f"Panel {pid}: '{field}' is text-typed in {index_pattern}; retrying with '{current}.keyword'")
+            body["aggs"] = _build_terms_agg(f"{current}.keyword", panel.get("size") or 10)
+            resp = await es_client.search(index=index_pattern, body=body)
+            panel_cache.remember_agg_field(index_pattern, field, f"{current}.keyword")
+            return resp
+
+    if ptype == "table" and "sort" in body:
+        # Sorting needs a mapped, sortable time field; some custom index
+        # patterns don't have one. Newest-first is a nicety, so fall back to an
+        # unsorted sample rather than erroring.
+        logger.info(f"Panel {pid}: cannot sort {index_pattern} by '{time_field}'; retrying unsorted")
+        body.pop("sort", None)
+        return await es_client.search(index=index_pattern, body=body)
+
+    raise RuntimeError(_msearch_error_message(error))
+
+
+def _panel_result(ptype: str, panel: Dict[str, Any], resp: dict) -> PanelResult:
+    if ptype == "stat":
+        total = resp["hits"]["total"]
+        count = total["value"] if isinstance(total, dict) else total
+        return PanelResult(type="stat", value=count)
+
+    if ptype == "histogram":
+        buckets = resp["aggregations"]["over_time"]["buckets"]
+        labels = [b["key_as_string"] for b in buckets]
+        data = [b["doc_count"] for b in buckets]
+        return PanelResult(type="histogram", labels=labels, data=data)
+
+    if ptype in ("pie", "bar_h"):
+        buckets = resp["aggregations"]["top_values"]["buckets"]
+        labels = [str(b["key"]) for b in buckets]
+        data = [b["doc_count"] for b in buckets]
+        return PanelResult(type=ptype, labels=labels, data=data)
+
+    table_fields = panel.get("fields") or []
+    rows = [{f: _extract_field(hit.get("_source") or {}, f) for f in table_fields} for hit in resp["hits"]["hits"]]
+    return PanelResult(type=ptype, columns=table_fields, rows=rows)
 
 
 async def get_panel_data(
@@ -1,4 +1,9 @@
 import fnmatch
+import json
+import os
+from datetime import datetime
+from typing import AsyncIterator
+from typing import Tuple
 
 from elasticsearch7.exceptions import NotFoundError
 from fastapi import HTTPException
@@ -16,6 +21,23 @@ from app.siem.schema.events import EventsQueryParams
 from app.siem.schema.events import EventsQueryResponse
 from app.siem.schema.events import FieldMapping
 from app.siem.schema.events import FieldMappingsResponse
+from app.siem.services import events_cursor
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, str(default))
+    try:
+        return max(int(raw), 1)
+    except ValueError:
+        logger.warning(f"{name}={raw!r} is not an integer; falling back to {default}")
+        return default
+
+
+#: Upper bound on one NDJSON export; the endpoint's ``max_events`` may ask for less.
+EXPORT_MAX_EVENTS = _env_int("SIEM_EVENTS_EXPORT_MAX_EVENTS", 100000)
+
+#: Events read from the indexer per round-trip while exporting.
+EXPORT_PAGE_SIZE = 1000
 
 
 def _event_from_hit(hit: dict) -> dict:
@@ -60,12 +82,17 @@ async def query_events(
 ) -> EventsQueryResponse:
     logger.info(f"Querying events for customer {customer_code}, source {source_name}")
 
-    # If a scroll_id is provided, continue scrolling
+    # Scroll ids handed out before cursor paging keep working until they expire.
     if params.scroll_id:
         return await _scroll_next_page(params.scroll_id)
 
     # Look up event source to get index_pattern and time_field
     event_source = await get_event_source_by_customer_and_name(customer_code, source_name, db)
+    scope = _cursor_scope(customer_code, source_name)
+
+    if params.cursor:
+        state = events_cursor.decode(scope, params.cursor)
+        return await _next_page(event_source.index_pattern, scope, state)
 
     return await _initial_search(
         index_pattern=event_source.index_pattern,
@@ -75,9 +102,55 @@ async def query_events(
         query=params.query,
         time_from=params.time_from,
         time_to=params.time_to,
+        scope=scope,
     )
 
 
+def _cursor_scope(customer_code: str, source_name: str) -> str:
+    return f"{customer_code}/{source_name}"
+
+
+def _build_search(
+    time_field: str,
+    timerange: str,
+    query: str = None,
+    time_from: str = None,
+    time_to: str = None,
+) -> dict:
+    """The query and sort shared by every page of one search.
+
+    A relative timerange is frozen to absolute bounds here, so later pages of
+    the same search cover the same window however long the analyst takes.
+    """
+    query_builder = AlertsQueryBuilder()
+    if not (time_from and time_to):
+        time_from = AlertsQueryBuilder._get_time_range_start(timerange)
+        time_to = datetime.utcnow().isoformat() + "Z"
+    query_builder.add_absolute_time_range(time_from=time_from, time_to=time_to, timestamp_field=time_field)
+    query_builder.add_sort(time_field, order="desc")
+    query_builder.query["sort"].append(events_cursor.TIEBREAKER_SORT)
+
+    # Add Lucene query_string if provided
+    if query:
+        query_builder.query["query"]["bool"]["must"].append(
+            {"query_string": {"query": query, "default_operator": "AND"}},
+        )
+
+    return query_builder.build()
+
+
+def _total(response: dict) -> Tuple[int, bool]:
+    """The hit count and whether it is exact (the indexer stops counting at 10,000 by default)."""
+    total = response["hits"]["total"]
+    if isinstance(total, dict):
+        return total["value"], total.get("relation", "eq") == "eq"
+    return total, True
+
+
+def _has_more(hits: list, page_size: int, seen: int, total: int, exact: bool) -> bool:
+    return len(hits) == page_size and (seen < total or not exact)
+
+
 async def _initial_search(
     index_pattern: str,
     time_field: str,
@@ -86,45 +159,29 @@ async def _initial_search(
     query: str = None,
     time_from: str = None,
     time_to: str = None,
+    scope: str = "",
 ) -> EventsQueryResponse:
     es_client = await create_wazuh_indexer_client_async("Wazuh-Indexer")
     try:
-        query_builder = AlertsQueryBuilder()
-        if time_from and time_to:
-            query_builder.add_absolute_time_range(time_from=time_from, time_to=time_to, timestamp_field=time_field)
-        else:
-            query_builder.add_time_range(timerange=timerange, timestamp_field=time_field)
-        query_builder.add_sort(time_field, order="desc")
-
-        # Add Lucene query_string if provided
-        if query:
-            query_builder.query["query"]["bool"]["must"].append(
-                {"query_string": {"query": query, "default_operator": "AND"}},
-            )
-
-        query = query_builder.build()
-
-        response = await es_client.search(
-            index=index_pattern,
-            body=query,
-            size=page_size,
-            scroll="5m",
-        )
+        body = _build_search(time_field, timerange, query=query, time_from=time_from, time_to=time_to)
+        response, _ = await events_cursor.search_page(es_client, index_pattern, body, page_size)
 
         hits = response["hits"]["hits"]
-        total = response["hits"]["total"]["value"] if isinstance(response["hits"]["total"], dict) else response["hits"]["total"]
-        scroll_id = response.get("_scroll_id")
-
-        # If all results fit in one page, clear the scroll context
-        if len(hits) >= total:
-            if scroll_id:
-                await _clear_scroll(es_client, scroll_id)
-                scroll_id = None
+        total, exact = _total(response)
+
+        # Nothing is held open on the indexer for the first page; the cursor
+        # only records where it ended.
+        cursor = None
+        if _has_more(hits, page_size, len(hits), total, exact):
+            cursor = events_cursor.encode(
+                scope,
+                {"body": body, "size": page_size, "after": hits[-1]["sort"], "seen": len(hits), "total": total, "exact": exact},
+            )
 
         return EventsQueryResponse(
             events=[_event_from_hit(hit) for hit in hits],
             total=total,
-            scroll_id=scroll_id,
+            cursor=cursor,
             page_size=page_size,
             success=True,
             message=f"Retrieved {len(hits)} of {total} events",
@@ -136,6 +193,121 @@ async def _initial_search(
         await es_client.close()
 
 
+async def _next_page(index_pattern: str, scope: str, state: dict) -> EventsQueryResponse:
+    """The page after the one ``state`` (a decoded cursor) ended on.
+
+    The first follow-up page opens the point-in-time the rest of the search
+    reads from; the last one closes it.
+    """
+    es_client = await create_wazuh_indexer_client_async("Wazuh-Indexer")
+    pit_id, flavour = state.get("pit"), state.get("flavour")
+    page_size, total, exact = state["size"], state["total"], state["exact"]
+    try:
+        if not pit_id and not state.get("stateless"):
+            pit_id, flavour = await events_cursor.open_pit(es_client, index_pattern)
+        response, pit_id = await events_cursor.search_page(
+            es_client,
+            index_pattern,
+            state["body"],
+            page_size,
+            search_after=state["after"],
+            pit_id=pit_id,
+        )
+        hits = response["hits"]["hits"]
+        seen = state["seen"] + len(hits)
+
+        cursor = None
+        if _has_more(hits, page_size, seen, total, exact):
+            cursor = events_cursor.encode(
+                scope,
+                {
+                    **state,
+                    "after": hits[-1]["sort"],
+                    "seen": seen,
+                    "pit": pit_id,
+                    "flavour": flavour,
+                    "stateless": pit_id is None,
+                },
+            )
+        else:
+            await events_cursor.close_pit(es_client, pit_id, flavour)
+
+        return EventsQueryResponse(
+            events=[_event_from_hit(hit) for hit in hits],
+            total=total,
+            cursor=cursor,
+            page_size=len(hits),
+            success=True,
+            message=f"Retrieved {len(hits)} of {total} events" if hits else "No more results",
+        )
+    except Exception as e:
+        logger.error(f"Error paging events: {e}")
+        raise HTTPException(status_code=500, detail=f"Error paging events: {e}")
+    finally:
+        await es_client.close()
+
+
+async def export_events(
+    customer_code: str,
+    source_name: str,
+    params: EventsQueryParams,
+    db: AsyncSession,
+    max_events: int = EXPORT_MAX_EVENTS,
+) -> AsyncIterator[bytes]:
+    """Resolve the search up front and return an NDJSON stream of its events, newest first.
+
+    The stream walks the same ``search_after`` cursor as the explorer, in
+    ``EXPORT_PAGE_SIZE`` pages inside one point-in-time, and stops after
+    ``max_events``.
+    """
+    event_source = await get_event_source_by_customer_and_name(customer_code, source_name, db)
+    try:
+        body = _build_search(
+            event_source.time_field,
+            params.timerange,
+            query=params.query,
+            time_from=params.time_from,
+            time_to=params.time_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _export_stream(event_source.index_pattern, body, max_events)
+
+
+async def _export_stream(index_pattern: str, body: dict, max_events: int) -> AsyncIterator[bytes]:
+    es_client = await create_wazuh_indexer_client_async("Wazuh-Indexer")
+    pit_id, flavour = await events_cursor.open_pit(es_client, index_pattern)
+    search_after = None
+    sent = 0
+    try:
+        while sent < max_events:
+            size = min(EXPORT_PAGE_SIZE, max_events - sent)
+            response, pit_id = await events_cursor.search_page(
+                es_client,
+                index_pattern,
+                body,
+                size,
+                search_after=search_after,
+                pit_id=pit_id,
+            )
+            hits = response["hits"]["hits"]
+            if not hits:
+                break
+            yield "".join(json.dumps(_event_from_hit(hit), default=str) + "\n" for hit in hits).encode("utf-8")
+            sent += len(hits)
+            if len(hits) < size:
+                break
+            search_after = hits[-1]["sort"]
+        logger.info(f"Exported {sent} events from {index_pattern}")
+    except Exception as e:
+        # The response has already started; all we can do is end it early.
+        logger.error(f"Error exporting events from {index_pattern} after {sent} events: {e}")
+        raise
+    finally:
+        await events_cursor.close_pit(es_client, pit_id, flavour)
+        await es_client.close()
+
+
 async def _scroll_next_page(scroll_id: str) -> EventsQueryResponse:
     es_client = await create_wazuh_indexer_client_async("Wazuh-Indexer")
     try:
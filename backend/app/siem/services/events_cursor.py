@@ -0,0 +1,187 @@
+"""Cursor pagination for the SIEM events explorer.
+
+The explorer used to open a five-minute scroll context for every search, even
+for analysts who looked at the first page and moved on. Scroll contexts hold
+heap on the indexer until they expire, and on busy shifts the explorer alone
+pushed the cluster into `search.max_open_scroll_context`.
+
+Paging is now `search_after` over a fixed sort (the source's time field, then
+a unique keyword as a tiebreaker), carried between requests in an opaque cursor
+token:
+
+* **The first page holds nothing open.** It is a plain search; if there is more,
+  the cursor only records where the page ended.
+* **A point-in-time is opened on the second page**, when the analyst has shown
+  they are paging, and kept alive for `SIEM_EVENTS_PIT_KEEP_ALIVE` (default
+  ``2m``) between pages — a fraction of a scroll's cost, and closed as soon as
+  the last page is read. Both the OpenSearch (`_search/point_in_time`) and the
+  Elasticsearch (`_pit`) flavours are supported.
+* **Indexers without PIT page statelessly.** `search_after` on its own still
+  pages correctly because a relative timerange is frozen to absolute bounds on
+  the first page; it just does not see a fixed snapshot. A PIT that expired
+  while the analyst was away falls back the same way.
+
+The token is HMAC-signed and bound to the customer and event source it was
+issued for: it carries the built query and a PIT id, and neither may be swapped
+for another tenant's.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from elasticsearch7.exceptions import ConnectionError
+from elasticsearch7.exceptions import NotFoundError
+from elasticsearch7.exceptions import TransportError
+from fastapi import HTTPException
+from loguru import logger
+
+from app.auth.utils import AuthHandler
+
+PIT_KEEP_ALIVE = os.getenv("SIEM_EVENTS_PIT_KEEP_ALIVE", "2m")
+
+#: Sorting on the time field alone would skip or repeat events that share a
+#: timestamp across a page boundary, so a unique keyword breaks ties. Graylog
+#: writes a `gl2_message_id` with doc_values to every message it indexes;
+#: `_id` would be unique too, but sorting on it loads `_id` fielddata onto the
+#: indexer heap. The PIT's implicit `_shard_doc` is no substitute: the first
+#: page runs without a PIT and a PIT can expire mid-search, so the sort values
+#: in a cursor must mean the same thing with or without one.
+TIEBREAKER = os.getenv("SIEM_EVENTS_TIEBREAKER_FIELD", "gl2_message_id")
+
+#: `unmapped_type` lets an index without the field sort it as missing rather
+#: than fail the search.
+TIEBREAKER_SORT = {TIEBREAKER: {"order": "asc", "unmapped_type": "keyword"}}
+
+#: After an indexer refuses to open a PIT, page statelessly for this long before asking again.
+PIT_RETRY_SECONDS = 600
+
+_SECRET = os.environ.get("SIEM_EVENTS_CURSOR_SECRET") or AuthHandler().secret
+
+_pit_unsupported_until = 0.0
+_pits_opened = 0
+_pits_closed = 0
+_stateless_pages = 0
+
+
+def _mac(payload: bytes) -> str:
+    return hmac.new(_SECRET.encode(), payload, hashlib.sha256).hexdigest()
+
+
+def encode(scope: str, state: Dict[str, Any]) -> str:
+    """Sign ``state`` for the event source ``scope`` and return it as an opaque token."""
+    payload = json.dumps({"scope": scope, **state}, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return f"{base64.urlsafe_b64encode(payload).decode('ascii')}.{_mac(payload)}"
+
+
+def decode(scope: str, token: str) -> Dict[str, Any]:
+    """Verify and unpack a token from `encode`; 400 if it was altered or issued for another source."""
+    try:
+        encoded, mac = token.rsplit(".", 1)
+        payload = base64.urlsafe_b64decode(encoded.encode("ascii"))
+        valid = hmac.compare_digest(mac, _mac(payload))
+        state = json.loads(payload) if valid else None
+    except (ValueError, UnicodeError):
+        state = None
+    if not isinstance(state, dict) or state.pop("scope", None) != scope:
+        raise HTTPException(status_code=400, detail="Invalid or expired events cursor")
+    return state
+
+
+async def open_pit(es_client, index_pattern: str) -> Tuple[Optional[str], Optional[str]]:
+    """Open a point-in-time on ``index_pattern``; returns ``(pit_id, flavour)``, or ``(None, None)`` if unsupported."""
+    global _pit_unsupported_until, _pits_opened
+
+    if time.monotonic() < _pit_unsupported_until:
+        return None, None
+    attempts = (
+        ("opensearch", f"/{index_pattern}/_search/point_in_time", "pit_id"),
+        ("elasticsearch", f"/{index_pattern}/_pit", "id"),
+    )
+    for flavour, path, key in attempts:
+        try:
+            response = await es_client.transport.perform_request("POST", path, params={"keep_alive": PIT_KEEP_ALIVE})
+        except ConnectionError:
+            raise
+        except TransportError as e:
+            # An unknown endpoint (404/400/405) or a role without the PIT privilege.
+            logger.debug(f"Point-in-time via {path} refused: {e}")
+            continue
+        pit_id = (response or {}).get(key)
+        if pit_id:
+            _pits_opened += 1
+            return pit_id, flavour
+    logger.info(f"The indexer does not support point-in-time search; paging events without one for {PIT_RETRY_SECONDS}s")
+    _pit_unsupported_until = time.monotonic() + PIT_RETRY_SECONDS
+    return None, None
+
+
+async def close_pit(es_client, pit_id: Optional[str], flavour: Optional[str]) -> None:
+    global _pits_closed
+
+    if not pit_id:
+        return
+    if flavour == "elasticsearch":
+        path, body = "/_pit", {"id": pit_id}
+    else:
+        path, body = "/_search/point_in_time", {"pit_id": [pit_id]}
+    try:
+        await es_client.transport.perform_request("DELETE", path, body=body)
+        _pits_closed += 1
+    except Exception as e:
+        # It expires on its own after PIT_KEEP_ALIVE.
+        logger.warning(f"Failed to close point-in-time: {e}")
+
+
+async def search_page(
+    es_client,
+    index_pattern: str,
+    body: Dict[str, Any],
+    size: int,
+    search_after: Optional[list] = None,
+    pit_id: Optional[str] = None,
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """One page of ``body`` (query + sort) after ``search_after``, inside ``pit_id`` when there is one.
+
+    Returns the response and the PIT id to use for the next page (the indexer
+    may hand back a new one). A PIT that has expired or been closed is dropped
+    and the page is read statelessly; the returned id is then None.
+    """
+    global _stateless_pages
+
+    page = {**body, "size": size}
+    if search_after:
+        page["search_after"] = search_after
+    if pit_id:
+        try:
+            response = await es_client.search(body={**page, "pit": {"id": pit_id, "keep_alive": PIT_KEEP_ALIVE}})
+            return response, response.get("pit_id") or pit_id
+        except NotFoundError as e:
+            logger.info(f"Events point-in-time is gone ({e}); continuing without it")
+    _stateless_pages += 1
+    return await es_client.search(index=index_pattern, body=page), None
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "pits_opened": _pits_opened,
+        "pits_closed": _pits_closed,
+        "stateless_pages": _stateless_pages,
+        "pit_supported": time.monotonic() >= _pit_unsupported_until,
+    }
+
+
+def reset_stats() -> None:
+    global _pit_unsupported_until, _pits_opened, _pits_closed, _stateless_pages
+
+    _pit_unsupported_until = 0.0
+    _pits_opened = _pits_closed = _stateless_pages = 0
@@ -0,0 +1,201 @@
+"""Short-lived caches behind SIEM dashboard panels.
+
+A dashboard refresh used to cost one indexer search per panel, run one after
+another, for every viewer: a 12-panel dashboard was 12+ serial round-trips, and
+ten analysts watching the same dashboard paid that ten times over. Terms panels
+on a `text` field paid once more each time, because the `.keyword` fallback was
+only discovered by failing the search first.
+
+`dashboards.execute_panels` now sends a dashboard's panels as one `_msearch`;
+this module holds the two things that make the rest of the saving:
+
+* **Panel results**, keyed by everything that determines them — index pattern,
+  time field, timerange, dashboard-wide query and the panel definitions — for
+  `SIEM_DASHBOARD_CACHE_SECONDS` (default 30). Timeranges are relative to
+  "now", so a result this young is as current as the refresh that asked for it.
+  Concurrent requests for the same key share one execution rather than racing
+  to fill it. Access checks happen before this cache is consulted, and the key
+  is the query itself, so two callers can only share a result they would each
+  have computed identically.
+* **Aggregation field names**, per (index pattern, field), for
+  `SIEM_DASHBOARD_FIELD_TYPE_SECONDS` (default 600): whether a terms agg on
+  `field` has to go to `field.keyword`, decided from `_field_caps` before the
+  search rather than from its error.
+
+`SIEM_DASHBOARD_CACHE_SECONDS=0` disables the result cache.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, str(default))
+    try:
+        return max(int(raw), 0)
+    except ValueError:
+        logger.warning(f"{name}={raw!r} is not an integer; falling back to {default}")
+        return default
+
+
+RESULT_TTL_SECONDS = _env_int("SIEM_DASHBOARD_CACHE_SECONDS", 30)
+FIELD_TYPE_TTL_SECONDS = _env_int("SIEM_DASHBOARD_FIELD_TYPE_SECONDS", 600)
+
+#: Distinct (dashboard, timerange) results held at once; the oldest go first.
+MAX_RESULTS = 256
+
+_results: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+_inflight: Dict[str, "asyncio.Future[Any]"] = {}
+_agg_fields: Dict[Tuple[str, str], Tuple[float, str]] = {}
+
+_hits = 0
+_misses = 0
+_shared = 0
+_field_hits = 0
+_field_lookups = 0
+
+
+def result_key(**parts: Any) -> str:
+    """A stable key for the inputs that determine a dashboard's panel results."""
+    encoded = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _fresh_result(key: str) -> Optional[Tuple[float, Any]]:
+    entry = _results.get(key)
+    if entry is None:
+        return None
+    if time.monotonic() - entry[0] >= RESULT_TTL_SECONDS:
+        _results.pop(key, None)
+        return None
+    _results.move_to_end(key)
+    return entry
+
+
+async def get_or_run(key: str, run: Callable[[], Awaitable[Tuple[T, bool]]]) -> T:
+    """Return the cached result for ``key``, or run ``run()`` once for every caller waiting on it.
+
+    ``run`` returns ``(result, cacheable)``. A result marked not cacheable (the
+    indexer was unreachable) is still shared with the callers already waiting for
+    it, but the next request runs again. A run that raises is not cached either;
+    each waiting caller receives its exception.
+    """
+    global _hits, _misses, _shared
+
+    if RESULT_TTL_SECONDS == 0:
+        _misses += 1
+        return (await run())[0]
+
+    entry = _fresh_result(key)
+    if entry is not None:
+        _hits += 1
+        return entry[1]
+
+    pending = _inflight.get(key)
+    if pending is not None and pending.get_loop() is asyncio.get_running_loop():
+        _shared += 1
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            # The caller running it went away (client disconnect); unless we
+            # were cancelled too, run it ourselves.
+            if not pending.cancelled() or asyncio.current_task().cancelling():
+                raise
+
+    _misses += 1
+    future: "asyncio.Future[T]" = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        result, cacheable = await run()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as exc:
+        future.set_exception(exc)
+        # Mark the exception retrieved; only the waiters (if any) re-raise it.
+        future.exception()
+        raise
+    else:
+        future.set_result(result)
+        if cacheable:
+            _results[key] = (time.monotonic(), result)
+            _results.move_to_end(key)
+            while len(_results) > MAX_RESULTS:
+                _results.popitem(last=False)
+        return result
+    finally:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
+def cached_agg_fields(index_pattern: str, fields: Iterable[str]) -> Tuple[Dict[str, str], list]:
+    """Split ``fields`` into those whose aggregation field is known and those that need a lookup."""
+    global _field_hits
+
+    known: Dict[str, str] = {}
+    unknown = []
+    now = time.monotonic()
+    for field in fields:
+        entry = _agg_fields.get((index_pattern, field))
+        if entry is not None and now - entry[0] < FIELD_TYPE_TTL_SECONDS:
+            known[field] = entry[1]
+            _field_hits += 1
+        else:
+            unknown.append(field)
+    return known, unknown
+
+
+def remember_agg_fields(index_pattern: str, resolved: Dict[str, str]) -> None:
+    global _field_lookups
+
+    _field_lookups += 1
+    now = time.monotonic()
+    for field, agg_field in resolved.items():
+        _agg_fields[(index_pattern, field)] = (now, agg_field)
+
+
+def remember_agg_field(index_pattern: str, field: str, agg_field: str) -> None:
+    """Correct one entry after a search proved the cached decision wrong."""
+    _agg_fields[(index_pattern, field)] = (time.monotonic(), agg_field)
+
+
+def clear() -> None:
+    _results.clear()
+    _agg_fields.clear()
+
+
+def stats() -> Dict[str, int]:
+    """Surfaced in the performance session log and GET /performance/caches."""
+    return {
+        "results": len(_results),
+        "hits": _hits,
+        "misses": _misses,
+        "shared_executions": _shared,
+        "agg_fields": len(_agg_fields),
+        "agg_field_hits": _field_hits,
+        "field_caps_lookups": _field_lookups,
+    }
+
+
+def reset_stats() -> None:
+    global _hits, _misses, _shared, _field_hits, _field_lookups
+
+    _hits = _misses = _shared = _field_hits = _field_lookups = 0
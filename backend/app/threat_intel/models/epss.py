@@ -0,0 +1,24 @@
+"""Local copy of the FIRST EPSS scores, one row per CVE.
+
+Filled in bulk from the daily published CSV by the `refresh_epss_scores` job and
+topped up with the occasional CVE the feed did not yet carry. Read into memory by
+`app.threat_intel.services.epss_cache`; nothing queries this table per request.
+"""
+from datetime import datetime
+
+from sqlmodel import Field
+from sqlmodel import SQLModel
+
+
+class EpssScore(SQLModel, table=True):
+    __tablename__ = "epss_score"
+    cve: str = Field(primary_key=True, max_length=32)
+    # Kept as the strings the API and the CSV both return, so scores round-trip
+    # into `VulnerabilitySearchItem` unchanged.
+    epss: str = Field(max_length=16)
+    percentile: str = Field(max_length=16)
+    # The model's score date (YYYY-MM-DD), not when the row was written.
+    score_date: str = Field(max_length=10)
+    # When the bulk refresh that owns the row ran. Rows topped up from the API
+    # carry that same time, so max(updated_at) is the last feed download.
+    updated_at: datetime = Field(default_factory=datetime.utcnow, index=True)
@@ -0,0 +1,316 @@
+"""Local EPSS scores for vulnerability search and export.
+
+Vulnerability search and export used to ask api.first.org for each CVE on its
+own, awaited inside the result loop. A search page of 50 rows was 50 sequential
+round trips; a 5,000-row CSV export was 5,000 of them and took many minutes, and
+with no route to the internet it produced no scores at all.
+
+FIRST publishes every score once a day as a single CSV. That file now lives in
+the `epss_score` table and in memory:
+
+* **The `refresh_epss_scores` job** downloads the daily CSV (`EPSS_FEED_URL`),
+  replaces the table in one transaction and swaps the in-memory map. It runs
+  hourly but only downloads once the snapshot is `EPSS_REFRESH_HOURS` old, so a
+  restart does not re-fetch a file that is still today's.
+* **Lookups are in memory.** `get_epss_scores` takes every CVE on a page (or an
+  export batch) at once. The table is read in on first use after a restart, so
+  an air-gapped deployment keeps serving the last snapshot it loaded.
+* **Misses go to the API in batches.** A CVE newer than the snapshot is fetched
+  with the API's comma-separated `cve=` form, `API_BATCH_SIZE` at a time, and
+  kept. A CVE the API does not know either is remembered until the next refresh,
+  so one export does not ask for it once per affected agent. Those rows are
+  stamped with the snapshot's refresh time, never later, so a lookup cannot make
+  an old feed look fresh and hold back the next download.
+
+`EPSS_FEED_URL` may also be a local path (or `file://` URL) to a CSV copied in by
+hand, which is how a deployment without internet access gets a snapshot at all.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import gzip
+import os
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+import httpx
+from loguru import logger
+from sqlalchemy import delete
+from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import select
+
+from app.blocking import run_blocking
+from app.db.db_session import get_db_session
+from app.threat_intel.models.epss import EpssScore
+from app.threat_intel.schema.epss import EpssThreatIntelRequest
+from app.threat_intel.services.epss import collect_epss_score
+
+Score = Tuple[str, str]
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, str(default))
+    try:
+        return max(int(raw), 1)
+    except ValueError:
+        logger.warning(f"{name}={raw!r} is not an integer; falling back to {default}")
+        return default
+
+
+FEED_URL = os.getenv("EPSS_FEED_URL", "https://epss.cyentia.com/epss_scores-current.csv.gz")
+
+# FIRST regenerates the scores once a day.
+REFRESH_HOURS = _env_int("EPSS_REFRESH_HOURS", 24)
+
+# The API rejects a `cve=` parameter longer than 2,000 characters; 100 ids fits
+# with room to spare and matches its default page size of 100 rows.
+API_BATCH_SIZE = 100
+API_CONCURRENCY = 4
+
+# Rows per INSERT when the daily feed (~300k CVEs) is written to the table.
+INSERT_CHUNK_SIZE = 5000
+
+FEED_TIMEOUT_SECONDS = 120
+
+# `updated_at` for rows fetched from the API before any feed was loaded: old
+# enough that a restart still sees the snapshot as stale.
+NEVER_REFRESHED = datetime(1970, 1, 1)
+
+_scores: Dict[str, Score] = {}
+_unknown: Set[str] = set()
+_loaded = False
+_load_lock = asyncio.Lock()
+_refreshed_at: Optional[datetime] = None
+_score_date: Optional[str] = None
+
+_hits = 0
+_misses = 0
+_api_calls = 0
+_refreshes = 0
+
+
+def _normalise(cve_id: Optional[str]) -> Optional[str]:
+    if not cve_id:
+        return None
+    cve_id = cve_id.strip().upper()
+    # Wazuh also reports vendor advisories (RHSA-…, USN-…); EPSS only scores CVEs.
+    return cve_id if cve_id.startswith("CVE-") else None
+
+
+def parse_feed(raw: bytes) -> Tuple[Optional[str], Dict[str, Score]]:
+    """Parse the daily CSV, gzipped or not, into (score date, cve → score).
+
+    The file opens with a comment line such as
+    `#model_version:v2025.03.14,score_date:2025-03-14T12:55:00+0000`, then the
+    `cve,epss,percentile` header.
+    """
+    if raw[:2] == b"\x1f\x8b":
+        raw = gzip.decompress(raw)
+    lines = raw.decode("utf-8").splitlines()
+
+    score_date = None
+    if lines and lines[0].startswith("#"):
+        for part in lines[0].lstrip("#").split(","):
+            key, _, value = part.partition(":")
+            if key.strip() == "score_date":
+                score_date = value.strip()[:10]
+        lines = lines[1:]
+
+    scores = {}
+    for row in csv.DictReader(lines):
+        cve_id = _normalise(row.get("cve"))
+        if cve_id and row.get("epss") and row.get("percentile"):
+            scores[cve_id] = (row["epss"], row["percentile"])
+    return score_date, scores
+
+
+async def _read_feed(url: str) -> bytes:
+    if url.startswith("file://"):
+        url = url[len("file://") :]
+    if "://" not in url:
+        return await run_blocking(Path(url).read_bytes)
+    async with httpx.AsyncClient(timeout=FEED_TIMEOUT_SECONDS, follow_redirects=True) as client:
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.content
+
+
+async def _load_snapshot() -> None:
+    global _scores, _refreshed_at, _score_date
+
+    async with get_db_session() as session:
+        rows = (await session.execute(select(EpssScore.cve, EpssScore.epss, EpssScore.percentile))).all()
+        refreshed_at, score_date = (await session.execute(select(func.max(EpssScore.updated_at), func.max(EpssScore.score_date)))).one()
+    _scores = {cve_id: (epss, percentile) for cve_id, epss, percentile in rows}
+    _refreshed_at = refreshed_at
+    _score_date = score_date
+    logger.info(f"Loaded {len(_scores)} EPSS scores from the local snapshot (score date {score_date})")
+
+
+async def ensure_loaded() -> None:
+    """Read the table into memory once per process.
+
+    A failed read is logged and not retried per lookup: the API fallback still
+    answers, and the next refresh fills memory regardless.
+    """
+    global _loaded
+
+    if _loaded:
+        return
+    async with _load_lock:
+        if _loaded:
+            return
+        try:
+            await _load_snapshot()
+        except Exception as e:
+            logger.warning(f"Could not load the local EPSS snapshot: {e}")
+        _loaded = True
+
+
+def is_stale() -> bool:
+    return _refreshed_at is None or datetime.utcnow() - _refreshed_at >= timedelta(hours=REFRESH_HOURS)
+
+
+async def _replace_table(score_date: str, scores: Dict[str, Score], written_at: datetime) -> None:
+    items = list(scores.items())
+    async with get_db_session() as session:
+        await session.execute(delete(EpssScore))
+        for start in range(0, len(items), INSERT_CHUNK_SIZE):
+            await session.execute(
+                insert(EpssScore),
+                [
+                    {"cve": cve_id, "epss": epss, "percentile": percentile, "score_date": score_date, "updated_at": written_at}
+                    for cve_id, (epss, percentile) in items[start : start + INSERT_CHUNK_SIZE]
+                ],
+            )
+        await session.commit()
+
+
+async def refresh(url: Optional[str] = None) -> int:
+    """Download the full feed, replace the table and the in-memory map.
+
+    Returns the number of scores now held. Raises if the feed cannot be read or
+    is empty; the previous snapshot is left untouched in that case.
+    """
+    global _scores, _loaded, _refreshed_at, _score_date, _refreshes
+
+    url = url or FEED_URL
+    # ~300k rows to gunzip and parse: off the event loop.
+    score_date, scores = await run_blocking(parse_feed, await _read_feed(url))
+    if not scores:
+        raise ValueError(f"The EPSS feed at {url} contained no scores")
+    score_date = score_date or datetime.utcnow().strftime("%Y-%m-%d")
+    written_at = datetime.utcnow()
+
+    try:
+        await _replace_table(score_date, scores, written_at)
+    except Exception as e:
+        # Memory is still worth updating: this process serves the new scores,
+        # and the next run writes the table again.
+        logger.warning(f"Could not persist the EPSS snapshot: {e}")
+
+    _scores = scores
+    _unknown.clear()
+    _refreshed_at = written_at
+    _score_date = score_date
+    _loaded = True
+    _refreshes += 1
+    return len(scores)
+
+
+async def _fetch_batch(limiter: asyncio.Semaphore, batch: List[str]) -> Dict[str, Tuple[str, str, str]]:
+    global _api_calls
+
+    async with limiter:
+        _api_calls += 1
+        try:
+            response = await collect_epss_score(EpssThreatIntelRequest(cve=",".join(batch)))
+        except Exception as e:
+            # Offline, or FIRST is having a bad day: serve what the snapshot has.
+            logger.warning(f"EPSS API lookup for {len(batch)} CVE(s) failed: {e}")
+            return {}
+    found = {}
+    for item in response.data or []:
+        cve_id = _normalise(item.cve)
+        if cve_id:
+            found[cve_id] = (item.epss, item.percentile, item.date)
+    # Only a successful answer proves the API has nothing for the rest.
+    _unknown.update(cve_id for cve_id in batch if cve_id not in found)
+    return found
+
+
+async def _persist_rows(rows: Dict[str, Tuple[str, str, str]]) -> None:
+    # `_load_snapshot` takes the refresh time from max(updated_at); a top-up
+    # must not move it forward.
+    written_at = _refreshed_at or NEVER_REFRESHED
+    try:
+        async with get_db_session() as session:
+            for cve_id, (epss, percentile, score_date) in rows.items():
+                await session.merge(
+                    EpssScore(cve=cve_id, epss=epss, percentile=percentile, score_date=score_date[:10], updated_at=written_at),
+                )
+            await session.commit()
+    except Exception as e:
+        logger.warning(f"Could not store {len(rows)} EPSS score(s) fetched from the API: {e}")
+
+
+async def get_epss_scores(cve_ids: Iterable[Optional[str]]) -> Dict[str, Score]:
+    """(epss, percentile) for every CVE in `cve_ids` that has a score.
+
+    Keys are upper-cased CVE ids; ids without a score are absent. Never raises.
+    """
+    global _hits, _misses
+
+    await ensure_loaded()
+
+    wanted = {cve_id for cve_id in map(_normalise, cve_ids) if cve_id}
+    found = {cve_id: _scores[cve_id] for cve_id in wanted if cve_id in _scores}
+    _hits += len(found)
+
+    missing = sorted(cve_id for cve_id in wanted if cve_id not in found and cve_id not in _unknown)
+    if not missing:
+        return found
+    _misses += len(missing)
+
+    limiter = asyncio.Semaphore(API_CONCURRENCY)
+    batches = [missing[start : start + API_BATCH_SIZE] for start in range(0, len(missing), API_BATCH_SIZE)]
+    fetched = {}
+    for result in await asyncio.gather(*(_fetch_batch(limiter, batch) for batch in batches)):
+        fetched.update(result)
+    if fetched:
+        for cve_id, (epss, percentile, _) in fetched.items():
+            _scores[cve_id] = (epss, percentile)
+            found[cve_id] = (epss, percentile)
+        await _persist_rows(fetched)
+    return found
+
+
+def reset_stats() -> None:
+    """Test seam, as in `app.connectors.cache`."""
+    global _hits, _misses, _api_calls, _refreshes
+
+    _hits = _misses = _api_calls = _refreshes = 0
+
+
+def stats() -> Dict[str, object]:
+    """Surfaced in the performance session log."""
+    return {
+        "scores": len(_scores),
+        "score_date": _score_date,
+        "refreshed_at": _refreshed_at.isoformat() if _refreshed_at else None,
+        "unknown": len(_unknown),
+        "hits": _hits,
+        "misses": _misses,
+        "api_calls": _api_calls,
+        "refreshes": _refreshes,
+    }
@@ -22,8 +22,10 @@ from fastapi.middleware.gzip import GZipMiddleware  # noqa: E402
 from fastapi.staticfiles import StaticFiles  # noqa: E402
 from loguru import logger  # noqa: E402
 
+from app.audit.services.audit import close_audit_writer
 from app.auth.utils import AuthHandler  # noqa: E402
 from app.blocking import configure_thread_limit
+from app.connectors.wazuh_indexer.utils import client_registry as wazuh_indexer_clients
 from app.data_store.data_store_setup import create_buckets
 from app.db.db_session import SQLALCHEMY_DATABASE_URI_NO_DB
 from app.db.db_session import async_engine
@@ -39,6 +41,10 @@ from app.db.db_setup import ensure_admin_user
 from app.db.db_setup import ensure_scheduler_user
 from app.db.db_setup import ensure_scheduler_user_removed
 from app.db.query_metrics import install as install_query_metrics
+from app.incidents.services import report_render_pool
+from app.incidents.services.velo_sigma_exclusions import (
+    close_match_stats as close_exclusion_match_stats,
+)
 from app.middleware.client_disconnect import CANCEL_ON_DISCONNECT_ENABLED
 from app.middleware.client_disconnect import ClientDisconnectMiddleware
 from app.middleware.exception_handlers import custom_http_exception_handler
@@ -49,6 +55,7 @@ from app.middleware.performance import PERF_MONITOR_ENABLED
 from app.middleware.performance import RequestTimingMiddleware
 from app.middleware.performance import lag_monitor
 from app.middleware.performance import performance_registry
+from app.notifications.services import emit as notification_queue
 from app.notifications.services.template_seeds import seed_builtin_templates
 from app.performance.services.session_log import session_log
 
@@ -186,7 +193,16 @@ async def lifespan(_app: FastAPI):
     if scheduler.running:
         logger.info("Scheduler is running, shutting down now...")
         scheduler.shutdown()
+    # Finish queued notifications once nothing is left to produce them.
+    await notification_queue.drain()
+    # Scheduler and ingest are stopped; write the exclusion match counts they left.
+    await close_exclusion_match_stats()
     await ensure_scheduler_user_removed(async_engine)
+    # After the scheduler, whose jobs are the last users of the pooled clients.
+    await wazuh_indexer_clients.close_all()
+    await report_render_pool.shutdown()
+    # Last: everything above may still record audit events.
+    await close_audit_writer()
 
 
 app = FastAPI(description="CoPilot API", version="0.1.0", title="CoPilot API", lifespan=lifespan)
@@ -0,0 +1,216 @@
+"""Agent sync diffs against one bulk load of `Agents` and writes in one transaction.
+
+`sync_agents_wazuh` used to SELECT by hostname and commit once per agent, after
+re-requesting the whole agent list with `limit=total`; the Velociraptor half
+scanned every client for every row and committed per row too. These tests pin
+the replacement: the Wazuh list is paged concurrently with trimmed fields, a
+sync of an unchanged fleet writes nothing, changes are counted as
+added/changed/unchanged/missing, removal is opt-in, and Velociraptor matching
+keeps its first-client-in-the-list rule.
+
+Run with: cd backend && python -m pytest tests/test_agent_bulk_sync.py
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+import app.agents.services.sync as sync  # noqa: E402
+import app.agents.wazuh.services.agents as wazuh_services  # noqa: E402
+from app.agents.velociraptor.schema.agents import Organization  # noqa: E402
+from app.agents.velociraptor.schema.agents import VelociraptorClients  # noqa: E402
+from app.agents.velociraptor.schema.agents import (  # noqa: E402
+    VelociraptorOrganizations,
+)
+from app.agents.wazuh.schema.agents import WazuhAgent  # noqa: E402
+from app.agents.wazuh.schema.agents import WazuhAgentsList  # noqa: E402
+from app.db.universal_models import AgentDataStore  # noqa: E402
+from app.db.universal_models import Agents  # noqa: E402
+from app.db.universal_models import AgentVulnerabilities  # noqa: E402
+
+
+def _wazuh_agent(n, version="v4.9.0", label="customer_acme"):
+    return WazuhAgent(
+        agent_id=f"{n:03d}",
+        agent_name=f"host-{n}",
+        agent_ip=f"10.0.0.{n}",
+        agent_os="Ubuntu",
+        agent_label=label,
+        agent_last_seen="2026-10-01T12:00:00+00:00" if n else "Unknown",
+        wazuh_agent_version=version,
+        wazuh_agent_status="active",
+    )
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    state = SimpleNamespace(engine=engine, writes=[], commits=0, wazuh=[], orgs={})
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record_writes(conn, cursor, statement, parameters, context, executemany):
+        if statement.split(" ", 1)[0] in ("INSERT", "UPDATE", "DELETE"):
+            state.writes.append(statement)
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def record_commit(conn):
+        state.commits += 1
+
+    async def create():
+        tables = [Agents.__table__, AgentDataStore.__table__, AgentVulnerabilities.__table__]
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda c: SQLModel.metadata.create_all(c, tables=tables))
+
+    asyncio.run(create())
+    state.commits = 0
+
+    @asynccontextmanager
+    async def session():
+        async with AsyncSession(engine) as db_session:
+            yield db_session
+
+    async def wazuh_agents():
+        return WazuhAgentsList(agents=state.wazuh, success=True, message="ok")
+
+    async def verified():
+        return True
+
+    async def orgs():
+        return VelociraptorOrganizations(organizations=[Organization(Name=o, OrgId=o) for o in state.orgs])
+
+    async def clients(org_id):
+        return VelociraptorClients(clients=state.orgs[org_id])
+
+    monkeypatch.setattr(sync, "get_db_session", session)
+    monkeypatch.setattr(sync, "fetch_wazuh_agents", wazuh_agents)
+    monkeypatch.setattr(sync, "is_velociraptor_verified", verified)
+    monkeypatch.setattr(sync, "fetch_velociraptor_organizations", orgs)
+    monkeypatch.setattr(sync, "fetch_velociraptor_clients", clients)
+    return state
+
+
+def _rows(engine):
+    async def query():
+        async with AsyncSession(engine) as session:
+            return {agent.hostname: agent for agent in (await session.execute(select(Agents))).scalars().all()}
+
+    return asyncio.run(query())
+
+
+def _client(client_id, hostname, last_seen=1_790_000_000_000_000, version="0.7.1"):
+    return {
+        "client_id": client_id,
+        "agent_information": {"version": version, "name": "velociraptor", "build_time": "", "build_url": ""},
+        "os_info": {"system": "linux", "hostname": hostname, "release": "", "machine": "", "fqdn": hostname, "mac_addresses": []},
+        "first_seen_at": 0,
+        "last_seen_at": last_seen,
+        "last_ip": "",
+        "last_interrogate_flow_id": "",
+        "last_interrogate_artifact_name": "",
+        "labels": [],
+        "last_hunt_timestamp": 0,
+        "last_event_table_version": 0,
+        "last_label_timestamp": 0,
+    }
+
+
+def test_wazuh_sync_writes_only_the_diff_in_one_transaction(db):
+    db.wazuh = [_wazuh_agent(n) for n in range(5)]
+    first = asyncio.run(sync.sync_agents_wazuh())
+    inserts, commits = len(db.writes), db.commits
+
+    db.writes.clear()
+    again = asyncio.run(sync.sync_agents_wazuh())
+    quiet_writes = list(db.writes)
+
+    db.wazuh = [_wazuh_agent(0), _wazuh_agent(1, version="v4.10.0"), _wazuh_agent(2), _wazuh_agent(3), _wazuh_agent(7)]
+    changed = asyncio.run(sync.sync_agents_wazuh())
+
+    assert first.wazuh.added == 5 and inserts >= 1 and commits == 1
+    assert (again.wazuh.unchanged, again.wazuh.changed, again.wazuh.added) == (5, 0, 0)
+    assert quiet_writes == []
+    assert changed.wazuh.model_dump() == {"added": 1, "changed": 1, "unchanged": 3, "removed": 0, "missing": 1}
+    rows = _rows(db.engine)
+    assert rows["host-1"].wazuh_agent_version == "v4.10.0" and rows["host-0"].customer_code == "acme"
+    # Removal is opt-in; host-4 is reported as missing and kept.
+    assert set(rows) == {"host-0", "host-1", "host-2", "host-3", "host-4", "host-7"}
+
+
+def test_removing_missing_agents_is_opt_in_and_never_follows_an_empty_list(db, monkeypatch):
+    monkeypatch.setattr(sync, "REMOVE_MISSING", True)
+    db.wazuh = [_wazuh_agent(n) for n in range(1, 4)]
+    asyncio.run(sync.sync_agents_wazuh())
+
+    db.wazuh = []
+    empty = asyncio.run(sync.sync_agents_wazuh())
+    db.wazuh = [_wazuh_agent(1)]
+    pruned = asyncio.run(sync.sync_agents_wazuh())
+
+    assert (empty.wazuh.removed, empty.wazuh.missing) == (0, 3)
+    assert (pruned.wazuh.removed, pruned.wazuh.unchanged) == (2, 1)
+    assert set(_rows(db.engine)) == {"host-1"}
+
+
+def test_velociraptor_sync_matches_through_maps_and_keeps_first_client_rule(db):
+    db.wazuh = [_wazuh_agent(n) for n in range(1, 4)]
+    asyncio.run(sync.sync_agents_wazuh())
+    db.orgs = {
+        "O1": [_client("C.aaa", "host-1"), _client("C.bbb", "elsewhere"), _client("C.ccc", "host-2")],
+        "O2": [_client("C.zzz", "not-ours")],
+    }
+    commits = db.commits
+
+    first = asyncio.run(sync.sync_agents_velociraptor())
+    rows = _rows(db.engine)
+    db.writes.clear()
+    again = asyncio.run(sync.sync_agents_velociraptor())
+
+    assert (first.velociraptor.changed, first.velociraptor.missing) == (2, 1)
+    assert (rows["host-1"].velociraptor_id, rows["host-1"].velociraptor_org) == ("C.aaa", "O1")
+    assert rows["host-3"].velociraptor_id is None
+    assert db.commits == commits + 2
+    assert (again.velociraptor.unchanged, again.velociraptor.changed) == (2, 0) and db.writes == []
+
+    # host-2 re-enrolled: the row's velociraptor_id (C.ccc) now comes before
+    # the new hostname match in the list, so the earlier client still wins.
+    db.orgs["O1"] = [_client("C.ccc", "old-name"), _client("C.new", "host-2")]
+    asyncio.run(sync.sync_agents_velociraptor())
+    assert _rows(db.engine)["host-2"].velociraptor_id == "C.ccc"
+
+
+def test_wazuh_agents_are_paged_concurrently_with_trimmed_fields(monkeypatch):
+    monkeypatch.setattr(wazuh_services, "AGENT_PAGE_SIZE", 100)
+    monkeypatch.setattr(wazuh_services, "AGENT_PAGE_CONCURRENCY", 2)
+    state = {"calls": [], "running": 0, "peak": 0}
+    total = 345
+
+    async def send_get_request(endpoint, params):
+        state["calls"].append(params)
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.01)
+        state["running"] -= 1
+        offset, limit = params["offset"], params["limit"]
+        items = [{"id": f"{n:03d}", "name": f"host-{n}", "group": ["customer_acme"]} for n in range(offset, min(offset + limit, total))]
+        return {"success": True, "data": {"data": {"affected_items": items, "total_affected_items": total}}}
+
+    monkeypatch.setattr(wazuh_services, "send_get_request", send_get_request)
+
+    collected = asyncio.run(wazuh_services.collect_wazuh_agents())
+
+    assert [agent.agent_name for agent in collected.agents] == [f"host-{n}" for n in range(total)]
+    assert [call["offset"] for call in state["calls"]] == [0, 100, 200, 300]
+    assert all(call["select"] == wazuh_services.AGENT_SELECT and call["limit"] == 100 for call in state["calls"])
+    assert state["peak"] == 2
@@ -0,0 +1,133 @@
+"""The alert ingest job: bulk hydration, bounded concurrent creates, bulk write-back.
+
+`create_alert_auto_route` used to process each Graylog event end to end before
+looking at the next — a GET, a `create_alert` and an `update` per event — and
+during an alert storm `gl-events-*` grew faster than that loop drained it. These
+tests pin the shape of the replacement: one `_mget` per batch, creates that
+overlap but never exceed the cap, one bulk write-back, per-stage metrics, and no
+duplicate alert when two events with the same title are created at once.
+
+Run with: cd backend && python -m pytest tests/test_alert_ingest_pipeline.py
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from app.incidents.schema.alert_collection import AlertsPayload  # noqa: E402
+from app.incidents.services import alert_ingest  # noqa: E402
+from app.incidents.services import incident_alert  # noqa: E402
+from app.middleware.performance import PerformanceRegistry  # noqa: E402
+
+
+def _event(n):
+    return SimpleNamespace(
+        id=f"event-{n}",
+        index="gl-events_0",
+        source=SimpleNamespace(origin_context=f"urn:graylog:message:es:wazuh-a_1:doc-{n}"),
+    )
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    state = SimpleNamespace(
+        pending=[_event(n) for n in range(12)],
+        mget_calls=[],
+        written_back=[],
+        in_flight=0,
+        peak_in_flight=0,
+        registry=PerformanceRegistry(),
+    )
+
+    async def fetch(batch_size):
+        batch = state.pending[:batch_size]
+        return AlertsPayload(alerts=[]).model_copy(update={"alerts": batch}), len(state.pending)
+
+    async def bulk(es_client, references):
+        state.mget_calls.append(list(references))
+        return [{"_index": index, "_id": doc_id, "_version": 1, "_source": {}} for index, doc_id in references]
+
+    async def create(request, session, alert_details=None):
+        assert alert_details is not None, "the pipeline should hand create_alert the hydrated document"
+        state.in_flight += 1
+        state.peak_in_flight = max(state.peak_in_flight, state.in_flight)
+        await asyncio.sleep(0.01)
+        state.in_flight -= 1
+        if request.alert_id == "doc-3":
+            raise RuntimeError("boom")
+        return int(request.alert_id.split("-")[1]) + 100
+
+    async def write_back(assignments):
+        state.written_back.append(assignments)
+        done = {reference.alert_id for reference, _ in assignments}
+        state.pending = [event for event in state.pending if event.id not in done]
+        return 0
+
+    @asynccontextmanager
+    async def session():
+        yield object()
+
+    async def client(name):
+        return object()
+
+    monkeypatch.setattr(alert_ingest, "get_alerts_not_created_in_copilot", fetch)
+    monkeypatch.setattr(alert_ingest, "get_alert_details_bulk", bulk)
+    monkeypatch.setattr(alert_ingest, "alert_model_from_document", lambda document: document)
+    monkeypatch.setattr(alert_ingest, "create_alert", create)
+    monkeypatch.setattr(alert_ingest, "add_copilot_alert_ids_bulk", write_back)
+    monkeypatch.setattr(alert_ingest, "get_db_session", session)
+    monkeypatch.setattr(alert_ingest, "create_wazuh_indexer_client_async", client)
+    monkeypatch.setattr(alert_ingest, "performance_registry", state.registry)
+    monkeypatch.setattr(alert_ingest, "CREATE_CONCURRENCY", 3)
+    return state
+
+
+def test_a_batch_is_hydrated_and_written_back_in_bulk(pipeline):
+    response = asyncio.run(alert_ingest.run_auto_alert_creation(batch_size=20, max_batches=1))
+
+    assert len(pipeline.mget_calls) == 1 and len(pipeline.mget_calls[0]) == 12
+    assert len(pipeline.written_back) == 1
+    assert response.alerts_created == 11
+    assert response.alerts_failed == 1
+    assert ("gl-events_0", "event-3") not in {(ref.index_name, ref.alert_id) for ref, _ in pipeline.written_back[0]}
+
+
+def test_creates_overlap_but_respect_the_cap(pipeline):
+    asyncio.run(alert_ingest.run_auto_alert_creation(batch_size=20, max_batches=1))
+
+    assert pipeline.peak_in_flight == 3
+
+
+def test_each_stage_is_reported_to_the_registry(pipeline):
+    asyncio.run(alert_ingest.run_auto_alert_creation(batch_size=5, max_batches=2))
+
+    stages = {stats.stage: stats for stats in pipeline.registry.stages}
+    assert set(stages) == {"fetch", "hydrate", "create", "write_back"}
+    assert all(stats.pipeline == "alert_ingest" for stats in stages.values())
+    assert stages["fetch"].runs == 2
+    # The failed event stays pending and is retried by the second batch, as before.
+    assert stages["create"].items == 8 and stages["create"].failures == 2
+
+
+def test_same_title_creates_are_serialised():
+    """Two concurrent events with one title must not both see "no open alert"."""
+    order = []
+
+    async def critical(name):
+        async with incident_alert.open_alert_guard("SOC01", "Brute force"):
+            order.append(f"{name}-in")
+            await asyncio.sleep(0.01)
+            order.append(f"{name}-out")
+
+    async def scenario():
+        await asyncio.gather(critical("a"), critical("b"))
+
+    asyncio.run(scenario())
+
+    assert order in (["a-in", "a-out", "b-in", "b-out"], ["b-in", "b-out", "a-in", "a-out"])
+    assert incident_alert._open_alert_locks == {}, "guard entries must not outlive their holders"
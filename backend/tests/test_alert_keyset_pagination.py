@@ -0,0 +1,191 @@
+"""Alert and case listings page by cursor, and filter with semi-joins.
+
+The listings paged with ``OFFSET (page - 1) * page_size``, and the filtered alert
+listing and its counts ran over a DISTINCT outer join of the asset, tag and IoC
+tables. These tests pin what replaced that: the tag/asset/IoC filters are EXISTS
+semi-joins with no DISTINCT, a cursor walk visits every matching alert once in
+the same order offset paging does — including rows that share an
+``alert_creation_time`` — a cursor is refused for a sort it was not issued for,
+and cases page the same way.
+
+Run with: cd backend && python -m pytest tests/test_alert_keyset_pagination.py
+"""
+
+import asyncio
+import os
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from fastapi import HTTPException  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from app.incidents import models  # noqa: E402
+from app.incidents.services import db_operations  # noqa: E402
+
+TABLES = [
+    model.__table__
+    for model in (
+        models.Alert,
+        models.AlertContext,
+        models.Asset,
+        models.Comment,
+        models.AlertTag,
+        models.AlertToTag,
+        models.IoC,
+        models.AlertToIoC,
+        models.Case,
+        models.CaseAlertLink,
+        models.CaseComment,
+    )
+]
+START = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def db():
+    """Twelve alerts, two per timestamp; the even ones tagged twice, every third with an IoC."""
+    engine = create_async_engine("sqlite+aiosqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda c: SQLModel.metadata.create_all(c, tables=TABLES))
+        async with AsyncSession(engine) as session:
+            phishing, urgent = models.AlertTag(tag="phishing"), models.AlertTag(tag="urgent")
+            ioc = models.IoC(value="10.0.0.1", type="IP")
+            context = models.AlertContext(source="wazuh", context={})
+            session.add_all([phishing, urgent, ioc, context])
+            await session.flush()
+            for n in range(12):
+                alert = models.Alert(
+                    alert_name=f"alert {n}",
+                    alert_description="",
+                    status="OPEN",
+                    alert_creation_time=START + timedelta(minutes=n // 2),
+                    customer_code="SOC01",
+                    source="wazuh",
+                )
+                session.add(alert)
+                await session.flush()
+                session.add(
+                    models.Asset(
+                        alert_linked=alert.id,
+                        asset_name="host-1",
+                        alert_context_id=context.id,
+                        customer_code="SOC01",
+                        index_name="idx",
+                        index_id="1",
+                    ),
+                )
+                session.add(
+                    models.Asset(
+                        alert_linked=alert.id,
+                        asset_name="host-2",
+                        alert_context_id=context.id,
+                        customer_code="SOC01",
+                        index_name="idx",
+                        index_id="1",
+                    ),
+                )
+                if n % 2 == 0:
+                    session.add(models.AlertToTag(alert_id=alert.id, tag_id=phishing.id))
+                    session.add(models.AlertToTag(alert_id=alert.id, tag_id=urgent.id))
+                if n % 3 == 0:
+                    session.add(models.AlertToIoC(alert_id=alert.id, ioc_id=ioc.id))
+            for n in range(5):
+                session.add(models.Case(case_name=f"case {n}", case_description="", customer_code="SOC01", case_status="OPEN"))
+            await session.commit()
+
+    asyncio.run(create())
+    statements.clear()
+    return engine, statements
+
+
+def _run(engine, work):
+    async def go():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            return await work(session)
+
+    return asyncio.run(go())
+
+
+def _walk(engine, page_size, **kwargs):
+    """Follow ``next_cursor`` from the first page to the end; returns the pages' alert ids."""
+    pages, cursor = [], None
+    while True:
+        alerts, cursor = _run(
+            engine,
+            lambda s: db_operations.page_alerts_multiple_filters(s, page_size=page_size, cursor=cursor, **kwargs),
+        )
+        pages.append([alert.id for alert in alerts])
+        if cursor is None:
+            return pages
+
+
+def test_filters_are_semi_joins_and_a_cursor_walk_matches_offset_paging(db):
+    engine, statements = db
+    filters = {"tags": ["phishing", "urgent"], "asset_name": "host-1"}
+
+    everything = _run(engine, lambda s: db_operations.list_alerts_multiple_filters(s, page_size=100, **filters))
+    listing_sql = next(sql for sql in statements if "FROM incident_management_alert" in sql)
+    total = _run(engine, lambda s: db_operations.alerts_total_multiple_filters(s, **filters))
+    by_offset = [
+        [a.id for a in _run(engine, lambda s: db_operations.list_alerts_multiple_filters(s, page=page, page_size=4, **filters))]
+        for page in (1, 2)
+    ]
+    pages = _walk(engine, 4, **filters)
+
+    assert [a.id for a in everything] == [11, 9, 7, 5, 3, 1] and total == 6
+    assert "EXISTS" in listing_sql and "DISTINCT" not in listing_sql and " JOIN " not in listing_sql
+    assert pages == by_offset == [[11, 9, 7, 5], [3, 1]]
+    assert _walk(engine, 5, ioc_value="10.0.0.1", order="asc") == [[1, 4, 7, 10]]
+    assert _run(engine, lambda s: db_operations.alerts_open_multiple_filters(s, ioc_value="10.0.0.1")) == 4
+
+
+def test_paging_by_creation_time_neither_skips_nor_repeats_ties(db):
+    engine, statements = db
+
+    pages = _walk(engine, 3, sort_by="alert_creation_time")
+    statements.clear()
+    _walk(engine, 3, sort_by="alert_creation_time", order="asc")
+    ascending_sql = statements[-1]
+
+    # Two alerts per minute: page boundaries fall between alerts sharing a timestamp.
+    assert pages == [[12, 11, 10], [9, 8, 7], [6, 5, 4], [3, 2, 1], []]
+    assert "alert_creation_time > ?" in ascending_sql
+
+
+def test_a_cursor_is_refused_for_another_sort_and_when_altered(db):
+    engine, _ = db
+    _, cursor = _run(engine, lambda s: db_operations.page_alerts_multiple_filters(s, page_size=2, sort_by="alert_creation_time"))
+
+    for bad in [dict(cursor=cursor), dict(cursor=cursor, sort_by="alert_creation_time", order="asc"), dict(cursor="not-a-cursor")]:
+        with pytest.raises(HTTPException) as raised:
+            _run(engine, lambda s: db_operations.page_alerts_multiple_filters(s, page_size=2, **bad))
+        assert raised.value.status_code == 400
+
+
+def test_cases_page_by_cursor(db, monkeypatch):
+    engine, _ = db
+
+    async def unrestricted(user, session, query, column, requested_customers=None):
+        return query
+
+    monkeypatch.setattr(db_operations.customer_access_handler, "filter_query_by_customer_access", unrestricted)
+
+    first, cursor = _run(engine, lambda s: db_operations.page_cases_for_user(None, s, page_size=3))
+    rest, last = _run(engine, lambda s: db_operations.page_cases_for_user(None, s, page=7, page_size=3, cursor=cursor))
+
+    assert [c.id for c in first] == [5, 4, 3] and [c.id for c in rest] == [2, 1] and last is None
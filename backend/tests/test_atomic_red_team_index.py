@@ -0,0 +1,158 @@
+"""The Atomic Red Team tests are served from a local index synced incrementally.
+
+`list_all_atomic_tests` used to download the repository's markdown index, whose
+entries carry no platforms (so the OS filter matched nothing), and each
+technique's markdown was fetched from GitHub when it was opened. These tests pin
+the index that replaced that: a sync downloads only the technique folders whose
+tree SHA changed and nothing when the branch did not move, the OS filter and
+markdown come from memory, a restart or an offline install serves the snapshot,
+and a failed folder is retried on the next sync.
+
+Run with: cd backend && python -m pytest tests/test_atomic_red_team_index.py
+"""
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import yaml
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+import app.connectors.wazuh_manager.services.atomic_red_team as atomic  # noqa: E402
+import app.connectors.wazuh_manager.services.mitre as mitre_service  # noqa: E402
+from app.integrations.copilot_searches.services import catalog_snapshots  # noqa: E402
+
+
+def _folder(name, platforms, dependencies=False):
+    tests = [{"name": f"test {n}", "supported_platforms": platforms} for n in range(len(platforms))]
+    if dependencies:
+        tests[0]["dependencies"] = [{"description": "needs a tool"}]
+    return {"yaml": yaml.safe_dump({"display_name": name, "atomic_tests": tests}), "md": f"# {name}\n\n## Atomic Test #1\n"}
+
+
+@pytest.fixture
+def github(monkeypatch, tmp_path):
+    """A fake GitHub serving ``state.folders`` at ``state.commit``, recording each request."""
+    monkeypatch.setattr(catalog_snapshots, "SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(catalog_snapshots, "OFFLINE", False)
+    state = SimpleNamespace(
+        commit="c1",
+        folders={
+            "T1003": _folder("OS Credential Dumping", ["windows", "linux"], dependencies=True),
+            "T1059.004": _folder("Unix Shell", ["linux", "macos"]),
+            "T1547": _folder("Boot or Logon Autostart Execution", ["windows"]),
+        },
+        fail=set(),
+        requests=[],
+    )
+
+    def handler(request):
+        url = str(request.url)
+        if url.endswith(f"/commits/{atomic.GITHUB_BRANCH}"):
+            state.requests.append("head")
+            etag = f'"{state.commit}"'
+            if request.headers.get("If-None-Match") == etag:
+                return httpx.Response(304)
+            return httpx.Response(200, text=state.commit, headers={"ETag": etag})
+        if "/contents/atomics" in url:
+            state.requests.append("contents")
+            assert request.url.params["ref"] == state.commit
+            entries = [{"name": tid, "type": "dir", "sha": f"{hash(str(body)) & 0xFFFFFFFF:x}"} for tid, body in state.folders.items()]
+            return httpx.Response(
+                200,
+                json=entries + [{"name": "Indexes", "type": "dir", "sha": "x"}, {"name": "README.md", "type": "file", "sha": "y"}],
+            )
+        path = url.split(f"/{state.commit}/atomics/", 1)[1]
+        technique_id, extension = path.split("/")[0], path.rsplit(".", 1)[1]
+        state.requests.append(path)
+        if technique_id in state.fail:
+            return httpx.Response(502)
+        return httpx.Response(200, text=state.folders[technique_id][extension])
+
+    real_client = httpx.AsyncClient
+
+    def client(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(atomic.httpx, "AsyncClient", client)
+    return state
+
+
+def _downloads(state):
+    return sorted(r for r in state.requests if r.endswith((".yaml", ".md")))
+
+
+def test_sync_downloads_only_changed_folders_and_filters_by_platform_from_memory(github):
+    index = atomic.AtomicRedTeamIndex()
+    asyncio.run(index.refresh())
+    first = _downloads(github)
+
+    github.requests.clear()
+    asyncio.run(index.refresh())
+    unchanged = list(github.requests)
+
+    github.commit = "c2"
+    github.folders["T1547"] = _folder("Boot or Logon Autostart Execution", ["windows", "linux"])
+    del github.folders["T1059.004"]
+    github.requests.clear()
+    asyncio.run(index.refresh())
+    changed = _downloads(github)
+
+    assert len(first) == 6 and unchanged == ["head"]
+    assert changed == ["T1547/T1547.md", "T1547/T1547.yaml"]
+    linux, linux_tests = index.list_tests("Linux")
+    assert [t["technique_id"] for t in linux] == ["T1003", "T1547"] and linux_tests == 4
+    assert index.list_tests("macos") == ([], 0)
+    assert index.list_tests()[0][0] == {
+        "technique_id": "T1003",
+        "technique_name": "OS Credential Dumping",
+        "test_count": 2,
+        "categories": ["linux", "windows"],
+        "has_prerequisites": True,
+    }
+    assert index.commit_sha == "c2"
+
+
+def test_a_restart_serves_the_listing_and_markdown_without_network(github, monkeypatch):
+    asyncio.run(atomic.AtomicRedTeamIndex().refresh())
+    github.requests.clear()
+
+    restarted = atomic.AtomicRedTeamIndex()
+    monkeypatch.setattr(mitre_service, "atomic_red_team_index", restarted)
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("markdown must come from the index")
+
+    monkeypatch.setattr(mitre_service.aiohttp, "ClientSession", no_network)
+
+    listing = asyncio.run(mitre_service.AtomicRedTeamService.list_all_atomic_tests("windows"))
+    markdown = asyncio.run(mitre_service.AtomicRedTeamService.get_technique_markdown("T1059.004"))
+
+    assert github.requests == []
+    assert [t["technique_id"] for t in listing["tests"]] == ["T1003", "T1547"] and listing["total_tests"] == 3
+    assert markdown == github.folders["T1059.004"]["md"]
+
+
+def test_a_failed_folder_is_retried_and_offline_mode_never_contacts_github(github, monkeypatch):
+    index = atomic.AtomicRedTeamIndex()
+    asyncio.run(index.refresh())
+
+    github.commit = "c2"
+    github.folders["T1003"] = _folder("OS Credential Dumping", ["windows"])
+    github.fail = {"T1003"}
+    asyncio.run(index.refresh())
+    assert index.commit_sha == "c1" and index.list_tests()[0][0]["categories"] == ["linux", "windows"]
+
+    github.fail = set()
+    github.requests.clear()
+    asyncio.run(index.refresh())
+    assert _downloads(github) == ["T1003/T1003.md", "T1003/T1003.yaml"] and index.commit_sha == "c2"
+
+    github.requests.clear()
+    monkeypatch.setattr(catalog_snapshots, "OFFLINE", True)
+    offline = atomic.AtomicRedTeamIndex()
+    asyncio.run(offline.refresh())
+    assert github.requests == [] and offline.list_tests("windows")[1] == 2
@@ -0,0 +1,123 @@
+"""The audit log listing pages by cursor, can cap its count, and searches FULLTEXT.
+
+`list_audit_logs` ran an exact COUNT and an OFFSET page on every request, and its
+search was three leading-wildcard ILIKE scans. These tests pin what replaced
+that: a cursor walk over ``(timestamp, id)`` visits every row once in the order
+offset paging does, even across rows sharing a timestamp; a capped count stops
+counting and says so; and search is a boolean-mode MATCH on MySQL, falling back to
+the substring match for short words and on SQLite.
+
+Run with: cd backend && python -m pytest tests/test_audit_query.py
+"""
+
+import asyncio
+import os
+from datetime import datetime
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from fastapi import HTTPException  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.dialects import mysql  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from app.audit.models.audit import AuditLog  # noqa: E402
+from app.audit.services import query  # noqa: E402
+
+START = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def db():
+    """Fifteen entries, three per timestamp; every fifth one a connector deletion."""
+    engine = create_async_engine("sqlite+aiosqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async def seed():
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda c: SQLModel.metadata.create_all(c, tables=[AuditLog.__table__]))
+        async with AsyncSession(engine) as session:
+            for n in range(1, 16):
+                deleted = n % 5 == 0
+                session.add(
+                    AuditLog(
+                        id=n,
+                        timestamp=START + timedelta(minutes=n // 3),
+                        action="connector.delete" if deleted else "auth.login",
+                        actor_username="alice" if n % 2 else "bob",
+                        entity_id=f"entity-{n}",
+                        details=f"Deleted Wazuh-Indexer connector {n}" if deleted else "Logged in",
+                    ),
+                )
+            await session.commit()
+
+    asyncio.run(seed())
+    statements.clear()
+    return engine, statements
+
+
+def _run(engine, work):
+    async def go():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            return await work(session)
+
+    return asyncio.run(go())
+
+
+def test_a_cursor_walk_matches_offset_paging_across_equal_timestamps(db):
+    engine, statements = db
+    by_offset = [[row.id for row in _run(engine, lambda s: query.list_audit_logs(s, skip=skip, limit=4))[0]] for skip in (0, 4, 8, 12)]
+
+    pages, cursor = [], None
+    while True:
+        rows, total, _, cursor = _run(engine, lambda s: query.page_audit_logs(s, limit=4, cursor=cursor, count="none"))
+        pages.append([row.id for row in rows])
+        if cursor is None:
+            break
+
+    assert pages == by_offset == [[15, 14, 13, 12], [11, 10, 9, 8], [7, 6, 5, 4], [3, 2, 1]]
+    assert total is None and "count(" not in statements[-1].lower()
+    with pytest.raises(HTTPException) as raised:
+        _run(engine, lambda s: query.page_audit_logs(s, cursor="not-a-cursor"))
+    assert raised.value.status_code == 400
+
+
+def test_a_capped_count_stops_at_the_cap(db, monkeypatch):
+    engine, _ = db
+    monkeypatch.setattr(query, "COUNT_CAP", 10)
+
+    _, total, capped, _ = _run(engine, lambda s: query.page_audit_logs(s, limit=2, count="capped"))
+    assert (total, capped) == (10, True)
+    _, total, capped, _ = _run(engine, lambda s: query.page_audit_logs(s, limit=2, count="capped", actor_username="alice"))
+    assert (total, capped) == (8, False)
+
+
+def test_search_is_fulltext_on_mysql_and_a_substring_match_elsewhere(db):
+    engine, _ = db
+
+    assert query.fulltext_terms("wazuh-indexer conn") == "+wazuh* +indexer* +conn*"
+    assert query.fulltext_terms("10.0.0.1") is None and query.fulltext_terms("--") is None
+
+    on_mysql = SimpleNamespace(bind=SimpleNamespace(dialect=SimpleNamespace(name="mysql")))
+    compiled = str(query._search_condition(on_mysql, "wazuh connector").compile(dialect=mysql.dialect()))
+    assert "MATCH (audit_log.details, audit_log.actor_username, audit_log.entity_id) AGAINST" in compiled
+    assert "IN BOOLEAN MODE" in compiled
+    short = str(query._search_condition(on_mysql, "10.0").compile(dialect=mysql.dialect()))
+    assert "MATCH" not in short and "LIKE" in short
+
+    # SQLite keeps the substring semantics: the words must appear together, in order.
+    rows, total = _run(engine, lambda s: query.list_audit_logs(s, search="connector wazuh"))
+    assert [row.id for row in rows] == [] and total == 0
+    rows, total = _run(engine, lambda s: query.list_audit_logs(s, search="Wazuh-Indexer"))
+    assert [row.id for row in rows] == [15, 10, 5] and total == 3
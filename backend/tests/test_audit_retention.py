@@ -0,0 +1,98 @@
+"""Audit-log retention deletes in bounded primary-key slices.
+
+`prune_audit_log` used to be one unbounded DELETE in one transaction, which on a
+large table held locks for minutes. These tests pin the chunked replacement:
+every slice is bounded, only rows past the cutoff go, gaps in the id sequence
+cost no empty slices, and each slice is reported as progress.
+
+Run with: cd backend && python -m pytest tests/test_audit_retention.py
+"""
+
+import asyncio
+import os
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from app.audit.models.audit import AuditLog  # noqa: E402
+from app.audit.services import retention  # noqa: E402
+from app.middleware.performance import PerformanceRegistry  # noqa: E402
+
+
+@pytest.fixture
+def table(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    deletes = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record_deletes(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("DELETE FROM audit_log"):
+            deletes.append(statement)
+
+    async def seed():
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda c: SQLModel.metadata.create_all(c, tables=[AuditLog.__table__]))
+        old = datetime.utcnow() - timedelta(days=200)
+        async with AsyncSession(engine) as session:
+            # 1-25 expired, then a gap, 1001-1025 expired, then 2001-2010 recent.
+            for ids, when in ((range(1, 26), old), (range(1001, 1026), old), (range(2001, 2011), datetime.utcnow())):
+                session.add_all(AuditLog(id=i, timestamp=when, action="alert.close") for i in ids)
+            await session.commit()
+
+    asyncio.run(seed())
+    registry = PerformanceRegistry()
+    monkeypatch.setattr(retention, "async_engine", engine)
+    monkeypatch.setattr(retention, "performance_registry", registry)
+    monkeypatch.setattr(retention, "BATCH_SIZE", 10)
+    monkeypatch.setattr(retention, "PAUSE_SECONDS", 0)
+    monkeypatch.setenv("AUDIT_LOG_RETENTION_DAYS", "90")
+    return engine, deletes, registry
+
+
+def _remaining(engine):
+    async def query():
+        async with AsyncSession(engine) as session:
+            return sorted((await session.execute(select(AuditLog.id))).scalars().all())
+
+    return asyncio.run(query())
+
+
+def test_expired_rows_are_deleted_in_bounded_slices(table):
+    engine, deletes, registry = table
+
+    deleted = asyncio.run(retention.prune_audit_log())
+
+    assert deleted == 50
+    assert _remaining(engine) == list(range(2001, 2011))
+    # 50 rows in slices of 10; the 975-id gap between them costs nothing.
+    assert len(deletes) == 5
+    assert all("audit_log.id >=" in statement and "audit_log.timestamp <" in statement for statement in deletes)
+    stage = registry.stages[0]
+    assert (stage.pipeline, stage.stage, stage.runs, stage.items) == ("audit_retention", "delete_slice", 5, 50)
+
+
+def test_nothing_expired_issues_no_delete(table, monkeypatch):
+    engine, deletes, _ = table
+    monkeypatch.setenv("AUDIT_LOG_RETENTION_DAYS", "365")
+
+    assert asyncio.run(retention.prune_audit_log()) == 0
+    assert deletes == []
+    assert len(_remaining(engine)) == 60
+
+
+def test_a_disabled_window_keeps_everything(table, monkeypatch):
+    engine, deletes, _ = table
+    monkeypatch.setenv("AUDIT_LOG_RETENTION_DAYS", "0")
+
+    assert asyncio.run(retention.prune_audit_log()) == 0
+    assert deletes == []
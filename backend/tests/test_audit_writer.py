@@ -0,0 +1,184 @@
+"""Audit events are buffered and written in batches, not one commit per event.
+
+`record_audit_event` used to open a session and commit a single row for every
+audited action — a full database round-trip each, so a mass alert closure was
+hundreds of sequential commits. These tests pin the buffered writer: a burst
+lands as a few multi-row INSERTs, nothing is lost on shutdown even mid-flush, and
+a database outage keeps the rows (in memory, or in the spill file, which is only
+removed once its replay commits) for the next flush.
+
+Run with: cd backend && python -m pytest tests/test_audit_writer.py
+"""
+
+import asyncio
+import os
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy import func  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from app.audit.models.audit import AuditAction  # noqa: E402
+from app.audit.models.audit import AuditLog  # noqa: E402
+from app.audit.services import audit  # noqa: E402
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    inserts = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO audit_log"):
+            inserts.append(len(parameters) if executemany else 1)
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda c: SQLModel.metadata.create_all(c, tables=[AuditLog.__table__]))
+
+    asyncio.run(create())
+    monkeypatch.setattr(audit, "async_engine", engine)
+    monkeypatch.setattr(audit, "_buffer", [])
+    monkeypatch.setattr(audit, "_flush_lock", asyncio.Lock())
+    monkeypatch.setattr(audit, "_flusher", None)
+    monkeypatch.setattr(audit, "FLUSH_SIZE", 50)
+    monkeypatch.setattr(audit, "SPILL_PATH", None)
+    yield engine, inserts
+
+
+async def _count(engine):
+    async with AsyncSession(engine) as session:
+        return (await session.execute(select(func.count()).select_from(AuditLog))).scalar_one()
+
+
+def test_a_burst_is_written_in_batches(writer):
+    engine, inserts = writer
+
+    async def scenario():
+        for n in range(120):
+            await audit.record_audit_event(action=AuditAction.CASE_CREATE, entity_type="case", entity_id=n)
+        await audit.close_audit_writer()
+        return await _count(engine)
+
+    assert asyncio.run(scenario()) == 120
+    assert len(inserts) <= 4 and sum(inserts) == 120
+
+
+def test_rows_wait_for_the_interval_then_land(writer, monkeypatch):
+    engine, _ = writer
+    monkeypatch.setattr(audit, "FLUSH_INTERVAL_SECONDS", 0.05)
+
+    async def scenario():
+        await audit.record_audit_event(action="alert.close", entity_id=7)
+        before = await _count(engine)
+        await asyncio.sleep(0.2)
+        after = await _count(engine)
+        await audit.close_audit_writer()
+        return before, after
+
+    assert asyncio.run(scenario()) == (0, 1)
+
+
+def test_a_failed_flush_keeps_the_rows_for_the_next_one(writer, monkeypatch):
+    engine, _ = writer
+    real_insert = audit._insert
+
+    async def down(rows):
+        raise ConnectionError("database unavailable")
+
+    async def scenario():
+        monkeypatch.setattr(audit, "_insert", down)
+        await audit.record_audit_event(action="alert.close", entity_id=1)
+        await audit.flush_audit_events()
+        kept = audit.stats()["buffered"]
+        monkeypatch.setattr(audit, "_insert", real_insert)
+        await audit.record_audit_event(action="alert.close", entity_id=2)
+        await audit.close_audit_writer()
+        return kept, await _count(engine)
+
+    assert asyncio.run(scenario()) == (1, 2)
+
+
+def test_failed_batches_spill_to_disk_and_are_replayed(writer, monkeypatch, tmp_path):
+    engine, _ = writer
+    spill = tmp_path / "audit-spill.jsonl"
+    monkeypatch.setattr(audit, "SPILL_PATH", str(spill))
+    real_insert = audit._insert
+
+    async def down(rows):
+        raise ConnectionError("database unavailable")
+
+    async def scenario():
+        monkeypatch.setattr(audit, "_insert", down)
+        await audit.record_audit_event(action="alert.close", entity_id=1, new_value={"status": "CLOSED"})
+        await audit.flush_audit_events()
+        spilled = spill.exists() and not audit._buffer
+        monkeypatch.setattr(audit, "_insert", real_insert)
+        await audit.close_audit_writer()
+        async with AsyncSession(engine) as session:
+            row = (await session.execute(select(AuditLog))).scalars().one()
+        return spilled, row
+
+    spilled, row = asyncio.run(scenario())
+
+    assert spilled
+    assert not spill.exists()
+    assert row.entity_id == "1" and row.new_value == {"status": "CLOSED"}
+
+
+def test_shutdown_during_a_flush_loses_nothing(writer, monkeypatch):
+    engine, _ = writer
+    real_insert = audit._insert
+    started = asyncio.Event()
+
+    async def slow(rows):
+        started.set()
+        await asyncio.sleep(0.05)
+        await real_insert(rows)
+
+    async def scenario():
+        monkeypatch.setattr(audit, "_insert", slow)
+        for n in range(60):
+            await audit.record_audit_event(action="alert.close", entity_id=n)
+        await started.wait()
+        await audit.close_audit_writer()
+        return await _count(engine)
+
+    assert asyncio.run(scenario()) == 60
+
+
+def test_the_spill_file_survives_a_replay_that_does_not_commit(writer, monkeypatch, tmp_path):
+    engine, _ = writer
+    spill = tmp_path / "audit-spill.jsonl"
+    monkeypatch.setattr(audit, "SPILL_PATH", str(spill))
+    real_insert = audit._insert
+
+    async def down(rows):
+        raise ConnectionError("database unavailable")
+
+    async def cancelled(rows):
+        raise asyncio.CancelledError
+
+    async def scenario():
+        monkeypatch.setattr(audit, "_insert", down)
+        await audit.record_audit_event(action="alert.close", entity_id=1)
+        await audit.flush_audit_events()
+        await audit.flush_audit_events()
+        monkeypatch.setattr(audit, "_insert", cancelled)
+        with pytest.raises(asyncio.CancelledError):
+            await audit.flush_audit_events()
+        kept = spill.read_text().count("\n")
+        monkeypatch.setattr(audit, "_insert", real_insert)
+        await audit.flush_audit_events()
+        return kept, await _count(engine)
+
+    assert asyncio.run(scenario()) == (1, 1)
+    assert not spill.exists()
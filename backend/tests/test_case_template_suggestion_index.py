@@ -0,0 +1,180 @@
+"""Case-template suggestions score from an in-memory index, not a reload per call.
+
+`suggest_templates` used to load every template with its tasks, rebuild each
+corpus and re-count usage history on every alert-to-case action. These tests pin
+the replacement: rankings are identical to scoring every template topically,
+only templates the inverted postings select run the topical scorers, the index
+is loaded once and reloaded after a template write, and usage counts are cached
+until a template is applied to a case.
+
+Run with: cd backend && python -m pytest tests/test_case_template_suggestion_index.py
+"""
+
+import asyncio
+import os
+import random
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+import app.incidents.services.template_suggestions as svc  # noqa: E402
+from app.incidents.models import Case  # noqa: E402
+from app.incidents.models import CaseEvent  # noqa: E402
+from app.incidents.models import CaseTask  # noqa: E402
+from app.incidents.models import CaseTemplate  # noqa: E402
+from app.incidents.models import CaseTemplateTask  # noqa: E402
+from app.incidents.schema.case_templates import CaseTemplateCreate  # noqa: E402
+from app.incidents.schema.case_templates import CaseTemplateTaskCreate  # noqa: E402
+from app.incidents.services.case_tasks import apply_template_to_case  # noqa: E402
+from app.incidents.services.case_templates import create_template  # noqa: E402
+from app.incidents.services.template_suggestions import AlertSignals  # noqa: E402
+
+TOPICS = "ransomware phishing lateral movement credential dumping beacon exfiltration powershell mimikatz kerberoast".split()
+FILLER = "review contain isolate notify collect document escalate verify confirm scope".split()
+TECHNIQUES = ["T1486", "T1566", "T1021", "T1003", "T1003.001", "T1059", "T1059.001", "T1041", "T1558"]
+
+
+def _create(rng, index):
+    words = rng.sample(FILLER, 4) + rng.sample(TOPICS, rng.randint(0, 2))
+    tasks = [
+        CaseTemplateTaskCreate(
+            title=" ".join(rng.sample(words, 3)),
+            description=f"See {rng.choice(TECHNIQUES)}" if rng.random() < 0.3 else None,
+            order_index=position,
+        )
+        for position in range(rng.randint(1, 3))
+    ]
+    return CaseTemplateCreate(
+        name=f"Template {index:03d} {' '.join(words[:2])}",
+        customer_code=rng.choice([None, None, "ACME", "OTHERCO"]),
+        source=rng.choice([None, "wazuh", "office365"]),
+        tasks=tasks,
+    )
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async def create():
+        tables = [t.__table__ for t in (Case, CaseTemplate, CaseTemplateTask, CaseTask, CaseEvent)]
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda c: SQLModel.metadata.create_all(c, tables=tables))
+
+    asyncio.run(create())
+    svc.invalidate_template_index()
+    svc.invalidate_usage_counts()
+    svc.reset_stats()
+    state = SimpleNamespace(engine=engine, statements=statements, signals=None)
+
+    async def signals(*_args, **_kwargs):
+        return state.signals
+
+    monkeypatch.setattr(svc, "build_alert_signals", signals)
+    yield state
+    svc.invalidate_template_index()
+    svc.invalidate_usage_counts()
+
+
+def _run(db, work):
+    async def go():
+        async with AsyncSession(db.engine, expire_on_commit=False) as session:
+            return await work(session)
+
+    return asyncio.run(go())
+
+
+def _suggest(db, signals):
+    db.signals = signals
+    return _run(db, lambda session: svc.suggest_templates(session, customer_code=signals.customer_code, limit=0))
+
+
+def _ranking(response):
+    return [(s.template.id, s.score, [(r.signal, r.detail, r.points) for r in s.reasons]) for s in response.suggestions]
+
+
+def test_rankings_match_scoring_every_template_topically(db, monkeypatch):
+    rng = random.Random(935)
+    for index in range(150):
+        _run(db, lambda session, index=index: create_template(_create(rng, index), "admin", session))
+    signals = AlertSignals(
+        customer_code="ACME",
+        source="wazuh",
+        tags=["ransomware", "lateral-movement", "T1566"],
+        mitre_ids={"T1003.001", "T1059"},
+        mitre_names=["Credential Dumping"],
+        rule_groups=["windows", "powershell", "syslog"],
+        keywords=["mimikatz", "beacon"],
+    )
+
+    indexed = _suggest(db, signals)
+    stats = svc.stats()
+    monkeypatch.setattr(svc.TemplateIndex, "topical_candidates", lambda self, signals: {t.id for t in self.templates})
+    exhaustive = _suggest(db, signals)
+
+    assert indexed.total_candidates == exhaustive.total_candidates > 50
+    assert _ranking(indexed) == _ranking(exhaustive)
+    assert any(reason.signal == "mitre_parent" for s in indexed.suggestions for reason in s.reasons)
+    assert 0 < stats["templates_scored_topically"] < 150
+
+
+def test_index_is_loaded_once_and_reloaded_after_a_template_write(db):
+    rng = random.Random(1)
+    _run(db, lambda session: create_template(_create(rng, 1), "admin", session))
+    signals = AlertSignals(customer_code="ACME", source=None)
+
+    _suggest(db, signals)
+    db.statements.clear()
+    again = _suggest(db, signals)
+    quiet = [s for s in db.statements if "incident_management_case_template" in s]
+
+    created = _run(
+        db,
+        lambda session: create_template(CaseTemplateCreate(name="Brand new", customer_code="ACME"), "admin", session),
+    )
+    after = _suggest(db, signals)
+
+    assert quiet == [] and svc.stats()["index_loads"] == 2
+    assert created.template.id in {s.template.id for s in after.suggestions}
+    assert after.total_candidates == again.total_candidates + 1
+
+
+def test_usage_counts_are_cached_until_a_template_is_applied(db):
+    template = _run(
+        db,
+        lambda session: create_template(
+            CaseTemplateCreate(name="Phishing", tasks=[CaseTemplateTaskCreate(title="Pull the message")]),
+            "admin",
+            session,
+        ),
+    ).template
+    signals = AlertSignals(customer_code="ACME", source=None)
+
+    async def open_case(session):
+        case = Case(case_name="c", case_description="d", case_status="OPEN", customer_code="ACME")
+        session.add(case)
+        await session.flush()
+        await apply_template_to_case(case.id, template.id, "analyst", session)
+
+    before = _suggest(db, signals)
+    _suggest(db, signals)
+    hits = svc.stats()["usage_hits"]
+    _run(db, open_case)
+    after = _suggest(db, signals)
+
+    assert hits == 1 and svc.stats()["usage_loads"] == 2
+    assert [r.signal for r in before.suggestions[0].reasons] == []
+    assert [r.detail for r in after.suggestions[0].reasons] == ["Applied to 1 case(s) for ACME"]
@@ -83,6 +83,16 @@ def _template(
     )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_caches():
+    """The template index and usage counts are module-level caches; every test stubs its own."""
+    svc.invalidate_template_index()
+    svc.invalidate_usage_counts()
+    yield
+    svc.invalidate_template_index()
+    svc.invalidate_usage_counts()
+
+
 def _signals(**kwargs):
     kwargs.setdefault("customer_code", "ACME")
     kwargs.setdefault("source", "wazuh")
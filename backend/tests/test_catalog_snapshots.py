@@ -0,0 +1,224 @@
+"""Detections Catalog caches persist to disk and refresh conditionally.
+
+Every restart used to begin with empty catalog caches: thousands of raw GitHub
+downloads for the rules, the full STIX bundle for the matrix and a full Wazuh
+`GET /rules`. These tests pin the replacement: a restart restores the snapshot
+and, inside the TTL, touches no network; a rules refresh downloads only the
+files whose blob SHA changed and nothing at all when the branch head did not
+move; the matrix sends its ETag back; a failed download is retried next time;
+and an offline install serves a copied snapshot without contacting GitHub.
+
+Run with: cd backend && python -m pytest tests/test_catalog_snapshots.py
+"""
+
+import asyncio
+import gzip
+import json
+import os
+from datetime import datetime
+from datetime import timedelta
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+import app.connectors.wazuh_manager.services.rules as rules_service  # noqa: E402
+import app.integrations.copilot_searches.services.copilot_searches as searches  # noqa: E402
+import app.integrations.copilot_searches.services.mitre_coverage as mitre  # noqa: E402
+import app.integrations.copilot_searches.services.wazuh_rules_cache as wazuh  # noqa: E402
+from app.connectors.wazuh_manager.schema.rules import WazuhRulesResponse  # noqa: E402
+from app.integrations.copilot_searches.services import catalog_snapshots  # noqa: E402
+
+
+def _rule(name):
+    return f"id: {name}\nname: {name.title()}\ndate: 2026-01-02\ngraylog:\n  query: 'event_id:{name}'\n"
+
+
+@pytest.fixture
+def github(monkeypatch, tmp_path):
+    """A fake GitHub serving ``state.files`` at ``state.commit``, counting requests by kind."""
+    monkeypatch.setattr(catalog_snapshots, "SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(catalog_snapshots, "OFFLINE", False)
+    catalog_snapshots.reset_stats()
+    state = SimpleNamespace(
+        commit="c1",
+        files={"detections/windows/a.yaml": _rule("a"), "detections/linux/b.yaml": _rule("b"), "README.md": "x"},
+        fail=set(),
+        requests=[],
+        bundle_etag='"bundle-1"',
+    )
+
+    def handler(request):
+        url = str(request.url)
+        if url.endswith(f"/commits/{searches.GITHUB_BRANCH}"):
+            state.requests.append("head")
+            etag = f'"{state.commit}"'
+            if request.headers.get("If-None-Match") == etag:
+                return httpx.Response(304)
+            return httpx.Response(200, text=state.commit, headers={"ETag": etag})
+        if "/git/trees/" in url:
+            state.requests.append("tree")
+            assert f"/git/trees/{state.commit}?" in url
+            tree = [{"path": path, "type": "blob", "sha": f"{hash(body) & 0xFFFFFFFF:x}"} for path, body in state.files.items()]
+            return httpx.Response(200, json={"tree": tree})
+        if url == mitre.MITRE_STIX_URL:
+            state.requests.append("bundle")
+            if request.headers.get("If-None-Match") == state.bundle_etag:
+                return httpx.Response(304)
+            bundle = {
+                "objects": [
+                    {
+                        "type": "x-mitre-tactic",
+                        "x_mitre_shortname": "execution",
+                        "name": "Execution",
+                        "external_references": [{"source_name": "mitre-attack", "external_id": "TA0002"}],
+                    },
+                    {
+                        "type": "attack-pattern",
+                        "name": "PowerShell",
+                        "kill_chain_phases": [{"kill_chain_name": "mitre-attack", "phase_name": "execution"}],
+                        "external_references": [{"source_name": "mitre-attack", "external_id": "T1059.001"}],
+                    },
+                ],
+            }
+            return httpx.Response(200, json=bundle, headers={"ETag": state.bundle_etag})
+        path = url.split(f"/{state.commit}/", 1)[1]
+        state.requests.append(path)
+        if path in state.fail:
+            return httpx.Response(502)
+        return httpx.Response(200, text=state.files[path])
+
+    real_client = httpx.AsyncClient
+
+    def client(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(searches.httpx, "AsyncClient", client)
+    return state
+
+
+def _downloads(state):
+    return sorted(r for r in state.requests if r.startswith("detections/"))
+
+
+def test_rules_refresh_downloads_only_changed_files_and_a_restart_resumes_from_disk(github):
+    cache = searches.RulesCache()
+    asyncio.run(cache.refresh())
+    first = _downloads(github)
+
+    github.requests.clear()
+    asyncio.run(cache.refresh())
+    unchanged = list(github.requests)
+
+    github.commit = "c2"
+    github.files["detections/windows/a.yaml"] = _rule("a2")
+    github.files["detections/cloud/c.yaml"] = _rule("c")
+    del github.files["detections/linux/b.yaml"]
+    github.requests.clear()
+    asyncio.run(cache.refresh())
+    changed = _downloads(github)
+
+    assert first == ["detections/linux/b.yaml", "detections/windows/a.yaml"]
+    assert unchanged == ["head"]
+    assert changed == ["detections/cloud/c.yaml", "detections/windows/a.yaml"]
+    assert sorted(cache._rules) == ["a2", "c"] and cache.get_rule_by_name("A2")["_category"] == "windows"
+
+    # A new process restores the snapshot and, inside the TTL, asks GitHub nothing.
+    github.requests.clear()
+    restarted = searches.RulesCache()
+    asyncio.run(restarted.ensure_loaded())
+    assert github.requests == []
+    assert restarted.get_all_rules() == json.loads(json.dumps(cache.get_all_rules(), default=str))
+    assert restarted._commit_sha == "c2" and catalog_snapshots.stats()["restored"] == 1
+
+
+def test_an_expired_snapshot_refreshes_conditionally_and_failed_files_are_retried(github):
+    asyncio.run(searches.RulesCache().refresh())
+    path = catalog_snapshots.snapshot_path(searches.RulesCache.snapshot_name)
+    with gzip.open(path, "rt") as handle:
+        payload = json.load(handle)
+    payload["saved_at"] = (datetime.utcnow() - timedelta(days=1)).isoformat()
+    with gzip.open(path, "wt") as handle:
+        json.dump(payload, handle)
+
+    github.commit = "c2"
+    github.files["detections/windows/a.yaml"] = _rule("a2")
+    github.fail = {"detections/windows/a.yaml"}
+    github.requests.clear()
+    cache = searches.RulesCache()
+    asyncio.run(cache.ensure_loaded())
+
+    # The old version is kept and the commit is not recorded, so the next
+    # refresh diffs against it again.
+    assert _downloads(github) == ["detections/windows/a.yaml"]
+    assert sorted(cache._rules) == ["a", "b"] and cache._commit_sha == "c1"
+
+    github.fail = set()
+    github.requests.clear()
+    asyncio.run(cache.refresh())
+    assert _downloads(github) == ["detections/windows/a.yaml"]
+    assert sorted(cache._rules) == ["a2", "b"] and cache._commit_sha == "c2"
+
+
+def test_mitre_matrix_sends_its_etag_and_restores_from_disk(github):
+    matrix = mitre.MitreMatrix()
+    asyncio.run(matrix.refresh())
+    asyncio.run(matrix.refresh())
+
+    restarted = mitre.MitreMatrix()
+    asyncio.run(restarted.ensure_loaded())
+
+    assert github.requests == ["bundle", "bundle"]
+    assert catalog_snapshots.stats()["writes"] == 1
+    assert restarted._techniques == matrix._techniques and [t["id"] for t in restarted._tactics] == ["TA0002"]
+    assert not restarted.is_stale
+
+
+def test_offline_mode_serves_a_copied_snapshot_without_contacting_github(github, monkeypatch):
+    asyncio.run(searches.RulesCache().refresh())
+    github.requests.clear()
+    monkeypatch.setattr(catalog_snapshots, "OFFLINE", True)
+
+    cache = searches.RulesCache()
+    count = asyncio.run(cache.refresh())
+
+    assert count == 2 and github.requests == []
+    assert not cache.is_stale
+
+
+def test_wazuh_rules_snapshot_keeps_integer_ids_and_skips_the_load_on_restart(github, monkeypatch):
+    calls = []
+
+    async def get_wazuh_rules(limit, offset):
+        calls.append(limit)
+        rule = {
+            "filename": "f.xml",
+            "relative_dirname": "ruleset/rules",
+            "id": 5710,
+            "level": 5,
+            "status": "enabled",
+            "description": "sshd",
+        }
+        return WazuhRulesResponse(success=True, message="ok", results=[rule])
+
+    monkeypatch.setattr(rules_service, "get_wazuh_rules", get_wazuh_rules)
+    asyncio.run(wazuh.WazuhRulesCache().ensure_loaded())
+
+    restarted = wazuh.WazuhRulesCache()
+    asyncio.run(restarted.ensure_loaded())
+
+    assert calls == [100000]
+    assert restarted.get_rule(5710)["description"] == "sshd" and restarted.is_available
+
+
+def test_a_corrupt_snapshot_is_ignored(github):
+    os.makedirs(catalog_snapshots.SNAPSHOT_DIR, exist_ok=True)
+    with open(catalog_snapshots.snapshot_path(searches.RulesCache.snapshot_name), "wb") as handle:
+        handle.write(b"not gzip")
+
+    cache = searches.RulesCache()
+    asyncio.run(cache.ensure_loaded())
+
+    assert cache.rules_count == 2 and github.requests[:2] == ["head", "tree"]
@@ -0,0 +1,146 @@
+"""Dashboard and list status counts come from one grouped query.
+
+The portal's alert and case stats, and the totals on the alert and case lists,
+each ran four counts — total, open, in progress, closed — and every alert count
+resolved customer access and rebuilt the tag RBAC filter again. These tests pin
+what replaced that: one ``GROUP BY status`` per call that agrees with the
+per-status counts under customer and tag restrictions, and no query at all for
+a user whose tag access admits nothing.
+
+Run with: cd backend && python -m pytest tests/test_dashboard_status_counts.py
+"""
+
+import asyncio
+import os
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy import func  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from app.customer_portal.routes import dashboard  # noqa: E402
+from app.incidents import models  # noqa: E402
+from app.incidents.services import db_operations  # noqa: E402
+
+TABLES = [model.__table__ for model in (models.Alert, models.AlertTag, models.AlertToTag, models.Case)]
+STATUSES = ["OPEN", "OPEN", "OPEN", "IN_PROGRESS", "CLOSED", "CLOSED"]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """Six alerts and six cases for each of SOC01 and SOC02; SOC01's open alerts are tagged."""
+    engine = create_async_engine("sqlite+aiosqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda c: SQLModel.metadata.create_all(c, tables=TABLES))
+        async with AsyncSession(engine) as session:
+            tag = models.AlertTag(tag="vip")
+            session.add(tag)
+            await session.flush()
+            tag_id = tag.id
+            for customer_code in ("SOC01", "SOC02"):
+                for status in STATUSES:
+                    alert = models.Alert(alert_name="a", alert_description="", status=status, customer_code=customer_code, source="wazuh")
+                    session.add(alert)
+                    await session.flush()
+                    if customer_code == "SOC01" and status == "OPEN":
+                        session.add(models.AlertToTag(alert_id=alert.id, tag_id=tag_id))
+                    session.add(models.Case(case_name="c", case_description="", case_status=status, customer_code=customer_code))
+            await session.commit()
+        return tag_id
+
+    tag_id = asyncio.run(create())
+    access = {"customers": ["*"], "tags": {"accessible_tags": ["*"], "include_untagged": True}}
+
+    async def resolve(user, requested, session):
+        return requested or access["customers"]
+
+    async def tag_filters(user, session):
+        return access["tags"]
+
+    monkeypatch.setattr(db_operations.customer_access_handler, "resolve_effective_customers", resolve)
+    monkeypatch.setattr(dashboard.customer_access_handler, "resolve_effective_customers", resolve)
+    monkeypatch.setattr(db_operations.tag_access_handler, "build_alert_query_filters", tag_filters)
+    statements.clear()
+    return engine, statements, access, tag_id
+
+
+def _run(engine, work):
+    async def go():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            return await work(session)
+
+    return asyncio.run(go())
+
+
+def _one_by_one(engine, **kwargs):
+    """The dashboard's old shape: the total, then one filtered count per status."""
+
+    async def count(session, status):
+        filters = await db_operations.alert_access_conditions(None, session, **kwargs)
+        if filters is None:
+            return 0
+        query = select(func.count(models.Alert.id)).where(models.Alert.status == status, *filters)
+        return (await session.execute(query)).scalar_one()
+
+    return {
+        "total": _run(engine, lambda s: db_operations.alert_total_for_user(None, s, **kwargs)),
+        "open": _run(engine, lambda s: count(s, "OPEN")),
+        "in_progress": _run(engine, lambda s: count(s, "IN_PROGRESS")),
+        "closed": _run(engine, lambda s: count(s, "CLOSED")),
+    }
+
+
+def test_alert_counts_are_one_grouped_query_that_matches_the_per_status_counts(db):
+    engine, statements, access, tag_id = db
+
+    grouped = _run(engine, lambda s: db_operations.alert_status_counts_for_user(None, s))
+    assert grouped == {"total": 12, "open": 6, "in_progress": 2, "closed": 4}
+    assert len(statements) == 1 and "GROUP BY" in statements[0]
+
+    # Tagged SOC01 alerts only, then SOC02's untagged ones: the RBAC conditions still apply.
+    access["tags"] = {"accessible_tags": [tag_id], "include_untagged": False}
+    assert _run(engine, lambda s: db_operations.alert_status_counts_for_user(None, s)) == _one_by_one(engine)
+    assert _one_by_one(engine)["total"] == 3
+    access["tags"] = {"accessible_tags": [], "include_untagged": True}
+    counts = _run(engine, lambda s: db_operations.alert_status_counts_for_user(None, s, customer_codes=["SOC02"]))
+    assert counts == _one_by_one(engine, customer_codes=["SOC02"]) == {"total": 6, "open": 3, "in_progress": 1, "closed": 2}
+
+
+def test_no_tag_access_answers_without_a_query(db):
+    engine, statements, access, _ = db
+    access["tags"] = {"accessible_tags": [], "include_untagged": False}
+
+    assert _run(engine, lambda s: db_operations.alert_status_counts_for_user(None, s)) == {
+        "total": 0,
+        "open": 0,
+        "in_progress": 0,
+        "closed": 0,
+    }
+    assert statements == []
+
+
+def test_portal_dashboard_stats_use_one_query_each(db):
+    engine, statements, access, _ = db
+    access["customers"] = ["SOC01"]
+    user = type("PortalUser", (), {"username": "portal"})()
+
+    alerts = _run(engine, lambda s: dashboard.get_customer_dashboard_alert_stats(customer_codes=None, current_user=user, db=s))
+    cases = _run(engine, lambda s: dashboard.get_customer_dashboard_case_stats(customer_codes=None, current_user=user, db=s))
+
+    assert (alerts.total, alerts.open, alerts.in_progress, alerts.closed) == (6, 3, 1, 2)
+    assert (cases.total, cases.open, cases.in_progress, cases.closed) == (6, 3, 1, 2)
+    assert len(statements) == 2 and all("GROUP BY" in sql for sql in statements)
@@ -0,0 +1,151 @@
+"""EPSS scores come from a local snapshot, with batched API calls for misses.
+
+Vulnerability search and export used to call api.first.org once per CVE inside
+the result loop, so a 5,000-row export was 5,000 sequential requests. These
+tests pin the replacement: the daily feed parses, known CVEs never leave the
+process, misses are fetched `API_BATCH_SIZE` at a time and asked for only once,
+storing them does not make an old snapshot look fresh, and a page of hits costs
+one lookup.
+
+Run with: cd backend && python -m pytest tests/test_epss_cache.py
+"""
+
+import asyncio
+import gzip
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from app.agents.vulnerabilities.services import vulnerabilities  # noqa: E402
+from app.threat_intel.models.epss import EpssScore  # noqa: E402
+from app.threat_intel.schema.epss import EpssData  # noqa: E402
+from app.threat_intel.schema.epss import EpssThreatIntelResponse  # noqa: E402
+from app.threat_intel.services import epss_cache  # noqa: E402
+
+FEED = (
+    "#model_version:v2025.03.14,score_date:2025-10-17T00:00:00+0000\n"
+    "cve,epss,percentile\n"
+    "CVE-2024-0001,0.97000,0.99900\n"
+    "CVE-2024-0002,0.00043,0.11000\n"
+)
+
+
+@pytest.fixture
+def api(monkeypatch):
+    state = SimpleNamespace(calls=[], known={}, fail=False)
+
+    async def collect(request):
+        state.calls.append(request.cve.split(","))
+        if state.fail:
+            raise RuntimeError("no route to api.first.org")
+        data = [
+            EpssData(cve=cve_id, epss=state.known[cve_id], percentile="0.5", date="2025-10-18")
+            for cve_id in request.cve.split(",")
+            if cve_id in state.known
+        ]
+        return EpssThreatIntelResponse(data=data, success=True, message="ok")
+
+    async def nothing(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(epss_cache, "collect_epss_score", collect)
+    monkeypatch.setattr(epss_cache, "_load_snapshot", nothing)
+    monkeypatch.setattr(epss_cache, "_persist_rows", nothing)
+    monkeypatch.setattr(epss_cache, "_scores", dict(epss_cache.parse_feed(FEED.encode())[1]))
+    monkeypatch.setattr(epss_cache, "_unknown", set())
+    monkeypatch.setattr(epss_cache, "_loaded", True)
+    epss_cache.reset_stats()
+    return state
+
+
+def test_the_daily_feed_parses_gzipped_or_plain():
+    for raw in (FEED.encode(), gzip.compress(FEED.encode())):
+        score_date, scores = epss_cache.parse_feed(raw)
+        assert score_date == "2025-10-17"
+        assert scores == {"CVE-2024-0001": ("0.97000", "0.99900"), "CVE-2024-0002": ("0.00043", "0.11000")}
+
+
+def test_snapshot_hits_never_call_the_api(api):
+    scores = asyncio.run(epss_cache.get_epss_scores(["cve-2024-0001", "CVE-2024-0002", "RHSA-2024:0001", None]))
+
+    assert scores == {"CVE-2024-0001": ("0.97000", "0.99900"), "CVE-2024-0002": ("0.00043", "0.11000")}
+    assert api.calls == []
+
+
+def test_misses_are_batched_and_asked_for_once(api):
+    missing = [f"CVE-2025-{n:05d}" for n in range(250)]
+    api.known = {missing[7]: "0.1"}
+
+    first = asyncio.run(epss_cache.get_epss_scores(missing))
+    second = asyncio.run(epss_cache.get_epss_scores(missing))
+
+    assert [len(batch) for batch in api.calls] == [100, 100, 50]
+    assert first == second == {missing[7]: ("0.1", "0.5")}
+    assert epss_cache.stats()["api_calls"] == 3
+
+
+def test_an_unreachable_api_degrades_to_the_snapshot(api):
+    api.fail = True
+
+    scores = asyncio.run(epss_cache.get_epss_scores(["CVE-2024-0001", "CVE-2025-99999"]))
+    api.fail = False
+    api.known = {"CVE-2025-99999": "0.2"}
+    retried = asyncio.run(epss_cache.get_epss_scores(["CVE-2025-99999"]))
+
+    assert scores == {"CVE-2024-0001": ("0.97000", "0.99900")}
+    assert retried == {"CVE-2025-99999": ("0.2", "0.5")}, "a failed call must not mark the CVE as unscored"
+
+
+def test_storing_api_scores_does_not_make_an_old_snapshot_look_fresh(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+    @asynccontextmanager
+    async def session():
+        async with AsyncSession(engine) as s:
+            yield s
+
+    async def go():
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda c: SQLModel.metadata.create_all(c, tables=[EpssScore.__table__]))
+        for refreshed_at in (None, datetime.utcnow() - timedelta(days=30)):
+            monkeypatch.setattr(epss_cache, "_refreshed_at", refreshed_at)
+            await epss_cache._persist_rows({"CVE-2025-99999": ("0.2", "0.5", "2025-10-18")})
+            await epss_cache._load_snapshot()
+            assert epss_cache.is_stale()
+
+    monkeypatch.setattr(epss_cache, "get_db_session", session)
+    monkeypatch.setattr(epss_cache, "_scores", {})
+    monkeypatch.setattr(epss_cache, "_score_date", None)
+    asyncio.run(go())
+    assert epss_cache._scores == {"CVE-2025-99999": ("0.2", "0.5")}
+
+
+def test_a_page_of_hits_costs_one_lookup(monkeypatch):
+    lookups = []
+
+    async def scores(cve_ids):
+        lookups.append(list(cve_ids))
+        return {"CVE-2024-0001": ("0.97000", "0.99900")}
+
+    monkeypatch.setattr(vulnerabilities, "get_epss_scores", scores)
+    hits = [
+        {"_id": str(n), "_source": {"agent": {"name": "host-1"}, "vulnerability": {"id": f"CVE-2024-000{n}", "severity": "High"}}}
+        for n in range(1, 4)
+    ]
+
+    items = asyncio.run(vulnerabilities.build_vulnerability_search_items(hits, {"host-1": "SOC01"}, include_epss=True))
+
+    assert len(lookups) == 1 and len(lookups[0]) == 3
+    assert [item.epss_score for item in items] == ["0.97000", None, None]
+    assert {item.customer_code for item in items} == {"SOC01"}
@@ -0,0 +1,107 @@
+"""Graylog alert hits are hydrated with `_mget`, not one GET per hit.
+
+`process_alert_hits` used to fire a `get` per hit through an unbounded
+`asyncio.gather`, so a `size=1000` Graylog query meant 1000 concurrent requests
+against the indexer. These tests pin the request count, the chunking and the
+concurrency cap, and that the response keeps its per-index grouping and its
+"alert not found" placeholders.
+
+Run with: cd backend && python -m pytest tests/test_graylog_alert_hydration.py
+"""
+
+import asyncio
+import os
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from elasticsearch7.exceptions import NotFoundError  # noqa: E402
+
+from app.connectors.wazuh_indexer.services import alerts as alerts_service  # noqa: E402
+
+
+class _Indexer:
+    def __init__(self, documents, missing_indices=()):
+        self.documents = documents
+        self.missing_indices = set(missing_indices)
+        self.calls = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def mget(self, index, body):
+        self.calls.append((index, list(body["ids"])))
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0)
+            if index in self.missing_indices:
+                raise NotFoundError(404, "index_not_found_exception", {})
+            docs = []
+            for doc_id in body["ids"]:
+                source = self.documents.get((index, doc_id))
+                if source is None:
+                    docs.append({"_index": index, "_id": doc_id, "found": False})
+                else:
+                    docs.append({"_index": index, "_id": doc_id, "found": True, "_source": source})
+            return {"docs": docs}
+        finally:
+            self.in_flight -= 1
+
+    async def get(self, **kwargs):
+        raise AssertionError("hydration must not fall back to one GET per hit")
+
+
+def _hit(index_name, doc_id):
+    return {"_id": f"gl-{doc_id}", "_source": {"origin_context": f"urn:graylog:message:es:{index_name}:{doc_id}"}}
+
+
+def test_hits_are_fetched_with_one_mget_per_index():
+    documents = {("wazuh-a_1", str(n)): {"n": n} for n in range(5)}
+    documents.update({("wazuh-b_1", str(n)): {"n": n} for n in range(3)})
+    hits = [_hit("wazuh-a_1", str(n)) for n in range(5)] + [_hit("wazuh-b_1", str(n)) for n in range(3)]
+    indexer = _Indexer(documents)
+
+    alerts = asyncio.run(alerts_service.process_alert_hits(hits, indexer))
+
+    assert sorted(index for index, _ in indexer.calls) == ["wazuh-a_1", "wazuh-b_1"]
+    assert [(group["index_name"], group["total_alerts"]) for group in alerts] == [("wazuh-a_1", 5), ("wazuh-b_1", 3)]
+    assert [alert["_source"]["n"] for alert in alerts[0]["alerts"]] == [0, 1, 2, 3, 4]
+
+
+def test_large_pages_are_chunked_and_capped(monkeypatch):
+    monkeypatch.setattr(alerts_service, "MGET_CHUNK_SIZE", 10)
+    monkeypatch.setattr(alerts_service, "MGET_CONCURRENCY", 2)
+    documents = {("wazuh-a_1", str(n)): {"n": n} for n in range(95)}
+    hits = [_hit("wazuh-a_1", str(n)) for n in range(95)]
+    indexer = _Indexer(documents)
+
+    alerts = asyncio.run(alerts_service.process_alert_hits(hits, indexer))
+
+    assert len(indexer.calls) == 10
+    assert max(len(ids) for _, ids in indexer.calls) == 10
+    assert indexer.peak_in_flight <= 2
+    assert alerts[0]["total_alerts"] == 95
+
+
+def test_missing_documents_and_indices_become_placeholders():
+    documents = {("wazuh-a_1", "1"): {"n": 1}}
+    hits = [_hit("wazuh-a_1", "1"), _hit("wazuh-a_1", "2"), _hit("gone_0", "3")]
+    indexer = _Indexer(documents, missing_indices={"gone_0"})
+
+    alerts = asyncio.run(alerts_service.process_alert_hits(hits, indexer))
+    by_index = {group["index_name"]: group["alerts"] for group in alerts}
+
+    assert by_index["wazuh-a_1"][0]["_source"] == {"n": 1}
+    assert by_index["wazuh-a_1"][1]["_source"] == {"message": "alert not found"}
+    assert by_index["gone_0"] == [{"_index": "gone_0", "_id": "3", "_source": {"message": "alert not found"}}]
+
+
+def test_index_filter_skips_other_indices_before_fetching():
+    documents = {("wazuh-a_1", "1"): {"n": 1}, ("wazuh-b_1", "2"): {"n": 2}}
+    indexer = _Indexer(documents)
+
+    alerts = asyncio.run(
+        alerts_service.process_alert_hits([_hit("wazuh-a_1", "1"), _hit("wazuh-b_1", "2")], indexer, index_filter="wazuh-b_1"),
+    )
+
+    assert indexer.calls == [("wazuh-b_1", ["2"])]
+    assert [group["index_name"] for group in alerts] == ["wazuh-b_1"]
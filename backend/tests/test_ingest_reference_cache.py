@@ -0,0 +1,178 @@
+"""Alert ingest reads its reference data through a cache the writers invalidate.
+
+Every `create_alert` re-read the source's field-name mappings, the customer's
+alert creation settings, the asset's agent row and the customer's notification
+setting. These tests pin what replaced that: a second alert for the same
+source, customer and host reads none of it from the database, callers get
+copies rather than a shared object, an unconfigured source or unknown customer
+is never remembered, and the routes and services that write those rows make
+the next alert see the change.
+
+Run with: cd backend && python -m pytest tests/test_ingest_reference_cache.py
+"""
+
+import asyncio
+import os
+from datetime import datetime
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from fastapi import HTTPException  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from app.db.universal_models import Agents  # noqa: E402
+from app.incidents import models  # noqa: E402
+from app.incidents.routes import db_operations as db_operations_routes  # noqa: E402
+from app.incidents.schema.db_operations import FieldAndAssetNames  # noqa: E402
+from app.incidents.schema.db_operations import PutNotification  # noqa: E402
+from app.incidents.services import db_operations  # noqa: E402
+from app.incidents.services import incident_alert  # noqa: E402
+from app.incidents.services import reference_cache  # noqa: E402
+from app.integrations import routes as integrations_routes  # noqa: E402
+from app.integrations.alert_creation_settings.models.alert_creation_settings import (  # noqa: E402
+    AlertCreationSettings,
+)
+
+TABLES = [
+    model.__table__
+    for model in (
+        models.FieldName,
+        models.AssetFieldName,
+        models.TimestampFieldName,
+        models.AlertTitleFieldName,
+        models.IoCFieldName,
+        models.Notification,
+        AlertCreationSettings,
+        Agents,
+    )
+]
+WAZUH = FieldAndAssetNames(
+    source="wazuh",
+    field_names=["rule_description", "agent_name"],
+    asset_name="agent_name",
+    timefield_name="timestamp",
+    alert_title_name="rule_description",
+    ioc_field_names=["data_srcip"],
+)
+
+
+@pytest.fixture
+def db():
+    engine = create_async_engine("sqlite+aiosqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda c: SQLModel.metadata.create_all(c, tables=TABLES))
+        async with AsyncSession(engine) as session:
+            session.add(AlertCreationSettings(customer_code="SOC01", customer_name="Acme Corp"))
+            session.add(
+                Agents(
+                    agent_id="001",
+                    ip_address="10.0.0.5",
+                    os="linux",
+                    hostname="host-1",
+                    label="SOC01",
+                    wazuh_last_seen=datetime(2026, 1, 1),
+                    wazuh_agent_version="4.9",
+                    customer_code="SOC01",
+                ),
+            )
+            await session.commit()
+        async with AsyncSession(engine) as session:
+            await db_operations_routes.create_wazuh_fields_and_assets(WAZUH, session=session)
+
+    asyncio.run(create())
+    reference_cache.invalidate_all()
+    reference_cache.reset_stats()
+    statements.clear()
+    yield engine, statements
+    reference_cache.invalidate_all()
+    reference_cache.reset_stats()
+
+
+def _run(engine, work):
+    async def go():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            return await work(session)
+
+    return asyncio.run(go())
+
+
+async def _lookups(session):
+    """The reference reads `create_alert` makes for one wazuh alert from host-1."""
+    await incident_alert.validate_syslog_type_source("wazuh", session)
+    settings = await incident_alert.is_customer_code_valid("SOC01", session)
+    field_names = await incident_alert.get_all_field_names("wazuh", session)
+    agent = await incident_alert.retrieve_agent_details_from_db("host-1", session)
+    return settings, field_names, agent
+
+
+def test_a_second_alert_reads_no_reference_data(db):
+    engine, statements = db
+
+    _, first_fields, _ = _run(engine, _lookups)
+    cold = len(statements)
+    first_fields.field_names.append("mutated by a caller")
+    statements.clear()
+    settings, field_names, agent = _run(engine, _lookups)
+
+    assert cold >= 7 and statements == []
+    assert settings.customer_name == "Acme Corp" and agent.agent_id == "001"
+    assert sorted(field_names.field_names) == ["agent_name", "rule_description"]
+    assert field_names.alert_title_name == "rule_description" and field_names.ioc_field_names == ["data_srcip"]
+    # The source check and the field names share one entry, so the first alert hits it once too.
+    assert reference_cache.stats()["hits"] == 5
+
+
+def test_unconfigured_sources_and_unknown_customers_are_not_remembered(db):
+    engine, statements = db
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as raised:
+            _run(engine, lambda s: incident_alert.validate_syslog_type_source("fortinet", s))
+        assert raised.value.status_code == 400
+        with pytest.raises(HTTPException):
+            _run(engine, lambda s: incident_alert.is_customer_code_valid("SOC02", s))
+    assert _run(engine, lambda s: incident_alert.retrieve_agent_details_from_db("host-9", s)) is None
+
+    fortinet = WAZUH.model_copy(update={"source": "fortinet"})
+    _run(engine, lambda s: db_operations_routes.create_wazuh_fields_and_assets(fortinet, session=s))
+
+    assert _run(engine, lambda s: incident_alert.get_all_field_names("fortinet", s)).asset_name == "agent_name"
+    assert reference_cache.stats()["hits"] == 0 and reference_cache.stats()["entries"] == 1
+
+
+def test_writes_are_seen_by_the_next_alert(db):
+    engine, _ = db
+    _run(engine, _lookups)
+
+    renamed = WAZUH.model_copy(update={"alert_title_name": "rule_name", "ioc_field_names": []})
+    _run(engine, lambda s: db_operations_routes.update_fields_and_assets(renamed, session=s))
+    assert _run(engine, lambda s: incident_alert.get_all_field_names("wazuh", s)).alert_title_name == "rule_name"
+
+    _run(engine, lambda s: integrations_routes.update_office365_organization_id("SOC01", "tenant-1", s))
+    assert _run(engine, lambda s: incident_alert.is_customer_code_valid("SOC01", s)).office365_organization_id == "tenant-1"
+
+    for enabled in (True, False):
+        notification = PutNotification(customer_code="SOC01", shuffle_workflow_id="wf-1", enabled=enabled)
+        _run(engine, lambda s: db_operations.put_customer_notification(notification, s))
+        setting = _run(
+            engine,
+            lambda s: incident_alert._customer_setting("notification", db_operations.get_customer_notification, "SOC01", s),
+        )
+        assert setting["enabled"] is enabled
+
+    _run(engine, lambda s: db_operations_routes.delete_configured_source("wazuh", session=s))
+    with pytest.raises(HTTPException):
+        _run(engine, lambda s: incident_alert.validate_syslog_type_source("wazuh", s))
@@ -0,0 +1,152 @@
+"""Integration scheduler jobs collect customers concurrently, each with a timeout.
+
+The Huntress, CarbonBlack, Darktrace, DUO, CATO and Mimecast jobs used to
+collect one customer after another on a shared session, re-read the job's
+metadata per customer and stamp `last_success` through the synchronous session.
+These tests pin the shared runner that replaced that loop: collections overlap
+up to the concurrency limit, a slow or failing customer does not hold back the
+rest, outcomes are recorded per customer, and `last_success` is written
+through the async session.
+
+Run with: cd backend && python -m pytest tests/test_integration_collector.py
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+import app.schedulers.services.integration_collector as collector  # noqa: E402
+import app.schedulers.services.invoke_duo as duo  # noqa: E402
+import app.schedulers.services.invoke_huntress as huntress  # noqa: E402
+from app.integrations.models.customer_integration_settings import (  # noqa: E402
+    CustomerIntegrations,
+)
+from app.integrations.modules.schema.duo import InvokeDuoResponse  # noqa: E402
+from app.integrations.modules.schema.huntress import (  # noqa: E402
+    InvokeHuntressResponse,
+)
+from app.schedulers.models.scheduler import JobMetadata  # noqa: E402
+
+JOB_ID = "invoke_huntress_integration_collect"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    state = SimpleNamespace(engine=engine, sessions=[])
+
+    async def create():
+        tables = [CustomerIntegrations.__table__, JobMetadata.__table__]
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda c: SQLModel.metadata.create_all(c, tables=tables))
+        async with AsyncSession(engine) as session:
+            for code in ["acme", "slow", "broken", "refused", "globex", "initech"]:
+                session.add(
+                    CustomerIntegrations(
+                        customer_code=code,
+                        customer_name=code,
+                        integration_service_id=1,
+                        integration_service_name="Huntress",
+                    ),
+                )
+            session.add(
+                CustomerIntegrations(
+                    customer_code="other",
+                    customer_name="other",
+                    integration_service_id=2,
+                    integration_service_name="DUO",
+                ),
+            )
+            session.add(JobMetadata(job_id=JOB_ID, time_interval=15, enabled=True, job_description="Huntress"))
+            await session.commit()
+
+    asyncio.run(create())
+
+    @asynccontextmanager
+    async def session():
+        async with AsyncSession(engine, expire_on_commit=False) as db_session:
+            yield db_session
+
+    monkeypatch.setattr(collector, "get_db_session", session)
+    monkeypatch.setattr(collector, "COLLECT_CONCURRENCY", 3)
+    monkeypatch.setattr(collector, "COLLECT_TIMEOUT_SECONDS", 0.5)
+    collector.reset_stats()
+    yield state
+    collector.reset_stats()
+
+
+def test_customers_are_collected_concurrently_and_one_slow_tenant_is_cut_off(db, monkeypatch):
+    calls = {"running": 0, "peak": 0, "requests": []}
+
+    async def collect_huntress_route(request, session):
+        calls["requests"].append(request)
+        db.sessions.append(session)
+        calls["running"] += 1
+        calls["peak"] = max(calls["peak"], calls["running"])
+        try:
+            await asyncio.sleep(5 if request.customer_code == "slow" else 0.1)
+            if request.customer_code == "broken":
+                raise RuntimeError("tenant API returned 500")
+        finally:
+            calls["running"] -= 1
+        if request.customer_code == "refused":
+            return InvokeHuntressResponse(success=False, message="bad credentials")
+        return InvokeHuntressResponse(success=True, message="ok")
+
+    monkeypatch.setattr(huntress, "collect_huntress_route", collect_huntress_route)
+
+    started = time.perf_counter()
+    response = asyncio.run(huntress.invoke_huntress_integration_collect())
+    elapsed = time.perf_counter() - started
+
+    outcomes = {c["customer_code"]: c["outcome"] for c in collector.stats()[JOB_ID]["customers"]}
+    assert response.success
+    assert outcomes == {
+        "acme": "success",
+        "slow": "timeout",
+        "broken": "error",
+        "refused": "failed",
+        "globex": "success",
+        "initech": "success",
+    }
+    assert calls["peak"] == 3 and elapsed < 1.5
+    assert len({id(session) for session in db.sessions}) == 6
+
+    async def job():
+        async with AsyncSession(db.engine) as session:
+            return (await session.execute(select(JobMetadata))).scalars().one()
+
+    assert asyncio.run(job()).last_success is not None
+
+
+def test_only_customers_with_the_integration_are_collected_even_without_job_metadata(db, monkeypatch):
+    async def drop_metadata():
+        async with AsyncSession(db.engine) as session:
+            await session.delete((await session.execute(select(JobMetadata))).scalars().one())
+            await session.commit()
+
+    asyncio.run(drop_metadata())
+    collected = []
+
+    async def collect_duo_route(request, session):
+        collected.append(request.customer_code)
+        return InvokeDuoResponse(success=True, message="ok")
+
+    monkeypatch.setattr(duo, "collect_duo_route", collect_duo_route)
+
+    response = asyncio.run(duo.invoke_duo_integration_collect())
+
+    assert response.success and collected == ["other"]
+    assert collector.stats()["invoke_duo_integration_collect"]["succeeded"] == 1
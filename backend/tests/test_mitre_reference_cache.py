@@ -0,0 +1,209 @@
+"""MITRE reference data is loaded once and shared, not fetched per request.
+
+`search_mitre_techniques_in_alerts` and `get_alerts_by_mitre_id` used to fetch
+every technique (twice) and every tactic from the Wazuh API on each call. These
+tests pin the cache that replaced that: the mapping builders keep their shapes
+but no longer call Wazuh once the cache is loaded, the compiled technique
+records resolve Wazuh's internal ids to ATT&CK ids, unfiltered list endpoints
+are paged from the cache exactly as Wazuh pages them, a restart restores the
+snapshot, and a Wazuh outage is neither fatal nor retried on every request.
+
+Run with: cd backend && python -m pytest tests/test_mitre_reference_cache.py
+"""
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+import app.connectors.wazuh_manager.services.mitre as mitre_service  # noqa: E402
+import app.connectors.wazuh_manager.services.mitre_reference as reference  # noqa: E402
+from app.connectors.wazuh_manager.schema.mitre import (  # noqa: E402
+    WazuhMitreGroupsResponse,
+)
+from app.connectors.wazuh_manager.schema.mitre import (  # noqa: E402
+    WazuhMitreMitigationsResponse,
+)
+from app.connectors.wazuh_manager.schema.mitre import (  # noqa: E402
+    WazuhMitreSoftwareResponse,
+)
+from app.connectors.wazuh_manager.schema.mitre import (  # noqa: E402
+    WazuhMitreTacticsResponse,
+)
+from app.connectors.wazuh_manager.schema.mitre import (  # noqa: E402
+    WazuhMitreTechniquesResponse,
+)
+from app.integrations.copilot_searches.services import catalog_snapshots  # noqa: E402
+
+COMMON = {
+    "description": "",
+    "modified_time": "2024-01-01",
+    "created_time": "2020-01-01",
+    "url": "https://attack.mitre.org",
+    "source": "mitre",
+}
+
+TACTICS = [
+    {**COMMON, "id": "x-mitre-tactic--exec", "external_id": "TA0002", "name": "Execution", "short_name": "execution", "techniques": []},
+    {
+        **COMMON,
+        "id": "x-mitre-tactic--cred",
+        "external_id": "TA0006",
+        "name": "Credential Access",
+        "short_name": "credential-access",
+        "techniques": [],
+    },
+]
+TECHNIQUES = [
+    {
+        **COMMON,
+        "id": "attack-pattern--csi",
+        "external_id": "T1059",
+        "name": "Command and Scripting Interpreter",
+        "tactics": ["x-mitre-tactic--exec"],
+    },
+    {
+        **COMMON,
+        "id": "attack-pattern--ps",
+        "external_id": "T1059.001",
+        "name": "PowerShell",
+        "tactics": ["x-mitre-tactic--exec"],
+        "subtechnique_of": "attack-pattern--csi",
+    },
+    {**COMMON, "id": "attack-pattern--osc", "external_id": "T1003", "name": "OS Credential Dumping", "tactics": ["x-mitre-tactic--cred"]},
+    {
+        **COMMON,
+        "id": "attack-pattern--lsass",
+        "external_id": "T1003.001",
+        "name": "LSASS Memory",
+        "tactics": ["x-mitre-tactic--cred", "x-mitre-tactic--gone"],
+        "subtechnique_of": "attack-pattern--osc",
+    },
+    {**COMMON, "id": "attack-pattern--shell", "external_id": "T1059.004", "name": "Unix Shell", "tactics": ["x-mitre-tactic--exec"]},
+]
+GROUPS = [{**COMMON, "id": "intrusion-set--apt29", "external_id": "G0016", "name": "APT29", "techniques": ["attack-pattern--ps"]}]
+SOFTWARE = [{**COMMON, "id": "tool--mimikatz", "external_id": "S0002", "name": "Mimikatz", "techniques": ["attack-pattern--lsass"]}]
+MITIGATIONS = [
+    {
+        **COMMON,
+        "id": "course-of-action--ep",
+        "external_id": "M1042",
+        "name": "Disable or Remove Feature",
+        "techniques": ["attack-pattern--ps"],
+    },
+]
+
+
+@pytest.fixture
+def wazuh(monkeypatch, tmp_path):
+    """Fake ``get_mitre_*`` fetchers paging the data above, recording each call."""
+    monkeypatch.setattr(catalog_snapshots, "SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(reference, "PAGE_SIZE", 2)
+    state = SimpleNamespace(calls=[], down=False)
+
+    def fetcher(kind, items, response):
+        async def fetch(limit=None, offset=None, select=None, sort=None, search=None, q=None):
+            state.calls.append((kind, limit, offset))
+            if state.down:
+                raise HTTPException(status_code=500, detail="Wazuh Manager is not reachable")
+            return response(success=True, message="ok", results=items[offset : offset + limit])
+
+        return fetch
+
+    monkeypatch.setattr(mitre_service, "get_mitre_tactics", fetcher("tactics", TACTICS, WazuhMitreTacticsResponse))
+    monkeypatch.setattr(mitre_service, "get_mitre_techniques", fetcher("techniques", TECHNIQUES, WazuhMitreTechniquesResponse))
+    monkeypatch.setattr(mitre_service, "get_mitre_groups", fetcher("groups", GROUPS, WazuhMitreGroupsResponse))
+    monkeypatch.setattr(mitre_service, "get_mitre_software", fetcher("software", SOFTWARE, WazuhMitreSoftwareResponse))
+    monkeypatch.setattr(mitre_service, "get_mitre_mitigations", fetcher("mitigations", MITIGATIONS, WazuhMitreMitigationsResponse))
+
+    cache = reference.MitreReferenceCache()
+    monkeypatch.setattr(reference, "mitre_reference_cache", cache)
+    monkeypatch.setattr(mitre_service, "mitre_reference_cache", cache)
+    state.cache = cache
+    return state
+
+
+def test_mappings_are_built_once_and_resolve_every_id_spelling(wazuh):
+    async def lookups():
+        names = await mitre_service._build_technique_id_name_mapping()
+        tactics = await mitre_service._build_technique_tactic_mapping()
+        for _ in range(3):
+            await mitre_service._build_technique_id_name_mapping()
+            await mitre_service._build_technique_tactic_mapping()
+        return names, tactics
+
+    names, tactics = asyncio.run(lookups())
+
+    # Each endpoint paged through once (PAGE_SIZE=2), none of them again.
+    assert [offset for kind, _, offset in wazuh.calls if kind == "techniques"] == [0, 2, 4]
+    assert len(wazuh.calls) == len(set(wazuh.calls)) == 3 + 2 + 1 + 1 + 1
+    assert names["T1059.001"] == names["1059.001"] == names["attack-pattern--ps"] == "PowerShell"
+    assert tactics["T1003.001"] == [
+        {"id": "x-mitre-tactic--cred", "name": "Credential Access", "short_name": "credential-access"},
+        {"id": "x-mitre-tactic--gone", "name": "Unknown", "short_name": ""},
+    ]
+    assert tactics["1059"] is tactics["attack-pattern--csi"]
+
+    cache = wazuh.cache
+    assert cache.technique("t1059.001") == {
+        "id": "T1059.001",
+        "name": "PowerShell",
+        "tactics": ["Execution"],
+        "parent": "T1059",
+        "groups": ["G0016"],
+        "software": [],
+        "mitigations": ["M1042"],
+    }
+    assert cache.parent_of("T1003.001") == "T1003" and cache.technique("attack-pattern--lsass")["software"] == ["S0002"]
+    assert cache.names_for({"T1059.001", "T1003", "T9999"}) == ["OS Credential Dumping", "PowerShell"]
+
+
+def test_unfiltered_listings_are_paged_from_the_cache_and_filtered_ones_go_to_wazuh(wazuh):
+    asyncio.run(wazuh.cache.refresh())
+    wazuh.calls.clear()
+
+    first = asyncio.run(reference.cached_page("techniques", None, None, None, None, None, None))
+    middle = asyncio.run(reference.cached_page("techniques", 2, 1, None, None, None, None))
+    filtered = asyncio.run(reference.cached_page("techniques", 2, 1, None, None, "powershell", None))
+
+    assert [t["external_id"] for t in first[0]] == [t["external_id"] for t in TECHNIQUES] and first[1] == 5
+    assert [t["external_id"] for t in middle[0]] == ["T1059.001", "T1003"]
+    assert filtered is None
+    assert wazuh.calls == []
+
+
+def test_a_restart_restores_the_snapshot_without_calling_wazuh(wazuh):
+    asyncio.run(wazuh.cache.refresh())
+    wazuh.calls.clear()
+
+    restarted = reference.MitreReferenceCache()
+    asyncio.run(restarted.ensure_loaded())
+
+    assert wazuh.calls == []
+    assert restarted.technique_tactics() == wazuh.cache.technique_tactics()
+    assert restarted.technique("T1059.001") == wazuh.cache.technique("T1059.001")
+
+
+def test_an_outage_keeps_the_previous_data_and_is_not_retried_per_request(wazuh, monkeypatch):
+    wazuh.down = True
+
+    async def cold():
+        return [await mitre_service._build_technique_id_name_mapping() for _ in range(3)]
+
+    assert asyncio.run(cold()) == [{}, {}, {}]
+    assert len(wazuh.calls) == 1
+    assert wazuh.cache.unavailable_reason == "Wazuh Manager is not reachable"
+
+    wazuh.down = False
+    monkeypatch.setattr(reference, "RETRY_MINUTES", 0)
+    asyncio.run(wazuh.cache.ensure_loaded())
+    loaded = wazuh.cache.technique_names()
+
+    wazuh.down = True
+    asyncio.run(wazuh.cache.refresh())
+
+    assert wazuh.cache.technique_names() is loaded and wazuh.cache.stats()["failures"] == 2
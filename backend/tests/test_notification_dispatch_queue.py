@@ -0,0 +1,138 @@
+"""Notification emission goes through a bounded queue and a fixed worker pool.
+
+`emit` used to create a task per event, each with its own session, so an alert
+burst became thousands of concurrent dispatches competing with API requests for
+the connection pool. These tests pin the replacement: concurrency never exceeds
+the worker count, duplicates waiting in the queue are coalesced, a full queue
+drops rather than blocks, provider calls are capped per channel, and `drain`
+finishes the queue before shutdown.
+
+Run with: cd backend && python -m pytest tests/test_notification_dispatch_queue.py
+"""
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from app.middleware.performance import PerformanceRegistry  # noqa: E402
+from app.notifications.schema.events import NotificationEvent  # noqa: E402
+from app.notifications.schema.notifications import NotificationSeverity  # noqa: E402
+from app.notifications.schema.notifications import NotificationTrigger  # noqa: E402
+from app.notifications.services import channel_limits  # noqa: E402
+from app.notifications.services import emit as emit_module  # noqa: E402
+
+
+def _event(n, dedupe_key=None):
+    return NotificationEvent(
+        customer_code="SOC01",
+        trigger=NotificationTrigger.ALERT_CREATED,
+        severity=NotificationSeverity.HIGH,
+        subject=f"Alert {n}",
+        summary="Burst",
+        entity_id=n,
+        dedupe_key=dedupe_key or f"alert:{n}:alert_created",
+    )
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    state = SimpleNamespace(dispatched=[], in_flight=0, peak=0, registry=PerformanceRegistry())
+
+    async def run(event):
+        state.in_flight += 1
+        state.peak = max(state.peak, state.in_flight)
+        await asyncio.sleep(0.005)
+        state.in_flight -= 1
+        state.dispatched.append(event.entity_id)
+
+    monkeypatch.setattr(emit_module, "_run", run)
+    monkeypatch.setattr(emit_module, "WORKERS", 3)
+    monkeypatch.setattr(emit_module, "performance_registry", state.registry)
+    monkeypatch.setattr(emit_module, "_queue", None)
+    monkeypatch.setattr(emit_module, "_queue_loop", None)
+    monkeypatch.setattr(emit_module, "_workers", [])
+    monkeypatch.setattr(emit_module, "_queued_keys", set())
+    monkeypatch.setattr(emit_module, "_accepting", True)
+    for counter in ("_enqueued", "_coalesced", "_dropped", "_processed", "_max_depth"):
+        monkeypatch.setattr(emit_module, counter, 0)
+    return state
+
+
+def test_a_burst_is_drained_by_a_fixed_number_of_workers(queue):
+    async def scenario():
+        for n in range(40):
+            emit_module.emit(_event(n))
+        await emit_module.drain()
+
+    asyncio.run(scenario())
+
+    assert sorted(queue.dispatched) == list(range(40))
+    assert queue.peak == 3
+    stats = emit_module.stats()
+    assert stats["processed"] == 40 and stats["max_depth"] >= 37
+    stages = {stage.stage: stage for stage in queue.registry.stages}
+    assert stages["queued"].items == stages["dispatch"].items == 40
+
+
+def test_a_duplicate_waiting_in_the_queue_is_coalesced(queue):
+    async def scenario():
+        emit_module.emit(_event(1))
+        emit_module.emit(_event(1))
+        emit_module.emit(_event(2))
+        await emit_module.drain()
+
+    asyncio.run(scenario())
+
+    assert sorted(queue.dispatched) == [1, 2]
+    assert emit_module.stats()["coalesced"] == 1
+
+
+def test_a_full_queue_drops_instead_of_blocking(queue, monkeypatch):
+    monkeypatch.setattr(emit_module, "QUEUE_SIZE", 5)
+
+    async def scenario():
+        for n in range(8):
+            emit_module.emit(_event(n))
+        await emit_module.drain()
+
+    asyncio.run(scenario())
+
+    assert len(queue.dispatched) == 5
+    assert emit_module.stats()["dropped"] == 3
+
+
+def test_emits_after_drain_are_refused(queue):
+    async def scenario():
+        emit_module.emit(_event(1))
+        await emit_module.drain()
+        emit_module.emit(_event(2))
+        await asyncio.sleep(0.02)
+
+    asyncio.run(scenario())
+
+    assert queue.dispatched == [1]
+
+
+def test_provider_calls_are_capped_per_channel(monkeypatch):
+    monkeypatch.setenv("NOTIFICATION_CHANNEL_CONCURRENCY_RESEND", "2")
+    peak = {"resend": 0, "webhook": 0}
+    current = {"resend": 0, "webhook": 0}
+
+    async def send(channel):
+        async with channel_limits.channel_slot(channel):
+            current[channel] += 1
+            peak[channel] = max(peak[channel], current[channel])
+            await asyncio.sleep(0.005)
+            current[channel] -= 1
+
+    async def scenario():
+        await asyncio.gather(*(send("resend") for _ in range(6)), *(send("webhook") for _ in range(6)))
+
+    asyncio.run(scenario())
+
+    assert peak == {"resend": 2, "webhook": 6}
+    assert channel_limits.stats()["resend"]["limit"] == 2
@@ -232,3 +232,50 @@ def test_render_json_rejects_output_that_is_not_valid_json():
 def test_render_json_accepts_a_correctly_quoted_template():
     out = rendering.render_json('{"text": {{ summary | tojson }}}', _event())
     assert '"text"' in out
+
+
+# ── compiled-template cache ───────────────────────────────────────────────
+
+
+def test_a_template_is_compiled_once_across_sends(monkeypatch):
+    """Every event × route used to re-parse the same source."""
+    rendering.clear_template_cache()
+    compiles = []
+    real = rendering._ENV.from_string
+    monkeypatch.setattr(rendering._ENV, "from_string", lambda source: compiles.append(source) or real(source))
+
+    rendering.compile_template("{{ summary }} ({{ severity }})")
+    for n in range(5):
+        _render("{{ summary }} ({{ severity }})", _event(summary=f"event {n}"))
+    rendering.render_json('{"text": {{ summary | tojson }}}', _event())
+
+    assert len(compiles) == 2
+    assert rendering.template_cache_stats()["hits"] == 5
+
+
+def test_autoescape_is_part_of_the_cache_key():
+    rendering.clear_template_cache()
+    plain = _render("{{ summary }}", _event(summary="a & b"))
+    escaped = _render("{{ summary }}", _event(summary="a & b"), autoescape=True)
+
+    assert (plain, escaped) == ("a & b", "a &amp; b")
+    assert rendering.template_cache_stats()["size"] == 2
+
+
+def test_a_template_that_fails_to_compile_is_not_cached():
+    rendering.clear_template_cache()
+    for _ in range(2):
+        with pytest.raises(TemplateError):
+            rendering.compile_template("{% if %}")
+
+    assert rendering.template_cache_stats() == {"size": 0, "max_size": rendering.TEMPLATE_CACHE_SIZE, "hits": 0, "misses": 2}
+
+
+def test_the_cache_evicts_the_least_recently_used(monkeypatch):
+    rendering.clear_template_cache()
+    monkeypatch.setattr(rendering, "TEMPLATE_CACHE_SIZE", 2)
+    for source in ("{{ summary }}", "{{ severity }}", "{{ summary }}", "{{ actor }}"):
+        rendering.compile_template(source)
+
+    rendering.compile_template("{{ summary }}")
+    assert rendering.template_cache_stats()["hits"] == 2, "the recently used entry must survive eviction"
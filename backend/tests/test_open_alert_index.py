@@ -0,0 +1,171 @@
+"""Ingest finds the customer's open alert by an indexed key, not a table scan.
+
+`open_alert_exists` used to filter `incident_management_alert` on customer_code,
+the TEXT alert_name and status, none of them indexed, once per ingested event.
+These tests pin what replaced that: new alerts carry the hashed dedup key the
+migration backfills, the lookup goes through the (dedup_key, status) index and
+still matches the title exactly, and the in-process map of open alerts is
+confirmed by primary key and dropped when an alert is closed or deleted — here
+or by another worker.
+
+Run with: cd backend && python -m pytest tests/test_open_alert_index.py
+"""
+
+import asyncio
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy import update  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from app.incidents import models  # noqa: E402
+from app.incidents.models import Alert  # noqa: E402
+from app.incidents.schema.db_operations import AlertStatus  # noqa: E402
+from app.incidents.schema.db_operations import UpdateAlertStatus  # noqa: E402
+from app.incidents.schema.incident_alert import CreatedAlertPayload  # noqa: E402
+from app.incidents.services import db_operations  # noqa: E402
+from app.incidents.services import incident_alert  # noqa: E402
+from app.incidents.services import open_alert_index  # noqa: E402
+
+# The alert and what `delete_alert` clears out along with it.
+TABLES = [
+    model.__table__
+    for model in (
+        models.Alert,
+        models.AlertContext,
+        models.Asset,
+        models.Comment,
+        models.AlertTag,
+        models.AlertToTag,
+        models.IoC,
+        models.AlertToIoC,
+        models.ThresholdAlertMetadata,
+        models.CaseTask,
+    )
+]
+MIGRATION = Path(__file__).resolve().parents[1] / "alembic" / "versions" / "d7a3f1c9e2b4_add_alert_dedup_key.py"
+
+
+def _payload(title):
+    return CreatedAlertPayload(
+        alert_context_payload={},
+        asset_payload="host-1",
+        timefield_payload="timestamp",
+        alert_title_payload=title,
+        source="wazuh",
+    )
+
+
+@pytest.fixture
+def db():
+    engine = create_async_engine("sqlite+aiosqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda c: SQLModel.metadata.create_all(c, tables=TABLES))
+
+    asyncio.run(create())
+    open_alert_index.clear()
+    open_alert_index.reset_stats()
+    yield engine, statements
+    open_alert_index.clear()
+    open_alert_index.reset_stats()
+
+
+def _run(engine, work):
+    async def go():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            return await work(session)
+
+    return asyncio.run(go())
+
+
+def test_the_lookup_uses_the_dedup_index_and_matches_the_title_exactly(db):
+    engine, statements = db
+
+    async def create(session):
+        first = await incident_alert.create_alert_in_copilot(_payload("Brute  force on SSH"), "SOC01", session)
+        await incident_alert.create_alert_in_copilot(_payload("Brute force on SSH"), "SOC02", session)
+        return first
+
+    first = _run(engine, create)
+    open_alert_index.clear()
+    statements.clear()
+
+    found = _run(engine, lambda s: incident_alert.open_alert_exists(_payload("Brute  force on SSH"), "SOC01", s))
+    lookup = statements[-1]
+    # Same normalised key, different exact title: the residual filter keeps the old semantics.
+    variant = _run(engine, lambda s: incident_alert.open_alert_exists(_payload("brute force on ssh"), "SOC01", s))
+
+    async def plan(session):
+        params = {
+            "dedup_key": open_alert_index.alert_dedup_key("SOC01", "Brute force on SSH"),
+            "customer_code": "SOC01",
+            "alert_name": "Brute force on SSH",
+        }
+        query = (
+            "EXPLAIN QUERY PLAN SELECT id FROM incident_management_alert "
+            "WHERE dedup_key = :dedup_key AND status = 'OPEN' AND customer_code = :customer_code AND alert_name = :alert_name"
+        )
+        return " ".join(str(row) for row in (await session.execute(text(query), params)).all())
+
+    assert first.dedup_key == open_alert_index.alert_dedup_key("SOC01", "brute force ON ssh ")
+    assert found == first.id and variant is None
+    assert "dedup_key" in lookup
+    assert "SEARCH incident_management_alert USING INDEX" in _run(engine, plan)
+
+
+def test_open_alerts_are_remembered_and_forgotten_when_closed_or_deleted(db):
+    engine, statements = db
+    created = _run(engine, lambda s: incident_alert.create_alert_in_copilot(_payload("Malware detected"), "SOC01", s))
+
+    statements.clear()
+    assert _run(engine, lambda s: open_alert_index.find_open_alert("SOC01", "Malware detected", s)) == created.id
+    assert len(statements) == 1 and "dedup_key" not in statements[0]
+    assert open_alert_index.stats()["hits"] == 1
+
+    _run(engine, lambda s: db_operations.update_alert_status(UpdateAlertStatus(alert_id=created.id, status=AlertStatus.CLOSED), s))
+    assert open_alert_index.stats()["size"] == 0
+    assert _run(engine, lambda s: open_alert_index.find_open_alert("SOC01", "Malware detected", s)) is None
+
+    reopened = _run(engine, lambda s: incident_alert.create_alert_in_copilot(_payload("Malware detected"), "SOC01", s))
+    _run(engine, lambda s: db_operations.delete_alert(reopened.id, s))
+    assert open_alert_index.stats()["size"] == 0
+
+
+def test_an_alert_closed_by_another_worker_is_not_reused(db):
+    engine, _ = db
+    created = _run(engine, lambda s: incident_alert.create_alert_in_copilot(_payload("Port scan"), "SOC01", s))
+
+    async def close_elsewhere(session):
+        await session.execute(update(Alert).where(Alert.id == created.id).values(status="CLOSED"))
+        await session.commit()
+
+    _run(engine, close_elsewhere)
+
+    assert _run(engine, lambda s: open_alert_index.find_open_alert("SOC01", "Port scan", s)) is None
+    assert open_alert_index.stats()["stale"] == 1 and open_alert_index.stats()["size"] == 0
+
+
+def test_the_migration_backfills_the_same_key(db):
+    spec = importlib.util.spec_from_file_location("alert_dedup_key_migration", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    for customer_code, title in [("SOC01", "Brute force"), ("SOC01", "  Brute\tFORCE "), ("SOC02", ""), ("SOC03", None)]:
+        assert migration._dedup_key(customer_code, title) == open_alert_index.alert_dedup_key(customer_code, title)
@@ -0,0 +1,129 @@
+"""Palace consolidation finds near-duplicate lessons through a MinHash-LSH index.
+
+`_find_duplicate_pairs` used to run `SequenceMatcher` over every pair of
+lessons in a room. These tests pin the replacement: large rooms only score
+LSH candidates yet find the same pairs as the exhaustive scan, small rooms are
+still compared exhaustively, signatures are computed once per lesson, and the
+index follows lessons as they are queued, retired, or edited.
+
+Run with: cd backend && python -m pytest tests/test_palace_lesson_index.py
+"""
+
+import asyncio
+import os
+import random
+import string
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from app.ai_analyst.services import ai_analyst  # noqa: E402
+from app.ai_analyst.services import lesson_index  # noqa: E402
+
+
+def _lessons(count, duplicates, seed=7):
+    """``count`` lessons of random words, then ``duplicates`` two-word edits of earlier ones."""
+    rng = random.Random(seed)
+    words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))) for _ in range(400)]
+    texts = [" ".join(rng.choice(words) for _ in range(rng.randint(10, 20))) for _ in range(count)]
+    for _ in range(duplicates):
+        edited = rng.choice(texts[:count]).split()
+        for _ in range(2):
+            edited[rng.randrange(len(edited))] = rng.choice(words)
+        texts.append(" ".join(edited).upper() if rng.random() < 0.3 else " ".join(edited))
+    return [(lesson_id, text) for lesson_id, text in enumerate(texts, start=1)]
+
+
+def _exhaustive(lessons, threshold):
+    texts = [lesson_index.normalize(text) for _, text in lessons]
+    return lesson_index.score_pairs(texts, lesson_index.all_pairs(len(texts)), threshold)
+
+
+@pytest.fixture(autouse=True)
+def fresh_index():
+    lesson_index.clear()
+    lesson_index.reset_stats()
+    yield
+    lesson_index.clear()
+
+
+def test_large_room_scores_only_candidates_and_matches_the_exhaustive_scan(monkeypatch):
+    # A smaller cut-over keeps the exhaustive reference scan quick.
+    monkeypatch.setattr(lesson_index, "PAIRWISE_MAX_LESSONS", 50)
+    lessons = _lessons(160, 20)
+    threshold = ai_analyst._DUPLICATE_SIMILARITY_THRESHOLD
+    expected = _exhaustive(lessons, threshold)
+    lesson_index.reset_stats()
+
+    found = asyncio.run(lesson_index.similar_pairs("acme", "fp_pattern", lessons, threshold))
+
+    assert len(expected) >= 20
+    assert sorted(found) == sorted(expected)
+    all_pairs = len(lessons) * (len(lessons) - 1) // 2
+    assert lesson_index.stats()["candidates_checked"] < all_pairs // 10
+
+
+def test_signatures_agree_in_proportion_to_shingle_overlap():
+    # A regression guard for the permutations: with too narrow a multiplier the
+    # shingle with the smallest crc32 wins every row and similar texts never collide.
+    a = "printer spooler alerts on host prn-01 are benign and can be closed"
+    b = "printer spooler alerts on host prn-07 are benign and can be closed"
+    shingles_a, shingles_b = lesson_index._shingles(a), lesson_index._shingles(b)
+    jaccard = len(shingles_a & shingles_b) / len(shingles_a | shingles_b)
+
+    agreement = (lesson_index.signature(a) == lesson_index.signature(b)).mean()
+
+    assert abs(agreement - jaccard) < 0.15
+
+
+def test_small_rooms_are_compared_exhaustively():
+    lessons = _lessons(40, 5)
+    expected = _exhaustive(lessons, 0.7)
+    lesson_index.reset_stats()
+
+    found = asyncio.run(lesson_index.similar_pairs("acme", "fp_pattern", lessons, 0.7))
+
+    assert sorted(found) == sorted(expected)
+    assert lesson_index.stats()["candidates_checked"] == 45 * 44 // 2
+
+
+def test_signatures_are_kept_and_the_index_follows_active_lessons():
+    lessons = _lessons(300, 10)
+    asyncio.run(lesson_index.similar_pairs("acme", "fp_pattern", lessons, 0.7))
+    assert lesson_index.stats()["signatures_computed"] == 310
+
+    # Queued in this process: indexed on the spot. Retired: dropped.
+    lesson_index.add("acme", "fp_pattern", 999, "  A brand new lesson about VPN logins ")
+    lesson_index.discard(1)
+    assert lesson_index.stats()["signatures_computed"] == 311
+
+    # The next consolidation only signs lessons it has not seen (or that were
+    # edited) and drops those no longer in the active set.
+    edited = [(2, "rewritten entirely")] + lessons[2:-1] + [(999, "a brand new lesson about vpn logins")]
+    asyncio.run(lesson_index.similar_pairs("acme", "fp_pattern", edited, 0.7))
+
+    assert lesson_index.stats()["signatures_computed"] == 312
+    assert lesson_index.stats()["lessons"] == len(edited)
+    assert lesson_index._rooms[("acme", "fp_pattern")][2][0] == "rewritten entirely"
+    assert lessons[-1][0] not in lesson_index._rooms[("acme", "fp_pattern")]
+
+
+def test_find_duplicate_pairs_stays_within_rooms_and_sorts_by_similarity():
+    def lesson(lesson_id, room, text):
+        return SimpleNamespace(id=lesson_id, lesson_type=room, lesson_text=text)
+
+    lessons = [
+        lesson(1, "fp_pattern", "Printer spooler alerts on host PRN-01 are benign"),
+        lesson(2, "fp_pattern", "printer spooler alerts on host PRN-02 are benign"),
+        lesson(3, "fp_pattern", "Unrelated lesson about VPN geolocation"),
+        lesson(4, "fp_pattern", "printer spooler alerts on PRN-01 are benign noise"),
+        lesson(5, "escalation", "Printer spooler alerts on host PRN-01 are benign"),
+    ]
+
+    pairs = asyncio.run(ai_analyst._find_duplicate_pairs("acme", lessons))
+
+    assert {(p.lesson_a_id, p.lesson_b_id) for p in pairs} == {(1, 2), (1, 4), (2, 4)}
+    assert all(p.room == "fp_pattern" for p in pairs)
+    assert [p.similarity for p in pairs] == sorted((p.similarity for p in pairs), reverse=True)
@@ -0,0 +1,97 @@
+"""PDF reports render on a dedicated, bounded worker pool.
+
+Customer reports used to draw their charts and render their template on the
+event loop and wait on wkhtmltopdf inside the API process, so a month-end batch
+pinned the whole API. These tests pin the pool: work really runs in a spawned
+worker process, no more than `WORKERS` jobs run at once, a full queue refuses
+rather than grows, and a failing job surfaces its own exception.
+
+Run with: cd backend && python -m pytest tests/test_report_render_pool.py
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from app.incidents.services import report_render_pool as pool  # noqa: E402
+from app.incidents.services.customer_report_charts import render_charts  # noqa: E402
+from app.middleware.performance import PerformanceRegistry  # noqa: E402
+
+
+@pytest.fixture
+def fresh_pool(monkeypatch):
+    registry = PerformanceRegistry()
+    monkeypatch.setattr(pool, "performance_registry", registry)
+    monkeypatch.setattr(pool, "_executor", None)
+    monkeypatch.setattr(pool, "_slots", {})
+    for counter in ("_waiting", "_running", "_submitted", "_completed", "_failed", "_rejected", "_max_waiting"):
+        monkeypatch.setattr(pool, counter, 0)
+    return registry
+
+
+def test_charts_render_in_a_spawned_worker_process(fresh_pool, monkeypatch):
+    monkeypatch.setattr(pool, "WORKERS", 1)
+    specs = {"status": ("donut", [[("OPEN", 3), ("CLOSED", 5)]], {"status_aware": True}), "trend": None}
+
+    async def scenario():
+        try:
+            return await pool.submit(render_charts, specs), await pool.submit(os.getpid)
+        finally:
+            await pool.shutdown()
+
+    charts, worker_pid = asyncio.run(scenario())
+
+    assert charts["status"].startswith("data:image/png;base64,") and charts["trend"] is None
+    assert worker_pid != os.getpid()
+    assert pool.stats()["completed"] == 2
+
+
+def test_concurrency_is_capped_and_excess_jobs_are_refused(fresh_pool, monkeypatch):
+    monkeypatch.setattr(pool, "WORKERS", 2)
+    monkeypatch.setattr(pool, "QUEUE_SIZE", 3)
+    threads = ThreadPoolExecutor(max_workers=8)
+    monkeypatch.setattr(pool, "_get_executor", lambda: threads)
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def render(n):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.02)
+        with lock:
+            state["running"] -= 1
+        return n
+
+    async def scenario():
+        return await asyncio.gather(*(pool.submit(render, n) for n in range(6)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    threads.shutdown()
+
+    assert results[:5] == [0, 1, 2, 3, 4]
+    assert isinstance(results[5], pool.RenderQueueFull)
+    assert state["peak"] == 2
+    stats = pool.stats()
+    assert (stats["completed"], stats["rejected"], stats["max_depth"], stats["depth"]) == (5, 1, 3, 0)
+    stages = {stage.stage: stage for stage in fresh_pool.stages}
+    assert stages["queued"].runs == stages["render"].runs == 5
+
+
+def test_a_failing_job_raises_its_own_error(fresh_pool, monkeypatch):
+    monkeypatch.setattr(pool, "WORKERS", 0)
+
+    def render():
+        raise ValueError("template syntax error")
+
+    with pytest.raises(ValueError, match="template syntax error"):
+        asyncio.run(pool.submit(render))
+
+    assert pool.stats()["failed"] == 1
+    assert fresh_pool.stages[-1].failures == 1
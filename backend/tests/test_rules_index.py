@@ -0,0 +1,133 @@
+"""The detection rules list filters through posting lists, not a scan per request.
+
+`filter_rules` used to walk every cached rule dict for each request and
+`get_rules_list` re-sorted the result by name every time. These tests pin the
+replacement: for every combination of filters the index returns exactly the
+rules the old scan matched, in the order the old sort produced, and text search
+only substring-checks rules that share a word with the query.
+
+Run with: cd backend && python -m pytest tests/test_rules_index.py
+"""
+
+import asyncio
+import itertools
+import os
+import random
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+import app.integrations.copilot_searches.services.copilot_searches as searches  # noqa: E402
+from app.integrations.copilot_searches.schema.copilot_searches import (  # noqa: E402
+    PlatformFilter,
+)
+from app.integrations.copilot_searches.schema.copilot_searches import (  # noqa: E402
+    RuleSeverity,
+)
+from app.integrations.copilot_searches.schema.copilot_searches import (  # noqa: E402
+    RuleStatus,
+)
+
+WORDS = "suspicious powershell encoded command lsass access sudo shell mailbox rule forwarding kerberos ticket".split()
+
+
+def _scan(rules, platform=PlatformFilter.ALL, category=None, status=None, severity=None, mitre_id=None, search=None, has_graylog=None):
+    """The filter and sort the index replaced."""
+    results = []
+    for rule in rules:
+        if platform != PlatformFilter.ALL and rule.get("_platform", "unknown") != platform.value:
+            continue
+        if category is not None and (rule.get("_category") or searches.UNCATEGORIZED).lower() != category.lower():
+            continue
+        if status is not None and rule.get("status", "").lower() != status.value:
+            continue
+        if severity is not None and rule.get("response", {}).get("severity", "").lower() != severity.value:
+            continue
+        if mitre_id is not None and not any(mitre_id.upper() in m.upper() for m in rule.get("tags", {}).get("mitre_attack_id", [])):
+            continue
+        if (
+            search is not None
+            and search.lower() not in rule.get("name", "").lower()
+            and search.lower() not in rule.get("description", "").lower()
+        ):
+            continue
+        if has_graylog is not None and rule.get("_has_graylog", False) != has_graylog:
+            continue
+        results.append(rule)
+    results.sort(key=lambda r: r.get("name", "").lower())
+    return results
+
+
+def _rules(count, seed=11):
+    rng = random.Random(seed)
+    rules = []
+    for n in range(count):
+        rule = {
+            "id": f"rule-{n}",
+            # Repeated names check that ties keep the cache's order.
+            "name": " ".join(rng.sample(WORDS, 2)).title() if n % 7 else "Duplicate Name",
+            "description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 6))) + rng.choice(["", " (T1003)", "-linux"]),
+            "status": rng.choice(["production", "Experimental", "deprecated", ""]),
+            "_platform": rng.choice(["windows", "linux", "powershell", "office365"]),
+            "_category": rng.choice(["Entra_id", "auditd", "eid_4104_script_block_logging", None]),
+            "_has_graylog": rng.random() < 0.5,
+            "tags": {"mitre_attack_id": rng.sample(["T1003", "T1003.001", "T1059.001", "T1098", "T1558.003"], rng.randint(0, 2))},
+        }
+        if rng.random() < 0.8:
+            rule["response"] = {"severity": rng.choice(["Low", "medium", "HIGH", "critical"])}
+        rules.append(rule)
+    return rules
+
+
+def _cache(rules):
+    cache = searches.RulesCache()
+    cache._files = {f"detections/x/{rule['id']}.yaml": {"sha": rule["id"], "rule": rule} for rule in rules}
+    cache._rebuild_indexes()
+    return cache
+
+
+def test_every_filter_combination_matches_the_linear_scan():
+    rules = _rules(400)
+    cache = _cache(rules)
+    ordered = list(cache._rules.values())
+    options = {
+        "platform": [PlatformFilter.ALL, PlatformFilter.WINDOWS, PlatformFilter.LINUX],
+        "category": [None, "entra_id", "uncategorized"],
+        "status": [None, RuleStatus.EXPERIMENTAL],
+        "severity": [None, RuleSeverity.HIGH],
+        "mitre_id": [None, "t1003", "1059", "T9999"],
+        "search": [None, "", "shell", "ERSHELL ENC", "(t1003", "-"],
+        "has_graylog": [None, True],
+    }
+
+    for values in itertools.product(*options.values()):
+        criteria = dict(zip(options, values))
+        assert cache.filter_rules(**criteria) == _scan(ordered, **criteria), criteria
+
+
+def test_text_search_only_checks_rules_sharing_a_word():
+    cache = _cache(_rules(400))
+    index = cache._index
+    checked = []
+
+    class Recording(list):
+        def __getitem__(self, position):
+            checked.append(position)
+            return list.__getitem__(self, position)
+
+    index.names = Recording(index.names)
+
+    found = cache.filter_rules(search="mailbox rule")
+
+    assert found and len(set(checked)) < len(index.ordered) // 2
+
+
+def test_rules_list_pages_the_presorted_result(monkeypatch):
+    cache = _cache(_rules(60))
+    monkeypatch.setattr(searches, "rules_cache", cache)
+    monkeypatch.setattr(cache, "_last_refresh", searches.datetime.utcnow())
+
+    page = asyncio.run(searches.get_rules_list(platform=PlatformFilter.LINUX, skip=5, limit=10))
+
+    expected = _scan(list(cache._rules.values()), platform=PlatformFilter.LINUX)
+    assert page["filtered"] == len(expected)
+    assert [rule.id for rule in page["rules"]] == [rule["id"] for rule in expected[5:15]]
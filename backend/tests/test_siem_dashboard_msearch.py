@@ -0,0 +1,164 @@
+"""SIEM dashboard panels run as one `_msearch`, with short-lived shared results.
+
+`execute_panels` used to search once per panel, serially, for every viewer, and
+found out a terms field was `text` by failing the search and retrying it with
+`.keyword`. These tests pin the replacement: one round-trip per dashboard, the
+`.keyword` decision made up front from cached field types, a failing panel
+still isolated from the rest, and concurrent viewers sharing one execution.
+
+Run with: cd backend && python -m pytest tests/test_siem_dashboard_msearch.py
+"""
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from app.siem.services import dashboards  # noqa: E402
+from app.siem.services import panel_cache  # noqa: E402
+
+TEXT_FIELD_ERROR = {
+    "type": "search_phase_execution_exception",
+    "reason": "all shards failed",
+    "caused_by": {"type": "illegal_argument_exception", "reason": "Text fields are not optimised for operations ..."},
+}
+
+PANELS = [
+    {"id": "total", "type": "stat"},
+    {"id": "over_time", "type": "histogram"},
+    {"id": "top_users", "type": "pie", "field": "user.name"},
+    {"id": "latest", "type": "table", "fields": ["user.name", "event.action"]},
+    {"id": "broken", "type": "bar_h"},
+]
+
+
+def _response(body):
+    if "aggs" in body and "over_time" in body["aggs"]:
+        return {"aggregations": {"over_time": {"buckets": [{"key_as_string": "10:00", "doc_count": 4}]}}}
+    if "aggs" in body:
+        return {"aggregations": {"top_values": {"buckets": [{"key": "alice", "doc_count": 3}]}}}
+    hits = [{"_source": {"user": {"name": "alice"}, "event.action": "logon"}}] if body["size"] else []
+    return {"hits": {"total": {"value": 7}, "hits": hits}}
+
+
+@pytest.fixture
+def indexer(monkeypatch):
+    state = SimpleNamespace(msearches=[], searches=[], field_caps=[], errors={}, mapping={"user.name": "text"})
+
+    class Client:
+        async def field_caps(self, index, fields):
+            state.field_caps.append(fields)
+            caps = {}
+            for name in fields.split(","):
+                base = name[: -len(".keyword")] if name.endswith(".keyword") else name
+                mapped = state.mapping.get(base)
+                if mapped:
+                    caps[name] = {"keyword": {}} if name.endswith(".keyword") else {mapped: {}}
+            return {"fields": caps}
+
+        async def msearch(self, body):
+            searches = body[1::2]
+            state.msearches.append(searches)
+            await asyncio.sleep(0.01)
+            return {
+                "responses": [
+                    {"error": state.errors[i], "status": 400} if i in state.errors else _response(b) for i, b in enumerate(searches)
+                ],
+            }
+
+        async def search(self, index, body):
+            state.searches.append(body)
+            return _response(body)
+
+        async def close(self):
+            pass
+
+    async def client(name="Wazuh-Indexer"):
+        return Client()
+
+    monkeypatch.setattr(dashboards, "create_wazuh_indexer_client_async", client)
+    panel_cache.clear()
+    panel_cache.reset_stats()
+    return state
+
+
+def _run(panels=PANELS, timerange="24h"):
+    return dashboards.execute_panels(panels=panels, index_pattern="wazuh-*", time_field="timestamp", timerange=timerange)
+
+
+def test_all_panels_go_in_one_msearch_with_keyword_decided_up_front(indexer):
+    results = asyncio.run(_run())
+
+    assert len(indexer.msearches) == 1 and len(indexer.msearches[0]) == 4
+    assert indexer.searches == []
+    terms = indexer.msearches[0][2]["aggs"]["top_values"]["terms"]
+    assert terms["field"] == "user.name.keyword"
+    assert results["total"].value == 7
+    assert results["over_time"].data == [4]
+    assert results["top_users"].labels == ["alice"]
+    assert results["latest"].rows == [{"user.name": "alice", "event.action": "logon"}]
+    assert results["broken"].error == "No field specified for aggregation"
+
+
+def test_a_failing_panel_does_not_fail_its_neighbours(indexer):
+    indexer.errors = {1: {"type": "search_phase_execution_exception", "root_cause": [{"reason": "bad interval"}]}, 3: {"type": "x"}}
+
+    results = asyncio.run(_run())
+
+    assert results["over_time"].error == "search_phase_execution_exception: bad interval"
+    assert results["total"].value == 7 and results["top_users"].labels == ["alice"]
+    # The table's failed sort is retried unsorted, on its own.
+    assert len(indexer.searches) == 1 and "sort" not in indexer.searches[0]
+    assert results["latest"].rows
+
+
+def test_a_stale_mapping_falls_back_to_keyword_and_is_remembered(indexer):
+    indexer.mapping = {"user.name": "keyword"}
+    indexer.errors = {2: TEXT_FIELD_ERROR}
+
+    results = asyncio.run(_run())
+    indexer.errors = {}
+    asyncio.run(_run(timerange="7d"))
+
+    assert results["top_users"].labels == ["alice"]
+    assert indexer.searches[0]["aggs"]["top_values"]["terms"]["field"] == "user.name.keyword"
+    assert indexer.msearches[1][2]["aggs"]["top_values"]["terms"]["field"] == "user.name.keyword"
+
+
+def test_concurrent_viewers_share_one_execution_and_field_types_are_cached(indexer):
+    async def scenario():
+        first = await asyncio.gather(*(_run() for _ in range(10)))
+        again = await _run()
+        other_range = await _run(timerange="7d")
+        return first, again, other_range
+
+    first, again, other_range = asyncio.run(scenario())
+
+    assert len(indexer.msearches) == 2
+    assert len(indexer.field_caps) == 1
+    assert all(result["total"].value == 7 for result in first) and again["total"].value == 7
+    assert other_range["total"].value == 7
+    stats = panel_cache.stats()
+    assert (stats["misses"], stats["shared_executions"], stats["hits"]) == (2, 9, 1)
+
+
+def test_an_indexer_outage_marks_every_panel_and_is_not_cached(indexer, monkeypatch):
+    async def down(self, body):
+        raise ConnectionError("indexer unreachable")
+
+    client = asyncio.run(dashboards.create_wazuh_indexer_client_async())
+    monkeypatch.setattr(type(client), "msearch", down)
+
+    results = asyncio.run(_run())
+    asyncio.run(_run())
+
+    assert panel_cache.stats()["misses"] == 2
+    assert {pid: result.error for pid, result in results.items() if pid != "broken"} == {
+        "total": "indexer unreachable",
+        "over_time": "indexer unreachable",
+        "top_users": "indexer unreachable",
+        "latest": "indexer unreachable",
+    }
@@ -0,0 +1,160 @@
+"""The SIEM events explorer pages with search_after cursors, not scroll contexts.
+
+Every explorer search used to open a five-minute scroll context, paged or not.
+These tests pin the replacement: the first page holds nothing open, a
+point-in-time is opened only once the analyst pages and closed on the last
+page, indexers without PIT (or a PIT that expired) page statelessly without
+losing or repeating events, cursors cannot be replayed against another source,
+and the NDJSON export walks the same cursor.
+
+Run with: cd backend && python -m pytest tests/test_siem_events_cursor.py
+"""
+
+import asyncio
+import base64
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+from elasticsearch7.exceptions import NotFoundError
+from fastapi import HTTPException
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from app.siem.schema.events import EventsQueryParams  # noqa: E402
+from app.siem.services import events  # noqa: E402
+from app.siem.services import events_cursor  # noqa: E402
+
+# 23 events; pairs share a timestamp so page boundaries fall inside ties.
+DOCS = [
+    {"_id": f"doc-{i:02d}", "_index": "wazuh-1", "_source": {"timestamp": 1000 - i // 2, "gl2_message_id": f"01J{i:02d}"}}
+    for i in range(23)
+]
+
+
+def _sort_key(doc):
+    return (-doc["_source"]["timestamp"], doc["_source"]["gl2_message_id"])
+
+
+@pytest.fixture
+def indexer(monkeypatch):
+    state = SimpleNamespace(searches=[], opened=[], closed=[], pit_support=True, expire=False)
+
+    class Transport:
+        async def perform_request(self, method, path, params=None, body=None):
+            if method == "POST":
+                if not state.pit_support:
+                    raise NotFoundError(404, "no handler found", {})
+                state.opened.append(path)
+                return {"pit_id": f"pit-{len(state.opened)}"}
+            state.closed.append(body)
+            return {}
+
+    class Client:
+        transport = Transport()
+
+        async def search(self, body, index=None):
+            state.searches.append({"index": index, **body})
+            if "pit" in body and state.expire:
+                raise NotFoundError(404, "search_context_missing_exception", {})
+            hits = sorted(DOCS, key=_sort_key)
+            if "search_after" in body:
+                after = (-body["search_after"][0], body["search_after"][1])
+                hits = [doc for doc in hits if _sort_key(doc) > after]
+            page = [{**doc, "sort": [doc["_source"]["timestamp"], doc["_source"]["gl2_message_id"]]} for doc in hits[: body["size"]]]
+            response = {"hits": {"total": {"value": len(DOCS), "relation": "eq"}, "hits": page}}
+            if "pit" in body:
+                response["pit_id"] = body["pit"]["id"]
+            return response
+
+        async def close(self):
+            pass
+
+    async def client(name="Wazuh-Indexer"):
+        return Client()
+
+    async def event_source(customer_code, source_name, db):
+        return SimpleNamespace(index_pattern=f"{customer_code}-*", time_field="timestamp")
+
+    monkeypatch.setattr(events, "create_wazuh_indexer_client_async", client)
+    monkeypatch.setattr(events, "get_event_source_by_customer_and_name", event_source)
+    events_cursor.reset_stats()
+    return state
+
+
+def _query(cursor=None, source="firewall", page_size=10):
+    params = EventsQueryParams(page_size=page_size, cursor=cursor)
+    return asyncio.run(events.query_events("acme", source, params, db=None))
+
+
+def _page_through(page_size=10):
+    pages = [_query(page_size=page_size)]
+    while pages[-1].cursor:
+        pages.append(_query(pages[-1].cursor, page_size=page_size))
+    return pages
+
+
+def test_first_page_holds_nothing_open_and_paging_opens_then_closes_one_pit(indexer):
+    pages = _page_through()
+
+    ids = [event["_id"] for page in pages for event in page.events]
+    assert ids == [doc["_id"] for doc in sorted(DOCS, key=_sort_key)]
+    assert [len(page.events) for page in pages] == [10, 10, 3]
+    assert all(page.scroll_id is None for page in pages)
+    first, *rest = indexer.searches
+    assert first["index"] == "acme-*" and "pit" not in first and "scroll" not in first
+    assert first["sort"] == [{"timestamp": {"order": "desc"}}, {"gl2_message_id": {"order": "asc", "unmapped_type": "keyword"}}]
+    assert all(search["pit"]["id"] == "pit-1" and search["index"] is None for search in rest)
+    assert indexer.opened == ["/acme-*/_search/point_in_time"]
+    assert indexer.closed == [{"pit_id": ["pit-1"]}]
+
+
+def test_a_single_page_result_opens_nothing(indexer):
+    pages = _page_through(page_size=50)
+
+    assert len(pages) == 1 and pages[0].cursor is None and len(pages[0].events) == 23
+    assert indexer.opened == [] and indexer.closed == []
+
+
+def test_indexers_without_pit_and_expired_pits_page_statelessly(indexer):
+    indexer.pit_support = False
+    without_pit = _page_through()
+    indexer.pit_support, indexer.expire = True, True
+    events_cursor.reset_stats()
+    expired = _page_through()
+
+    expected = [doc["_id"] for doc in sorted(DOCS, key=_sort_key)]
+    for pages in (without_pit, expired):
+        assert [event["_id"] for page in pages for event in page.events] == expected
+    assert events_cursor.stats()["pits_opened"] == 1
+    # The expired PIT is abandoned, not reopened, and nothing is left to close.
+    assert indexer.closed == []
+
+
+def test_cursors_are_bound_to_their_source_and_tamper_evident(indexer):
+    cursor = _query().cursor
+    encoded, mac = cursor.rsplit(".", 1)
+    state = json.loads(base64.urlsafe_b64decode(encoded))
+    state["body"]["query"] = {"match_all": {}}
+    forged = base64.urlsafe_b64encode(json.dumps(state).encode()).decode() + "." + mac
+
+    for bad, source in ((cursor, "dns"), (forged, "firewall"), ("not-a-cursor", "firewall")):
+        with pytest.raises(HTTPException) as raised:
+            _query(bad, source=source)
+        assert raised.value.status_code == 400
+
+
+def test_export_streams_ndjson_through_one_pit_and_honours_the_cap(indexer, monkeypatch):
+    monkeypatch.setattr(events, "EXPORT_PAGE_SIZE", 5)
+
+    async def collect():
+        stream = await events.export_events("acme", "firewall", EventsQueryParams(), db=None, max_events=12)
+        return b"".join([chunk async for chunk in stream])
+
+    lines = asyncio.run(collect()).decode().splitlines()
+
+    assert [json.loads(line)["_id"] for line in lines] == [doc["_id"] for doc in sorted(DOCS, key=_sort_key)][:12]
+    assert [search["size"] for search in indexer.searches] == [5, 5, 2]
+    assert indexer.opened == ["/acme-*/_search/point_in_time"]
+    assert indexer.closed == [{"pit_id": ["pit-1"]}]
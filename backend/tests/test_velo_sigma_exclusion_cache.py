@@ -0,0 +1,190 @@
+"""Velociraptor Sigma exclusions are compiled once and matched from memory.
+
+`check_exclusions` used to SELECT every enabled exclusion for every alert, rebuild
+each rule's regexes while walking all of them, and UPDATE `match_count` once per
+excluded alert. These tests pin the replacement: a burst costs one read, only
+exclusions for the alert's channel and rule are evaluated, writes through the
+service are visible to the very next alert, and match counts land in one UPDATE
+per exclusion when flushed.
+
+Run with: cd backend && python -m pytest tests/test_velo_sigma_exclusion_cache.py
+"""
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from app.incidents.models import VeloSigmaExclusion  # noqa: E402
+from app.incidents.schema.velo_sigma import VelociraptorSigmaAlert  # noqa: E402
+from app.incidents.schema.velo_sigma import VeloSigmaExclusionCreate  # noqa: E402
+from app.incidents.services import velo_sigma_exclusions as cache  # noqa: E402
+from app.incidents.services.velo_sigma import VeloSigmaExclusionService  # noqa: E402
+
+POWERSHELL = "Microsoft-Windows-PowerShell/Operational"
+
+
+def _alert(path="C:\\Windows\\Temp\\build\\deploy.ps1", script="Get-Date", title="Suspicious Script", channel=POWERSHELL):
+    system = {
+        "Provider": {"Name": "Microsoft-Windows-PowerShell", "Guid": "{a0c1853b}"},
+        "EventID": {"Value": 4104},
+        "Version": 1,
+        "Level": 5,
+        "Task": 2,
+        "Opcode": 15,
+        "Keywords": 0,
+        "TimeCreated": {"SystemTime": 1760000000.0},
+        "EventRecordID": 1,
+        "Execution": {"ProcessID": 1, "ThreadID": 1},
+        "Channel": channel,
+        "Computer": "host-1",
+        "Security": {"UserID": "S-1-5-18"},
+    }
+    event_data = {"MessageNumber": 1, "MessageTotal": 1, "ScriptBlockText": script, "ScriptBlockId": "x", "Path": path}
+    return VelociraptorSigmaAlert(
+        computer="host-1",
+        channel=channel,
+        title=title,
+        level="high",
+        event={"System": system, "Message": "", "EventData": event_data},
+        index_pattern="velo_*",
+        sourceRef="ref",
+    )
+
+
+@pytest.fixture
+def store(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    state = SimpleNamespace(engine=engine, selects=0, updates=[])
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "incident_management_velo_sigma_exclusion" not in statement:
+            return
+        if statement.startswith("SELECT"):
+            state.selects += 1
+        elif statement.startswith("UPDATE"):
+            state.updates.append(parameters)
+
+    async def seed():
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda c: SQLModel.metadata.create_all(c, tables=[VeloSigmaExclusion.__table__]))
+        async with AsyncSession(engine) as session:
+            session.add_all(
+                [
+                    VeloSigmaExclusion(
+                        id=1,
+                        name="build scripts",
+                        channel=POWERSHELL,
+                        title="Suspicious Script",
+                        field_matches={"Path": "regex:C:\\\\Windows\\\\Temp\\\\.*\\\\deploy.ps1"},
+                        created_by="test",
+                    ),
+                    VeloSigmaExclusion(id=2, name="sysmon noise", channel="Microsoft-Windows-Sysmon/Operational", created_by="test"),
+                    VeloSigmaExclusion(
+                        id=3,
+                        name="any clock read",
+                        field_matches={"ScriptBlockText": "regex:^get-date$"},
+                        created_by="test",
+                    ),
+                    VeloSigmaExclusion(id=4, name="disabled", channel=POWERSHELL, enabled=False, created_by="test"),
+                ],
+            )
+            await session.commit()
+
+    asyncio.run(seed())
+    monkeypatch.setattr(cache, "async_engine", engine)
+    monkeypatch.setattr(cache, "_index", None)
+    monkeypatch.setattr(cache, "_pending", {})
+    monkeypatch.setattr(cache, "_flush_lock", asyncio.Lock())
+    monkeypatch.setattr(cache, "_flusher", None)
+    cache.reset_stats()
+    state.selects = 0
+    return state
+
+
+def _check(engine, alerts):
+    async def run():
+        async with AsyncSession(engine) as session:
+            service = VeloSigmaExclusionService(session)
+            matched = [await service.check_exclusions(alert) for alert in alerts]
+        await cache.close_match_stats()
+        return [exclusion.id if exclusion else None for exclusion in matched]
+
+    return asyncio.run(run())
+
+
+def _match_counts(engine):
+    async def query():
+        async with AsyncSession(engine) as session:
+            rows = (await session.execute(select(VeloSigmaExclusion).order_by(VeloSigmaExclusion.id))).scalars().all()
+            return {row.id: row.match_count for row in rows}
+
+    return asyncio.run(query())
+
+
+def test_a_burst_reads_once_and_writes_one_update_per_exclusion(store):
+    alerts = [_alert(script="Invoke-Thing") for _ in range(20)] + [_alert(path="C:\\Users\\x.ps1") for _ in range(5)]
+
+    matched = _check(store.engine, alerts)
+
+    assert matched == [1] * 20 + [3] * 5
+    assert store.selects == 1
+    assert len(store.updates) == 2
+    assert _match_counts(store.engine) == {1: 20, 2: 0, 3: 5, 4: 0}
+
+
+def test_only_candidate_exclusions_are_evaluated(store):
+    matched = _check(store.engine, [_alert(title="Other Rule", script="Invoke-Thing")])
+
+    assert matched == [None]
+    # Only the wildcard exclusion 3 applies to another rule; 1, 2 and the disabled 4 are never looked at.
+    assert cache.stats()["candidates_evaluated"] == 1
+
+
+def test_exclusion_writes_are_seen_by_the_next_alert(store):
+    async def scenario():
+        async with AsyncSession(store.engine) as session:
+            service = VeloSigmaExclusionService(session)
+            before = await service.check_exclusions(_alert(title="Other Rule", script="whoami"))
+            created = await service.create_exclusion(
+                VeloSigmaExclusionCreate(name="whoami", title="Other Rule", field_matches={"ScriptBlockText": "WHOAMI"}),
+            )
+            after = await service.check_exclusions(_alert(title="Other Rule", script="whoami"))
+            await service.update_exclusion(created.id, {"enabled": False})
+            disabled = await service.check_exclusions(_alert(title="Other Rule", script="whoami"))
+        await cache.close_match_stats()
+        return before, after and after.id == created.id, disabled
+
+    assert asyncio.run(scenario()) == (None, True, None)
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_compiled_rules_keep_the_old_matching_semantics():
+    def compiled(field_matches):
+        return cache.CompiledExclusion.from_row(VeloSigmaExclusion(id=9, name="t", field_matches=field_matches, created_by="t"))
+
+    exact_path = compiled({"TargetFilename": "C:\\\\Program Files\\\\App\\\\"})
+    assert exact_path.matches("unknown", {"TargetFilename": "c:\\program files\\app"})
+    assert not exact_path.matches("unknown", {"TargetFilename": "c:\\program files\\other"})
+
+    host = compiled({"HostApplication": "powershell.exe -nop"})
+    assert host.matches("unknown", {"Host Application": "PowerShell.exe -NOP"})
+    assert not host.matches("unknown", {"Path": "x"})
+
+    # A path regex decides on its own, as it always has.
+    path_first = compiled({"Path": "regex:C:\\\\Temp\\\\.*", "User": "alice"})
+    assert path_first.matches("unknown", {"Path": "c:\\temp\\a.ps1", "User": "bob"})
+
+    broken = compiled({"CommandLine": "regex:(unclosed"})
+    assert not broken.matches("unknown", {"CommandLine": "(unclosed"})
@@ -0,0 +1,145 @@
+"""Pooled Wazuh-Indexer clients: built once, rebuilt only when the connector changes.
+
+Every call to `create_wazuh_indexer_client_async` used to construct a new
+`AsyncElasticsearch` — a fresh TLS handshake and connection pool each time, and
+most callers never closed it. These tests pin the three properties that make
+sharing one client safe: reuse, rebuild on a real credential change, and a
+`close()` that a caller cannot use to tear the shared pool down.
+
+Run with: cd backend && python -m pytest tests/test_wazuh_indexer_client_registry.py
+"""
+
+import asyncio
+import os
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET", "test-only-secret-not-the-compromised-default")
+
+from app.connectors import cache as connector_cache  # noqa: E402
+from app.connectors.wazuh_indexer.utils import client_registry  # noqa: E402
+
+
+class _FakeClient:
+    def __init__(self, hosts, **kwargs):
+        self.hosts = hosts
+        self.kwargs = kwargs
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+    async def search(self, **kwargs):
+        return {"hosts": self.hosts}
+
+
+@pytest.fixture(autouse=True)
+def _clean_registry(monkeypatch):
+    client_registry._async_clients.clear()
+    client_registry._sync_clients.clear()
+    client_registry._retired.clear()
+    client_registry._locks.clear()
+    client_registry.reset_stats()
+
+    rows = {"Wazuh-Indexer": {"connector_url": "https://indexer.local:9200", "connector_username": "admin", "connector_password": "one"}}
+    loads = []
+
+    async def fake_load(connector_name):
+        loads.append(connector_name)
+        return dict(rows[connector_name])
+
+    monkeypatch.setattr(client_registry, "_load_attributes", fake_load)
+    monkeypatch.setattr(client_registry, "AsyncElasticsearch", _FakeClient)
+    yield rows, loads
+    client_registry._async_clients.clear()
+    client_registry._sync_clients.clear()
+    client_registry._retired.clear()
+
+
+def test_repeated_calls_share_one_client(_clean_registry):
+    _, loads = _clean_registry
+
+    async def scenario():
+        return [await client_registry.get_async_client("Wazuh-Indexer") for _ in range(5)]
+
+    handles = asyncio.run(scenario())
+
+    assert len({id(handle._client) for handle in handles}) == 1
+    assert loads == ["Wazuh-Indexer"], "the connector row was re-read for a pooled client"
+    assert client_registry.stats()["builds"] == 1
+    assert handles[0]._client.kwargs["maxsize"] == client_registry.POOL_MAXSIZE
+
+
+def test_concurrent_cold_calls_build_once(_clean_registry):
+    async def scenario():
+        return await asyncio.gather(*(client_registry.get_async_client("Wazuh-Indexer") for _ in range(10)))
+
+    handles = asyncio.run(scenario())
+
+    assert len({id(handle._client) for handle in handles}) == 1
+    assert client_registry.stats()["builds"] == 1
+
+
+def test_a_caller_closing_its_handle_leaves_the_pool_open(_clean_registry):
+    async def scenario():
+        first = await client_registry.get_async_client("Wazuh-Indexer")
+        await first.close()
+        second = await client_registry.get_async_client("Wazuh-Indexer")
+        return first, second, await second.search(index="wazuh-*")
+
+    first, second, result = asyncio.run(scenario())
+
+    assert first._client is second._client
+    assert first._client.closed is False
+    assert result == {"hosts": ["https://indexer.local:9200"]}
+
+
+def test_a_rotated_password_builds_a_new_client(_clean_registry):
+    rows, _ = _clean_registry
+
+    async def scenario():
+        before = await client_registry.get_async_client("Wazuh-Indexer")
+        rows["Wazuh-Indexer"]["connector_password"] = "two"
+        connector_cache.invalidate("Wazuh-Indexer")
+        after = await client_registry.get_async_client("Wazuh-Indexer")
+        return before, after
+
+    before, after = asyncio.run(scenario())
+
+    assert before._client is not after._client
+    assert after._client.kwargs["http_auth"] == ("admin", "two")
+    assert before._client in client_registry._retired, "the old client should wait out its grace period"
+
+
+def test_an_unchanged_row_after_invalidation_keeps_the_client(_clean_registry):
+    """`verify_connector_by_id` invalidates on every verify; that alone is not a change."""
+    _, loads = _clean_registry
+
+    async def scenario():
+        before = await client_registry.get_async_client("Wazuh-Indexer")
+        connector_cache.invalidate("Wazuh-Indexer")
+        after = await client_registry.get_async_client("Wazuh-Indexer")
+        return before, after
+
+    before, after = asyncio.run(scenario())
+
+    assert before._client is after._client
+    assert loads == ["Wazuh-Indexer", "Wazuh-Indexer"], "an invalidated client must re-read its row"
+    assert client_registry.stats()["builds"] == 1
+
+
+def test_close_all_closes_pooled_and_retired_clients(_clean_registry):
+    rows, _ = _clean_registry
+
+    async def scenario():
+        old = await client_registry.get_async_client("Wazuh-Indexer")
+        rows["Wazuh-Indexer"]["connector_url"] = "https://indexer-2.local:9200"
+        connector_cache.invalidate_all()
+        new = await client_registry.get_async_client("Wazuh-Indexer")
+        await client_registry.close_all()
+        return old, new
+
+    old, new = asyncio.run(scenario())
+
+    assert old._client.closed and new._client.closed
+    assert client_registry.stats()["async_clients"] == 0
@@ -67,7 +67,7 @@ export default {
 			params: {
 				timerange?: string
 				page_size?: number
-				scroll_id?: string
+				cursor?: string
 				query?: string
 				time_from?: string
 				time_to?: string
@@ -79,7 +79,7 @@ export default {
 			FlaskBaseResponse & {
 				events: EventSearchResult[]
 				total: number
-				scroll_id: string | null
+				cursor: string | null
 				page_size: number
 			}
 		>(`/siem/events/${query.customerCode}/${query.sourceName}`, { params: query.params, signal })
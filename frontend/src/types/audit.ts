@@ -17,14 +17,21 @@ export interface AuditLogEntry {
 }
 
 export interface AuditLogPagination {
-	total: number
+	/** null when requested with `count: "none"` */
+	total: number | null
+	/** with `count: "capped"`, true when there are more matching entries than `total` */
+	total_capped: boolean
 	skip: number
 	limit: number
+	/** pass back as `cursor` for the next page; null after the last page */
+	next_cursor: string | null
 }
 
 export interface AuditLogFilters {
 	skip?: number
 	limit?: number
+	cursor?: string
+	count?: "exact" | "capped" | "none"
 	actor_user_id?: number
 	actor_username?: string
 	action?: string
@@ -36,7 +43,7 @@ export interface AuditLogFilters {
 	start_time?: string
 	/** ISO datetime; only entries at/before this UTC time */
 	end_time?: string
-	/** Substring search over details, username and entity id */
+	/** Search over details, username and entity id: every word, as a word prefix (substring on short words) */
 	search?: string
 }
 